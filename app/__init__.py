@@ -1,10 +1,20 @@
-from flask import Flask, session, redirect, url_for, flash, render_template
+from flask import Flask, session, redirect, url_for, flash, render_template, jsonify, request, Response, abort
+import hmac
+import multiprocessing
 import os
 import threading
 from supabase import create_client, Client
 from datetime import datetime, timezone
 
 from . import sign_logic
+from . import recognition_metrics
+
+try:
+    from flask_sock import Sock
+except ImportError: # WebSocket frame streaming is optional
+    Sock = None
+
+sock = Sock() if Sock else None
 
 def format_utc_datetime(value):
     if not value:
@@ -46,16 +56,15 @@ def create_app(config_override=None): # Changed parameter name for clarity
             app.supabase = None
 
     print(f"App created. Static folder: {app.static_folder}, Template folder: {app.template_folder}")
-    print(f"Attempting to load model from: {app.config.get('MODEL_PATH')}")
-
+    sign_logic.MODEL_REGISTRY_DIR = app.config.get('MODEL_REGISTRY_DIR') or sign_logic.MODEL_REGISTRY_DIR
+    print(f"Model registry: {sign_logic.MODEL_REGISTRY_DIR}")
 
-    with app.app_context():
-        sign_logic.initialize_resources()
 
-        if sign_logic.interpreter is None or sign_logic.hands is None:
-             print("*"*60)
-             print("WARNING: Sign recognition initialization failed. Some features might not work.")
-             print("*"*60)
+    # Recognition resources warm up on a background thread on first use (or now, with WARM_UP_ON_START=1),
+    # so workers that only serve admin and teacher pages never load them. Progress is reported by /readyz.
+    # Video recognition pool processes (spawned, they re-import run.py) never warm up.
+    if sign_logic.WARM_UP_ON_START and multiprocessing.parent_process() is None:
+        sign_logic.start_warm_up()
 
 
     from .auth import bp as auth_bp
@@ -68,6 +77,9 @@ def create_app(config_override=None): # Changed parameter name for clarity
     app.register_blueprint(teacher_bp, url_prefix='/teacher') # Changed from 'teacher_routes.bp'
     app.register_blueprint(admin_bp, url_prefix='/admin') # Changed from admin_routes.bp
 
+    if sock is not None:
+        sock.init_app(app)
+
     # Register custom Jinja filter
     app.jinja_env.filters['format_utc_datetime'] = format_utc_datetime
 
@@ -87,6 +99,33 @@ def create_app(config_override=None): # Changed parameter name for clarity
                 return redirect(url_for('auth.login'))
         return redirect(url_for('auth.login'))
 
+    @app.route('/healthz')
+    def healthz():
+        return jsonify({'status': 'ok'})
+
+    @app.route('/readyz')
+    def readyz():
+        sign_logic.start_warm_up()
+        readiness = sign_logic.get_readiness()
+        return jsonify(readiness), 200 if readiness['status'] == 'ready' else 503
+
+    if not app.config.get('METRICS_TOKEN'):
+        print("METRICS_TOKEN is not set: /metrics is only served in debug mode (admins can use Admin > Metrics).")
+
+    @app.route('/metrics')
+    def metrics():
+        """Recognition latency histograms and frame counters in the Prometheus text format.
+
+        Requires 'Authorization: Bearer <METRICS_TOKEN>'; without a configured token it only exists in debug mode.
+        """
+        token = app.config.get('METRICS_TOKEN')
+        if not token:
+            if not app.debug:
+                abort(404)
+        elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(403)
+        return Response(recognition_metrics.registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
     @app.errorhandler(404)
     def page_not_found(e):
         return render_template('404.html'), 404
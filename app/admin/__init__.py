@@ -5,3 +5,5 @@ bp = Blueprint('admin', __name__)
 from . import dashboard_routes
 from . import user_management_routes
 from . import subject_management_routes
+from . import metrics_routes
+from . import model_routes
@@ -0,0 +1,41 @@
+from flask import render_template, session, jsonify
+from . import bp
+from app.utils import login_required, role_required
+from app import recognition_metrics, sign_logic
+
+@bp.route('/metrics')
+@login_required
+@role_required('Admin')
+def admin_metrics():
+    """Recognition latency per stage and frame counters (the same data as the Prometheus /metrics endpoint)."""
+    user_name = session.get('user_name', 'Admin')
+    counters = [
+        ('Frames processed', recognition_metrics.frames_total),
+        ('Frames without a hand', recognition_metrics.frames_without_hand_total),
+        ('Frames dropped', recognition_metrics.frames_dropped_total),
+        ('Prediction cache lookups', recognition_metrics.prediction_cache_total),
+    ]
+    counter_rows = [{'label': label, 'total': family.total(),
+                     'breakdown': ', '.join(f"{key}: {value}" for key, value in sorted(family.snapshot().items()))}
+                    for label, family in counters]
+    cache_lookups = recognition_metrics.prediction_cache_total.snapshot()
+    cache_total = sum(cache_lookups.values())
+    cache_hit_rate = cache_lookups.get('hit', 0) / cache_total if cache_total else None
+    age = recognition_metrics.prediction_age_seconds.child()
+    prediction_age = {q: age.quantile(q) for q in (0.5, 0.9, 0.99)}
+    return render_template('AdminMetrics.html',
+                           user_name=user_name,
+                           stages=recognition_metrics.stage_summary(),
+                           counters=counter_rows,
+                           prediction_age=prediction_age,
+                           prediction_age_count=age.count,
+                           cache_hit_rate=cache_hit_rate,
+                           readiness=sign_logic.get_readiness(),
+                           active_sessions=len(sign_logic.session_registry))
+
+@bp.route('/video_feed/stats')
+@login_required
+@role_required('Admin')
+def video_feed_stats():
+    """Per-stage timings (capture, inference, encode) of the camera feeds currently streaming, with each subscriber's delivery stats."""
+    return jsonify({'pipelines': sign_logic.get_camera_pipeline_stats()})
@@ -0,0 +1,56 @@
+from flask import render_template, session, redirect, url_for, flash
+from . import bp
+from app.utils import login_required, role_required
+from app import sign_logic, model_registry
+
+@bp.route('/models')
+@login_required
+@role_required('Admin')
+def admin_models():
+    """Registered model versions and the one serving predictions in this worker."""
+    user_name = session.get('user_name', 'Admin')
+    try:
+        versions = model_registry.list_versions(sign_logic.MODEL_REGISTRY_DIR)
+        registry_error = None
+    except model_registry.ModelRegistryError as e:
+        versions, registry_error = [], str(e)
+    loaded = sign_logic.active_model.describe() if sign_logic.active_model is not None else None
+    return render_template('AdminModels.html',
+                           user_name=user_name,
+                           versions=versions,
+                           loaded=loaded,
+                           registry_dir=sign_logic.MODEL_REGISTRY_DIR,
+                           registry_error=registry_error,
+                           reload_error=sign_logic.model_reload_error,
+                           variant=sign_logic.MODEL_VARIANT,
+                           watch_interval=sign_logic.MODEL_WATCH_INTERVAL)
+
+def _flash_reload(result):
+    if result['status'] == 'reloaded':
+        was = f" (was '{result['previous_version']}')" if result['previous_version'] else ''
+        flash(f"Model version '{result['version']}' is now serving predictions{was}.", 'success')
+    elif result['status'] == 'unchanged':
+        flash(f"Model version '{result['version']}' is already serving predictions.", 'info')
+    else:
+        flash(f"Reload failed; version '{result['version']}' keeps serving predictions: {result['error']}", 'danger')
+
+@bp.route('/models/reload', methods=['POST'])
+@login_required
+@role_required('Admin')
+def reload_model():
+    """Reloads the manifest's active version in this worker (other workers pick it up through their file watch)."""
+    _flash_reload(sign_logic.reload_model(force=True))
+    return redirect(url_for('admin.admin_models'))
+
+@bp.route('/models/<version>/activate', methods=['POST'])
+@login_required
+@role_required('Admin')
+def activate_model(version):
+    """Marks a registered version active in the manifest and swaps it in."""
+    try:
+        model_registry.set_active_version(version, sign_logic.MODEL_REGISTRY_DIR)
+    except model_registry.ModelRegistryError as e:
+        flash(f"Could not activate version '{version}': {e}", 'danger')
+        return redirect(url_for('admin.admin_models'))
+    _flash_reload(sign_logic.reload_model())
+    return redirect(url_for('admin.admin_models'))
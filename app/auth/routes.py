@@ -1,7 +1,7 @@
 from flask import render_template, redirect, url_for, flash, request, session, current_app
 from . import bp
 from app.utils import login_required
-from app.sign_logic import release_resources as release_camera_resources 
+from app.sign_logic import release_session as release_recognition_session
 from supabase import Client, PostgrestAPIError
 from gotrue.errors import AuthApiError
 from flask import jsonify, request
@@ -171,13 +171,11 @@ def logout():
     # Get user name for flash message before clearing session
     user_name = session.get('user_name', 'User') 
 
-    # Release camera and related resources first
+    # Drop this user's recognition session first; other students keep their streams
     try:
-        print("Calling release_camera_resources from logout...")
-        release_camera_resources()
-        print("Camera resources signaled for release.")
+        release_recognition_session(session.get('user_id'))
     except Exception as e:
-        print(f"Error calling release_camera_resources during logout: {e}")
+        print(f"Error releasing recognition session during logout: {e}")
         flash('Could not properly stop camera feed, but proceeding with logout.', 'warning')
 
     supabase: Client = current_app.supabase
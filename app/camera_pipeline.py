@@ -0,0 +1,165 @@
+from collections import deque
+import threading
+import time
+import os
+
+from .recognition_metrics import frames_dropped_total
+
+# --- Camera Pipeline Config ---
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 2)) # Processed frames waiting for the encode/stream stage; the oldest is dropped when full
+CAPTURE_RETRY_DELAY = 0.01 # Seconds the capture thread waits after a failed read
+STAGE_POLL_INTERVAL = 0.1 # Seconds a stage waits for input before re-checking for stop
+# --------------------------------
+
+
+class StageStats:
+    """Timing of one pipeline stage: frames handled, frames dropped, and last/mean/max latency."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.frames = 0
+        self.dropped = 0
+        self.total_seconds = 0.0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.frames += 1
+            self.total_seconds += seconds
+            self.last_seconds = seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+
+    def record_drop(self):
+        with self._lock:
+            self.dropped += 1
+        frames_dropped_total.inc(f'{self.name}_queue')
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                'frames': self.frames,
+                'dropped': self.dropped,
+                'fps': round(self.frames / elapsed, 2),
+                'last_ms': round(self.last_seconds * 1000, 3),
+                'mean_ms': round(self.total_seconds / self.frames * 1000, 3) if self.frames else 0.0,
+                'max_ms': round(self.max_seconds * 1000, 3),
+            }
+
+
+class BoundedStageQueue:
+    """Hand-off between two stages. Putting into a full queue drops its oldest item, so producers never block."""
+
+    def __init__(self, maxsize, stats=None):
+        self._items = deque()
+        self.maxsize = maxsize
+        self.stats = stats # the producer's StageStats; drops are counted there
+        self._condition = threading.Condition()
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                if self.stats is not None:
+                    self.stats.record_drop()
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Returns the oldest item, or None if nothing arrived within timeout."""
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def clear(self):
+        with self._condition:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class CameraPipeline:
+    """Capture -> inference -> encode/stream, each stage running concurrently.
+
+    capture() returns a frame or None; it runs on its own thread and only the newest frame is kept
+    (latest-frame-wins), so the device buffer is drained continuously and never goes stale.
+    process(frame, captured_at) runs on a second thread and its results are queued for the consumer,
+    which calls next_output() and records its own encode time with record_encode(). Throughput is
+    bounded by the slowest stage rather than the sum of all of them.
+    """
+
+    def __init__(self, capture, process, queue_size=PIPELINE_QUEUE_SIZE, name='camera'):
+        self.capture = capture
+        self.process = process
+        self.name = name
+        self.stats = {stage: StageStats(stage) for stage in ('capture', 'inference', 'encode')}
+        self._captured = BoundedStageQueue(1, self.stats['capture'])
+        self._processed = BoundedStageQueue(queue_size, self.stats['inference'])
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for target, stage in ((self._capture_loop, 'capture'), (self._inference_loop, 'inference')):
+            thread = threading.Thread(target=target, name=f'{self.name}-{stage}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        self._captured.clear()
+        self._processed.clear()
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stopped.is_set()
+
+    def _capture_loop(self):
+        while not self._stopped.is_set():
+            start = time.perf_counter()
+            try:
+                frame = self.capture()
+            except Exception as e:
+                print(f"Pipeline '{self.name}' capture error: {e}")
+                frame = None
+            if frame is None:
+                time.sleep(CAPTURE_RETRY_DELAY)
+                continue
+            self.stats['capture'].record(time.perf_counter() - start)
+            self._captured.put((frame, time.time()))
+
+    def _inference_loop(self):
+        while not self._stopped.is_set():
+            item = self._captured.get(timeout=STAGE_POLL_INTERVAL)
+            if item is None:
+                continue
+            frame, captured_at = item
+            start = time.perf_counter()
+            try:
+                result = self.process(frame, captured_at)
+            except Exception as e:
+                print(f"Pipeline '{self.name}' inference error: {e}")
+                continue
+            self.stats['inference'].record(time.perf_counter() - start)
+            if result is not None:
+                self._processed.put(result)
+
+    def next_output(self, timeout=STAGE_POLL_INTERVAL):
+        """Returns the next processed frame for the encode/stream stage, or None on timeout."""
+        return self._processed.get(timeout=timeout)
+
+    def record_encode(self, seconds):
+        self.stats['encode'].record(seconds)
+
+    def snapshot(self):
+        return {'name': self.name, 'running': self.running,
+                'stages': {stage: stats.snapshot() for stage, stats in self.stats.items()}}
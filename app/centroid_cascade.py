@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+
+# --- Centroid Cascade Config ---
+CENTROID_CASCADE = os.getenv('CENTROID_CASCADE', '1') == '1' # Answer clearly separated hands from the version's class prototypes before the model; '0' sends every hand to the model
+CENTROIDS_SUFFIX = '.centroids.npz' # Written next to the model by tools/build_centroids.py and registered with it
+CENTROIDS_FORMAT_VERSION = 1
+# --------------------------------
+
+
+def centroids_path_for(model_path):
+    return os.path.splitext(model_path)[0] + CENTROIDS_SUFFIX
+
+
+class CentroidCascade:
+    """Nearest-prototype early exit in front of the model (see tools/build_centroids.py).
+
+    prototypes is a (P, F) float32 matrix of class centroids (or a few k-means prototypes per class) and
+    prototype_classes the class of each row. A hand exits early when its nearest prototype lies within that
+    class's radius and the nearest prototype of any other class is at least ratio_threshold times farther;
+    it is then answered with class_probabilities[class], the model's mean output for that class. Every other
+    hand (an ambiguous margin, or far from all prototypes) goes to the model.
+    """
+
+    def __init__(self, prototypes, prototype_classes, class_probabilities, radii, ratio_threshold):
+        self.prototypes = np.ascontiguousarray(prototypes, dtype=np.float32)
+        self.prototype_classes = np.asarray(prototype_classes, dtype=np.intp)
+        self.class_probabilities = np.ascontiguousarray(class_probabilities, dtype=np.float32)
+        self.class_probabilities.setflags(write=False) # rows are handed out as predictions, never copied
+        self.radii = np.asarray(radii, dtype=np.float32)
+        self.ratio_threshold = float(ratio_threshold)
+        self.num_classes, self.num_features = len(self.class_probabilities), self.prototypes.shape[1]
+
+        # Prototypes regrouped class by class, k per class (a class with fewer repeats its first one), so one
+        # min over the last axis gives each class's nearest prototype. Squared distances throughout:
+        # |x - p|^2 = |x|^2 - 2 x.p + |p|^2, with -2 p stored transposed for one matrix product per batch.
+        groups = [self.prototypes[self.prototype_classes == index] for index in range(self.num_classes)]
+        self._per_class = max(len(group) for group in groups)
+        grouped = np.concatenate([np.concatenate([group] + [group[:1]] * (self._per_class - len(group))) for group in groups])
+        self._scaled_prototypes = np.ascontiguousarray(-2.0 * grouped.T, dtype=np.float32)
+        self._prototype_norms = np.einsum('ij,ij->i', grouped, grouped).astype(np.float32)
+        self._squared_radii = self.radii ** 2
+        self._radii_list = self._squared_radii.tolist()
+        self._squared_ratio = self.ratio_threshold ** 2
+
+    def __len__(self):
+        return len(self.prototypes)
+
+    def _class_distances(self, vectors):
+        """(N, num_classes) squared distance of each vector to each class's nearest prototype, less |x|^2."""
+        distances = vectors @ self._scaled_prototypes
+        distances += self._prototype_norms
+        return distances.reshape(len(vectors), self.num_classes, self._per_class).min(axis=2)
+
+    def early_exit(self, vectors):
+        """For (N, F) vectors, returns (bool mask of the rows answered early, nearest class index of every row)."""
+        per_class = self._class_distances(vectors)
+        classes = np.argmin(per_class, axis=1)
+        two_nearest = np.partition(per_class, 1, axis=1)[:, :2] + np.einsum('ij,ij->i', vectors, vectors)[:, None]
+        nearest_distance = np.maximum(two_nearest[:, 0], 0.0)
+        mask = (nearest_distance <= self._squared_radii[classes]) & (two_nearest[:, 1] >= self._squared_ratio * nearest_distance)
+        return mask, classes
+
+    def exit_class(self, vector):
+        """early_exit() for one (F,) vector, the live path: its class index if answered early, else None."""
+        per_class = self._class_distances(vector.reshape(1, -1))[0].tolist()
+        norm = float(np.dot(vector, vector))
+        index = min(range(self.num_classes), key=per_class.__getitem__)
+        nearest_distance = max(per_class[index] + norm, 0.0)
+        per_class[index] = float('inf')
+        if nearest_distance <= self._radii_list[index] and min(per_class) + norm >= self._squared_ratio * nearest_distance:
+            return index
+        return None
+
+    def save(self, path, source_model=None):
+        np.savez(path, format_version=CENTROIDS_FORMAT_VERSION, prototypes=self.prototypes,
+                 prototype_classes=self.prototype_classes.astype(np.int16), class_probabilities=self.class_probabilities,
+                 radii=self.radii, ratio_threshold=np.float32(self.ratio_threshold), source_model=str(source_model or ''))
+        return path
+
+
+def load_centroid_cascade(path):
+    """Reads a CentroidCascade saved by tools/build_centroids.py; raises ValueError for an unreadable file."""
+    try:
+        with np.load(path) as data:
+            if int(data['format_version']) > CENTROIDS_FORMAT_VERSION:
+                raise ValueError(f"{path} has format_version {int(data['format_version'])}; this build reads up to {CENTROIDS_FORMAT_VERSION}.")
+            return CentroidCascade(data['prototypes'], data['prototype_classes'], data['class_probabilities'],
+                                   data['radii'], float(data['ratio_threshold']))
+    except (OSError, KeyError) as e:
+        raise ValueError(f"Cannot read class prototypes from {path}: {e}")
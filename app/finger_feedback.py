@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+
+from .landmark_normalization import NUM_LANDMARKS, NUM_FEATURES
+
+# --- Finger Feedback Config ---
+# While a student practices a target sign, frames that are not that sign are compared with the target's landmark
+# statistics (see tools/build_finger_stats.py) and the finger that deviates most is named, so the UI can highlight it.
+# The statistics are a file of the model version (<model>.finger_stats.npz, registered next to its class prototypes),
+# so they always belong to the model that read the frame.
+FINGER_FEEDBACK = os.getenv('FINGER_FEEDBACK', '1') == '1' # Compute finger feedback for sessions with a practice target
+FINGER_STATS_SUFFIX = '.finger_stats.npz' # Statistics file next to its model: landmark_model.tflite -> landmark_model.finger_stats.npz
+FINGER_FEEDBACK_INTERVAL = 0.5 # Seconds between computations per session; frames in between keep the last result
+FINGER_FEEDBACK_MIN_Z = 1.5 # RMS z-score over a finger's landmarks at which it is named for correction
+FINGERS = (('thumb', (1, 2, 3, 4)), ('index', (5, 6, 7, 8)), ('middle', (9, 10, 11, 12)), ('ring', (13, 14, 15, 16)), ('pinky', (17, 18, 19, 20))) # MediaPipe landmark indices, base to tip
+# --------------------------------
+
+FINGER_NAMES = tuple(name for name, _ in FINGERS)
+
+
+def finger_stats_path_for(model_path):
+    """Where tools/build_finger_stats.py writes, and the registry looks for, a model's finger statistics."""
+    return os.path.splitext(model_path)[0] + FINGER_STATS_SUFFIX
+
+
+class FingerStats:
+    """Per-class landmark means and standard deviations, a few variants per class (k-means clusters). Loaded with the model version and shared by all sessions.
+
+    means and stds are (classes, variants, 42) in normalized coordinates; a class with fewer variants repeats
+    its first one. deviation() z-scores one frame against the nearest variant of the target class and
+    reduces the squared z-scores to per-finger and per-landmark RMS values: one vectorized pass over the 21x2 array.
+    """
+
+    def __init__(self, class_names, means, stds):
+        self.class_names = [str(name) for name in class_names]
+        self.means = np.ascontiguousarray(means, dtype=np.float32)
+        self.stds = np.ascontiguousarray(stds, dtype=np.float32)
+        self._inverse_stds = 1.0 / self.stds
+        self._class_index = {name: index for index, name in enumerate(self.class_names)}
+        self._finger_matrix = np.zeros((NUM_FEATURES, len(FINGERS)), dtype=np.float32) # mean over a finger's x and y values
+        for column, (_, landmarks) in enumerate(FINGERS):
+            for landmark in landmarks:
+                self._finger_matrix[2 * landmark:2 * landmark + 2, column] = 1.0 / (2 * len(landmarks))
+
+    def __contains__(self, sign):
+        return sign in self._class_index
+
+    @classmethod
+    def load(cls, path):
+        """Reads statistics saved by tools/build_finger_stats.py; raises ValueError for an unreadable file."""
+        try:
+            with np.load(path) as data:
+                return cls(data['class_names'], data['means'], data['stds'])
+        except (OSError, KeyError) as e:
+            raise ValueError(f"Cannot read finger statistics from {path}: {e}")
+
+    def save(self, path):
+        np.savez(path, class_names=np.array(self.class_names), means=self.means, stds=self.stds)
+        return path
+
+    def deviation(self, landmarks, sign, min_z=FINGER_FEEDBACK_MIN_Z):
+        """Compares a normalized (42,) frame with sign's statistics; None for a sign without statistics.
+
+        Returns {'target', 'finger' (the worst finger at min_z or above, else None), 'score' (its RMS z),
+        'fingers' ({finger: RMS z}), 'landmarks' (landmark indices of that finger at min_z or above, worst first)}.
+        """
+        index = self._class_index.get(sign)
+        if index is None:
+            return None
+        z = landmarks - self.means[index]
+        z *= self._inverse_stds[index]
+        np.square(z, out=z)
+        variant = int(np.argmin(z.sum(axis=1)))
+        squared = z[variant]
+        finger_scores = np.sqrt(squared @ self._finger_matrix).tolist()
+        worst = max(range(len(FINGERS)), key=finger_scores.__getitem__)
+        finger = FINGER_NAMES[worst] if finger_scores[worst] >= min_z else None
+        flagged = []
+        if finger is not None:
+            landmark_scores = np.sqrt(squared.reshape(NUM_LANDMARKS, 2).mean(axis=1)).tolist()
+            flagged = sorted((landmark for landmark in FINGERS[worst][1] if landmark_scores[landmark] >= min_z),
+                             key=landmark_scores.__getitem__, reverse=True)
+        return {'target': sign, 'finger': finger, 'score': round(finger_scores[worst], 2),
+                'fingers': {name: round(score, 2) for name, score in zip(FINGER_NAMES, finger_scores)}, 'landmarks': flagged}
+
+
+class FingerFeedback:
+    """Per-session, rate-limited finger feedback towards one target sign.
+
+    update() runs FingerStats.deviation() at most once per interval, and only on frames that are not the
+    target; a frame of the target (or without a hand) clears the result at once. Between computations the
+    last result is kept, so a 15-30 fps stream costs about two computations a second. stats_for_version(version)
+    returns the FingerStats of the model version that read a frame (None for the serving one, or None if it
+    has none); it is asked again whenever the frames' version changes, so a model swap never mixes statistics.
+    """
+
+    def __init__(self, target, stats_for_version, interval=FINGER_FEEDBACK_INTERVAL):
+        self.target = target
+        self.stats_for_version = stats_for_version
+        self.interval = interval
+        self.result = None
+        self._computed_at = None
+        self._version = None
+        self.stats = stats_for_version(None)
+
+    def update(self, prediction, landmarks, current_time, model_version=None):
+        """Returns the current result (None while the frames match the target or show no hand)."""
+        if model_version is not None and model_version != self._version:
+            self._version = model_version
+            self.stats = self.stats_for_version(model_version)
+            self.result, self._computed_at = None, None
+        if landmarks is None or prediction == self.target or self.stats is None:
+            self.result, self._computed_at = None, None
+        elif self._computed_at is None or current_time - self._computed_at >= self.interval:
+            self.result = self.stats.deviation(landmarks, self.target)
+            self._computed_at = current_time
+        return self.result
+
+
+def create_finger_feedback(target, stats_for_version):
+    """A FingerFeedback towards target for a session, or None when FINGER_FEEDBACK is off or the serving model has no statistics for target."""
+    if not FINGER_FEEDBACK or not target:
+        return None
+    stats = stats_for_version(None)
+    if stats is None or target not in stats:
+        return None
+    return FingerFeedback(target, stats_for_version)
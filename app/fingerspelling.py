@@ -0,0 +1,157 @@
+import re
+import time
+
+# --- Fingerspelling Word Mode Config ---
+FINGERSPELL_BEAM_WIDTH = 8 # Prefixes kept per frame; each frame costs O(beam width * alphabet)
+FINGERSPELL_MIN_BLANK = 0.05 # Smallest "between letters" (CTC blank) probability of a frame with a hand
+FINGERSPELL_MIN_LETTER_PROBABILITY = 1e-4 # Letters less likely than this in a frame are not extended
+FINGERSPELL_WORD_GAP_FRAMES = 8 # Frames without a hand (about 0.5 s at 15 fps) that end a word
+FINGERSPELL_HYPOTHESES = 3 # Ranked words reported while spelling
+# --------------------------------
+
+_WORD_PATTERN = re.compile(r"[A-Za-z]{2,}")
+
+
+def vocabulary_words(texts):
+    """Upper-case words (two letters or more) found in texts: strings (split on anything but letters) or lists of them."""
+    words = []
+    for text in texts:
+        if isinstance(text, (list, tuple)):
+            words.extend(vocabulary_words(text))
+        elif text:
+            words.extend(word.upper() for word in _WORD_PATTERN.findall(str(text)))
+    return list(dict.fromkeys(words))
+
+
+class LexiconTrie:
+    """Prefix tree of the words a student may spell, over the model's single-letter classes.
+
+    Nodes are integers (0 is the root); children[node] maps a class index to the child node, letter[node]
+    and parent[node] are the class index and node that lead to node, and word[node] is the word ending
+    there (None for a prefix). Words using a letter the model does not know are left out.
+    """
+
+    def __init__(self, words, class_names):
+        letter_index = {name.upper(): index for index, name in enumerate(class_names) if len(name) == 1}
+        self.class_names = list(class_names)
+        self.num_classes = len(class_names)
+        self.children = [{}]
+        self.letter = [None]
+        self.parent = [None]
+        self.word = [None]
+        self.words = []
+        for word in words:
+            word = word.upper()
+            if not word or any(char not in letter_index for char in word):
+                continue
+            node = 0
+            for char in word:
+                index = letter_index[char]
+                child = self.children[node].get(index)
+                if child is None:
+                    child = len(self.children)
+                    self.children[node][index] = child
+                    self.children.append({})
+                    self.letter.append(index)
+                    self.parent.append(node)
+                    self.word.append(None)
+                node = child
+            if self.word[node] is None:
+                self.word[node] = word
+                self.words.append(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def prefix(self, node):
+        """The letters spelled to reach node."""
+        letters = []
+        while node:
+            letters.append(self.class_names[self.letter[node]])
+            node = self.parent[node]
+        return ''.join(reversed(letters))
+
+
+class FingerspellingDecoder:
+    """Per-session CTC-style prefix beam search over the model's per-frame probabilities, constrained to a LexiconTrie.
+
+    update() takes each frame's probability vector (None for a frame without a hand). A letter held for
+    many frames collapses into one; a doubled letter ("LL") needs a blank (a low-confidence or handless
+    frame) between its two holds. Frames without a hand are blanks, and FINGERSPELL_WORD_GAP_FRAMES of
+    them in a row end the word: the most likely complete word is returned and the search starts over.
+    Beams are keyed by trie node, so each frame costs O(beam_width * alphabet) at most.
+    """
+
+    def __init__(self, trie, beam_width=FINGERSPELL_BEAM_WIDTH, min_blank=FINGERSPELL_MIN_BLANK,
+                 word_gap_frames=FINGERSPELL_WORD_GAP_FRAMES):
+        self.trie = trie
+        self.beam_width = beam_width
+        self.min_blank = min_blank
+        self.word_gap_frames = word_gap_frames
+        self.reset()
+
+    def reset(self):
+        self._beams = {0: (1.0, 0.0)} # trie node -> (probability ending in a blank, probability ending in its letter)
+        self._gap_frames = 0
+        self._spelling = False # a hand has been seen since the last reset
+
+    def update(self, probabilities, current_time=None):
+        """Advances the search by one frame; returns {'sign', 'confidence', 'timestamp'} when it ends a word, else None."""
+        if probabilities is None or len(probabilities) != self.trie.num_classes:
+            self._gap_frames += 1
+            self._step_blank()
+            if self._spelling and self._gap_frames >= self.word_gap_frames:
+                return self._finish_word(current_time)
+            return None
+        self._gap_frames = 0
+        self._spelling = True
+        self._step(probabilities)
+        return None
+
+    def _step_blank(self):
+        self._beams = {node: (blank + letter, 0.0) for node, (blank, letter) in self._beams.items()}
+
+    def _step(self, probabilities):
+        blank_probability = max(self.min_blank, 1.0 - float(max(probabilities)))
+        letter_scale = 1.0 - blank_probability
+        children, letter_of = self.trie.children, self.trie.letter
+        beams = {}
+        for node, (blank, letter) in self._beams.items():
+            total = blank + letter
+            node_blank, node_letter = beams.get(node, (0.0, 0.0))
+            node_blank += total * blank_probability
+            if node:
+                node_letter += letter * float(probabilities[letter_of[node]]) * letter_scale # the same letter, still held
+            beams[node] = (node_blank, node_letter)
+            for index, child in children[node].items():
+                p = float(probabilities[index]) * letter_scale
+                if p < FINGERSPELL_MIN_LETTER_PROBABILITY:
+                    continue
+                # A repeat of the node's own letter only starts a new letter after a blank
+                extend = blank * p if node and index == letter_of[node] else total * p
+                child_blank, child_letter = beams.get(child, (0.0, 0.0))
+                beams[child] = (child_blank, child_letter + extend)
+
+        ranked = sorted(beams.items(), key=lambda item: item[1][0] + item[1][1], reverse=True)[:self.beam_width]
+        norm = sum(blank + letter for _, (blank, letter) in ranked) or 1.0
+        self._beams = {node: (blank / norm, letter / norm) for node, (blank, letter) in ranked}
+
+    def hypotheses(self, count=FINGERSPELL_HYPOTHESES):
+        """Up to count complete words among the beams as [{'word', 'score'}], most likely first."""
+        words = [(self.trie.word[node], blank + letter) for node, (blank, letter) in self._beams.items()
+                 if self.trie.word[node] is not None and blank + letter >= 0.001]
+        words.sort(key=lambda item: item[1], reverse=True)
+        return [{'word': word, 'score': round(score, 3)} for word, score in words[:count]]
+
+    def prefix(self):
+        """The letters of the most likely prefix spelled so far."""
+        node = max(self._beams, key=lambda n: sum(self._beams[n]))
+        return self.trie.prefix(node)
+
+    def _finish_word(self, current_time):
+        best = self.hypotheses(1)
+        self.reset()
+        if not best:
+            return None
+        return {'sign': best[0]['word'], 'confidence': best[0]['score'],
+                'timestamp': current_time if current_time is not None else time.time()}
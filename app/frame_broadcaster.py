@@ -0,0 +1,160 @@
+import threading
+import time
+
+from .camera_pipeline import STAGE_POLL_INTERVAL
+from .recognition_metrics import frames_dropped_total
+
+
+class BroadcastFrame:
+    """One published frame: the payload every subscriber sends from, plus the prediction it shows."""
+
+    __slots__ = ('seq', 'payload', 'prediction', 'published_at')
+
+    def __init__(self, seq, payload, prediction, published_at):
+        self.seq = seq
+        self.payload = payload
+        self.prediction = prediction
+        self.published_at = published_at
+
+
+class Subscription:
+    """A subscriber's cursor into a FrameBroadcaster. Slow subscribers skip straight to the newest frame."""
+
+    def __init__(self, broadcaster, recognition_session):
+        self.broadcaster = broadcaster
+        self.recognition_session = recognition_session
+        self.cursor = broadcaster.latest_seq # only frames published after subscribing are delivered
+        self.delivered = 0
+        self.skipped = 0
+        self.stream = None # the subscriber's AdaptiveMjpegStream, if any; reported in snapshots
+        self.closed = False
+
+    def next_frame(self, timeout=STAGE_POLL_INTERVAL):
+        """Waits for a frame newer than the cursor; returns the newest one, or None on timeout/close."""
+        frame = self.broadcaster._wait_for_frame(self.cursor, timeout)
+        if frame is None or self.closed:
+            return None
+        skipped = frame.seq - self.cursor - 1
+        if skipped:
+            self.skipped += skipped
+            frames_dropped_total.inc('subscriber_skip', skipped)
+        self.cursor = frame.seq
+        self.delivered += 1
+        return frame
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broadcaster._unsubscribe(self)
+
+
+class FrameBroadcaster:
+    """Runs one capture + recognition + encode loop per source and fans it out to any number of subscribers.
+
+    make_pipeline(broadcaster) builds the CameraPipeline whose processed frames are turned into a payload
+    once by encode(processed, encode_stats) -> (payload, prediction dict) and published to all subscribers;
+    encode_stats is the pipeline's 'encode' StageStats. The loop starts with the first subscriber and
+    stops as soon as the last one unsubscribes.
+    """
+
+    def __init__(self, name, make_pipeline, encode):
+        self.name = name
+        self.make_pipeline = make_pipeline
+        self.encode = encode
+        self.pipeline = None
+        self.latest_seq = 0
+        self._latest = None
+        self._subscriptions = []
+        self.subscriber_sessions = () # distinct RecognitionSessions of the current subscribers, replaced on change
+        self._lifecycle_lock = threading.Lock() # subscribe/unsubscribe/start/stop
+        self._condition = threading.Condition() # frame publication
+        self._stopped = threading.Event()
+        self._publisher = None
+        self.frames_published = 0
+
+    def subscribe(self, recognition_session=None):
+        with self._lifecycle_lock:
+            subscription = Subscription(self, recognition_session)
+            self._subscriptions.append(subscription)
+            self._refresh_sessions()
+            if self._publisher is None:
+                self._start()
+            print(f"Broadcaster '{self.name}': subscriber added ({len(self._subscriptions)} active).")
+            return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lifecycle_lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                self._refresh_sessions()
+            print(f"Broadcaster '{self.name}': subscriber left ({len(self._subscriptions)} active).")
+            if not self._subscriptions and self._publisher is not None:
+                self._stop()
+        with self._condition:
+            self._condition.notify_all() # wake the leaving subscriber if it is waiting
+
+    def _refresh_sessions(self):
+        sessions = []
+        for subscription in self._subscriptions:
+            if subscription.recognition_session is not None and subscription.recognition_session not in sessions:
+                sessions.append(subscription.recognition_session)
+        self.subscriber_sessions = tuple(sessions)
+
+    def _start(self):
+        """Call with _lifecycle_lock held."""
+        self._stopped.clear()
+        self.pipeline = self.make_pipeline(self).start()
+        self._publisher = threading.Thread(target=self._publish_loop, name=f'{self.name}-encode', daemon=True)
+        self._publisher.start()
+        print(f"Broadcaster '{self.name}' started.")
+
+    def _stop(self):
+        """Call with _lifecycle_lock held."""
+        self._stopped.set()
+        self.pipeline.stop()
+        if self._publisher is not threading.current_thread():
+            self._publisher.join(timeout=1.0)
+        self._publisher = None
+        print(f"Broadcaster '{self.name}' stopped (no subscribers).")
+
+    def _publish_loop(self):
+        """Encode/stream stage: prepares each processed frame once and hands it to every subscriber."""
+        pipeline = self.pipeline
+        while not self._stopped.is_set():
+            processed = pipeline.next_output()
+            if processed is None:
+                continue
+            try:
+                payload, prediction = self.encode(processed, pipeline.stats['encode'])
+            except Exception as e:
+                print(f"Broadcaster '{self.name}' encode error: {e}")
+                continue
+            if payload is None:
+                continue
+            with self._condition:
+                self.latest_seq += 1
+                self._latest = BroadcastFrame(self.latest_seq, payload, prediction, time.time())
+                self.frames_published += 1
+                self._condition.notify_all()
+
+    def _wait_for_frame(self, cursor, timeout):
+        with self._condition:
+            if self.latest_seq <= cursor:
+                self._condition.wait(timeout)
+            if self.latest_seq <= cursor:
+                return None
+            return self._latest
+
+    def snapshot(self):
+        with self._lifecycle_lock:
+            subscriptions = list(self._subscriptions)
+            pipeline = self.pipeline if self._publisher is not None else None
+        return {
+            'name': self.name,
+            'running': pipeline is not None,
+            'frames_published': self.frames_published,
+            'subscribers': [{'user_id': s.recognition_session.user_id if s.recognition_session else None,
+                             'delivered': s.delivered, 'skipped': s.skipped,
+                             'stream': s.stream.snapshot() if s.stream is not None else None} for s in subscriptions],
+            'stages': pipeline.snapshot()['stages'] if pipeline is not None else {},
+        }
@@ -0,0 +1,113 @@
+import cv2
+import numpy as np
+from collections import deque
+import threading
+import os
+
+from .recognition_metrics import frames_dropped_total
+
+# --- Browser Frame Ingestion Config ---
+MAX_FRAME_WIDTH = int(os.getenv('MAX_FRAME_WIDTH', 640)) # Frames wider than this are downscaled before MediaPipe
+MAX_FRAME_HEIGHT = int(os.getenv('MAX_FRAME_HEIGHT', 480))
+MAX_FRAME_BYTES = int(os.getenv('MAX_FRAME_BYTES', 2 * 1024 * 1024)) # Reject payloads larger than this
+FRAME_QUEUE_SIZE = int(os.getenv('FRAME_QUEUE_SIZE', 2)) # Pending frames kept per session; older ones are dropped
+ENCODED_FRAME_TYPES = {'image/jpeg', 'image/jpg', 'image/png', 'image/webp'}
+RAW_FRAME_TYPES = {'application/octet-stream'}
+RAW_FRAME_CHANNELS = {3: cv2.COLOR_BGR2RGB, 4: cv2.COLOR_RGBA2RGB} # 3 = BGR, 4 = RGBA (canvas getImageData)
+# --------------------------------
+
+
+class FrameDecodeError(ValueError):
+    """Raised when an uploaded frame cannot be decoded."""
+
+
+class PendingFrame:
+    """An undecoded browser frame waiting in a session's ingest queue."""
+    __slots__ = ('payload', 'content_type', 'width', 'height', 'channels', 'mirror')
+
+    def __init__(self, payload, content_type, width=None, height=None, channels=None, mirror=True):
+        self.payload = payload
+        self.content_type = content_type
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.mirror = mirror
+
+
+def make_pending_frame(payload, content_type, width=None, height=None, channels=None, mirror=True):
+    """Validates request metadata cheaply so bad uploads fail before they are queued."""
+    if not payload:
+        raise FrameDecodeError("Empty frame payload.")
+    if len(payload) > MAX_FRAME_BYTES:
+        raise FrameDecodeError(f"Frame payload too large ({len(payload)} bytes, max {MAX_FRAME_BYTES}).")
+
+    content_type = (content_type or '').lower()
+    if content_type in ENCODED_FRAME_TYPES:
+        return PendingFrame(payload, content_type, mirror=mirror)
+    if content_type in RAW_FRAME_TYPES:
+        channels = channels or 4
+        if not width or not height:
+            raise FrameDecodeError("Raw frames require width and height.")
+        if channels not in RAW_FRAME_CHANNELS:
+            raise FrameDecodeError(f"Unsupported channel count {channels} (expected 3 or 4).")
+        if len(payload) != width * height * channels:
+            raise FrameDecodeError(f"Raw frame size {len(payload)} does not match {width}x{height}x{channels}.")
+        return PendingFrame(payload, content_type, width, height, channels, mirror)
+    raise FrameDecodeError(f"Unsupported frame content type '{content_type}'.")
+
+
+def decode_frame(pending_frame):
+    """Decodes a PendingFrame into a contiguous RGB uint8 array no larger than the configured max resolution."""
+    # np.frombuffer wraps the request bytes without copying them
+    buffer = np.frombuffer(pending_frame.payload, dtype=np.uint8)
+    if pending_frame.content_type in ENCODED_FRAME_TYPES:
+        image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        if image is None:
+            raise FrameDecodeError("Could not decode image payload.")
+        color_conversion = cv2.COLOR_BGR2RGB
+    else:
+        image = buffer.reshape(pending_frame.height, pending_frame.width, pending_frame.channels)
+        color_conversion = RAW_FRAME_CHANNELS[pending_frame.channels]
+
+    height, width = image.shape[:2]
+    scale = min(MAX_FRAME_WIDTH / width, MAX_FRAME_HEIGHT / height, 1.0)
+    if scale < 1.0:
+        # Downscaling first keeps the remaining passes on the smaller image
+        image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    if pending_frame.mirror:
+        image = cv2.flip(image, 1) # Mirror to match the server camera path
+    return cv2.cvtColor(image, color_conversion)
+
+
+class FrameIngestQueue:
+    """Bounded per-session queue with latest-frame-wins semantics."""
+
+    def __init__(self, maxlen=FRAME_QUEUE_SIZE):
+        self._frames = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, pending_frame):
+        with self._lock:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1 # deque drops the oldest frame for us
+                frames_dropped_total.inc('browser_queue')
+            self._frames.append(pending_frame)
+            self.received += 1
+
+    def take_latest(self):
+        """Returns the newest pending frame (or None) and discards anything older."""
+        with self._lock:
+            if not self._frames:
+                return None
+            pending_frame = self._frames.pop()
+            if self._frames:
+                self.dropped += len(self._frames)
+                frames_dropped_total.inc('browser_queue', len(self._frames))
+            self._frames.clear()
+            return pending_frame
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
@@ -0,0 +1,43 @@
+import os
+
+# --- Two-Hand Tracking Config ---
+HAND_SEARCH_INTERVAL = int(os.getenv('HAND_SEARCH_INTERVAL', 5)) # While one hand is tracked, look for a second one every Nth frame
+# --------------------------------
+
+
+class TwoHandTracker:
+    """MediaPipe Hands for two-hand mode that costs about as much as one-hand tracking while one hand is in view.
+
+    A max_num_hands=2 tracker runs palm detection on every frame until it tracks two hands, which more
+    than halves the frame rate for a single hand. Here a one-hand tracker follows a single hand and the
+    two-hand tracker only looks for a second one every search_interval frames; once it finds both hands
+    it tracks them (no detection) until one is lost. process() returns MediaPipe results like Hands does.
+    """
+
+    def __init__(self, create_hands, search_interval=HAND_SEARCH_INTERVAL):
+        self._one_hand = create_hands(1)
+        self._two_hands = create_hands(2)
+        self.search_interval = max(1, search_interval)
+        self._frames_since_search = 0
+        self._tracking_two = False
+
+    def process(self, image):
+        if self._tracking_two:
+            results = self._two_hands.process(image)
+            if results.multi_hand_landmarks and len(results.multi_hand_landmarks) >= 2:
+                return results
+            self._tracking_two = False # a hand left: back to one-hand tracking, searching again in search_interval frames
+            self._frames_since_search = 0
+            return results
+
+        self._frames_since_search += 1
+        if self._frames_since_search < self.search_interval:
+            return self._one_hand.process(image)
+        self._frames_since_search = 0
+        results = self._two_hands.process(image)
+        self._tracking_two = bool(results.multi_hand_landmarks) and len(results.multi_hand_landmarks) >= 2
+        return results
+
+    def close(self):
+        self._one_hand.close()
+        self._two_hands.close()
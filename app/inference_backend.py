@@ -0,0 +1,183 @@
+import os
+
+import numpy as np
+
+from . import tflite_model as tfl
+from .interpreter_pool import InterpreterPool
+
+# --- Inference Backend Config ---
+# 'numpy' runs the model's dense layers directly in NumPy (no TensorFlow import); models it cannot
+# execute fall back to 'tflite', which serves every invoke from an InterpreterPool.
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'numpy').lower()
+# --------------------------------
+
+
+class UnsupportedModelError(ValueError):
+    """Raised when NumpyBackend meets an operator or layout it does not implement."""
+
+
+# Pre-typed scalars so the per-row quantization below never converts Python numbers on the hot path
+_INT8_MAX = np.float32(127)
+_SYMMETRIC_MIN = np.float32(-127) # Symmetric quantization leaves -128 unused
+_ASYMMETRIC_LEVELS = np.float32(255)
+_MIN_QUANTIZATION_SCALE = np.float32(np.finfo(np.float32).tiny) # All-zero rows quantize to zeros instead of NaN
+_ZERO = np.float32(0)
+
+
+def _fake_quantize_rows(activations, asymmetric):
+    """Rounds each row to int8 and back, using the same per-row scale (and zero point) as TFLite hybrid kernels."""
+    if asymmetric:
+        lower = np.minimum(activations.min(axis=1, keepdims=True), _ZERO)
+        scale = np.maximum(activations.max(axis=1, keepdims=True), _ZERO)
+        scale -= lower
+        scale /= _ASYMMETRIC_LEVELS
+        np.maximum(scale, _MIN_QUANTIZATION_SCALE, out=scale)
+        # The int8 range [-128, 127] minus the zero point, i.e. the representable levels in units of scale
+        np.divide(lower, scale, out=lower)
+        np.round(lower, out=lower)
+        upper = lower + _ASYMMETRIC_LEVELS
+    else:
+        scale = np.abs(activations).max(axis=1, keepdims=True)
+        scale /= _INT8_MAX
+        np.maximum(scale, _MIN_QUANTIZATION_SCALE, out=scale)
+        lower, upper = _SYMMETRIC_MIN, _INT8_MAX
+    quantized = activations / scale
+    np.round(quantized, out=quantized)
+    np.minimum(quantized, upper, out=quantized)
+    np.maximum(quantized, lower, out=quantized)
+    quantized *= scale
+    return quantized
+
+
+class NumpyBackend:
+    """Pure-NumPy executor for small feed-forward .tflite models.
+
+    Weights and biases are read out of the flatbuffer once (int8 weights are dequantized with their
+    per-channel scales) and every FULLY_CONNECTED layer runs as one batched matmul. Layers with int8
+    weights also round their inputs to int8 per row, as TFLite's dynamic-range (hybrid) kernels do,
+    so outputs match the interpreter rather than the float model it was converted from. Supported ops:
+    FULLY_CONNECTED, RELU, RELU6, SOFTMAX, RESHAPE and DEQUANTIZE of constants. The compiled layers are
+    read-only, so predict() is safe to call from any number of threads at once.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, model_path):
+        model = tfl.read_model(model_path)
+        if len(model.inputs) != 1 or len(model.outputs) != 1:
+            raise UnsupportedModelError("Only single-input, single-output models are supported.")
+        input_tensor = model.tensors[model.inputs[0]]
+        output_tensor = model.tensors[model.outputs[0]]
+        if input_tensor.dtype != np.float32 or len(input_tensor.shape) != 2:
+            raise UnsupportedModelError(f"Expected a float32 (batch, features) input, got {input_tensor.dtype} {input_tensor.shape}.")
+        self.num_features = input_tensor.shape[1]
+        self.num_classes = output_tensor.shape[-1]
+        self._steps = self._compile(model)
+
+    def _compile(self, model):
+        """Turns the operator list into [(kind, params)] over a single running activation."""
+        constants = {} # tensor index -> float32 array, for DEQUANTIZE outputs
+        current = model.inputs[0]
+        steps = []
+
+        def constant(index):
+            if index in constants:
+                return constants[index]
+            return model.tensors[index].dequantized()
+
+        for op in model.operators:
+            if op.opcode == tfl.DEQUANTIZE and model.tensors[op.inputs[0]].data is not None:
+                constants[op.outputs[0]] = model.tensors[op.inputs[0]].dequantized()
+                continue
+            if op.inputs[0] != current:
+                raise UnsupportedModelError("Only sequential (single-path) graphs are supported.")
+
+            if op.opcode == tfl.FULLY_CONNECTED:
+                weights = constant(op.inputs[1]) # (units, inputs)
+                has_bias = len(op.inputs) > 2 and op.inputs[2] >= 0
+                bias = constant(op.inputs[2]) if has_bias else np.zeros(weights.shape[0], dtype=np.float32)
+                activation = op.options.scalar(0, '<b') if op.options is not None else tfl.ACTIVATION_NONE
+                if activation not in (tfl.ACTIVATION_NONE, tfl.ACTIVATION_RELU, tfl.ACTIVATION_RELU6):
+                    raise UnsupportedModelError(f"Unsupported fused activation {activation}.")
+                input_quantization = None
+                if model.tensors[op.inputs[1]].dtype == np.int8: # Hybrid layer: float activations, int8 weights
+                    asymmetric = op.options is not None and op.options.scalar(3, '<b') == 1
+                    input_quantization = 'asymmetric' if asymmetric else 'symmetric'
+                steps.append(('dense', (np.ascontiguousarray(weights.T), np.ascontiguousarray(bias), activation, input_quantization)))
+            elif op.opcode == tfl.RELU:
+                steps.append(('activation', tfl.ACTIVATION_RELU))
+            elif op.opcode == tfl.RELU6:
+                steps.append(('activation', tfl.ACTIVATION_RELU6))
+            elif op.opcode == tfl.SOFTMAX:
+                beta = op.options.scalar(0, '<f', 1.0) if op.options is not None else 1.0
+                steps.append(('softmax', np.float32(beta)))
+            elif op.opcode == tfl.RESHAPE:
+                if len(model.tensors[op.outputs[0]].shape) != 2:
+                    raise UnsupportedModelError("Only reshapes to (batch, features) are supported.")
+            else:
+                raise UnsupportedModelError(f"Unsupported builtin operator {op.opcode}.")
+            current = op.outputs[0]
+
+        if current != model.outputs[0]:
+            raise UnsupportedModelError("Graph output is not the end of the operator chain.")
+        return steps
+
+    def predict(self, batch):
+        """Runs an (N, num_features) float32 batch; returns (N, num_classes) probabilities."""
+        activations = np.asarray(batch, dtype=np.float32)
+        for kind, params in self._steps:
+            if kind == 'dense':
+                weights, bias, activation, input_quantization = params
+                if input_quantization is not None:
+                    activations = _fake_quantize_rows(activations, input_quantization == 'asymmetric')
+                activations = activations @ weights
+                activations += bias
+                if activation == tfl.ACTIVATION_RELU:
+                    np.maximum(activations, _ZERO, out=activations)
+                elif activation == tfl.ACTIVATION_RELU6:
+                    np.clip(activations, 0, 6, out=activations)
+            elif kind == 'activation':
+                activations = np.maximum(activations, 0) if params == tfl.ACTIVATION_RELU else np.clip(activations, 0, 6)
+            elif kind == 'softmax':
+                activations = activations * params # also copies, so the caller's batch is never modified
+                activations -= activations.max(axis=1, keepdims=True)
+                np.exp(activations, out=activations)
+                activations /= activations.sum(axis=1, keepdims=True)
+        return activations
+
+    def warm_up(self):
+        self.predict(np.zeros((1, self.num_features), dtype=np.float32))
+
+    def pin_current_thread(self):
+        return True # Stateless: every thread can call predict() directly
+
+
+class TFLiteBackend:
+    """Runs the model through the TFLite interpreter, one InterpreterPool slot per concurrent caller."""
+
+    name = 'tflite'
+
+    def __init__(self, model_path):
+        self.pool = InterpreterPool(model_path)
+        self.num_features, self.num_classes = self.pool.io_shape()
+
+    def predict(self, batch):
+        return self.pool.predict(batch)
+
+    def warm_up(self):
+        self.pool.warm_up(self.num_features)
+
+    def pin_current_thread(self):
+        return self.pool.pin_current_thread()
+
+
+def create_backend(model_path, backend_name=INFERENCE_BACKEND):
+    """Builds the configured backend, falling back to TFLite when NumpyBackend cannot run the model."""
+    if backend_name == 'numpy':
+        try:
+            return NumpyBackend(model_path)
+        except (UnsupportedModelError, tfl.TFLiteFormatError) as e:
+            print(f"NumPy inference backend cannot run {model_path} ({e}); falling back to TFLite.")
+    elif backend_name != 'tflite':
+        print(f"Unknown INFERENCE_BACKEND '{backend_name}'; using TFLite.")
+    return TFLiteBackend(model_path)
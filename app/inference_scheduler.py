@@ -0,0 +1,120 @@
+from collections import deque
+from concurrent.futures import Future
+import threading
+import time
+import os
+
+import numpy as np
+
+# --- Inference Scheduler Config ---
+# How long the first request waits for others to join its batch. 0 still batches everything that queued up
+# while the previous batch was running, without adding latency for a lone student.
+INFERENCE_BATCH_WINDOW_MS = float(os.getenv('INFERENCE_BATCH_WINDOW_MS', 0))
+INFERENCE_MAX_BATCH = int(os.getenv('INFERENCE_MAX_BATCH', 32)) # A batch is dispatched immediately once this many requests are pending
+INFERENCE_RESULT_TIMEOUT = 2.0 # Seconds a caller waits for its result before giving up
+# --------------------------------
+
+
+class InferenceScheduler:
+    """Collects landmark vectors from concurrent sessions and runs them through the model as one batch.
+
+    run_batch(batch) receives an (N, num_features) float32 array and must return (N, num_classes)
+    probabilities. Callers get a Future per vector; one background thread does all the invokes.
+    thread_initializer, if given, runs once on that thread before the first batch.
+    """
+
+    def __init__(self, run_batch, num_features=42, batch_window_ms=INFERENCE_BATCH_WINDOW_MS, max_batch_size=INFERENCE_MAX_BATCH, thread_initializer=None):
+        self.run_batch = run_batch
+        self.thread_initializer = thread_initializer
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._batch_buffer = np.empty((max_batch_size, num_features), dtype=np.float32)
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.stats = {'batches': 0, 'requests': 0, 'max_batch_seen': 0, 'errors': 0}
+        self._thread = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._thread.start()
+
+    def submit(self, vector):
+        """Queues one normalized landmark vector; returns a Future resolving to its probability row."""
+        future = Future()
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Inference scheduler is stopped.")
+            self._pending.append((vector, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._condition.notify()
+        return future
+
+    def submit_many(self, vectors):
+        """Queues several vectors (e.g. both hands of one frame) at once, so they land in the same batch; returns their Futures."""
+        futures = [Future() for _ in vectors]
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Inference scheduler is stopped.")
+            was_idle = not self._pending
+            self._pending.extend(zip(vectors, futures))
+            if was_idle or len(self._pending) >= self.max_batch_size:
+                self._condition.notify()
+        return futures
+
+    def predict(self, vector, timeout=INFERENCE_RESULT_TIMEOUT):
+        return self.submit(vector).result(timeout=timeout)
+
+    def predict_many(self, vectors, timeout=INFERENCE_RESULT_TIMEOUT):
+        return [future.result(timeout=timeout) for future in self.submit_many(vectors)]
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._pending and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                return []
+            # The oldest request sets the deadline; later arrivals ride along until it expires or the batch fills
+            deadline = time.monotonic() + self.batch_window
+            while len(self._pending) < self.max_batch_size and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _run(self):
+        if self.thread_initializer is not None:
+            self.thread_initializer()
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if self._stopped:
+                    break
+                continue
+            count = len(batch)
+            batch_input = self._batch_buffer[:count]
+            for row, (vector, _) in enumerate(batch):
+                batch_input[row] = vector
+            try:
+                probabilities = self.run_batch(batch_input)
+            except Exception as e:
+                print(f"Inference scheduler batch of {count} failed: {e}")
+                self.stats['errors'] += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for row, (_, future) in enumerate(batch):
+                future.set_result(probabilities[row])
+            self.stats['batches'] += 1
+            self.stats['requests'] += count
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], count)
+
+        with self._condition:
+            for _, future in self._pending:
+                future.set_exception(RuntimeError("Inference scheduler is stopped."))
+            self._pending.clear()
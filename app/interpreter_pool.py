@@ -0,0 +1,140 @@
+from contextlib import contextmanager
+import queue
+import threading
+import os
+
+import numpy as np
+
+# --- Interpreter Pool Config ---
+INTERPRETER_POOL_SIZE = int(os.getenv('INTERPRETER_POOL_SIZE', os.cpu_count() or 1)) # Interpreters that may invoke concurrently
+INTERPRETER_NUM_THREADS = int(os.getenv('INTERPRETER_NUM_THREADS', 1)) # Intra-op threads per interpreter
+BATCH_BUCKETS = (1, 4, 16, 64) # A batch is zero-padded up to the smallest bucket that fits; larger batches are chunked
+# --------------------------------
+
+
+def _load_interpreter_class():
+    """Imports a TFLite Interpreter only when one is needed, preferring the standalone runtimes over full TensorFlow."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class InterpreterSlot:
+    """One pool member: a set of TFLite interpreters for the same model, one per batch-size bucket.
+
+    A TFLite Interpreter is not safe to invoke from two threads at once, so a slot is only
+    ever used by the thread that checked it out. Tensors are allocated once per bucket and
+    never resized while serving.
+    """
+
+    def __init__(self, model_path, num_threads=INTERPRETER_NUM_THREADS, buckets=BATCH_BUCKETS):
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.buckets = buckets
+        self._interpreters = {} # bucket size -> (interpreter, input_index, output_index)
+
+    def _get(self, bucket_size):
+        if bucket_size not in self._interpreters:
+            interpreter = _load_interpreter_class()(model_path=self.model_path, num_threads=self.num_threads)
+            input_detail = interpreter.get_input_details()[0]
+            interpreter.resize_tensor_input(input_detail['index'], [bucket_size, int(input_detail['shape'][-1])])
+            interpreter.allocate_tensors()
+            self._interpreters[bucket_size] = (interpreter, input_detail['index'], interpreter.get_output_details()[0]['index'])
+        return self._interpreters[bucket_size]
+
+    def io_shape(self):
+        """Returns (num_features, num_classes) read from the batch-1 interpreter."""
+        interpreter, input_index, output_index = self._get(self.buckets[0])
+        output_detail = next(d for d in interpreter.get_output_details() if d['index'] == output_index)
+        input_detail = next(d for d in interpreter.get_input_details() if d['index'] == input_index)
+        return int(input_detail['shape'][-1]), int(output_detail['shape'][-1])
+
+    def warm_up(self, num_features):
+        """Allocates every bucket up front and runs one invoke on each."""
+        for bucket_size in self.buckets:
+            self.predict(np.zeros((bucket_size, num_features), dtype=np.float32))
+
+    def predict(self, batch):
+        """Runs an (N, num_features) float32 batch; returns (N, num_classes) probabilities."""
+        num_rows = len(batch)
+        largest_bucket = self.buckets[-1]
+        probabilities = None
+        for start in range(0, num_rows, largest_bucket):
+            chunk = batch[start:start + largest_bucket]
+            bucket_size = next(size for size in self.buckets if size >= len(chunk))
+            interpreter, input_index, output_index = self._get(bucket_size)
+            if len(chunk) < bucket_size:
+                chunk_input = np.zeros((bucket_size, chunk.shape[1]), dtype=np.float32)
+                chunk_input[:len(chunk)] = chunk
+            else:
+                chunk_input = np.ascontiguousarray(chunk, dtype=np.float32)
+            interpreter.set_tensor(input_index, chunk_input)
+            interpreter.invoke()
+            output = interpreter.get_tensor(output_index)
+            if probabilities is None:
+                probabilities = np.empty((num_rows, output.shape[1]), dtype=np.float32)
+            probabilities[start:start + len(chunk)] = output[:len(chunk)]
+        return probabilities
+
+
+class InterpreterPool:
+    """Fixed set of InterpreterSlots with checkout/return semantics.
+
+    Long-lived worker threads (e.g. the inference scheduler) can pin a slot with
+    pin_current_thread(); their checkouts then skip the shared queue entirely.
+    """
+
+    def __init__(self, model_path, size=INTERPRETER_POOL_SIZE, num_threads=INTERPRETER_NUM_THREADS, buckets=BATCH_BUCKETS):
+        self.size = max(1, size)
+        self.num_threads = num_threads
+        self._slots = [InterpreterSlot(model_path, num_threads, buckets) for _ in range(self.size)]
+        self._free = queue.LifoQueue() # LIFO hands back the most recently used (warmest) slot
+        for slot in self._slots:
+            self._free.put(slot)
+        self._local = threading.local()
+        self._pin_lock = threading.Lock()
+        self._pinned_count = 0
+
+    def pin_current_thread(self):
+        """Reserves a slot for the calling thread, as long as at least one slot stays shared."""
+        if getattr(self._local, 'slot', None) is not None:
+            return True
+        with self._pin_lock:
+            if self.size - self._pinned_count < 2:
+                return False
+            self._local.slot = self._free.get()
+            self._pinned_count += 1
+            return True
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        pinned_slot = getattr(self._local, 'slot', None)
+        if pinned_slot is not None:
+            yield pinned_slot # thread-local fast path
+            return
+        try:
+            slot = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No TFLite interpreter became available in time.")
+        try:
+            yield slot
+        finally:
+            self._free.put(slot)
+
+    def predict(self, batch, timeout=None):
+        with self.checkout(timeout) as slot:
+            return slot.predict(batch)
+
+    def io_shape(self):
+        with self.checkout() as slot:
+            return slot.io_shape()
+
+    def warm_up(self, num_features):
+        for slot in self._slots:
+            slot.warm_up(num_features)
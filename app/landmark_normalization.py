@@ -0,0 +1,52 @@
+import numpy as np
+
+# MediaPipe hand landmark indices used for normalization
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_FINGER_MCP = 9
+MIN_SCALE = 1e-6 # Guards against division by zero for degenerate hands
+NUM_FEATURES = NUM_LANDMARKS * 2
+
+_MIN_SCALE = np.float32(MIN_SCALE) # Pre-typed so np.maximum does not convert a Python float on every call
+
+
+def normalize_landmarks(points, out=None):
+    """Normalizes hand landmarks the same way the training data was prepared.
+
+    points: (N, 21, 2) x/y coordinates; a single (21, 2) hand or flat (N, 42) rows are also accepted.
+    Each hand is shifted so the wrist is the origin and divided by the wrist-to-MIDDLE_FINGER_MCP distance.
+    out: optional preallocated (N, 42) float32 buffer; written in place and returned.
+    Returns an (N, 42) float32 array laid out x0, y0, x1, y1, ... as the model expects.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    points = points.reshape(-1, NUM_LANDMARKS, 2)
+    num_hands = points.shape[0]
+    if out is None:
+        out = np.empty((num_hands, NUM_FEATURES), dtype=np.float32)
+    normalized = out.reshape(num_hands, NUM_LANDMARKS, 2)
+
+    np.subtract(points, points[:, WRIST:WRIST + 1, :], out=normalized)
+    scale = np.hypot(normalized[:, MIDDLE_FINGER_MCP, 0], normalized[:, MIDDLE_FINGER_MCP, 1])
+    np.maximum(scale, _MIN_SCALE, out=scale)
+    np.divide(normalized, scale[:, None, None], out=normalized)
+    return out
+
+
+def mirror_normalized_landmarks(normalized):
+    """Mirrors normalized (N, 42) rows in place (x -> -x), so a left hand reads as the same sign made with the right.
+
+    Normalization removes position and scale only, so mirroring before or after it gives the same vector.
+    """
+    normalized[:, 0::2] *= -1
+    return normalized
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Copies a MediaPipe NormalizedLandmarkList's x/y values into a (21, 2) float32 array."""
+    landmark_list = hand_landmarks.landmark
+    if out is None:
+        out = np.empty((len(landmark_list), 2), dtype=np.float32)
+    for i, landmark in enumerate(landmark_list):
+        out[i, 0] = landmark.x
+        out[i, 1] = landmark.y
+    return out
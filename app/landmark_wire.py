@@ -0,0 +1,47 @@
+import numpy as np
+
+# --- Landmark Wire Format ---
+# Request body: little-endian float32 values, hand after hand, landmark after landmark:
+#   x0, y0[, z0], x1, y1[, z1], ... x20, y20[, z20]   (dims=2 or dims=3, 21 landmarks per hand)
+# Coordinates are the raw MediaPipe image-normalized values; the server applies wrist/scale normalization.
+# Binary response: one packed record per hand, see PREDICTION_RECORD_DTYPE.
+NUM_LANDMARKS = 21
+SUPPORTED_DIMS = (2, 3)
+MAX_LANDMARK_BATCH = 4096 # Hands per request
+LANDMARK_DTYPE = np.dtype('<f4')
+PREDICTION_RECORD_DTYPE = np.dtype([('class_index', '<u2'), ('confidence', '<f4')])
+PREDICTION_RECORD_FORMAT = 'class_index:u2le,confidence:f32le'
+# --------------------------------
+
+
+class LandmarkPayloadError(ValueError):
+    """Raised when a landmark payload does not match the wire format."""
+
+
+def decode_landmark_payload(payload, dims=2):
+    """Returns an (N, 21, 2) float32 view of the x/y coordinates in a packed landmark payload."""
+    if dims not in SUPPORTED_DIMS:
+        raise LandmarkPayloadError(f"Unsupported dims {dims} (expected 2 or 3).")
+    if not payload or len(payload) % LANDMARK_DTYPE.itemsize:
+        raise LandmarkPayloadError("Payload must be a non-empty sequence of float32 values.")
+
+    values = np.frombuffer(payload, dtype=LANDMARK_DTYPE)
+    floats_per_hand = NUM_LANDMARKS * dims
+    if values.size % floats_per_hand:
+        raise LandmarkPayloadError(f"Payload holds {values.size} floats, not a multiple of {floats_per_hand}.")
+    num_hands = values.size // floats_per_hand
+    if num_hands > MAX_LANDMARK_BATCH:
+        raise LandmarkPayloadError(f"Batch of {num_hands} hands exceeds the limit of {MAX_LANDMARK_BATCH}.")
+
+    points = values.reshape(num_hands, NUM_LANDMARKS, dims)[:, :, :2]
+    if not np.isfinite(points).all():
+        raise LandmarkPayloadError("Payload contains NaN or infinite values.")
+    return points
+
+
+def encode_prediction_records(class_indices, confidences):
+    """Packs per-hand predictions into PREDICTION_RECORD_DTYPE bytes."""
+    records = np.empty(len(class_indices), dtype=PREDICTION_RECORD_DTYPE)
+    records['class_index'] = class_indices
+    records['confidence'] = confidences
+    return records.tobytes()
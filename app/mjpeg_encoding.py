@@ -0,0 +1,181 @@
+import functools
+import threading
+import time
+import os
+
+import cv2
+import numpy as np
+
+from .recognition_metrics import observe_stage
+
+# --- MJPEG Stream Config ---
+STREAM_JPEG_QUALITY = int(os.getenv('STREAM_JPEG_QUALITY', 70)) # Starting (and best) JPEG quality of a stream; OpenCV's default is 95
+STREAM_MIN_JPEG_QUALITY = 35 # Adaptive quality never goes below this
+STREAM_QUALITY_STEP = 10 # Quality change per adaptation step (kept coarse so streams share encodings)
+STREAM_SCALE = float(os.getenv('STREAM_SCALE', 0.75)) # Output size relative to the captured frame
+STREAM_MAX_FPS = float(os.getenv('STREAM_MAX_FPS', 15)) # Frames per second sent to one viewer at most
+STREAM_MIN_FPS = 2.0 # Adaptive frame rate never goes below this
+STREAM_KEEPALIVE_INTERVAL = 2.0 # Seconds after which an unchanged frame (or placeholder) is re-sent anyway
+UNCHANGED_FRAME_THRESHOLD = 0.75 # Mean abs difference (0-255) of frame signatures below which a frame is not re-sent
+SIGNATURE_SIZE = (32, 24) # Grayscale thumbnail compared to detect unchanged frames
+STREAM_ADAPT_INTERVAL = 1.0 # Seconds between two downgrade steps
+STREAM_RECOVER_INTERVAL = 3.0 # Seconds of clear sending before an upgrade step
+STREAM_BACKLOG_RATIO = 0.5 # A send taking more than this share of the frame interval means the socket is backing up
+STREAM_CLEAR_RATIO = 0.15 # Sends below this share of the frame interval let the stream recover
+# --------------------------------
+
+
+def multipart_chunk(jpeg_bytes):
+    return (b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n\r\n' + jpeg_bytes + b'\r\n')
+
+
+def encode_jpeg(image_bgr, quality=STREAM_JPEG_QUALITY, scale=1.0):
+    """JPEG-encodes a BGR image at the given quality after scaling it; returns bytes (None on failure)."""
+    if scale != 1.0:
+        height, width = image_bgr.shape[:2]
+        image_bgr = cv2.resize(image_bgr, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    ret, buffer = cv2.imencode('.jpg', image_bgr, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    return buffer.tobytes() if ret else None
+
+
+@functools.lru_cache(maxsize=32)
+def placeholder_chunk(text, color=(200, 200, 200), font_scale=1.0):
+    """Multipart chunk of a static placeholder/error image, encoded once and reused by every stream."""
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.putText(image, text, (50, 240), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 2)
+    return multipart_chunk(encode_jpeg(image, STREAM_JPEG_QUALITY, STREAM_SCALE))
+
+
+def frame_signature(image_bgr):
+    """Small grayscale thumbnail used to tell whether two frames look the same."""
+    thumbnail = cv2.resize(image_bgr, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+
+
+class EncodedFrame:
+    """A published frame plus its lazily computed signature and JPEG encodings, shared by all streams.
+
+    overlay is whatever the frame's drawn text shows (e.g. the prediction and the stable display): a change
+    in it is too small for the thumbnail signature to notice, so streams compare it separately.
+    Streams asking for the same (quality, scale) reuse one encoding; encode_stats (a StageStats) times each one.
+    """
+
+    __slots__ = ('image', 'signature', 'overlay', '_encodings', '_lock', 'encode_stats')
+
+    def __init__(self, image_bgr, encode_stats=None, overlay=None):
+        self.image = image_bgr
+        self.signature = frame_signature(image_bgr)
+        self.overlay = overlay
+        self._encodings = {}
+        self._lock = threading.Lock()
+        self.encode_stats = encode_stats
+
+    def chunk(self, quality, scale):
+        key = (quality, scale)
+        with self._lock:
+            if key not in self._encodings:
+                start = time.perf_counter()
+                jpeg_bytes = encode_jpeg(self.image, quality, scale)
+                self._encodings[key] = multipart_chunk(jpeg_bytes) if jpeg_bytes is not None else None
+                seconds = time.perf_counter() - start
+                observe_stage('imencode', seconds)
+                if self.encode_stats is not None:
+                    self.encode_stats.record(seconds)
+            return self._encodings[key]
+
+
+class StreamProfile:
+    """Requested output of one MJPEG stream: best JPEG quality, scale and frame-rate cap."""
+
+    def __init__(self, quality=STREAM_JPEG_QUALITY, scale=STREAM_SCALE, max_fps=STREAM_MAX_FPS):
+        self.quality = int(min(max(quality, STREAM_MIN_JPEG_QUALITY), 95))
+        self.scale = float(min(max(scale, 0.1), 1.0))
+        self.max_fps = float(min(max(max_fps, STREAM_MIN_FPS), 60))
+
+    @classmethod
+    def from_args(cls, args):
+        """Reads ?quality=&scale=&fps= from request args, falling back to the configured defaults."""
+        return cls(quality=args.get('quality', STREAM_JPEG_QUALITY, type=int),
+                   scale=args.get('scale', STREAM_SCALE, type=float),
+                   max_fps=args.get('fps', STREAM_MAX_FPS, type=float))
+
+
+class AdaptiveMjpegStream:
+    """Per-viewer encoder state: frame-rate cap, unchanged-frame skipping and back-pressure adaptation.
+
+    The caller measures how long each yielded chunk took to write (WSGI servers write synchronously,
+    so that is the time until the generator resumes) and passes it to record_send(). When sends take
+    too large a share of the frame interval, quality drops step by step, then the frame rate; once
+    sends are fast again for a while, frame rate and then quality recover.
+    """
+
+    def __init__(self, profile=None):
+        self.profile = profile or StreamProfile()
+        self.quality = self.profile.quality
+        self.fps = self.profile.max_fps
+        self._last_sent_at = 0.0
+        self._last_signature = None
+        self._last_overlay = None
+        self._send_seconds_ema = 0.0
+        self._last_adapted_at = time.monotonic()
+        self.frames_sent = 0
+        self.frames_unchanged = 0
+        self.bytes_sent = 0
+        self.downgrades = 0
+
+    def time_until_next_send(self, now=None):
+        now = time.monotonic() if now is None else now
+        return self._last_sent_at + 1.0 / self.fps - now
+
+    def should_send(self, frame, now=None):
+        """False if the frame looks like the last one sent (unless the keep-alive interval has passed).
+
+        A frame whose overlay differs from the last one sent is always sent: a new label on a still hand.
+        """
+        now = time.monotonic() if now is None else now
+        if frame.overlay != self._last_overlay:
+            return True
+        if self._last_signature is not None and now - self._last_sent_at < STREAM_KEEPALIVE_INTERVAL:
+            difference = cv2.absdiff(frame.signature, self._last_signature).mean()
+            if difference < UNCHANGED_FRAME_THRESHOLD:
+                self.frames_unchanged += 1
+                return False
+        return True
+
+    def encode(self, frame, now=None):
+        """Returns the multipart chunk for this frame at the stream's current quality and scale."""
+        chunk = frame.chunk(self.quality, self.profile.scale)
+        if chunk is not None:
+            self._last_signature = frame.signature
+            self._last_overlay = frame.overlay
+            self._last_sent_at = time.monotonic() if now is None else now
+        return chunk
+
+    def record_send(self, num_bytes, send_seconds, now=None):
+        now = time.monotonic() if now is None else now
+        self.frames_sent += 1
+        self.bytes_sent += num_bytes
+        self._send_seconds_ema = 0.8 * self._send_seconds_ema + 0.2 * send_seconds
+        frame_interval = 1.0 / self.fps
+        if self._send_seconds_ema > STREAM_BACKLOG_RATIO * frame_interval:
+            if now - self._last_adapted_at >= STREAM_ADAPT_INTERVAL:
+                if self.quality > STREAM_MIN_JPEG_QUALITY:
+                    self.quality = max(STREAM_MIN_JPEG_QUALITY, self.quality - STREAM_QUALITY_STEP)
+                else:
+                    self.fps = max(STREAM_MIN_FPS, self.fps * 0.75)
+                self.downgrades += 1
+                self._last_adapted_at = now
+        elif self._send_seconds_ema < STREAM_CLEAR_RATIO * frame_interval:
+            if now - self._last_adapted_at >= STREAM_RECOVER_INTERVAL:
+                if self.fps < self.profile.max_fps:
+                    self.fps = min(self.profile.max_fps, self.fps / 0.75)
+                elif self.quality < self.profile.quality:
+                    self.quality = min(self.profile.quality, self.quality + STREAM_QUALITY_STEP)
+                self._last_adapted_at = now
+
+    def snapshot(self):
+        return {'quality': self.quality, 'scale': self.profile.scale, 'fps_cap': round(self.fps, 2),
+                'frames_sent': self.frames_sent, 'frames_unchanged': self.frames_unchanged,
+                'bytes_sent': self.bytes_sent, 'downgrades': self.downgrades,
+                'send_ms': round(self._send_seconds_ema * 1000, 3)}
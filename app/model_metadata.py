@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+
+from . import landmark_normalization
+
+# Compact description of a model, stored next to it as <model>.json (see tools/convert_landmark_metadata.py)
+METADATA_FORMAT_VERSION = 1
+METADATA_SUFFIX = '.json'
+
+
+class ModelMetadataError(ValueError):
+    """Raised when a model's metadata file is missing fields or does not describe the model next to it."""
+
+
+# Quantized variants written next to a model by tools/quantize_model.py, as <model>.<variant>.tflite
+MODEL_VARIANTS = ('float32', 'dynamic', 'float16', 'int8')
+DEFAULT_VARIANT = 'default' # the model file itself
+
+
+def metadata_path_for(model_path):
+    return os.path.splitext(model_path)[0] + METADATA_SUFFIX
+
+
+def model_variant_path(model_path, variant=DEFAULT_VARIANT):
+    """Path of a quantized variant of model_path ('default' is the model itself)."""
+    if variant == DEFAULT_VARIANT:
+        return model_path
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}'. Choose one of: {', '.join((DEFAULT_VARIANT,) + MODEL_VARIANTS)}")
+    root, extension = os.path.splitext(model_path)
+    return f"{root}.{variant}{extension}"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def current_normalization():
+    """The normalization parameters app.landmark_normalization applies at runtime."""
+    return {
+        'num_landmarks': landmark_normalization.NUM_LANDMARKS,
+        'origin_landmark': landmark_normalization.WRIST,
+        'scale_landmark': landmark_normalization.MIDDLE_FINGER_MCP,
+        'min_scale': landmark_normalization.MIN_SCALE,
+    }
+
+
+def build_model_metadata(model_path, class_names, num_features, source=None):
+    return {
+        'format_version': METADATA_FORMAT_VERSION,
+        'model_file': os.path.basename(model_path),
+        'model_sha256': file_sha256(model_path),
+        'input_shape': [None, int(num_features)],
+        'class_names': [str(name) for name in class_names],
+        'normalization': current_normalization(),
+        'source': source,
+    }
+
+
+def write_model_metadata(model_path, metadata):
+    """Writes metadata next to the model atomically (temp file + rename); returns the path."""
+    path = metadata_path_for(model_path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_model_metadata(model_path, verify_hash=True):
+    """Reads and validates <model>.json. A few hundred bytes: no pickle, no training data.
+
+    verify_hash checks model_sha256 against the model file, so a replaced model with stale
+    class names fails loudly instead of mislabelling predictions.
+    """
+    path = metadata_path_for(model_path)
+    with open(path) as f:
+        metadata = json.load(f)
+
+    missing = [key for key in ('format_version', 'model_sha256', 'input_shape', 'class_names', 'normalization') if key not in metadata]
+    if missing:
+        raise ModelMetadataError(f"{path} is missing {', '.join(missing)}.")
+    if metadata['format_version'] > METADATA_FORMAT_VERSION:
+        raise ModelMetadataError(f"{path} has format_version {metadata['format_version']}; this build reads up to {METADATA_FORMAT_VERSION}.")
+    if metadata['normalization'] != current_normalization():
+        raise ModelMetadataError(f"{path} was built for normalization {metadata['normalization']}, runtime uses {current_normalization()}.")
+    if verify_hash and file_sha256(model_path) != metadata['model_sha256']:
+        raise ModelMetadataError(f"{path} does not match {os.path.basename(model_path)} (sha256 differs); regenerate it.")
+    return metadata
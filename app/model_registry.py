@@ -0,0 +1,330 @@
+from datetime import datetime, timezone
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+
+from .model_metadata import (file_sha256, load_model_metadata, metadata_path_for, model_variant_path, ModelMetadataError,
+                             DEFAULT_VARIANT, MODEL_VARIANTS)
+from .inference_backend import create_backend
+from .centroid_cascade import centroids_path_for, load_centroid_cascade
+from .finger_feedback import finger_stats_path_for, FingerStats
+from .inference_scheduler import InferenceScheduler
+from .recognition_metrics import observe_stage, centroid_cascade_total
+from .landmark_normalization import NUM_FEATURES
+
+# --- Model Registry Config ---
+# Versioned models live in <MODEL_REGISTRY_DIR>/<version>/ next to their .json metadata; manifest.json lists every
+# version with the sha256 of each of its files and names the active one (see tools/register_model.py). A file identical
+# to one an earlier version already stores is not copied again: the version's shared_files name the directory holding it.
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR') or os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models'))
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 2 # 2 added shared_files; manifests without shared files are still written as 1
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$') # Version names double as directory names
+# --------------------------------
+
+
+class ModelRegistryError(ValueError):
+    """Raised when the manifest is missing or malformed, a version is unknown, or a file does not match its hash."""
+
+
+def manifest_path(registry_dir=MODEL_REGISTRY_DIR):
+    return os.path.join(registry_dir, MANIFEST_FILE)
+
+
+def manifest_mtime(registry_dir=MODEL_REGISTRY_DIR):
+    """Modification time of the manifest (None if missing), for the file watch in sign_logic."""
+    try:
+        return os.stat(manifest_path(registry_dir)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_manifest(registry_dir=MODEL_REGISTRY_DIR):
+    path = manifest_path(registry_dir)
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise ModelRegistryError(f"No model registry manifest at {path} (run python -m tools.register_model).")
+    except json.JSONDecodeError as e:
+        raise ModelRegistryError(f"{path} is not valid JSON: {e}")
+
+    missing = [key for key in ('format_version', 'active', 'versions') if key not in manifest]
+    if missing:
+        raise ModelRegistryError(f"{path} is missing {', '.join(missing)}.")
+    if manifest['format_version'] > MANIFEST_FORMAT_VERSION:
+        raise ModelRegistryError(f"{path} has format_version {manifest['format_version']}; this build reads up to {MANIFEST_FORMAT_VERSION}.")
+    for version, entry in manifest['versions'].items():
+        if 'model_file' not in entry or entry['model_file'] not in entry.get('files', {}):
+            raise ModelRegistryError(f"{path}: version '{version}' does not list its model_file in files.")
+        for file_name, owner in entry.get('shared_files', {}).items():
+            owner_entry = manifest['versions'].get(owner)
+            if (file_name not in entry['files'] or owner_entry is None or file_name in owner_entry.get('shared_files', {})
+                    or owner_entry['files'].get(file_name) != entry['files'][file_name]):
+                raise ModelRegistryError(f"{path}: version '{version}' shares {file_name} with '{owner}', which does not store the same file.")
+    if manifest['active'] is not None and manifest['active'] not in manifest['versions']:
+        raise ModelRegistryError(f"{path}: active version '{manifest['active']}' is not registered.")
+    return manifest
+
+
+def write_manifest(manifest, registry_dir=MODEL_REGISTRY_DIR):
+    """Writes the manifest atomically (temp file + rename), so a running app never reads half of it."""
+    path = manifest_path(registry_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def _version_entry(manifest, version):
+    version = manifest['active'] if version is None else version
+    if version is None:
+        raise ModelRegistryError("The model registry has no active version.")
+    if version not in manifest['versions']:
+        raise ModelRegistryError(f"Unknown model version '{version}'. Registered: {', '.join(manifest['versions']) or 'none'}.")
+    return version, manifest['versions'][version]
+
+
+def registered_file_path(registry_dir, version, entry, file_name):
+    """Where a version's file is stored: its own directory, or that of the version it shares the file with."""
+    return os.path.join(registry_dir, entry.get('shared_files', {}).get(file_name, version), file_name)
+
+
+def verify_file(registry_dir, version, entry, file_name):
+    """Checks one registered file against the sha256 recorded in the manifest; returns its path."""
+    path = registered_file_path(registry_dir, version, entry, file_name)
+    expected = entry['files'].get(file_name)
+    if expected is None:
+        raise ModelRegistryError(f"{file_name} is not registered under model version '{version}'.")
+    if not os.path.exists(path):
+        raise ModelRegistryError(f"Model version '{version}' is missing {file_name}.")
+    if file_sha256(path) != expected:
+        raise ModelRegistryError(f"{path} does not match the sha256 in the manifest; re-register version '{version}'.")
+    return path
+
+
+def resolve_model(version=None, variant=DEFAULT_VARIANT, registry_dir=MODEL_REGISTRY_DIR):
+    """Returns (version, model path) of a registered model (the active version by default), hash-checked.
+
+    A variant that was not registered with the version falls back to its default model, with a message.
+    """
+    version, entry = _version_entry(load_manifest(registry_dir), version)
+    try:
+        model_file = os.path.basename(model_variant_path(entry['model_file'], variant))
+    except ValueError as e:
+        print(f"{e}. Using the default model.")
+        model_file = entry['model_file']
+    if model_file not in entry['files']:
+        print(f"Model variant '{variant}' is not registered under version '{version}' (run python -m tools.quantize_model, then re-register). Using the default model.")
+        model_file = entry['model_file']
+    path = verify_file(registry_dir, version, entry, model_file)
+    verify_file(registry_dir, version, entry, os.path.basename(metadata_path_for(model_file)))
+    return version, path
+
+
+def resolve_centroids(version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """Hash-checked path of a version's class prototypes (tools/build_centroids.py), or None if none were registered."""
+    version, entry = _version_entry(load_manifest(registry_dir), version)
+    centroids_file = os.path.basename(centroids_path_for(entry['model_file']))
+    if centroids_file not in entry['files']:
+        return None
+    return verify_file(registry_dir, version, entry, centroids_file)
+
+
+def resolve_finger_stats(version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """Hash-checked path of a version's finger statistics (tools/build_finger_stats.py), or None if none were registered."""
+    version, entry = _version_entry(load_manifest(registry_dir), version)
+    stats_file = os.path.basename(finger_stats_path_for(entry['model_file']))
+    if stats_file not in entry['files']:
+        return None
+    return verify_file(registry_dir, version, entry, stats_file)
+
+
+def active_model_path(registry_dir=MODEL_REGISTRY_DIR):
+    """Path of the active version's default model, without hash checks (default --model of the benchmarks and tools)."""
+    version, entry = _version_entry(load_manifest(registry_dir), None)
+    return registered_file_path(registry_dir, version, entry, entry['model_file'])
+
+
+def list_versions(registry_dir=MODEL_REGISTRY_DIR):
+    """Registered versions, newest first, for the admin view."""
+    manifest = load_manifest(registry_dir)
+    versions = [dict(entry, version=version, active=version == manifest['active'], shared_files=entry.get('shared_files', {}))
+                for version, entry in manifest['versions'].items()]
+    return sorted(versions, key=lambda entry: entry.get('created_at') or '', reverse=True)
+
+
+def next_version_name(manifest):
+    numbers = [int(version[1:]) for version in manifest['versions'] if re.fullmatch(r'v\d+', version)]
+    return f"v{max(numbers, default=0) + 1}"
+
+
+def _stored_versions(manifest, file_name, digest):
+    """Versions whose own directory stores file_name with this sha256, oldest first."""
+    return [version for version, entry in manifest['versions'].items()
+            if entry['files'].get(file_name) == digest and file_name not in entry.get('shared_files', {})]
+
+
+def register_model(model_path, version=None, source=None, activate=False, registry_dir=MODEL_REGISTRY_DIR):
+    """Copies a model, its metadata, any quantized variants, class prototypes and finger statistics next to it into <registry_dir>/<version>/.
+
+    A model and its metadata that an earlier version already stores byte for byte (e.g. a new version that
+    only adds class prototypes) are shared with it instead of copied, and so are identical prototypes or statistics files;
+    a model is never shared without its own metadata, which is read from next to it.
+    The metadata is validated against the model before anything is copied. The manifest is only updated
+    once every file is in place, so the app never sees a version whose files are still being written.
+    Returns the version name.
+    """
+    load_model_metadata(model_path) # raises ModelMetadataError for a model without matching metadata
+    try:
+        manifest = load_manifest(registry_dir)
+    except ModelRegistryError:
+        if os.path.exists(manifest_path(registry_dir)):
+            raise
+        manifest = {'format_version': 1, 'active': None, 'versions': {}}
+    version = version or next_version_name(manifest)
+    if not VERSION_PATTERN.match(version):
+        raise ModelRegistryError(f"Invalid version name '{version}'; use letters, digits, '.', '_' and '-'.")
+    if version in manifest['versions']:
+        raise ModelRegistryError(f"Model version '{version}' is already registered.")
+
+    models = [model_path]
+    for variant in MODEL_VARIANTS:
+        variant_path = model_variant_path(model_path, variant)
+        if os.path.exists(variant_path) and os.path.exists(metadata_path_for(variant_path)):
+            load_model_metadata(variant_path)
+            models.append(variant_path)
+    groups = [(path, metadata_path_for(path)) for path in models] # shared or copied together
+    if os.path.exists(centroids_path_for(model_path)):
+        load_centroid_cascade(centroids_path_for(model_path)) # raises ValueError for an unreadable file
+        groups.append((centroids_path_for(model_path),))
+    if os.path.exists(finger_stats_path_for(model_path)):
+        FingerStats.load(finger_stats_path_for(model_path)) # raises ValueError for an unreadable file
+        groups.append((finger_stats_path_for(model_path),))
+
+    version_dir = os.path.join(registry_dir, version)
+    os.makedirs(version_dir, exist_ok=False)
+    files, shared_files = {}, {}
+    for group in groups:
+        digests = {os.path.basename(path): file_sha256(path) for path in group}
+        owners = [owner for owner in _stored_versions(manifest, *next(iter(digests.items())))
+                  if all(owner in _stored_versions(manifest, name, digest) for name, digest in digests.items())
+                  and all(os.path.exists(os.path.join(registry_dir, owner, name)) for name in digests)]
+        for path in group:
+            name = os.path.basename(path)
+            if owners:
+                shared_files[name] = owners[0]
+                files[name] = digests[name]
+            else:
+                target = os.path.join(version_dir, name)
+                shutil.copyfile(path, target)
+                files[name] = file_sha256(target)
+
+    manifest['versions'][version] = {
+        'model_file': os.path.basename(model_path),
+        'files': files,
+        'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'source': source,
+    }
+    if shared_files:
+        manifest['versions'][version]['shared_files'] = shared_files
+        manifest['format_version'] = max(manifest['format_version'], 2)
+    if activate or manifest['active'] is None:
+        manifest['active'] = version
+    write_manifest(manifest, registry_dir)
+    return version
+
+
+def set_active_version(version, registry_dir=MODEL_REGISTRY_DIR):
+    """Marks a registered version active; running apps pick it up through their file watch or an admin reload."""
+    manifest = load_manifest(registry_dir)
+    version, entry = _version_entry(manifest, version)
+    verify_file(registry_dir, version, entry, entry['model_file'])
+    manifest['active'] = version
+    write_manifest(manifest, registry_dir)
+    return version
+
+
+class LoadedModel:
+    """One registered model version, loaded and warmed: backend, class names, metadata and its own InferenceScheduler.
+
+    sign_logic swaps these as a whole, so a prediction that started on one version finishes on it. With
+    centroids_path (the version's registered class prototypes), hands the CentroidCascade can answer never
+    reach the scheduler or the backend. finger_stats_path (the version's registered finger statistics) gives
+    finger_stats, which must cover exactly the model's classes; None without it.
+    """
+
+    def __init__(self, version, path, centroids_path=None, finger_stats_path=None):
+        self.version = version
+        self.path = path
+        self.metadata = load_model_metadata(path)
+        self.class_names = self.metadata['class_names']
+        self.backend = create_backend(path)
+        self.backend.warm_up()
+        if len(self.class_names) != self.backend.num_classes or self.metadata['input_shape'][-1] != self.backend.num_features:
+            raise ModelMetadataError(f"Metadata lists {len(self.class_names)} classes / {self.metadata['input_shape'][-1]} features, "
+                                     f"model has {self.backend.num_classes} / {self.backend.num_features}.")
+        self.num_features = self.backend.num_features
+        self.hands_per_input = 2 if self.num_features == 2 * NUM_FEATURES else 1 # a joint two-hand model takes both hands as one 84-feature row
+        self.cascade = load_centroid_cascade(centroids_path) if centroids_path else None
+        if self.cascade is not None and (self.cascade.num_features, self.cascade.num_classes) != (self.num_features, len(self.class_names)):
+            raise ModelMetadataError(f"{os.path.basename(centroids_path)} has {self.cascade.num_classes} classes / {self.cascade.num_features} features, "
+                                     f"model has {len(self.class_names)} / {self.num_features}.")
+        self.finger_stats = FingerStats.load(finger_stats_path) if finger_stats_path else None
+        if self.finger_stats is not None and sorted(self.finger_stats.class_names) != sorted(self.class_names):
+            raise ModelMetadataError(f"{os.path.basename(finger_stats_path)} has statistics of {len(self.finger_stats.class_names)} signs "
+                                     f"that are not the model's {len(self.class_names)} classes.")
+        self.loaded_at = time.time()
+        self.scheduler = InferenceScheduler(self.predict_batch, num_features=self.num_features,
+                                            thread_initializer=self.backend.pin_current_thread)
+
+    def predict_batch(self, normalized_landmarks):
+        """Runs the model on an (N, num_features) float32 array; returns (N, num_classes) probabilities.
+
+        Bulk batches skip the cascade: batching already spreads one invoke over every row.
+        """
+        start = time.perf_counter()
+        probabilities = self.backend.predict(normalized_landmarks)
+        observe_stage('inference', time.perf_counter() - start)
+        return probabilities
+
+    def predict(self, normalized_vector):
+        """Predicts one normalized vector: from the cascade if it can answer, else through this version's scheduler (batched with other sessions)."""
+        if self.cascade is not None:
+            start = time.perf_counter()
+            index = self.cascade.exit_class(normalized_vector)
+            observe_stage('early_exit', time.perf_counter() - start)
+            centroid_cascade_total.inc('model' if index is None else 'exit')
+            if index is not None:
+                return self.cascade.class_probabilities[index]
+        return self.scheduler.predict(normalized_vector)
+
+    def predict_many(self, normalized_vectors):
+        """Predicts several vectors (both hands of a frame); the ones the cascade cannot answer share one scheduler batch."""
+        if self.cascade is None or not normalized_vectors:
+            return self.scheduler.predict_many(normalized_vectors)
+        start = time.perf_counter()
+        mask, classes = self.cascade.early_exit(np.stack(normalized_vectors))
+        observe_stage('early_exit', time.perf_counter() - start)
+        rows = [self.cascade.class_probabilities[index] if answered else None for answered, index in zip(mask, classes)]
+        pending = [row for row, answered in enumerate(mask) if not answered]
+        centroid_cascade_total.inc('exit', len(rows) - len(pending))
+        centroid_cascade_total.inc('model', len(pending))
+        if pending:
+            for row, probabilities in zip(pending, self.scheduler.predict_many([normalized_vectors[row] for row in pending])):
+                rows[row] = probabilities
+        return rows
+
+    def close(self):
+        self.scheduler.stop()
+
+    def describe(self):
+        return {'version': self.version, 'model': os.path.basename(self.path), 'backend': self.backend.name,
+                'classes': len(self.class_names), 'hands': self.hands_per_input,
+                'prototypes': len(self.cascade) if self.cascade is not None else 0, 'loaded_at': self.loaded_at}
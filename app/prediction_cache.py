@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import threading
+import os
+
+import numpy as np
+
+from .landmark_normalization import NUM_FEATURES
+
+# --- Prediction Cache Config ---
+PREDICTION_CACHE_GRID = float(os.getenv('PREDICTION_CACHE_GRID', 0.1)) # Grid step of the normalized landmarks (units of wrist-to-middle-MCP distance); 0 disables the cache
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 32)) # Cached probability vectors kept per session (least recently used evicted first)
+PREDICTION_CACHE_MIN_CONFIDENCE = 0.95 # Only outputs at least this confident are cached, so borderline frames always run the model
+# --------------------------------
+
+
+class PredictionCache:
+    """Per-session LRU cache of model outputs for near-identical normalized landmark vectors.
+
+    While a sign is held, consecutive frames differ by tracker jitter only. Each entry is keyed on the
+    first vector's grid cell (the vector divided by grid, rounded) and keeps that vector as its
+    representative. A lookup hits when its cell matches, or else when a representative lies within half
+    a grid step on every coordinate: with 42 coordinates, jitter alone moves almost every frame into a
+    different cell, so the distance check is what makes holds hit. Representatives never move, so a
+    slow drift cannot chain hits away from the vector the cached output was computed for. Only confident
+    outputs are cached: near MIN_PREDICTION_CONFIDENCE a small move can change the label, so those frames
+    always run the model. A grid of 0 disables the cache.
+
+    Entries belong to the model version that computed them: a lookup for another version empties the
+    cache, and a put from a version that is no longer current is dropped (see reload_model in sign_logic).
+    """
+
+    def __init__(self, grid=PREDICTION_CACHE_GRID, max_entries=PREDICTION_CACHE_SIZE,
+                 min_confidence=PREDICTION_CACHE_MIN_CONFIDENCE, num_features=NUM_FEATURES):
+        self.grid = grid
+        self.max_entries = max_entries
+        self.min_confidence = min_confidence
+        self.enabled = grid > 0 and max_entries > 0
+        self.tolerance = np.float32(grid / 2)
+        self._inverse_grid = np.float32(1.0 / grid) if self.enabled else None
+        self._entries = OrderedDict() # key -> (slot, probabilities), least recently used first
+        self._representatives = np.zeros((max(max_entries, 0), num_features), dtype=np.float32)
+        self._distances = np.empty((max(max_entries, 0), num_features), dtype=np.float32) # scratch for lookups
+        self._slot_keys = [None] * max(max_entries, 0)
+        self._lock = threading.Lock()
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, normalized_vector):
+        """The cache key of one normalized (42,) vector: its grid cell as bytes."""
+        return np.rint(normalized_vector * self._inverse_grid).astype(np.int16).tobytes()
+
+    def lookup(self, normalized_vector, model_version=None):
+        """Returns (key, cached read-only probability vector or None) for one normalized vector."""
+        key = self.key(normalized_vector)
+        with self._lock:
+            if model_version != self.model_version:
+                self._clear_locked()
+                self.model_version = model_version
+            entry = self._entries.get(key)
+            if entry is None and self._entries:
+                entry_key = self._nearest_locked(normalized_vector)
+                if entry_key is not None:
+                    key, entry = entry_key, self._entries[entry_key]
+            if entry is None:
+                self.misses += 1
+                return key, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key, entry[1]
+
+    def _nearest_locked(self, normalized_vector):
+        count = len(self._entries)
+        distances = self._distances[:count]
+        np.subtract(self._representatives[:count], normalized_vector, out=distances)
+        np.abs(distances, out=distances)
+        worst = distances.max(axis=1)
+        slot = int(np.argmin(worst))
+        return self._slot_keys[slot] if worst[slot] <= self.tolerance else None
+
+    def put(self, key, normalized_vector, probabilities, model_version=None):
+        """Caches the model's output for a vector that missed; outputs below min_confidence are not kept."""
+        if np.max(probabilities) < self.min_confidence:
+            return
+        probabilities = np.array(probabilities, dtype=np.float32, copy=True)
+        probabilities.flags.writeable = False # shared by every later hit
+        with self._lock:
+            if model_version != self.model_version:
+                return # computed by a model that has since been replaced
+            if key in self._entries:
+                slot = self._entries[key][0]
+            elif len(self._entries) < self.max_entries:
+                slot = len(self._entries)
+            else:
+                _, (slot, _) = self._entries.popitem(last=False)
+            self._representatives[slot] = normalized_vector
+            self._slot_keys[slot] = key
+            self._entries[key] = (slot, probabilities)
+            self._entries.move_to_end(key)
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self):
+        self._entries.clear()
+        self._slot_keys = [None] * len(self._slot_keys)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'grid': self.grid, 'entries': len(self._entries), 'model_version': self.model_version,
+                    'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': round(self.hit_rate, 4)}
@@ -0,0 +1,243 @@
+from collections import deque
+import os
+
+import numpy as np
+
+# --- Prediction Smoothing Config ---
+STABILIZER = os.getenv('STABILIZER', 'majority') # Strategy for new sessions: 'majority', 'ema' or 'hysteresis'
+PREDICTION_BUFFER_SIZE = 10 # Number of frames to consider
+SMOOTHING_THRESHOLD = 0.9 # % of buffer that must agree
+STABLE_STATE_HOLD_DURATION = 1.5 # Seconds to hold a stable prediction
+MIN_PREDICTION_CONFIDENCE = 0.90 # Minimum confidence for an individual frame's prediction to be considered valid
+NON_VALID_SIGN_STATES = {"Unknown", "No hand detected", "Processing Error", "Landmark count error", "Detect Error", "...", "Stab. Error", "Low Confidence"} # Define invalid states
+
+EMA_ALPHA = 0.3 # Weight of the newest frame's probability vector in the moving average
+EMA_ENTER_THRESHOLD = 0.7 # Averaged probability a class needs to become the stable prediction
+
+HYSTERESIS_ENTER_FRAMES = 5 # Consecutive valid frames of a new sign before it is shown
+HYSTERESIS_EXIT_FRAMES = 8 # Consecutive frames not supporting the shown sign before it is dropped
+HYSTERESIS_EXIT_CONFIDENCE = 0.6 # A frame still supports the shown sign while its probability stays at or above this
+# --------------------------------
+
+READY = "Ready..."
+
+
+class Stabilizer:
+    """Turns per-frame predictions into the stable prediction shown to a student.
+
+    update() takes one frame's instantaneous prediction (a class name or a NON_VALID_SIGN_STATES entry),
+    its confidence, the frame time and optionally the model's full probability vector, and returns the
+    stable display. A shown sign is held for hold_duration after its last support, then reverts to "Ready...".
+    """
+
+    name = None
+
+    def __init__(self, hold_duration=STABLE_STATE_HOLD_DURATION):
+        self.hold_duration = hold_duration
+        self.display = READY
+        self.last_valid_timestamp = None
+
+    def update(self, prediction, confidence, current_time, probabilities=None):
+        raise NotImplementedError
+
+    def set_status(self, status_text):
+        """Shows a status message (e.g. camera errors) until the next sign is stabilized."""
+        self.display = status_text
+        self.last_valid_timestamp = None
+
+    def _show(self, sign, current_time):
+        self.display = sign
+        self.last_valid_timestamp = current_time
+
+    def _release_if_expired(self, current_time):
+        """Reverts to "Ready..." once the shown sign has gone unsupported for hold_duration."""
+        if self.last_valid_timestamp is not None and current_time - self.last_valid_timestamp >= self.hold_duration:
+            self.display = READY
+            self.last_valid_timestamp = None
+
+    def _release_stale_sign(self):
+        """A sign (or status) shown without a recent valid frame goes back to "Ready..."."""
+        if self.last_valid_timestamp is None and self.display != READY and self.display not in NON_VALID_SIGN_STATES:
+            self.display = READY
+
+    def params(self):
+        return {'hold_duration': self.hold_duration}
+
+
+class MajorityVoteStabilizer(Stabilizer):
+    """Shows a sign once SMOOTHING_THRESHOLD of the last buffer_size frames agree on it.
+
+    Running counts are updated as predictions enter and leave the window, so each update is O(1)
+    instead of recounting the whole buffer. When the required count is a strict majority of the buffer
+    at most one label can reach it, so the leader is tracked incrementally; otherwise (e.g. threshold 0.5,
+    or 0.55 of 10 frames, which requires 5) two labels can tie and the most frequent one is taken,
+    keeping the current leader on a tie.
+    """
+
+    name = 'majority'
+
+    def __init__(self, buffer_size=PREDICTION_BUFFER_SIZE, threshold=SMOOTHING_THRESHOLD, hold_duration=STABLE_STATE_HOLD_DURATION):
+        super().__init__(hold_duration)
+        if buffer_size < 1 or not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Majority stabilizer needs buffer_size >= 1 and 0 < threshold <= 1, got {buffer_size} and {threshold}.")
+        self.buffer_size = buffer_size
+        self.threshold = threshold
+        self.required_count = max(1, int(buffer_size * threshold))
+        self._unique_leader = 2 * self.required_count > buffer_size # a strict majority: no two labels can both reach it
+        self.buffer = deque()
+        self.counts = {}
+        self._leader = None # the label with at least required_count votes, if any
+
+    def update(self, prediction, confidence, current_time, probabilities=None):
+        counts = self.counts
+        counts[prediction] = counts.get(prediction, 0) + 1
+        self.buffer.append(prediction)
+        if len(self.buffer) > self.buffer_size:
+            leaving = self.buffer.popleft()
+            counts[leaving] -= 1
+            if not counts[leaving]:
+                del counts[leaving]
+        self._update_leader(prediction)
+
+        if len(self.buffer) < self.buffer_size:
+            self._release_if_expired(current_time)
+        elif self._leader is not None:
+            if self._leader not in NON_VALID_SIGN_STATES:
+                self._show(self._leader, current_time)
+            else:
+                if self.display not in NON_VALID_SIGN_STATES:
+                    self.display = READY
+                self.last_valid_timestamp = None
+        elif self.last_valid_timestamp is not None:
+            self._release_if_expired(current_time)
+        else:
+            self._release_stale_sign()
+        return self.display
+
+    def _update_leader(self, entered):
+        if not self._unique_leader:
+            leader = max(self.counts, key=self.counts.get)
+            if self._leader is not None and self.counts.get(self._leader, 0) == self.counts[leader]:
+                leader = self._leader
+            self._leader = leader if self.counts[leader] >= self.required_count else None
+        elif self.counts.get(entered, 0) >= self.required_count:
+            self._leader = entered
+        elif self._leader is not None and self.counts.get(self._leader, 0) < self.required_count:
+            self._leader = None
+
+    def params(self):
+        return dict(super().params(), buffer_size=self.buffer_size, threshold=self.threshold)
+
+
+class EmaStabilizer(Stabilizer):
+    """Exponential moving average over the model's full probability vectors.
+
+    Frames without model output (no hand, errors) contribute a zero vector, so the average decays while
+    the hand is away. Low-confidence frames still contribute their probabilities instead of being discarded.
+    The class with the highest average is shown once it reaches enter_threshold. Class names are
+    learned from the frames' own predictions (which are the argmax class names), so no label list is needed.
+    """
+
+    name = 'ema'
+
+    def __init__(self, alpha=EMA_ALPHA, enter_threshold=EMA_ENTER_THRESHOLD, hold_duration=STABLE_STATE_HOLD_DURATION):
+        super().__init__(hold_duration)
+        self.alpha = alpha
+        self.enter_threshold = enter_threshold
+        self.scores = None
+        self._labels = {} # class index -> class name
+
+    def update(self, prediction, confidence, current_time, probabilities=None):
+        if probabilities is not None:
+            probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+            if self.scores is None or len(self.scores) != len(probabilities):
+                self.scores = np.zeros(len(probabilities), dtype=np.float32)
+            if prediction not in NON_VALID_SIGN_STATES:
+                self._labels[int(np.argmax(probabilities))] = prediction
+        if self.scores is not None:
+            self.scores *= 1.0 - self.alpha
+            if probabilities is not None: # frames without a model output (no hand, errors) only decay the average
+                self.scores += self.alpha * probabilities
+
+        leader = int(np.argmax(self.scores)) if self.scores is not None else None
+        if leader is not None and self.scores[leader] >= self.enter_threshold and leader in self._labels:
+            self._show(self._labels[leader], current_time)
+        elif self.last_valid_timestamp is not None:
+            self._release_if_expired(current_time)
+        else:
+            self._release_stale_sign()
+        return self.display
+
+    def params(self):
+        return dict(super().params(), alpha=self.alpha, enter_threshold=self.enter_threshold)
+
+
+class HysteresisStabilizer(Stabilizer):
+    """Enters a sign after enter_frames consecutive valid frames of it; leaves after exit_frames without support.
+
+    While a sign is shown, a frame supports it if it predicts the same sign or, when probabilities are
+    given, still gives that class at least exit_confidence (lower than MIN_PREDICTION_CONFIDENCE, so
+    borderline frames do not make the display flicker).
+    """
+
+    name = 'hysteresis'
+
+    def __init__(self, enter_frames=HYSTERESIS_ENTER_FRAMES, exit_frames=HYSTERESIS_EXIT_FRAMES,
+                 exit_confidence=HYSTERESIS_EXIT_CONFIDENCE, hold_duration=STABLE_STATE_HOLD_DURATION):
+        super().__init__(hold_duration)
+        self.enter_frames = enter_frames
+        self.exit_frames = exit_frames
+        self.exit_confidence = exit_confidence
+        self._candidate = None
+        self._candidate_frames = 0
+        self._misses = 0
+        self._shown_index = None # class index of the shown sign, for exit_confidence
+
+    def update(self, prediction, confidence, current_time, probabilities=None):
+        valid = prediction not in NON_VALID_SIGN_STATES
+        if valid and prediction == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate = prediction if valid else None
+            self._candidate_frames = 1 if valid else 0
+
+        showing_sign = self.display not in NON_VALID_SIGN_STATES and self.display != READY and self.last_valid_timestamp is not None
+        if showing_sign and self._supports_shown(prediction, probabilities):
+            self._misses = 0
+            self.last_valid_timestamp = current_time
+        elif self._candidate is not None and self._candidate_frames >= self.enter_frames:
+            self._show(self._candidate, current_time)
+            self._misses = 0
+            self._shown_index = int(np.argmax(probabilities)) if probabilities is not None else None
+        elif showing_sign:
+            self._misses += 1
+            if self._misses >= self.exit_frames:
+                self.display = READY
+                self.last_valid_timestamp = None
+            else:
+                self._release_if_expired(current_time)
+        else:
+            self._release_stale_sign()
+        return self.display
+
+    def _supports_shown(self, prediction, probabilities):
+        if prediction == self.display:
+            return True
+        if probabilities is not None and self._shown_index is not None and prediction == "Low Confidence":
+            return float(np.asarray(probabilities).reshape(-1)[self._shown_index]) >= self.exit_confidence
+        return False
+
+    def params(self):
+        return dict(super().params(), enter_frames=self.enter_frames, exit_frames=self.exit_frames,
+                    exit_confidence=self.exit_confidence)
+
+
+STABILIZERS = {cls.name: cls for cls in (MajorityVoteStabilizer, EmaStabilizer, HysteresisStabilizer)}
+
+
+def create_stabilizer(kind=None, **params):
+    """Builds the stabilizer named kind (default: the STABILIZER setting); params override its defaults."""
+    kind = kind or STABILIZER
+    if kind not in STABILIZERS:
+        raise ValueError(f"Unknown stabilizer '{kind}'. Choose one of: {', '.join(STABILIZERS)}")
+    return STABILIZERS[kind](**params)
@@ -0,0 +1,193 @@
+from bisect import bisect_left
+import threading
+
+# --- Recognition Metrics Config ---
+STAGES = ('capture', 'color_conversion', 'hands_process', 'normalization', 'early_exit', 'inference', 'drawing', 'imencode', 'yield') # Stages of the recognition loop that are timed
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0) # Upper bounds (seconds) of the stage latency buckets
+PREDICTION_AGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0) # Upper bounds (seconds) of the prediction age buckets
+# --------------------------------
+
+
+class Histogram:
+    """Fixed-bucket histogram: observe() only bumps preallocated counters, so recording a frame allocates nothing."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1) # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value) # first bucket whose upper bound is >= value
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """Returns (cumulative bucket counts, sum, count), read consistently."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def quantile(self, q):
+        """Estimates the q-quantile by linear interpolation inside its bucket (None if empty)."""
+        cumulative, _, count = self.snapshot()
+        if not count:
+            return None
+        rank = q * count
+        lower = 0.0
+        previous = 0
+        for index, running in enumerate(cumulative):
+            upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+            if running >= rank:
+                in_bucket = running - previous
+                fraction = (rank - previous) / in_bucket if in_bucket else 0.0
+                return lower + (upper - lower) * fraction
+            lower, previous = upper, running
+        return self.bounds[-1]
+
+
+class HistogramFamily:
+    """Histograms of one metric, one per label value (e.g. per stage)."""
+
+    def __init__(self, name, help_text, label=None, label_values=(), bounds=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.bounds = bounds
+        self.children = {value: Histogram(bounds) for value in label_values}
+        self._lock = threading.Lock()
+        if label is None:
+            self.children[None] = Histogram(bounds)
+
+    def child(self, label_value=None):
+        histogram = self.children.get(label_value)
+        if histogram is None:
+            with self._lock:
+                histogram = self.children.setdefault(label_value, Histogram(self.bounds))
+        return histogram
+
+    def observe(self, value, label_value=None):
+        self.child(label_value).observe(value)
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for label_value, histogram in list(self.children.items()):
+            cumulative, total, count = histogram.snapshot()
+            labels = f'{self.label}="{label_value}",' if self.label else ''
+            for bound, running in zip(histogram.bounds + ('+Inf',), cumulative):
+                lines.append(f'{self.name}_bucket{{{labels}le="{bound}"}} {running}')
+            suffix = f'{{{labels[:-1]}}}' if labels else ''
+            lines.append(f"{self.name}_sum{suffix} {total:.9g}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+
+
+class CounterFamily:
+    """Monotonic counters of one metric, one per label value."""
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value=None, amount=1):
+        with self._lock:
+            self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.values)
+
+    def total(self):
+        with self._lock:
+            return sum(self.values.values())
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        for label_value, value in self.snapshot().items():
+            labels = f'{{{self.label}="{label_value}"}}' if self.label and label_value is not None else ''
+            lines.append(f"{self.name}{labels} {value}")
+
+
+class GaugeFamily:
+    """A value read at scrape time from a callback (e.g. active sessions), so nothing is recorded per frame."""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+    def render(self, lines):
+        try:
+            value = float(self.read())
+        except Exception as e:
+            print(f"Metrics: gauge {self.name} could not be read: {e}")
+            return
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} gauge")
+        lines.append(f"{self.name} {value:.9g}")
+
+
+class MetricsRegistry:
+    """All recognition metrics of the process, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self.families = []
+
+    def histogram(self, name, help_text, label=None, label_values=(), bounds=LATENCY_BUCKETS):
+        family = HistogramFamily(name, help_text, label, label_values, bounds)
+        self.families.append(family)
+        return family
+
+    def counter(self, name, help_text, label=None):
+        family = CounterFamily(name, help_text, label)
+        self.families.append(family)
+        return family
+
+    def gauge(self, name, help_text, read):
+        family = GaugeFamily(name, help_text, read)
+        self.families.append(family)
+        return family
+
+    def render_prometheus(self):
+        lines = []
+        for family in self.families:
+            family.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+stage_seconds = registry.histogram('handspoken_stage_seconds', 'Time spent in each stage of the recognition loop.', 'stage', STAGES)
+prediction_age_seconds = registry.histogram('handspoken_prediction_age_seconds', 'Age of the frame behind each prediction returned to a student.', bounds=PREDICTION_AGE_BUCKETS)
+frames_total = registry.counter('handspoken_frames_total', 'Frames run through hand detection, by source.', 'source')
+frames_without_hand_total = registry.counter('handspoken_frames_without_hand_total', 'Frames in which no hand was detected, by source.', 'source')
+frames_dropped_total = registry.counter('handspoken_frames_dropped_total', 'Frames dropped before being processed or sent, by reason.', 'reason')
+centroid_cascade_total = registry.counter('handspoken_centroid_cascade_total', 'Hands answered by the centroid cascade (see centroid_cascade.py) or sent on to the model, by result.', 'result')
+prediction_cache_total = registry.counter('handspoken_prediction_cache_total', 'Prediction cache lookups (see prediction_cache.py), by result.', 'result')
+
+
+def observe_stage(stage, seconds):
+    stage_seconds.child(stage).observe(seconds)
+
+
+def stage_summary():
+    """Per-stage count, mean and p50/p90/p99 in milliseconds, for the admin view."""
+    summary = []
+    for stage, histogram in stage_seconds.children.items():
+        _, total, count = histogram.snapshot()
+        row = {'stage': stage, 'count': count, 'mean_ms': round(total / count * 1000, 3) if count else None}
+        for q in (0.5, 0.9, 0.99):
+            value = histogram.quantile(q)
+            row[f'p{int(q * 100)}_ms'] = round(value * 1000, 3) if value is not None else None
+        summary.append(row)
+    return summary
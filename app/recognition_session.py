@@ -0,0 +1,300 @@
+import time
+import threading
+from .frame_ingest import FrameIngestQueue
+from .prediction_cache import PredictionCache
+from .prediction_stabilizer import create_stabilizer, MIN_PREDICTION_CONFIDENCE, NON_VALID_SIGN_STATES
+from .sign_attempts import SignAttemptDetector, SignAttemptLog, is_sign_display
+from .sequence_recognition import create_sequence_recognizer
+from .fingerspelling import FingerspellingDecoder, LexiconTrie
+from .finger_feedback import create_finger_feedback
+
+# --- Prediction Push Config ---
+PUSH_CONFIDENCE_DELTA = 0.05 # Confidence change that counts as a new prediction update while the sign stays the same
+
+# --- Session Registry Config ---
+SESSION_IDLE_TIMEOUT = 300 # Seconds without activity before a session is evicted
+SESSION_EVICTION_INTERVAL = 30 # Minimum seconds between eviction sweeps
+# --------------------------------
+
+
+class RecognitionSession:
+    """Prediction smoothing state for a single student. stabilizer defaults to create_stabilizer() (see prediction_stabilizer.py)."""
+
+    def __init__(self, user_id, stabilizer=None):
+        self.user_id = user_id
+        self.stabilizer = stabilizer or create_stabilizer()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock) # notified whenever prediction_seq advances
+        self.prediction_seq = 0 # increases each time the published prediction (sign or confidence) changes
+        self.prediction_updated_at = time.time()
+        self.last_processed_frame_confidence = 0.0 # Confidence of the last frame's valid instantaneous prediction
+        self.last_frame_at = None # Capture time of the last frame fed to the stabilizer (prediction age)
+        self.model_version = None # Registry version of the model behind the last frame's prediction
+        self.created_at = time.time()
+        self.last_active = self.created_at
+        self.stats = {
+            'frames_processed': 0,
+            'frames_without_hand': 0,
+            'stable_changes': 0,
+        }
+        # Browser-captured frames (see frame_ingest); hands is this session's own MediaPipe tracker
+        self.frame_queue = FrameIngestQueue()
+        self.processing_lock = threading.Lock()
+        self.hands = None
+        self.prediction_cache = PredictionCache() # model outputs for recently seen (quantized) landmark vectors
+        self.sequence_recognizer = create_sequence_recognizer() # dynamic signs over a sliding landmark window (SEQUENCE_MODE), or None
+        # Sign attempts found in the stable predictions, tagged with the assignment being practiced (see sign_attempts)
+        self.attempt_detector = SignAttemptDetector()
+        self.attempt_log = SignAttemptLog()
+        self.attempt_assignment_id = None
+        self._attempt_starts = {} # assignment id -> first attempt seq of its current practice run
+        # Word mode: spelled words (see fingerspelling) are logged as attempts instead of held letters
+        self.word_decoder = None
+        # Practice target chosen on the dashboard: frames that are not it get finger feedback (see finger_feedback)
+        self.practice_target = None
+        self.finger_feedback = None
+        self._published = self._prediction_locked() # (sign, confidence) at prediction_seq
+        self._published_words = None # (prefix, hypothesis words) at prediction_seq in word mode
+        self._published_feedback = None # (finger, landmarks) at prediction_seq while practicing a target
+
+    def close(self):
+        """Releases per-session resources (MediaPipe tracker)."""
+        with self.processing_lock:
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = None
+
+    def touch(self):
+        self.last_active = time.time()
+
+    @property
+    def stable_prediction_display(self):
+        return self.stabilizer.display
+
+    def set_status(self, status_text):
+        """Overrides the displayed prediction with a status message (e.g. camera errors)."""
+        with self.lock:
+            self.stabilizer.set_status(status_text)
+            current_time = time.time()
+            self._detect_attempt_locked(current_time)
+            self._publish_locked(current_time)
+
+    def record_prediction(self, instantaneous_prediction, confidence, current_time, probabilities=None, model_version=None, landmarks=None):
+        """Feeds one frame's prediction (and optionally the model's probability vector and version) to the stabilizer.
+
+        landmarks, the frame's normalized hand vector, feeds the session's sequence_recognizer, whose
+        window-level output replaces the frame's prediction while the hand is moving, and the finger
+        feedback towards the practice target.
+        """
+        with self.lock:
+            self.last_active = current_time
+            self.last_frame_at = current_time
+            if model_version is not None:
+                self.model_version = model_version
+            self.stats['frames_processed'] += 1
+            if instantaneous_prediction == "No hand detected":
+                self.stats['frames_without_hand'] += 1
+            word = self.word_decoder.update(probabilities, current_time) if self.word_decoder is not None else None
+            if self.finger_feedback is not None:
+                self.finger_feedback.update(instantaneous_prediction, landmarks, current_time, model_version)
+            if self.sequence_recognizer is not None and (landmarks is not None or instantaneous_prediction == "No hand detected"):
+                instantaneous_prediction, confidence, probabilities = self.sequence_recognizer.update(
+                    landmarks, instantaneous_prediction, confidence, probabilities)
+
+            if instantaneous_prediction not in NON_VALID_SIGN_STATES:
+                self.last_processed_frame_confidence = confidence
+            elif instantaneous_prediction == "Low Confidence":
+                self.last_processed_frame_confidence = 0.0
+
+            previous_display = self.stabilizer.display
+            try:
+                self.stabilizer.update(instantaneous_prediction, confidence, current_time, probabilities)
+            except Exception as e:
+                print(f"Error during stabilization (user {self.user_id}): {e}")
+                self.stabilizer.set_status("Stab. Error")
+            if self.stabilizer.display != previous_display:
+                self.stats['stable_changes'] += 1
+            attempt = self._detect_attempt_locked(current_time)
+            if word is not None:
+                attempt = self.attempt_log.append(word, self.attempt_assignment_id, self.model_version)
+            self._publish_locked(current_time, force=attempt is not None) # a new attempt is pushed even if the sign did not change
+
+    def _detect_attempt_locked(self, current_time):
+        """Feeds the published display to the attempt detector; appends a completed attempt to the log and returns it.
+
+        In word mode held letters are not attempts; the word decoder logs whole words instead.
+        """
+        if self.word_decoder is not None:
+            return None
+        sign, confidence = self._prediction_locked()
+        attempt = self.attempt_detector.update(sign, confidence, current_time)
+        if attempt is None:
+            return None
+        return self.attempt_log.append(attempt, self.attempt_assignment_id, self.model_version)
+
+    def start_attempts(self, assignment_id, words=None, class_names=None):
+        """Starts a practice run for an assignment: later attempts are tagged with it, earlier ones no longer count.
+
+        With words (and the model's class_names) the run is in word mode: the student fingerspells words
+        from that vocabulary and each decoded word is one attempt. Returns the seq the run's first attempt will get.
+        """
+        trie = LexiconTrie(words, class_names) if words and class_names else None
+        with self.lock:
+            self.attempt_assignment_id = assignment_id
+            self.attempt_detector.reset()
+            self.word_decoder = FingerspellingDecoder(trie) if trie else None
+            self._attempt_starts[assignment_id] = self.attempt_log.next_seq
+            return self.attempt_log.next_seq
+
+    def set_practice_target(self, sign, finger_stats_for=None):
+        """Sets the sign the student is practicing (None to stop); frames that are not it get finger feedback.
+
+        finger_stats_for(version) returns a model version's FingerStats (see sign_logic.finger_stats_for);
+        without it there is no feedback.
+        """
+        with self.lock:
+            self.practice_target = sign or None
+            self.finger_feedback = create_finger_feedback(self.practice_target, finger_stats_for) if finger_stats_for else None
+            self._publish_locked(time.time())
+            return self.finger_feedback is not None
+
+    def attempts_for(self, assignment_id):
+        """Attempts of the assignment's current practice run, oldest first ([] if it was never started)."""
+        with self.lock:
+            first_seq = self._attempt_starts.get(assignment_id)
+            if first_seq is None:
+                return []
+            return self.attempt_log.since(first_seq, assignment_id)
+
+    def has_practice_run(self, assignment_id):
+        """True if a practice run for the assignment was started in this session."""
+        with self.lock:
+            return assignment_id in self._attempt_starts
+
+    def mark_attempts_submitted(self, assignment_id, attempts):
+        """Ends the run at the last submitted attempt, so a second submission does not count them again."""
+        if not attempts:
+            return
+        with self.lock:
+            if assignment_id in self._attempt_starts:
+                self._attempt_starts[assignment_id] = max(self._attempt_starts[assignment_id], attempts[-1]['seq'] + 1)
+
+    def _prediction_locked(self):
+        display = self.stabilizer.display
+        current_confidence = 0.0
+        if is_sign_display(display):
+            current_confidence = float(self.last_processed_frame_confidence)
+        return str(display), float(current_confidence)
+
+    def _publish_locked(self, current_time, force=False):
+        """Advances prediction_seq and wakes waiters if the sign changed or the confidence moved noticeably (always with force).
+
+        A single low-confidence frame zeroes the confidence without changing the stable sign; that is not published.
+        """
+        sign, confidence = self._prediction_locked()
+        published_sign, published_confidence = self._published
+        words = self._words_locked()
+        if words is not None:
+            words_key = (words['prefix'], tuple(hypothesis['word'] for hypothesis in words['hypotheses']))
+            force = force or words_key != self._published_words # the spelled prefix or the ranking changed
+            self._published_words = words_key
+        feedback = self._feedback_locked()
+        feedback_key = (feedback['finger'], tuple(feedback['landmarks'])) if feedback is not None else None
+        force = force or feedback_key != self._published_feedback # a different finger (or none) to fix
+        self._published_feedback = feedback_key
+        if not force and sign == published_sign and (confidence == 0.0 or abs(confidence - published_confidence) < PUSH_CONFIDENCE_DELTA):
+            return
+        self._published = (sign, confidence)
+        self.prediction_seq += 1
+        self.prediction_updated_at = current_time
+        self.changed.notify_all()
+
+    def _feedback_locked(self):
+        return self.finger_feedback.result if self.finger_feedback is not None else None
+
+    def _words_locked(self):
+        if self.word_decoder is None:
+            return None
+        return {"prefix": self.word_decoder.prefix(), "hypotheses": self.word_decoder.hypotheses()}
+
+    def snapshot(self):
+        """Returns the stable prediction, the confidence of the last valid processed frame, its sequence number/timestamp and model version.
+
+        held_for is how long the shown sign has been held towards the next attempt (None without a sign);
+        recent_attempts are the newest SIGN_ATTEMPT_PUSH_COUNT entries of the attempt log, oldest first, so a
+        client sees every attempt logged since the previous push (attempts_for() has the whole practice run). In word mode, words holds the spelled prefix
+        and the ranked word hypotheses ({"prefix", "hypotheses": [{"word", "score"}]}; otherwise None).
+        finger_feedback is the latest FingerStats.deviation() towards the practice target, or None.
+        """
+        with self.lock:
+            sign, confidence = self._prediction_locked()
+            return {"sign": sign, "confidence": confidence, "seq": self.prediction_seq, "timestamp": self.prediction_updated_at,
+                    "model_version": self.model_version, "held_for": self.attempt_detector.held_for(time.time()),
+                    "hold_seconds": self.attempt_detector.hold_seconds, "recent_attempts": self.attempt_log.recent(),
+                    "words": self._words_locked(), "finger_feedback": self._feedback_locked()}
+
+    def wait_for_change(self, after_seq, timeout):
+        """Blocks until prediction_seq is past after_seq or timeout expires; returns snapshot(), or None on timeout."""
+        with self.lock:
+            if not self.changed.wait_for(lambda: self.prediction_seq > after_seq, timeout):
+                return None
+        return self.snapshot()
+
+
+class SessionRegistry:
+    """Thread-safe map of user id -> RecognitionSession with idle eviction."""
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT, eviction_interval=SESSION_EVICTION_INTERVAL):
+        self.idle_timeout = idle_timeout
+        self.eviction_interval = eviction_interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._last_eviction = time.time()
+
+    def get(self, user_id):
+        """Returns the session for user_id, creating it on first use."""
+        now = time.time()
+        expired = []
+        with self._lock:
+            if now - self._last_eviction >= self.eviction_interval:
+                expired = self._evict_idle_locked(now)
+            recognition_session = self._sessions.get(user_id)
+            if recognition_session is None:
+                recognition_session = RecognitionSession(user_id)
+                self._sessions[user_id] = recognition_session
+                print(f"Created recognition session for user {user_id}. Active sessions: {len(self._sessions)}")
+        for expired_session in expired:
+            expired_session.close()
+        recognition_session.touch()
+        return recognition_session
+
+    def discard(self, user_id):
+        with self._lock:
+            recognition_session = self._sessions.pop(user_id, None)
+        if recognition_session is not None:
+            recognition_session.close()
+        return recognition_session
+
+    def evict_idle(self):
+        with self._lock:
+            expired = self._evict_idle_locked(time.time())
+        for recognition_session in expired:
+            recognition_session.close()
+        return expired
+
+    def _evict_idle_locked(self, now):
+        self._last_eviction = now
+        expired = [s for s in self._sessions.values() if now - s.last_active >= self.idle_timeout]
+        for recognition_session in expired:
+            del self._sessions[recognition_session.user_id]
+        if expired:
+            print(f"Evicted {len(expired)} idle recognition session(s). Active sessions: {len(self._sessions)}")
+        return expired
+
+    def sessions(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,263 @@
+import os
+import threading
+
+import numpy as np
+
+from .landmark_normalization import NUM_FEATURES
+
+# --- Dynamic Sign Config ---
+# Signs made with a movement ("Hello", "Thank You") are matched against templates over a sliding window of
+# normalized landmarks (see tools/build_sequence_templates.py); static signs keep the per-frame model.
+SEQUENCE_MODE = os.getenv('SEQUENCE_MODE', '0') == '1' # Give every recognition session a SequenceRecognizer
+SEQUENCE_TEMPLATES_FILE = os.getenv('SEQUENCE_TEMPLATES_FILE') or os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'sequence_templates.npz'))
+SEQUENCE_WINDOW_FRAMES = 30 # Frames in the window (2 s at 15 fps); templates are resampled to this length
+SEQUENCE_SEGMENTS = 3 # The window is cut into this many equal parts; a template is the mean pose and movement of each part
+SEQUENCE_MIN_HAND_FRACTION = 0.5 # Share of the window's frames (in every segment) that must have a hand
+SEQUENCE_MOTION_LAG = 5 # Motion is measured between frames this far apart, so per-frame landmark jitter does not add up
+SEQUENCE_MIN_MOTION = 0.6 # Mean landmark movement over SEQUENCE_MOTION_LAG frames (normalized units) that makes the window dynamic
+SEQUENCE_MATCH_DISTANCE = 0.25 # Largest RMS distance per feature to a template that still counts as a match (see benchmarks/bench_sequence_recognition.py)
+SEQUENCE_TEMPERATURE = 0.1 # Softmax temperature turning template distances into confidences
+SEQUENCE_HOLD_FRAMES = 12 # A match stays the frame prediction this long, so the stabilizer (majority: 9 of 10 frames) can show it
+# --------------------------------
+
+
+class LandmarkWindow:
+    """Fixed-size ring buffer of normalized landmark frames with incrementally maintained window features.
+
+    Each frame is stored with its movement: the absolute per-feature change from the frame motion_lag
+    earlier. Window features are the per-segment means of both, so a moving hand and a held pose with the
+    same average shape stay apart. Storage is preallocated. Each push() moves at most one frame across
+    each segment boundary, so the per-segment sums, hand counts and the motion total are updated in
+    O(segments * features) as frames arrive and leave; nothing is re-stacked. Frames without a hand count
+    as gaps.
+    """
+
+    def __init__(self, window_frames=SEQUENCE_WINDOW_FRAMES, segments=SEQUENCE_SEGMENTS, num_features=NUM_FEATURES,
+                 motion_lag=SEQUENCE_MOTION_LAG):
+        if window_frames % segments:
+            raise ValueError(f"window_frames ({window_frames}) must be a multiple of segments ({segments}).")
+        if not 0 < motion_lag < window_frames:
+            raise ValueError(f"motion_lag ({motion_lag}) must be between 1 and window_frames - 1.")
+        self.window_frames = window_frames
+        self.segments = segments
+        self.segment_frames = window_frames // segments
+        self.num_features = num_features
+        self.motion_lag = motion_lag
+        self._frames = np.zeros((window_frames, 2 * num_features), dtype=np.float32) # pose, then |change| since motion_lag frames earlier
+        self._has_hand = np.zeros(window_frames, dtype=bool)
+        self._motion = np.zeros(window_frames, dtype=np.float32) # norm of the change (0 across gaps)
+        self._segment_sums = np.zeros((segments, 2 * num_features), dtype=np.float64)
+        self._segment_counts = np.zeros(segments, dtype=np.int64)
+        self._features = np.empty(segments * 2 * num_features, dtype=np.float32)
+        self.motion_sum = 0.0
+        self.count = 0 # frames pushed, up to window_frames
+        self._next = 0 # ring slot the next frame is written to
+
+    def _slot(self, age):
+        """Ring slot of the frame pushed age frames ago (0: the newest)."""
+        return (self._next - 1 - age) % self.window_frames
+
+    def _move(self, slot, from_segment, to_segment):
+        if self._has_hand[slot]:
+            if from_segment >= 0:
+                self._segment_sums[from_segment] -= self._frames[slot]
+                self._segment_counts[from_segment] -= 1
+            if to_segment >= 0:
+                self._segment_sums[to_segment] += self._frames[slot]
+                self._segment_counts[to_segment] += 1
+
+    def push(self, vector):
+        """Adds one frame's normalized landmarks ((num_features,) array, or None for a frame without a hand)."""
+        if self.count == self.window_frames:
+            oldest = self._next
+            self._move(oldest, 0, -1)
+            self.motion_sum -= self._motion[oldest]
+        # Frames at the segment boundaries move one segment towards the oldest
+        for segment in range(1, self.segments):
+            age = self.window_frames - segment * self.segment_frames - 1 # age (before this push) of the frame entering segment - 1
+            if age < self.count:
+                self._move(self._slot(age), segment, segment - 1)
+
+        slot = self._next
+        previous = self._slot(self.motion_lag - 1) if self.count >= self.motion_lag else None
+        self._motion[slot] = 0.0
+        if vector is None:
+            self._has_hand[slot] = False
+        else:
+            row = self._frames[slot]
+            pose, change = row[:self.num_features], row[self.num_features:]
+            pose[:] = vector
+            self._has_hand[slot] = True
+            if previous is not None and self._has_hand[previous]:
+                np.subtract(pose, self._frames[previous, :self.num_features], out=change)
+                np.abs(change, out=change)
+                self._motion[slot] = float(np.linalg.norm(change))
+            else:
+                change.fill(0.0)
+            self.motion_sum += self._motion[slot]
+            self._segment_sums[self.segments - 1] += row
+            self._segment_counts[self.segments - 1] += 1
+        self._next = (self._next + 1) % self.window_frames
+        self.count = min(self.count + 1, self.window_frames)
+
+    @property
+    def full(self):
+        return self.count == self.window_frames
+
+    @property
+    def mean_motion(self):
+        return self.motion_sum / max(self.count - self.motion_lag, 1)
+
+    def features(self, min_hand_fraction=SEQUENCE_MIN_HAND_FRACTION):
+        """Per-segment mean poses and movements as one (segments * 2 * num_features,) vector (reused buffer),
+        or None if the window is not full or a segment has too few frames with a hand."""
+        if not self.full or self._segment_counts.min() < min_hand_fraction * self.segment_frames:
+            return None
+        np.divide(self._segment_sums, self._segment_counts[:, None], out=self._features.reshape(self.segments, -1), casting='unsafe')
+        return self._features
+
+    def clear(self):
+        self._has_hand[:] = False
+        self._segment_sums[:] = 0.0
+        self._segment_counts[:] = 0
+        self.motion_sum = 0.0
+        self.count = 0
+        self._next = 0
+
+
+def window_features(frames, window_frames=SEQUENCE_WINDOW_FRAMES, segments=SEQUENCE_SEGMENTS, motion_lag=SEQUENCE_MOTION_LAG):
+    """Template features of one recorded sign ((T, num_features) normalized frames of one performance).
+
+    The recording is resampled to window_frames by linear interpolation, then averaged per segment, which
+    gives the vector LandmarkWindow.features() produces when the same movement fills the window (the
+    hand is taken to be still before the recording starts).
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    positions = np.linspace(0, len(frames) - 1, window_frames)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(frames) - 1)
+    weight = (positions - lower)[:, None]
+    resampled = frames[lower] * (1 - weight) + frames[upper] * weight
+    change = np.abs(resampled - resampled[np.maximum(np.arange(window_frames) - motion_lag, 0)])
+    rows = np.hstack([resampled, change])
+    return rows.reshape(segments, window_frames // segments, -1).mean(axis=1).reshape(-1).astype(np.float32)
+
+
+class SequenceTemplates:
+    """Labelled template feature vectors (several per sign allowed), matched by RMS distance. Shared by all sessions."""
+
+    def __init__(self, names, features, window_frames=SEQUENCE_WINDOW_FRAMES, segments=SEQUENCE_SEGMENTS, motion_lag=SEQUENCE_MOTION_LAG):
+        self.names = [str(name) for name in names] # one per template row
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.window_frames = int(window_frames)
+        self.segments = int(segments)
+        self.motion_lag = int(motion_lag)
+        self.signs = sorted(set(self.names))
+        self._sign_index = np.array([self.signs.index(name) for name in self.names], dtype=np.int64)
+
+    @classmethod
+    def load(cls, path=SEQUENCE_TEMPLATES_FILE):
+        data = np.load(path)
+        return cls(data['names'], data['features'], int(data['window_frames']), int(data['segments']), int(data['motion_lag']))
+
+    def save(self, path):
+        np.savez(path, names=np.array(self.names), features=self.features,
+                 window_frames=self.window_frames, segments=self.segments, motion_lag=self.motion_lag)
+        return path
+
+    def match(self, features, differences=None, sign_distances=None, temperature=SEQUENCE_TEMPERATURE):
+        """Returns (sign, RMS distance, confidences over self.signs) of the nearest template.
+
+        differences (shaped like self.features) and sign_distances (one per sign) are optional scratch
+        buffers; each caller passes its own, since the templates are shared between threads.
+        """
+        differences = np.subtract(self.features, features, out=differences)
+        np.square(differences, out=differences)
+        distances = np.sqrt(differences.mean(axis=1))
+        if sign_distances is None:
+            sign_distances = np.empty(len(self.signs), dtype=np.float32)
+        sign_distances.fill(np.inf)
+        np.minimum.at(sign_distances, self._sign_index, distances)
+        confidences = np.exp(-(sign_distances - sign_distances.min()) / temperature)
+        confidences /= confidences.sum()
+        best = int(np.argmin(sign_distances))
+        return self.signs[best], float(sign_distances[best]), confidences
+
+
+class SequenceRecognizer:
+    """Per-session dynamic sign recognition: a LandmarkWindow plus the shared templates.
+
+    update() takes each frame's normalized landmarks and its static prediction. When the window moves
+    and is close to a template, the frame's prediction becomes that window-level match for hold_frames
+    frames (a movement lines up with its template for only a few frames), so the session's stabilizer
+    runs over sequence-level outputs; otherwise the static prediction passes through. Probability vectors
+    are laid out as the static classes followed by templates.signs, so probability-based stabilizers see
+    one consistent class space.
+    """
+
+    def __init__(self, templates, min_motion=SEQUENCE_MIN_MOTION, match_distance=SEQUENCE_MATCH_DISTANCE, hold_frames=SEQUENCE_HOLD_FRAMES):
+        self.templates = templates
+        self.window = LandmarkWindow(templates.window_frames, templates.segments, motion_lag=templates.motion_lag)
+        self.min_motion = min_motion
+        self.match_distance = match_distance
+        self.hold_frames = hold_frames
+        self._match = None # (sign, confidence, probabilities) of the last match, repeated while _match_frames_left
+        self._match_frames_left = 0
+        self.num_static_classes = 0 # length of the static model's probability vectors, from the last one seen
+        self._differences = np.empty_like(templates.features) # scratch for templates.match()
+        self._sign_distances = np.empty(len(templates.signs), dtype=np.float32)
+
+    def _combined(self, static_probabilities=None, sequence_confidences=None):
+        combined = np.zeros(self.num_static_classes + len(self.templates.signs), dtype=np.float32)
+        if static_probabilities is not None:
+            combined[:self.num_static_classes] = static_probabilities
+        if sequence_confidences is not None:
+            combined[self.num_static_classes:] = sequence_confidences
+        return combined
+
+    def update(self, landmarks, prediction, confidence, probabilities=None):
+        """Returns the frame's (prediction, confidence, probabilities) after window-level recognition."""
+        self.window.push(landmarks)
+        if probabilities is not None:
+            self.num_static_classes = len(probabilities) # follows the serving model across reloads
+        features = self.window.features() if self.window.mean_motion >= self.min_motion else None
+        if features is not None:
+            sign, distance, confidences = self.templates.match(features, self._differences, self._sign_distances)
+            if distance <= self.match_distance:
+                self._match = (sign, float(confidences.max()), self._combined(sequence_confidences=confidences))
+                self._match_frames_left = self.hold_frames
+        if self._match_frames_left > 0:
+            self._match_frames_left -= 1
+            return self._match
+        if probabilities is not None:
+            probabilities = self._combined(static_probabilities=probabilities)
+        return prediction, confidence, probabilities
+
+
+_templates = None
+_templates_lock = threading.Lock()
+_templates_missing_reported = False
+
+
+def load_sequence_templates(path=None):
+    """The shared SequenceTemplates (loaded once), or None if the templates file does not exist."""
+    global _templates, _templates_missing_reported
+    path = path or SEQUENCE_TEMPLATES_FILE
+    with _templates_lock:
+        if _templates is None:
+            if not os.path.exists(path):
+                if not _templates_missing_reported:
+                    print(f"SEQUENCE_MODE is on but {path} does not exist (run python -m tools.build_sequence_templates); dynamic signs are off.")
+                    _templates_missing_reported = True
+                return None
+            _templates = SequenceTemplates.load(path)
+            print(f"Loaded {len(_templates.names)} sequence templates for {len(_templates.signs)} dynamic signs from {path}.")
+        return _templates
+
+
+def create_sequence_recognizer():
+    """A SequenceRecognizer for a new session, or None when SEQUENCE_MODE is off or there are no templates."""
+    if not SEQUENCE_MODE:
+        return None
+    templates = load_sequence_templates()
+    return SequenceRecognizer(templates) if templates is not None else None
@@ -0,0 +1,88 @@
+from collections import deque
+
+from .prediction_stabilizer import NON_VALID_SIGN_STATES
+
+# --- Sign Attempt Config ---
+SIGN_ATTEMPT_HOLD_SECONDS = 2.5 # How long a stable sign must stay shown to count as one attempt (the assignment page counted 25 polls of 100 ms)
+SIGN_ATTEMPT_LOG_SIZE = 512 # Attempts kept per session; older ones fall off the ring buffer
+SIGN_ATTEMPT_PUSH_COUNT = 8 # Newest attempts sent with every pushed prediction, so attempts between two pushes still reach the page
+# --------------------------------
+
+
+def is_sign_display(display):
+    """True if a stable display is a recognized sign rather than a status ("Ready...", errors, no hand)."""
+    return display not in NON_VALID_SIGN_STATES and \
+           display != "Ready..." and \
+           display != "Initializing..." and \
+           display != "..." and \
+           "Error" not in display
+
+
+class SignAttemptDetector:
+    """Turns a session's stable predictions into graded sign attempts.
+
+    update() takes the published (sign, confidence) at each frame time. A sign that stays shown for
+    hold_seconds is one attempt, recorded with the confidence published at that moment; holding it
+    longer counts again every hold_seconds. Any other display (another sign, "Ready...", no hand)
+    restarts the hold.
+    """
+
+    def __init__(self, hold_seconds=SIGN_ATTEMPT_HOLD_SECONDS):
+        self.hold_seconds = hold_seconds
+        self._sign = None
+        self._held_since = None
+
+    def reset(self):
+        self._sign = self._held_since = None
+
+    def held_for(self, current_time):
+        """Seconds the current sign has been held towards the next attempt, or None if no sign is shown."""
+        if self._held_since is None:
+            return None
+        return max(0.0, current_time - self._held_since)
+
+    def update(self, sign, confidence, current_time):
+        """Returns {'sign', 'confidence', 'timestamp'} when this frame completes an attempt, else None."""
+        if not is_sign_display(sign):
+            self.reset()
+            return None
+        if sign != self._sign:
+            self._sign, self._held_since = sign, current_time
+            return None
+        if current_time - self._held_since < self.hold_seconds:
+            return None
+        self._held_since = current_time
+        return {'sign': sign, 'confidence': float(confidence), 'timestamp': current_time}
+
+
+class SignAttemptLog:
+    """Append-only ring buffer of one session's sign attempts.
+
+    Each entry gets the next seq number and the assignment that was being practiced (None outside an
+    assignment). Not locked on its own: RecognitionSession appends and reads it under its lock.
+    """
+
+    def __init__(self, maxlen=SIGN_ATTEMPT_LOG_SIZE):
+        self._entries = deque(maxlen=maxlen)
+        self.next_seq = 0
+
+    def append(self, attempt, assignment_id=None, model_version=None):
+        entry = dict(attempt, seq=self.next_seq, assignment_id=assignment_id, model_version=model_version)
+        self._entries.append(entry)
+        self.next_seq += 1
+        return entry
+
+    def last(self):
+        return self._entries[-1] if self._entries else None
+
+    def recent(self, count=SIGN_ATTEMPT_PUSH_COUNT):
+        """The newest count entries, oldest first."""
+        return [dict(entry) for entry in list(self._entries)[-count:]]
+
+    def since(self, first_seq, assignment_id=None):
+        """Entries from first_seq on (those still in the buffer), optionally only those of one assignment."""
+        return [dict(entry) for entry in self._entries
+                if entry['seq'] >= first_seq and (assignment_id is None or entry['assignment_id'] == assignment_id)]
+
+    def __len__(self):
+        return len(self._entries)
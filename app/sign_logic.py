@@ -1,47 +1,225 @@
 import cv2
-import mediapipe as mp
 import numpy as np
-import tensorflow as tf
-import pickle
-from collections import deque
 import time
 import threading
 import os # Import os module
+from .recognition_session import RecognitionSession, SessionRegistry, MIN_PREDICTION_CONFIDENCE, NON_VALID_SIGN_STATES
+from .frame_ingest import decode_frame, FrameDecodeError
+from .hand_tracking import TwoHandTracker
+from .landmark_normalization import normalize_landmarks, landmarks_to_array, mirror_normalized_landmarks, NUM_LANDMARKS, NUM_FEATURES
+from .camera_pipeline import CameraPipeline
+from .frame_broadcaster import FrameBroadcaster
+from .mjpeg_encoding import AdaptiveMjpegStream, EncodedFrame, placeholder_chunk, STREAM_KEEPALIVE_INTERVAL
+from .recognition_metrics import registry as metrics_registry, observe_stage, prediction_age_seconds, frames_total, frames_without_hand_total, prediction_cache_total
+from .model_metadata import load_model_metadata, metadata_path_for, DEFAULT_VARIANT
+from . import model_registry
+from .model_registry import LoadedModel, resolve_model, resolve_centroids, resolve_finger_stats, manifest_mtime
+from .centroid_cascade import CENTROID_CASCADE
+from .finger_feedback import FINGER_FEEDBACK
 
 # Configuration
 # Construct paths relative to the current file's directory
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(CURRENT_DIR, '..', 'landmark_model.tflite') # Updated to TFLite model
-LANDMARK_FILE = os.path.join(CURRENT_DIR, '..', 'hand_landmarks.pkl')
+MODEL_REGISTRY_DIR = model_registry.MODEL_REGISTRY_DIR # Versioned models and manifest.json (see model_registry.py); create_app sets it from config
+MODEL_VARIANT = os.getenv('MODEL_VARIANT') or DEFAULT_VARIANT # 'default', or a variant written by tools/quantize_model.py: 'float32', 'dynamic', 'float16', 'int8'
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', 5)) # Seconds between checks of the registry manifest for a new active version; 0 disables the watch
+MODEL_RETIRE_DELAY = 5 # Seconds a replaced model keeps its scheduler running, so predictions already submitted to it are answered
+HAND_MODE = os.getenv('HAND_MODE', 'one') # 'one': classify the first tracked hand; 'two': track both, canonicalize by handedness, classify them in one batch
+TRAINED_HANDEDNESS = 'Left' # MediaPipe's label for the hand the model was trained on (the sign images, as fed to MediaPipe, read as 'Left')
 
 # Model & Resources
-interpreter = None # Changed from model to interpreter for TFLite
-input_details = None
-output_details = None
+mp = None # mediapipe module; imported on first use by _import_mediapipe() because the import alone takes seconds
+active_model = None # LoadedModel serving predictions (backend, class names, scheduler of one registry version); reload_model() replaces it whole
+MODEL_PATH = None # Path of the active model; the names below mirror active_model for older callers
+inference_backend = None # NumpyBackend or TFLiteBackend, chosen by INFERENCE_BACKEND (see inference_backend.py)
 CLASS_NAMES = []
+model_metadata = None # Contents of the model's .json metadata (see model_metadata.py)
+model_reload_error = None # Why the last reload failed (the previous model kept serving), for the admin Models page
+_model_reload_lock = threading.Lock() # Serializes loads and swaps; predictions never take it
+_loaded_manifest_mtime = None # Manifest modification time when active_model was resolved, for the file watch
+_model_watch_thread = None
 hands = None
 cap = None
 is_initialized = False
 initialization_lock = threading.Lock()
 stop_camera_feed_event = threading.Event() # Event to signal feed termination
 
-# --- Prediction Smoothing Config ---
-PREDICTION_BUFFER_SIZE = 10 # Number of frames to consider
-SMOOTHING_THRESHOLD = 0.9 # % of buffer that must agree
-STABLE_STATE_HOLD_DURATION = 1.5 # Seconds to hold a stable prediction
-MIN_PREDICTION_CONFIDENCE = 0.90 # Minimum confidence for an individual frame's prediction to be considered valid
-NON_VALID_SIGN_STATES = {"Unknown", "No hand detected", "Processing Error", "Landmark count error", "Detect Error", "...", "Stab. Error", "Low Confidence"} # Define invalid states
-
-# Prediction State
-prediction_buffer = deque(maxlen=PREDICTION_BUFFER_SIZE)
-stable_prediction_display = "Initializing..."
-last_processed_frame_confidence = 0.0 # Confidence of the last frame's valid instantaneous prediction
-last_valid_prediction_timestamp = None
+# Resource status shown when no per-student prediction applies (init errors, camera disabled)
+resource_status_message = "Initializing..."
+
+# Per-student recognition sessions, keyed by user id
+session_registry = SessionRegistry()
+metrics_registry.gauge('handspoken_recognition_sessions', 'Active per-student recognition sessions.', lambda: len(session_registry))
+
+# One capture/recognition/encode loop per camera source, shared by every /video_feed subscriber (see frame_broadcaster.py)
+CAMERA_SOURCE = 'camera0' # The device opened by initialize_resources()
+BROWSER_CAPTURE = os.getenv('BROWSER_CAPTURE', '0') == '1' # Student pages capture the camera in the browser and post frames to /student/recognize_frame instead of showing /video_feed (always with NO_CAMERA)
+camera_broadcasters = {}
+
+# Per-thread preallocated landmark buffers for the live path (camera loop and browser frames run on different threads)
+_frame_buffers = threading.local()
+
+# Background warm-up: resources load on a daemon thread the first time recognition is needed, never inside create_app
+WARM_UP_ON_START = os.getenv('WARM_UP_ON_START', '0') == '1' # Start warming as soon as the app is created instead of on first use
+WARM_UP_RETRY_INTERVAL = 30 # Seconds before a failed warm-up may be retried
+warm_up_state = "cold" # cold -> warming -> ready, or failed
+warm_up_error = None
+warm_up_started_at = None
+warm_up_finished_at = None
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+metrics_registry.gauge('handspoken_recognition_ready', '1 once the model and MediaPipe are loaded, else 0.', lambda: warm_up_state == "ready") # reading it must not start the warm-up
+
+# Prediction push channel (SSE and long-poll) instead of clients polling /get_prediction
+PREDICTION_WAIT_TIMEOUT = 25 # Longest a long-poll request blocks before answering "no change" (below common proxy timeouts)
+PREDICTION_KEEPALIVE_INTERVAL = 15 # Seconds between SSE keep-alive comments when nothing changes
+STATUS_POLL_INTERVAL = 0.25 # How often waiters re-check a server-wide status (warming up, camera disabled)
 # --------------------------------
 
+def _import_mediapipe():
+    global mp
+    if mp is None:
+        import mediapipe
+        mp = mediapipe
+    return mp
+
+def _create_hands(max_num_hands=None):
+    """Creates a MediaPipe Hands tracker configured for video streams (a TwoHandTracker in two-hand mode)."""
+    if max_num_hands is None and HAND_MODE == 'two':
+        return TwoHandTracker(_create_hands)
+    mp_hands_sol = _import_mediapipe().solutions.hands
+    return mp_hands_sol.Hands(
+        static_image_mode=False,
+        max_num_hands=max_num_hands or 1,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.6)
+
+def _load_model_version(version, path):
+    """Loads one resolved registry version (with its class prototypes, if registered and CENTROID_CASCADE is on,
+    and its finger statistics, if registered and FINGER_FEEDBACK is on) into a warmed LoadedModel."""
+    print(f"Loading model version '{version}' from: {path}")
+    centroids_path = resolve_centroids(version, MODEL_REGISTRY_DIR) if CENTROID_CASCADE else None
+    finger_stats_path = resolve_finger_stats(version, MODEL_REGISTRY_DIR) if FINGER_FEEDBACK else None
+    model = LoadedModel(version, path, centroids_path, finger_stats_path)
+    print(f"Model version '{version}' loaded with the '{model.backend.name}' inference backend: "
+          f"{model.num_features} input features, {len(model.class_names)} classes; inference scheduler started "
+          f"(window {model.scheduler.batch_window * 1000:.1f} ms, max batch {model.scheduler.max_batch_size}).")
+    if model.cascade is not None:
+        print(f"Centroid cascade: {len(model.cascade)} class prototypes answer hands whose nearest other class is "
+              f"{model.cascade.ratio_threshold:.2f}x farther; the rest go to the model.")
+    if model.finger_stats is not None:
+        print(f"Finger feedback: statistics of {len(model.finger_stats.class_names)} signs.")
+    elif FINGER_FEEDBACK:
+        print(f"Model version '{version}' has no finger statistics (run python -m tools.build_finger_stats, then register); finger feedback is off.")
+    return model
+
+def finger_stats_for(version=None):
+    """FingerStats of the serving model (or None) if version is None or the serving version; None for any other version."""
+    model = active_model
+    if model is None or (version is not None and model.version != version):
+        return None
+    return model.finger_stats
+
+def _activate_model(model):
+    """Makes model the one every new prediction uses; returns the model it replaced."""
+    global active_model, MODEL_PATH, inference_backend, CLASS_NAMES, model_metadata
+    previous = active_model
+    MODEL_PATH, inference_backend, CLASS_NAMES, model_metadata = model.path, model.backend, model.class_names, model.metadata
+    active_model = model # the swap itself: one reference assignment, read once per prediction
+    return previous
+
+def load_model_resources():
+    """Loads the active registry version (model, class names, scheduler) if none is loaded. Call with initialization_lock held."""
+    global _loaded_manifest_mtime
+    with _model_reload_lock:
+        if active_model is None:
+            mtime = manifest_mtime(MODEL_REGISTRY_DIR)
+            _activate_model(_load_model_version(*resolve_model(None, MODEL_VARIANT, MODEL_REGISTRY_DIR)))
+            _loaded_manifest_mtime = mtime
+
+def reload_model(version=None, force=False):
+    """Loads a registry version (the manifest's active one by default) next to the serving model, then swaps it in.
+
+    The new model is loaded, warmed and run once through its own scheduler before the swap, so live
+    streams never wait on it; predictions already submitted to the old model finish there, and its
+    scheduler stops MODEL_RETIRE_DELAY seconds later. If the new version fails to verify or load, the
+    old one keeps serving. Returns {'status': 'reloaded' | 'unchanged' | 'failed', 'version', ...}.
+    """
+    global model_reload_error, _loaded_manifest_mtime
+    with _model_reload_lock:
+        current = active_model
+        _loaded_manifest_mtime = manifest_mtime(MODEL_REGISTRY_DIR) # a failed version is retried on the next change
+        try:
+            target_version, path = resolve_model(version, MODEL_VARIANT, MODEL_REGISTRY_DIR) # checks the files against the manifest hashes
+            if current is not None and not force and (current.version, current.path) == (target_version, path):
+                return {'status': 'unchanged', 'version': current.version}
+            model = _load_model_version(target_version, path)
+            model.scheduler.predict(np.zeros(model.num_features, dtype=np.float32)) # starts its scheduler thread off the live path
+        except Exception as e:
+            print(f"Model reload failed, {'keeping version ' + repr(current.version) if current else 'no model loaded'}: {e}")
+            model_reload_error = str(e)
+            return {'status': 'failed', 'version': current.version if current else None, 'error': str(e)}
+        previous = _activate_model(model)
+        model_reload_error = None
+
+    if previous is not None:
+        retire = threading.Timer(MODEL_RETIRE_DELAY, previous.close)
+        retire.daemon = True
+        retire.start()
+    print(f"Model version '{model.version}' is now serving predictions (was '{previous.version if previous else None}').")
+    return {'status': 'reloaded', 'version': model.version, 'previous_version': previous.version if previous else None}
+
+def _watch_model_registry():
+    """Reloads the model whenever the registry manifest changes (a version registered with --activate, or activated)."""
+    while True:
+        time.sleep(MODEL_WATCH_INTERVAL)
+        mtime = manifest_mtime(MODEL_REGISTRY_DIR)
+        if mtime is None or mtime == _loaded_manifest_mtime:
+            continue
+        print("Model registry manifest changed; checking the active version.")
+        reload_model()
+
+def start_model_watch():
+    """Starts the manifest file watch (once per process) unless MODEL_WATCH_INTERVAL is 0."""
+    global _model_watch_thread
+    if MODEL_WATCH_INTERVAL <= 0 or _model_watch_thread is not None:
+        return
+    with _model_reload_lock:
+        if _model_watch_thread is None:
+            _model_watch_thread = threading.Thread(target=_watch_model_registry, name='model-registry-watch', daemon=True)
+            _model_watch_thread.start()
+            print(f"Watching {model_registry.manifest_path(MODEL_REGISTRY_DIR)} for model changes every {MODEL_WATCH_INTERVAL:g}s.")
+
+def load_class_names():
+    """Class names of the serving model; before it loads, read from the active version's metadata file (a few hundred bytes)."""
+    global CLASS_NAMES, model_metadata
+    if active_model is not None:
+        return active_model.class_names
+    if not CLASS_NAMES:
+        _, path = resolve_model(None, MODEL_VARIANT, MODEL_REGISTRY_DIR)
+        print(f"Loading model metadata from: {metadata_path_for(path)}")
+        model_metadata = load_model_metadata(path)
+        CLASS_NAMES = model_metadata['class_names']
+        print(f"Class names loaded: {len(CLASS_NAMES)} classes found.")
+    return CLASS_NAMES
+
+def ensure_model_loaded():
+    """Loads the model and class names if needed, without touching the camera."""
+    global resource_status_message
+    if active_model is not None:
+        return True
+    with initialization_lock:
+        try:
+            load_model_resources()
+            return True
+        except Exception as e:
+            print(f"Error loading model resources: {e}")
+            resource_status_message = "Error: Init Failed"
+            return False
+
 def initialize_resources():
     """Loads model, class names, initializes MediaPipe, and opens camera."""
-    global interpreter, input_details, output_details, CLASS_NAMES, hands, cap, is_initialized, stable_prediction_display, stop_camera_feed_event
+    global hands, cap, is_initialized, resource_status_message, stop_camera_feed_event
 
     with initialization_lock:
         if is_initialized: # Simpler check: if fully initialized (including potentially camera), return
@@ -62,40 +240,16 @@ def initialize_resources():
         stop_camera_feed_event.clear()
         print("Initializing resources for sign logic...")
         try:
-            # Load TFLite Model if not already loaded
-            if interpreter is None:
-                print(f"Loading TFLite model from: {MODEL_PATH}")
-                interpreter = tf.lite.Interpreter(model_path=MODEL_PATH)
-                interpreter.allocate_tensors()
-                input_details = interpreter.get_input_details()
-                output_details = interpreter.get_output_details()
-                print("TFLite model loaded and tensors allocated successfully.")
-                print(f"Input details: {input_details}")
-                print(f"Output details: {output_details}")
-
-            # Load Class Names if not already loaded
-            if not CLASS_NAMES:
-                print(f"Loading class names from: {LANDMARK_FILE}")
-                with open(LANDMARK_FILE, 'rb') as f:
-                    data = pickle.load(f)
-                CLASS_NAMES = data['class_names']
-                print(f"Class names loaded: {len(CLASS_NAMES)} classes found.")
-
-            # Debug print for NO_CAMERA environment variable
+            load_model_resources()
+
             no_camera_env_var = os.getenv('NO_CAMERA')
-            print(f"DEBUG: Value of NO_CAMERA environment variable: '{no_camera_env_var}' (type: {type(no_camera_env_var)})")
 
             # Conditional Initialization for MediaPipe Hands and Camera
             if not no_camera_env_var:
                 # Initialize MediaPipe Hands only if NO_CAMERA is not set
                 if hands is None:
                     print("Initializing MediaPipe Hands (NO_CAMERA is not set)...")
-                    mp_hands_sol = mp.solutions.hands
-                    hands = mp_hands_sol.Hands(
-                        static_image_mode=False,
-                        max_num_hands=1,
-                        min_detection_confidence=0.6,
-                        min_tracking_confidence=0.6)
+                    hands = _create_hands()
                     print("MediaPipe Hands initialized.")
                 
                 # Initialize Camera only if NO_CAMERA is not set
@@ -126,235 +280,433 @@ def initialize_resources():
                 hands = None # Explicitly ensure hands is None if NO_CAMERA is set
 
             is_initialized = True # Mark as initialized if model and class_names are loaded. Camera and Hands are conditionally initialized.
-            stable_prediction_display = "Ready..."
+            resource_status_message = "Ready..."
             print("Resource initialization (model, landmarks) complete. Hands and Camera conditionally initialized.")
             return True
 
         except FileNotFoundError as e:
             print(f"Error: File not found during initialization - {e}")
-            stable_prediction_display = "Error: File Missing"
+            resource_status_message = "Error: File Missing"
             if 'cap' in locals() and cap and cap.isOpened(): cap.release()
             if 'hands' in locals() and hands: hands.close()
-            interpreter, cap, hands, is_initialized = None, None, None, False # model changed to interpreter
+            cap, hands, is_initialized = None, None, False
             return False
         except Exception as e:
             print(f"Error during resource initialization: {e}")
-            stable_prediction_display = "Error: Init Failed"
+            resource_status_message = "Error: Init Failed"
             if 'cap' in locals() and cap and cap.isOpened(): cap.release()
             if 'hands' in locals() and hands: hands.close()
-            interpreter, cap, hands, is_initialized = None, None, None, False # model changed to interpreter
+            cap, hands, is_initialized = None, None, False
             return False
 
+# --- Background Warm-Up ---
+
+def _run_warm_up():
+    """Loads the model, runs a dummy invoke through the scheduler and imports MediaPipe, then opens the camera."""
+    global warm_up_state, warm_up_error, warm_up_finished_at, resource_status_message
+    try:
+        with initialization_lock:
+            load_model_resources() # includes the backend's own dummy invoke
+        predict_scheduled(np.zeros(active_model.num_features, dtype=np.float32)) # starts the scheduler thread
+        _import_mediapipe() # browser frames create their own Hands per session
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
+        warm_up_error = str(e)
+        resource_status_message = "Error: Init Failed"
+        warm_up_state = "failed"
+        warm_up_finished_at = time.time()
+        return
+
+    # Browser frames and landmark requests are served from here on; only /video_feed needs what follows
+    warm_up_state = "ready"
+    warm_up_finished_at = time.time()
+    print(f"Warm-up complete in {warm_up_finished_at - warm_up_started_at:.2f}s; recognition is ready.")
+    start_model_watch()
+    initialize_resources() # MediaPipe Hands and the server-side camera, for /video_feed
+
+def start_warm_up():
+    """Starts the background warm-up if it has not run yet (or failed a while ago). Never blocks; returns the state."""
+    global warm_up_state, warm_up_error, warm_up_started_at, _warm_up_thread
+    if warm_up_state in ("ready", "warming"):
+        return warm_up_state
+    with _warm_up_lock:
+        retry_allowed = warm_up_state == "failed" and time.time() - warm_up_finished_at >= WARM_UP_RETRY_INTERVAL
+        if warm_up_state == "cold" or retry_allowed:
+            # The thread is assigned before the state turns "warming": callers that see "warming" read _warm_up_thread
+            _warm_up_thread = threading.Thread(target=_run_warm_up, name='sign-logic-warm-up', daemon=True)
+            warm_up_error = None
+            warm_up_started_at = time.time()
+            warm_up_state = "warming"
+            _warm_up_thread.start()
+            print("Background warm-up of recognition resources started.")
+    return warm_up_state
+
+def is_ready():
+    """True once the model is loaded and warmed; triggers the warm-up otherwise."""
+    return start_warm_up() == "ready"
+
+def get_readiness():
+    """Warm-up state for the /readyz endpoint."""
+    model = active_model
+    return {
+        "status": warm_up_state,
+        "backend": model.backend.name if model is not None else None,
+        "model": os.path.basename(model.path) if model is not None else None,
+        "model_version": model.version if model is not None else None,
+        "hand_mode": HAND_MODE,
+        "classes": len(model.class_names) if model is not None else 0,
+        "camera": bool(cap is not None and cap.isOpened()),
+        "warm_up_seconds": round((warm_up_finished_at or time.time()) - warm_up_started_at, 3) if warm_up_started_at else None,
+        "error": warm_up_error,
+    }
+
+def _classify_hand(hand_landmarks, prediction_cache=None):
+    """Normalizes one hand's landmarks and runs the model (or reuses prediction_cache's output for a near-identical hand).
+
+    Returns (instantaneous_prediction, confidence, current_prediction_text, probabilities, model_version, landmarks), where
+    probabilities is the model's output row (None if the model did not run), for the stabilizer, model_version
+    the registry version that produced it and landmarks the normalized vector (a per-thread buffer, valid until
+    the thread's next frame; None if the hand could not be normalized), for the session's sequence recognizer.
+    """
+    current_prediction_text = ""
+    instantaneous_prediction = "No hand detected"
+    confidence = 0.0
+    prediction = None
+    model = None
+    landmarks = None
+
+    try:
+        model = _get_active_model() # read once: a reload mid-frame does not mix two models
+        if len(hand_landmarks.landmark) == NUM_LANDMARKS:
+            if not hasattr(_frame_buffers, 'points'):
+                _frame_buffers.points = np.empty((1, NUM_LANDMARKS, 2), dtype=np.float32)
+                _frame_buffers.normalized = np.empty((1, NUM_LANDMARKS * 2), dtype=np.float32)
+            start = time.perf_counter()
+            landmarks_to_array(hand_landmarks, out=_frame_buffers.points[0])
+            landmark_input = normalize_landmarks(_frame_buffers.points, out=_frame_buffers.normalized)
+            landmarks = landmark_input[0]
+            observe_stage('normalization', time.perf_counter() - start)
+
+            # Check if input shape matches model's expected input shape excluding batch size
+            if landmark_input.shape[1] != model.num_features:
+                print(f"Error: Input data shape {landmark_input.shape[1:]} does not match model expected shape ({model.num_features},)")
+                current_prediction_text = "Detect: Input Shape Error"
+                instantaneous_prediction = "Input Shape Error"
+            else:
+                prediction = predict_cached(landmark_input[0], prediction_cache, model)
+                predicted_class_index = np.argmax(prediction)
+                confidence = np.max(prediction)
+
+                if confidence >= MIN_PREDICTION_CONFIDENCE:
+                    predicted_letter = model.class_names[predicted_class_index]
+                    current_prediction_text = f"Detect: {predicted_letter} ({confidence*100:.2f}%)"
+                    instantaneous_prediction = predicted_letter
+                else:
+                    current_prediction_text = f"Detect: Low Confidence ({confidence*100:.2f}%)"
+                    instantaneous_prediction = "Low Confidence"
+        else:
+            current_prediction_text = "Detect: Landmark count error"
+            instantaneous_prediction = "Landmark count error"
+
+    except Exception as e:
+        current_prediction_text = f"Detect Error: {e}"
+        instantaneous_prediction = "Detect Error"
+        print(f"Detection Error: {e}")
+
+    return instantaneous_prediction, confidence, current_prediction_text, prediction, model.version if model is not None else None, landmarks
+
+def _detected_hands(results):
+    """The tracked hands of a MediaPipe result as [(hand_landmarks, handedness label)], the TRAINED_HANDEDNESS hand first."""
+    detected = []
+    for i, hand_landmarks in enumerate(results.multi_hand_landmarks or ()):
+        label = TRAINED_HANDEDNESS
+        if results.multi_handedness and i < len(results.multi_handedness):
+            label = results.multi_handedness[i].classification[0].label
+        detected.append((hand_landmarks, label))
+    detected.sort(key=lambda hand: hand[1] != TRAINED_HANDEDNESS)
+    return detected[:2]
+
+def _predict_hands_cached(normalized, prediction_cache, model):
+    """predict_cached() for several hands: cache misses go to the model's scheduler together, as one batch."""
+    rows = [None] * len(normalized)
+    misses = []
+    for row, vector in enumerate(normalized):
+        if prediction_cache is not None and prediction_cache.enabled:
+            key, probabilities = prediction_cache.lookup(vector, model.version)
+            prediction_cache_total.inc('miss' if probabilities is None else 'hit')
+            rows[row] = probabilities
+            if probabilities is None:
+                misses.append((row, key))
+        else:
+            misses.append((row, None))
+    if misses:
+        for (row, key), probabilities in zip(misses, model.predict_many([normalized[row] for row, _ in misses])):
+            rows[row] = probabilities
+            if key is not None:
+                prediction_cache.put(key, normalized[row], probabilities, model.version)
+    return rows
+
+def _classify_hands(results, prediction_cache=None):
+    """Two-hand mode: classifies every tracked hand of a frame (at most two) with one batched invoke.
+
+    The hand the model was trained on (TRAINED_HANDEDNESS) comes first and the other one is mirrored, so
+    both read like the same sign made with the trained hand. A joint two-hand model (84 features) gets one
+    row, trained hand then other hand, with zeros for a hand that is not in view; a one-hand model scores each hand and the more confident one
+    becomes the frame's prediction. Returns the same tuple as _classify_hand().
+    """
+    current_prediction_text = ""
+    instantaneous_prediction = "No hand detected"
+    confidence = 0.0
+    prediction = None
+    model = None
+    landmarks = None
+
+    try:
+        model = _get_active_model()
+        detected = _detected_hands(results)
+        if any(len(hand_landmarks.landmark) != NUM_LANDMARKS for hand_landmarks, _ in detected):
+            return "Landmark count error", 0.0, "Detect: Landmark count error", None, model.version, None
+        if not hasattr(_frame_buffers, 'hand_points'):
+            _frame_buffers.hand_points = np.empty((2, NUM_LANDMARKS, 2), dtype=np.float32)
+            _frame_buffers.hand_normalized = np.empty((2, NUM_FEATURES), dtype=np.float32)
+            _frame_buffers.joint = np.empty((1, 2 * NUM_FEATURES), dtype=np.float32)
+        count = len(detected)
+        start = time.perf_counter()
+        for row, (hand_landmarks, _) in enumerate(detected):
+            landmarks_to_array(hand_landmarks, out=_frame_buffers.hand_points[row])
+        normalized = normalize_landmarks(_frame_buffers.hand_points[:count], out=_frame_buffers.hand_normalized[:count])
+        for row, (_, label) in enumerate(detected):
+            if label != TRAINED_HANDEDNESS:
+                mirror_normalized_landmarks(normalized[row:row + 1])
+        landmarks = normalized[0] # the sequence recognizer follows the first (trained-hand side) hand
+        observe_stage('normalization', time.perf_counter() - start)
+
+        if model.hands_per_input == 2:
+            joint = _frame_buffers.joint
+            joint.fill(0.0)
+            # A second hand with the same handedness label as the first takes the remaining slot
+            slots = [0 if label == TRAINED_HANDEDNESS else 1 for _, label in detected]
+            if count == 2 and slots[0] == slots[1]:
+                slots[1] = 1 - slots[0]
+            for row, slot in enumerate(slots):
+                joint[0, slot * NUM_FEATURES:(slot + 1) * NUM_FEATURES] = normalized[row]
+            prediction = model.predict(joint[0]) # the cache only holds one-hand vectors
+            instantaneous_prediction, confidence = _label_prediction(prediction, model.class_names)
+            current_prediction_text = f"Detect: {instantaneous_prediction} ({confidence*100:.2f}%)"
+        elif model.num_features != NUM_FEATURES:
+            print(f"Error: Model expects {model.num_features} input features; two-hand mode needs {NUM_FEATURES} or {2 * NUM_FEATURES}.")
+            current_prediction_text = "Detect: Input Shape Error"
+            instantaneous_prediction = "Input Shape Error"
+        else:
+            hand_texts = []
+            for (_, handedness), probabilities in zip(detected, _predict_hands_cached(normalized, prediction_cache, model)):
+                label, hand_confidence = _label_prediction(probabilities, model.class_names)
+                hand_texts.append(f"{handedness[0]}: {label} ({hand_confidence*100:.0f}%)")
+                if prediction is None or hand_confidence > confidence:
+                    prediction, instantaneous_prediction, confidence = probabilities, label, hand_confidence
+            current_prediction_text = "Detect: " + " | ".join(hand_texts)
+
+    except Exception as e:
+        current_prediction_text = f"Detect Error: {e}"
+        instantaneous_prediction = "Detect Error"
+        print(f"Detection Error: {e}")
+
+    return instantaneous_prediction, confidence, current_prediction_text, prediction, model.version if model is not None else None, landmarks
+
+def _classify_results(results, prediction_cache=None):
+    """Classifies the hands of a MediaPipe result that found at least one, per HAND_MODE."""
+    if HAND_MODE == 'two':
+        return _classify_hands(results, prediction_cache)
+    return _classify_hand(results.multi_hand_landmarks[0], prediction_cache)
+
 # --- Frame Generation Function
-def generate_frames():
-    """Generates camera frames with sign prediction overlays for web streaming."""
-    global stable_prediction_display, last_valid_prediction_timestamp, prediction_buffer, hands, cap, interpreter, input_details, output_details, CLASS_NAMES, stop_camera_feed_event
+
+def _read_camera_frame():
+    """Capture stage: reads one frame from the shared camera, or returns None (also while it is being re-initialized)."""
+    if not initialization_lock.acquire(blocking=False):
+        return None
+    try:
+        if not cap or not cap.isOpened():
+            return None
+        start = time.perf_counter()
+        success, image = cap.read()
+        observe_stage('capture', time.perf_counter() - start)
+    finally:
+        initialization_lock.release()
+    return image if success else None
+
+def _annotate_camera_frame(recognition_session, image, captured_at):
+    """Inference stage: runs MediaPipe + the model on one camera frame and draws the overlays.
+
+    Returns (annotated BGR image, instantaneous_prediction, confidence, probabilities, model_version).
+    """
+    mp_drawing = _import_mediapipe().solutions.drawing_utils
+    mp_hands_sol = mp.solutions.hands # Use the same name as in initialize_resources for consistency
+
+    start = time.perf_counter()
+    image_rgb = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
+    color_seconds = time.perf_counter() - start
+    image_rgb.flags.writeable = False
+    start = time.perf_counter()
+    results = hands.process(image_rgb)
+    observe_stage('hands_process', time.perf_counter() - start)
+    start = time.perf_counter()
+    image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+    observe_stage('color_conversion', color_seconds + time.perf_counter() - start)
+    image_bgr.flags.writeable = True
+    frames_total.inc('camera')
+
+    confidence = 0.0
+    probabilities = None
+    model_version = None
+    landmarks = None
+    draw_seconds = 0.0
+
+    if results.multi_hand_landmarks:
+        start = time.perf_counter()
+        for hand_landmarks in results.multi_hand_landmarks:
+            mp_drawing.draw_landmarks(
+                image_bgr, hand_landmarks, mp_hands_sol.HAND_CONNECTIONS)
+        draw_seconds = time.perf_counter() - start
+
+        instantaneous_prediction, confidence, current_prediction_text, probabilities, model_version, landmarks = _classify_results(results, recognition_session.prediction_cache)
+    else:
+        current_prediction_text = "Detect: No hand detected"
+        instantaneous_prediction = "No hand detected"
+        frames_without_hand_total.inc('camera')
+
+    recognition_session.record_prediction(instantaneous_prediction, confidence, captured_at, probabilities, model_version, landmarks)
+    stable_prediction_display = recognition_session.stable_prediction_display
+
+    start = time.perf_counter()
+    cv2.putText(image_bgr, current_prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 120, 0), 2, cv2.LINE_AA)
+
+    stable_color = (0, 255, 0)
+    if stable_prediction_display in NON_VALID_SIGN_STATES or stable_prediction_display == "Ready..." or stable_prediction_display == "Initializing...":
+        stable_color = (200, 200, 200)
+    if "Error" in stable_prediction_display:
+        stable_color = (0, 0, 255)
+
+    cv2.putText(image_bgr, f"Stable: {stable_prediction_display}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, stable_color, 2, cv2.LINE_AA)
+    observe_stage('drawing', draw_seconds + time.perf_counter() - start)
+    return image_bgr, instantaneous_prediction, confidence, probabilities, model_version, landmarks
+
+def _encode_broadcast_frame(processed, encode_stats=None):
+    """Encode stage: wraps one annotated frame in an EncodedFrame, JPEG-encoded lazily per (quality, scale) for all subscribers."""
+    image_bgr, prediction = processed
+    return EncodedFrame(image_bgr, encode_stats, prediction.get("overlay")), prediction
+
+def _make_camera_pipeline(broadcaster):
+    # The overlay shows the source's own stable prediction; every subscribed student's session
+    # also receives each frame's prediction, so their /get_prediction works as with a private feed.
+    display_session = RecognitionSession(broadcaster.name)
+
+    def process(image, captured_at):
+        image_bgr, instantaneous_prediction, confidence, probabilities, model_version, landmarks = _annotate_camera_frame(display_session, image, captured_at)
+        for recognition_session in broadcaster.subscriber_sessions:
+            recognition_session.record_prediction(instantaneous_prediction, confidence, captured_at, probabilities, model_version, landmarks)
+        overlay = (instantaneous_prediction, display_session.stable_prediction_display) # the drawn labels, so streams never skip a label change
+        return image_bgr, {"prediction": instantaneous_prediction, "confidence": float(confidence), "model_version": model_version, "overlay": overlay}
+
+    return CameraPipeline(_read_camera_frame, process, name=broadcaster.name)
+
+def _get_camera_broadcaster(source=CAMERA_SOURCE):
+    if source not in camera_broadcasters:
+        with initialization_lock:
+            if source not in camera_broadcasters:
+                camera_broadcasters[source] = FrameBroadcaster(source, _make_camera_pipeline, _encode_broadcast_frame)
+    return camera_broadcasters[source]
+
+def generate_frames(recognition_session, stream_profile=None):
+    """Generates camera frames with sign prediction overlays for web streaming.
+
+    Predictions are smoothed in the given student's RecognitionSession. Capture and recognition run
+    once in the camera's FrameBroadcaster, however many feeds are open; this generator subscribes and
+    sends the newest frame at the quality, scale and frame rate of its AdaptiveMjpegStream, skipping
+    frames that look unchanged and backing off when the client cannot keep up (see mjpeg_encoding.py).
+    Placeholder and error images are encoded once and reused.
+    """
+    global hands, cap, inference_backend, CLASS_NAMES, stop_camera_feed_event
 
     if os.getenv('NO_CAMERA'):
         print("NO_CAMERA set. Frame generation (camera feed) is disabled.")
-        # Yield a static image indicating camera is disabled
-        disabled_img = np.zeros((480, 640, 3), dtype=np.uint8)
-        cv2.putText(disabled_img, "Camera Disabled by Server Config", (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 2)
+        # Yield a static image indicating camera is disabled; browsers keep showing the last frame
         while not stop_camera_feed_event.is_set():
-            _, buffer = cv2.imencode('.jpg', disabled_img)
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(1) # Keep yielding the static image
+            yield placeholder_chunk("Camera Disabled by Server Config", font_scale=0.7)
+            time.sleep(STREAM_KEEPALIVE_INTERVAL)
         print("Exited disabled frame generation loop.")
         return
 
+    # Show a placeholder while the background warm-up runs instead of blocking the response
+    while not is_initialized and start_warm_up() != "failed" and not stop_camera_feed_event.is_set():
+        warm_up_thread = _warm_up_thread
+        if warm_up_thread is None or not warm_up_thread.is_alive():
+            break
+        yield placeholder_chunk("Warming up...")
+        time.sleep(0.25)
+
     if not is_initialized:
         if not initialize_resources():
             print("Initialization failed. Cannot generate frames.")
-            error_img = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(error_img, "Camera/Model Init Failed", (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            _, buffer = cv2.imencode('.jpg', error_img)
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+            yield placeholder_chunk("Camera/Model Init Failed", (0, 0, 255))
             return
 
-    mp_drawing = mp.solutions.drawing_utils
-    mp_hands_sol = mp.solutions.hands # Use the same name as in initialize_resources for consistency
+    # Capture and recognition run once per source in the broadcaster; this generator only encodes and sends
+    subscription = _get_camera_broadcaster().subscribe(recognition_session)
+    stream = AdaptiveMjpegStream(stream_profile)
+    subscription.stream = stream
 
     print("Starting frame generation loop...")
-    while not stop_camera_feed_event.is_set():
-        if not cap or not cap.isOpened():
-             if not stop_camera_feed_event.is_set():
-                print("Error: Camera not available. Attempting to re-initialize...")
-                if not initialize_resources():
-                    stable_prediction_display = "Error: Camera Lost"
-                    error_img = np.zeros((480, 640, 3), dtype=np.uint8)
-                    cv2.putText(error_img, "Camera Connection Lost", (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                    _, buffer = cv2.imencode('.jpg', error_img)
-                    frame_bytes = buffer.tobytes()
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                    time.sleep(1)
-                    continue
-                else:
-                    print("Camera re-initialized successfully.")
-                    if not cap or not cap.isOpened(): # Check again after re-init
-                        print("Camera still not available after re-initialization attempt.")
-                        # Yield error and continue
-                        stable_prediction_display = "Error: Camera Init Loop"
-                        error_img = np.zeros((480, 640, 3), dtype=np.uint8)
-                        cv2.putText(error_img, "Camera Init Loop", (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                        _, buffer = cv2.imencode('.jpg', error_img)
-                        frame_bytes = buffer.tobytes()
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    try:
+        while not stop_camera_feed_event.is_set():
+            if not cap or not cap.isOpened():
+                 if not stop_camera_feed_event.is_set():
+                    print("Error: Camera not available. Attempting to re-initialize...")
+                    if not initialize_resources():
+                        recognition_session.set_status("Error: Camera Lost")
+                        yield placeholder_chunk("Camera Connection Lost", (0, 0, 255))
                         time.sleep(1)
                         continue
-             else:
-                print("Camera feed stop requested, exiting generation loop.")
-                break
-
-        if stop_camera_feed_event.is_set():
-            print("Camera feed stop requested during frame processing, exiting.")
-            break
-
-        current_time = time.time()
-        success, image = cap.read()
-        if not success:
-            time.sleep(0.01)
-            continue
-
-        image_rgb = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
-        image_rgb.flags.writeable = False
-        results = hands.process(image_rgb)
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
-        image_bgr.flags.writeable = True
-
-        current_prediction_text = ""
-        instantaneous_prediction = "No hand detected"
-
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]
-            mp_drawing.draw_landmarks(
-                image_bgr, hand_landmarks, mp_hands_sol.HAND_CONNECTIONS)
-
-            landmarks_normalized = []
-            try:
-                wrist = hand_landmarks.landmark[0]
-                origin_x, origin_y = wrist.x, wrist.y
-                mcp_middle = hand_landmarks.landmark[mp_hands_sol.HandLandmark.MIDDLE_FINGER_MCP]
-                scale = np.sqrt((mcp_middle.x - origin_x)**2 + (mcp_middle.y - origin_y)**2)
-                scale = max(scale, 1e-6)
-
-                for landmark in hand_landmarks.landmark:
-                    norm_x = (landmark.x - origin_x) / scale
-                    norm_y = (landmark.y - origin_y) / scale
-                    landmarks_normalized.extend([norm_x, norm_y])
-
-                if len(landmarks_normalized) == 42:
-                    # Prepare input for TFLite model
-                    # Ensure the input shape and type match what the TFLite model expects.
-                    # input_details[0]['shape'] usually is [1, num_features] for this kind of model.
-                    # input_details[0]['dtype'] is usually np.float32.
-                    landmark_input = np.array([landmarks_normalized], dtype=input_details[0]['dtype'])
-                    
-                    # Check if input shape matches model's expected input shape excluding batch size
-                    if landmark_input.shape[1:] != tuple(input_details[0]['shape'][1:]):
-                        print(f"Error: Input data shape {landmark_input.shape[1:]} does not match model expected shape {input_details[0]['shape'][1:]}")
-                        current_prediction_text = "Detect: Input Shape Error"
-                        instantaneous_prediction = "Input Shape Error"
                     else:
-                        interpreter.set_tensor(input_details[0]['index'], landmark_input)
-                        interpreter.invoke()
-                        prediction = interpreter.get_tensor(output_details[0]['index'])
-                        
-                        predicted_class_index = np.argmax(prediction[0]) # Output is usually [[...]]
-                        confidence = np.max(prediction[0])
-
-                    global last_processed_frame_confidence
-                    if confidence >= MIN_PREDICTION_CONFIDENCE:
-                        predicted_letter = CLASS_NAMES[predicted_class_index]
-                        current_prediction_text = f"Detect: {predicted_letter} ({confidence*100:.2f}%)"
-                        instantaneous_prediction = predicted_letter
-                        last_processed_frame_confidence = confidence
-                    else:
-                        current_prediction_text = f"Detect: Low Confidence ({confidence*100:.2f}%)"
-                        instantaneous_prediction = "Low Confidence"
-                        last_processed_frame_confidence = 0.0
-                else:
-                    current_prediction_text = "Detect: Landmark count error"
-                    instantaneous_prediction = "Landmark count error"
-
-            except Exception as e:
-                current_prediction_text = f"Detect Error: {e}"
-                instantaneous_prediction = "Detect Error"
-                print(f"Detection Error: {e}")
-
-            prediction_buffer.append(instantaneous_prediction)
-
-        else:
-            current_prediction_text = "Detect: No hand detected"
-            instantaneous_prediction = "No hand detected"
-            prediction_buffer.append(instantaneous_prediction)
-
-        if len(prediction_buffer) == PREDICTION_BUFFER_SIZE:
-            try:
-                counts = {pred: prediction_buffer.count(pred) for pred in set(prediction_buffer)}
-                if counts:
-                    most_common_pred = max(counts, key=counts.get)
-                    most_common_count = counts[most_common_pred]
-                    required_count = int(PREDICTION_BUFFER_SIZE * SMOOTHING_THRESHOLD)
-                    is_stable_candidate = (most_common_count >= required_count)
-
-                    if is_stable_candidate:
-                        if most_common_pred not in NON_VALID_SIGN_STATES:
-                            if stable_prediction_display != most_common_pred:
-                                stable_prediction_display = most_common_pred
-                            last_valid_prediction_timestamp = current_time
-                        else:
-                            if stable_prediction_display not in NON_VALID_SIGN_STATES and stable_prediction_display != "Ready...":
-                                stable_prediction_display = "Ready..."
-                            last_valid_prediction_timestamp = None
-                    else:
-                        if last_valid_prediction_timestamp is not None and (current_time - last_valid_prediction_timestamp >= STABLE_STATE_HOLD_DURATION):
-                            if stable_prediction_display != "Ready...":
-                                stable_prediction_display = "Ready..."
-                            last_valid_prediction_timestamp = None
-                        elif last_valid_prediction_timestamp is None and stable_prediction_display not in ["Ready..."] and stable_prediction_display not in NON_VALID_SIGN_STATES:
-                            stable_prediction_display = "Ready..."
-                else:
-                     stable_prediction_display = "..."
-                     last_valid_prediction_timestamp = None
-
-            except Exception as e:
-                print(f"Error during stabilization: {e}")
-                stable_prediction_display = "Stab. Error"
-                last_valid_prediction_timestamp = None
-
-        elif last_valid_prediction_timestamp is not None and (current_time - last_valid_prediction_timestamp >= STABLE_STATE_HOLD_DURATION):
-            if stable_prediction_display != "Ready...":
-                stable_prediction_display = "Ready..."
-            last_valid_prediction_timestamp = None
-
-        cv2.putText(image_bgr, current_prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 120, 0), 2, cv2.LINE_AA)
+                        print("Camera re-initialized successfully.")
+                        if not cap or not cap.isOpened(): # Check again after re-init
+                            print("Camera still not available after re-initialization attempt.")
+                            # Yield error and continue
+                            recognition_session.set_status("Error: Camera Init Loop")
+                            yield placeholder_chunk("Camera Init Loop", (0, 0, 255))
+                            time.sleep(1)
+                            continue
+                 else:
+                    print("Camera feed stop requested, exiting generation loop.")
+                    break
 
-        stable_color = (0, 255, 0)
-        if stable_prediction_display in NON_VALID_SIGN_STATES or stable_prediction_display == "Ready..." or stable_prediction_display == "Initializing...":
-            stable_color = (200, 200, 200)
-        if "Error" in stable_prediction_display:
-            stable_color = (0, 0, 255)
-
-        cv2.putText(image_bgr, f"Stable: {stable_prediction_display}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, stable_color, 2, cv2.LINE_AA)
+            if stop_camera_feed_event.is_set():
+                print("Camera feed stop requested during frame processing, exiting.")
+                break
 
-        try:
-            ret, buffer = cv2.imencode('.jpg', image_bgr)
-            if not ret:
+            frame = subscription.next_frame()
+            if frame is None:
+                continue
+            wait = stream.time_until_next_send()
+            if wait > 0:
+                # Frame-rate cap: sleep, then send whatever is newest by then
+                time.sleep(wait)
+                frame = subscription.next_frame(timeout=0) or frame
+            if not stream.should_send(frame.payload):
+                continue
+            chunk = stream.encode(frame.payload)
+            if chunk is None:
                 print("Error encoding frame to JPEG.")
                 continue
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        except Exception as e:
-            print(f"Error encoding or yielding frame: {e}")
-            if stop_camera_feed_event.is_set():
-                break
+            # WSGI servers write each chunk before resuming the generator, so this measures the socket write
+            send_start = time.perf_counter()
+            yield chunk
+            send_seconds = time.perf_counter() - send_start
+            stream.record_send(len(chunk), send_seconds)
+            observe_stage('yield', send_seconds)
+    finally:
+        # Also runs when the client disconnects; the last subscriber to leave stops the broadcaster
+        subscription.close()
 
     print("Exited frame generation loop.")
 
@@ -370,11 +722,136 @@ def generate_frames():
 
         print("Defensive cleanup in generate_frames exit done.")
 
+# --- Browser-Captured Frames ---
+
+def _process_browser_frame(recognition_session, pending_frame):
+    """Decodes one browser frame and runs MediaPipe + the model within the student's session."""
+    current_time = time.time()
+    try:
+        image_rgb = decode_frame(pending_frame)
+    except FrameDecodeError as e:
+        print(f"Browser frame decode error (user {recognition_session.user_id}): {e}")
+        return False
+
+    if recognition_session.hands is None:
+        recognition_session.hands = _create_hands()
+    image_rgb.flags.writeable = False
+    start = time.perf_counter()
+    results = recognition_session.hands.process(image_rgb)
+    observe_stage('hands_process', time.perf_counter() - start)
+    frames_total.inc('browser')
+
+    confidence = 0.0
+    probabilities = None
+    model_version = None
+    landmarks = None
+    if results.multi_hand_landmarks:
+        instantaneous_prediction, confidence, _, probabilities, model_version, landmarks = _classify_results(results, recognition_session.prediction_cache)
+    else:
+        instantaneous_prediction = "No hand detected"
+        frames_without_hand_total.inc('browser')
+    recognition_session.record_prediction(instantaneous_prediction, confidence, current_time, probabilities, model_version, landmarks)
+    return True
+
+def process_pending_frames(recognition_session):
+    """Processes the newest queued browser frame if no other request is already doing so.
+
+    Frames that arrive while the session is busy replace older queued ones (latest frame wins),
+    so a client sending faster than we can process never builds up a backlog.
+    Returns a dict with the session's stable prediction and ingest counters.
+    """
+    if not is_ready():
+        return dict(recognition_session.snapshot(), processed=False, status=warm_up_state, error="Recognition is warming up")
+
+    frame_queue = recognition_session.frame_queue
+    processed = False
+    # Re-check after releasing the lock so a frame queued during the last pass is not stranded
+    while len(frame_queue) and recognition_session.processing_lock.acquire(blocking=False):
+        try:
+            latest_frame = frame_queue.take_latest()
+            while latest_frame is not None:
+                processed = _process_browser_frame(recognition_session, latest_frame) or processed
+                latest_frame = frame_queue.take_latest()
+        finally:
+            recognition_session.processing_lock.release()
+
+    recognition_session.touch()
+    return dict(recognition_session.snapshot(),
+                processed=processed,
+                frames_received=frame_queue.received,
+                frames_dropped=frame_queue.dropped)
+
+def submit_browser_frame(recognition_session, pending_frame):
+    """Queues a browser frame for the student's session and processes the latest one."""
+    recognition_session.frame_queue.put(pending_frame)
+    return process_pending_frames(recognition_session)
+
+# --- Landmark-Only Recognition ---
+
+def _label_prediction(probabilities, class_names):
+    """Maps one row of model output to (label, confidence) using MIN_PREDICTION_CONFIDENCE."""
+    predicted_class_index = int(np.argmax(probabilities))
+    confidence = float(probabilities[predicted_class_index])
+    if confidence >= MIN_PREDICTION_CONFIDENCE:
+        return class_names[predicted_class_index], confidence
+    return "Low Confidence", confidence
+
+def _get_active_model():
+    """The serving LoadedModel, loading the active registry version first if needed. Read it once per prediction."""
+    model = active_model
+    if model is None:
+        if not ensure_model_loaded():
+            raise RuntimeError("Model unavailable.")
+        model = active_model
+    return model
+
+def predict_landmark_batch(normalized_landmarks):
+    """Runs the model on an (N, 42) float32 array of normalized landmarks; returns (N, num_classes) probabilities."""
+    return _get_active_model().predict_batch(normalized_landmarks)
+
+def predict_scheduled(normalized_vector, model=None):
+    """Predicts one normalized (42,) vector, batched with whatever other sessions submit at the same moment."""
+    return (model or _get_active_model()).predict(normalized_vector)
+
+def predict_cached(normalized_vector, prediction_cache=None, model=None):
+    """predict_scheduled(), answered from the session's PredictionCache when a near-identical hand was seen recently."""
+    model = model or _get_active_model()
+    if prediction_cache is None or not prediction_cache.enabled:
+        return model.predict(normalized_vector)
+    key, probabilities = prediction_cache.lookup(normalized_vector, model.version)
+    if probabilities is not None:
+        prediction_cache_total.inc('hit')
+        return probabilities
+    prediction_cache_total.inc('miss')
+    probabilities = model.predict(normalized_vector)
+    prediction_cache.put(key, normalized_vector, probabilities, model.version)
+    return probabilities
+
+def recognize_landmarks(recognition_session, points):
+    """Classifies pre-extracted hand landmarks ((N, 21, 2) raw MediaPipe coordinates).
+
+    A single hand is treated as a live frame and fed to the student's stabilizer;
+    a batch is scored statelessly (bulk scoring) and returns per-hand class indices and confidences,
+    with the class names and version of the model that scored them.
+    """
+    model = _get_active_model()
+    normalized = normalize_landmarks(points)
+    if len(points) == 1:
+        probabilities = predict_cached(normalized[0], recognition_session.prediction_cache, model)
+        instantaneous_prediction, confidence = _label_prediction(probabilities, model.class_names)
+        recognition_session.record_prediction(instantaneous_prediction, confidence, time.time(), probabilities, model.version, normalized[0])
+        return dict(recognition_session.snapshot(), prediction=instantaneous_prediction, prediction_confidence=confidence)
+
+    probabilities = model.predict_batch(normalized)
+    class_indices = np.argmax(probabilities, axis=1)
+    confidences = probabilities[np.arange(len(probabilities)), class_indices]
+    return {'class_indices': class_indices, 'confidences': confidences, 'class_names': model.class_names, 'model_version': model.version}
+
 # --- Functions for Routes ---
 
 def release_resources():
     """Releases camera, MediaPipe hands, and resets initialization state."""
-    global cap, hands, interpreter, is_initialized, stable_prediction_display, stop_camera_feed_event, initialization_lock # model changed to interpreter
+    global cap, hands, is_initialized, resource_status_message, stop_camera_feed_event, initialization_lock
 
     print("Attempting to release resources...")
     stop_camera_feed_event.set()
@@ -400,50 +877,100 @@ def release_resources():
         else:
             print("MediaPipe Hands were not initialized or already closed.")
         
-        # Optionally reset interpreter and CLASS_NAMES if they should be reloaded from scratch next time
-        # interpreter = None
-        # input_details = None
-        # output_details = None
-        # CLASS_NAMES = []
+        # The model stays loaded; reload_model() replaces it without a restart
 
         is_initialized = False # Mark as not initialized
-        stable_prediction_display = "Offline"
+        resource_status_message = "Offline"
 
         print("Resources released and state reset.")
 
 
-def get_stable_prediction():
-    """Returns the current stable prediction and the confidence of the last valid processed frame."""
-    global stable_prediction_display, last_processed_frame_confidence, is_initialized, stop_camera_feed_event
+def get_camera_pipeline_stats():
+    """Per-stage timings and subscribers of every camera broadcaster."""
+    return [broadcaster.snapshot() for broadcaster in list(camera_broadcasters.values())]
+
+def get_session(user_id):
+    """Returns the RecognitionSession for a student, creating it if needed."""
+    return session_registry.get(user_id)
+
+def release_session(user_id):
+    """Drops a student's recognition session (e.g. on logout)."""
+    if session_registry.discard(user_id) is not None:
+        print(f"Released recognition session for user {user_id}.")
+
+def uses_browser_capture():
+    """Whether the student pages capture the camera in the browser: BROWSER_CAPTURE, or NO_CAMERA (the server has no camera to stream)."""
+    return BROWSER_CAPTURE or bool(os.getenv('NO_CAMERA'))
+
+def _status_override(recognition_session):
+    """Server-wide status shown instead of the student's own prediction (camera disabled, warming up), or None."""
+    # With NO_CAMERA the server camera feeds nothing, so resource_status_message is shown until the
+    # student's browser sends frames or landmarks of its own; from then on the session's prediction is.
+    if os.getenv('NO_CAMERA') and recognition_session.last_frame_at is None:
+        return str(resource_status_message)
+    if not stop_camera_feed_event.is_set() and not is_ready():
+        return "Warming up..."
+    return None
+
+def current_prediction(recognition_session):
+    """Returns {sign, confidence, seq, timestamp} for the student; a server-wide status replaces sign and confidence."""
+    prediction = recognition_session.snapshot()
+    override = _status_override(recognition_session)
+    if override is not None:
+        prediction["sign"], prediction["confidence"] = override, 0.0
+    elif recognition_session.last_frame_at is not None:
+        prediction_age_seconds.observe(max(0.0, time.time() - recognition_session.last_frame_at))
+    return prediction
+
+def get_stable_prediction(recognition_session):
+    """Returns the student's stable prediction and the confidence of their last valid processed frame."""
     import json
-
-    # If NO_CAMERA is set, camera-dependent predictions are not relevant.
-    # The stable_prediction_display might be "Camera Disabled..." or similar.
-    if os.getenv('NO_CAMERA'):
-        # You might want to return a specific state or the current stable_prediction_display
-        # which would reflect that the camera is off.
-        return json.dumps({"sign": str(stable_prediction_display), "confidence": 0.0})
-
-    if not is_initialized and not stop_camera_feed_event.is_set():
-        print("get_stable_prediction: resources not initialized and feed not stopped, attempting to initialize.")
-        initialize_resources()
-
-    current_confidence = 0.0
-    if stable_prediction_display not in NON_VALID_SIGN_STATES and \
-       stable_prediction_display != "Ready..." and \
-       stable_prediction_display != "Initializing..." and \
-       stable_prediction_display != "..." and \
-       "Error" not in stable_prediction_display: # Added check for error states
-        current_confidence = float(last_processed_frame_confidence)
-    else:
-        current_confidence = 0.0
-
-    return json.dumps({"sign": str(stable_prediction_display), "confidence": float(current_confidence)})
+    return json.dumps(current_prediction(recognition_session))
+
+def wait_for_prediction(recognition_session, after_seq, timeout=PREDICTION_WAIT_TIMEOUT):
+    """Long-poll: blocks while the student's prediction is still at after_seq, until it changes or a server-wide status does.
+
+    Returns current_prediction(), or None if nothing changed within timeout. A status change (e.g. warm-up
+    finishing) is returned even though seq does not advance, so clients render every answer they get.
+    """
+    if recognition_session.prediction_seq != after_seq:
+        # Also answers at once for a seq from an evicted session or a previous server run
+        return current_prediction(recognition_session)
+    deadline = time.monotonic() + timeout
+    override = _status_override(recognition_session)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        # Frames and landmarks from the browser still change the session while a status is shown (and the
+        # first one lifts the NO_CAMERA status), so wait on it; the status itself is re-checked every STATUS_POLL_INTERVAL
+        wait_seconds = remaining if override is None else min(remaining, STATUS_POLL_INTERVAL)
+        if recognition_session.wait_for_change(after_seq, wait_seconds) is not None:
+            return current_prediction(recognition_session)
+        if override is not None and _status_override(recognition_session) != override:
+            return current_prediction(recognition_session)
+
+def generate_prediction_events(user_id, last_seq=-1):
+    """Server-Sent Events stream of the student's prediction changes ('prediction' events with id = seq).
+
+    Sends the current prediction first, then one event per change, with keep-alive comments in between.
+    The session is looked up again on every wake-up so an evicted and re-created session is followed.
+    """
+    import json
+    yield "retry: 2000\n\n"
+    while not stop_camera_feed_event.is_set():
+        prediction = wait_for_prediction(get_session(user_id), last_seq, PREDICTION_KEEPALIVE_INTERVAL)
+        if prediction is None:
+            yield ": keep-alive\n\n"
+            continue
+        last_seq = prediction["seq"]
+        yield f"id: {last_seq}\nevent: prediction\ndata: {json.dumps(prediction)}\n\n"
 
 def get_available_signs():
-    """Returns the list of class names loaded from the model/pickle file."""
-    global CLASS_NAMES, is_initialized # Ensure is_initialized is global here
-    if not is_initialized: # Check if basic resources (interpreter, class names) are loaded
-        print("get_available_signs: resources not fully initialized, attempting to initialize interpreter and class names.")
-        initialize_resources() # This will load interpreter and class names even if camera fails or is disabled
-    return CLASS_NAMES
+    """Returns the list of class names from the model's metadata file (empty if it cannot be read)."""
+    start_warm_up()
+    try:
+        return load_class_names()
+    except (OSError, ValueError) as e: # ModelMetadataError and malformed JSON are ValueErrors
+        print(f"get_available_signs: could not load model metadata: {e}")
+        return []
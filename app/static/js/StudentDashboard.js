@@ -12,8 +12,13 @@ document.addEventListener('DOMContentLoaded', function() {
     const signTipsArea = document.getElementById('sign-tips-area');
     const tipSignLetter = document.getElementById('tip-sign-letter');
     const tipText = document.getElementById('tip-text');
+    const fingerFeedbackElement = document.getElementById('finger-feedback');
+    const fingerFeedbackText = document.getElementById('finger-feedback-text');
 
-    let predictionInterval = null;
+    let predictionInterval = null; // local timer that refreshes the hold countdown; sends no requests
+    let predictionStream = null; // pushed prediction changes (see prediction_stream.js)
+    let browserCaptureHandle = null; // camera captured in the browser (see browser_capture.js), when the server has none
+    let latestPrediction = null;
     let currentPracticeSign = null;
     let lastStablePrediction = null;
     let successStartTime = null;
@@ -21,7 +26,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // These are expected to be set by inline script in the HTML template
     // const predictionUrl = "{{ url_for('student.get_prediction') }}";
+    // const predictionEventsUrl = "{{ url_for('student.prediction_events') }}";
+    // const waitPredictionUrl = "{{ url_for('student.wait_prediction') }}";
+    // const practiceTargetUrl = "{{ url_for('student.set_practice_target') }}";
     // const videoFeedUrl = "{{ url_for('student.video_feed') }}";
+    // const browserCapture = {{ browser_capture | tojson }};
+    // const recognizeFrameUrl = "{{ url_for('student.recognize_frame') }}";
     // const staticBaseUrl = "{{ url_for('static', filename='') }}"; 
 
     const signTips = {
@@ -58,7 +68,8 @@ document.addEventListener('DOMContentLoaded', function() {
 
     window.addEventListener('pagehide', function() {
         stopPredictionPolling(); 
-        if (videoFeedElement && videoFeedElement.src !== "") {
+        stopBrowserCapture();
+        if (videoFeedElement && !usesBrowserCapture() && videoFeedElement.src !== "") {
             videoFeedElement.src = ""; 
             console.log("Cleared video feed source on page hide (StudentDashboard).");
             if (videoPlaceholderText) videoPlaceholderText.style.display = 'block';
@@ -67,8 +78,23 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
+    function usesBrowserCapture() {
+        return typeof browserCapture !== 'undefined' && browserCapture;
+    }
+
+    function stopBrowserCapture() {
+        if (browserCaptureHandle) {
+            browserCaptureHandle.stop();
+            browserCaptureHandle = null;
+        }
+    }
+
     function startCameraOnClick() {
         console.log("Start Camera button clicked on Dashboard.");
+        if (usesBrowserCapture()) {
+            startBrowserCameraOnClick();
+            return;
+        }
         if (!videoFeedElement || !videoFeedUrl) {
             console.error("Video feed element or URL not found/configured!");
             if (videoPlaceholderText) videoPlaceholderText.textContent = "Camera configuration error.";
@@ -86,8 +112,24 @@ document.addEventListener('DOMContentLoaded', function() {
         videoFeedElement.onload = handleStreamLoad;
     }
 
+    // The server has no camera: this browser's camera is shown here and its frames are sent for recognition
+    function startBrowserCameraOnClick() {
+        if (!videoFeedElement || typeof recognizeFrameUrl === 'undefined') {
+            console.error("Video element or frame upload URL not found/configured!");
+            if (videoPlaceholderText) videoPlaceholderText.textContent = "Camera configuration error.";
+            return;
+        }
+        if (startCameraButton) startCameraButton.classList.add('hidden');
+        if (videoPlaceholderText) videoPlaceholderText.style.display = 'none';
+        videoFeedElement.style.display = 'block';
+        browserCaptureHandle = startBrowserCapture(videoFeedElement, recognizeFrameUrl, handleStreamLoad, message => {
+            handleStreamError();
+            if (videoPlaceholderText) videoPlaceholderText.textContent = message;
+        });
+    }
+
     function handleStreamError() {
-        console.error("Error loading video feed stream from backend. Check Flask server and endpoint URL:", videoFeedUrl);
+        console.error("Error loading video feed stream. Check Flask server and endpoint URL:", usesBrowserCapture() ? recognizeFrameUrl : videoFeedUrl);
         if(instructionText) instructionText.textContent = "Error loading video stream from server.";
         if(feedbackElement) {
             feedbackElement.textContent = 'Stream Error';
@@ -99,8 +141,9 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         if(videoFeedElement) {
             videoFeedElement.style.display = 'none';
-            videoFeedElement.src = ""; // Clear src on error
+            if (!usesBrowserCapture()) videoFeedElement.src = ""; // Clear src on error
         }
+        stopBrowserCapture();
         if(startCameraButton) startCameraButton.classList.remove('hidden'); // Show start button again
         stopPredictionPolling();
     }
@@ -122,6 +165,8 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         lastStablePrediction = null;
         successStartTime = null;
+        showFingerFeedback(null);
+        sendPracticeTarget(sign);
 
         // Using lowercase .png for consistency and to avoid case-sensitivity issues.
         // The 'sign' variable comes from button text, assume it's already the correct case (e.g., "A", "B")
@@ -155,14 +200,45 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    function sendPracticeTarget(sign) {
+        // The server compares frames that are not this sign with it and names the finger to fix
+        if (typeof practiceTargetUrl === 'undefined') return;
+        const formData = new FormData();
+        formData.append('sign', sign);
+        fetch(practiceTargetUrl, { method: 'POST', body: formData })
+            .then(response => response.json())
+            .then(data => { if (data.error) console.warn(`Practice target not set: ${data.error}`); })
+            .catch(error => console.error('Error setting practice target:', error));
+    }
+
+    function showFingerFeedback(feedback) {
+        if (!fingerFeedbackElement) return;
+        const finger = feedback && feedback.target === currentPracticeSign ? feedback.finger : null;
+        fingerFeedbackElement.querySelectorAll('.finger').forEach(element => {
+            element.classList.toggle('finger-fix', element.dataset.finger === finger);
+        });
+        if (!finger) {
+            fingerFeedbackElement.style.display = 'none';
+            return;
+        }
+        if (fingerFeedbackText) fingerFeedbackText.textContent = `Check your ${finger === 'thumb' ? 'thumb' : finger + ' finger'}.`;
+        fingerFeedbackElement.style.display = 'block';
+    }
+
     function startPredictionPolling() {
         if (predictionInterval) { clearInterval(predictionInterval); }
-        // Ensure predictionUrl is defined (should be from inline script in HTML)
-        if (typeof predictionUrl !== 'undefined') {
-            predictionInterval = setInterval(fetchPrediction, 500); // Poll every 500ms
-            console.log("Prediction polling started.");
+        // Ensure the push URLs are defined (should be from inline script in HTML)
+        if (typeof predictionEventsUrl !== 'undefined' && typeof waitPredictionUrl !== 'undefined') {
+            if (!predictionStream) {
+                predictionStream = openPredictionStream(predictionEventsUrl, waitPredictionUrl, data => {
+                    latestPrediction = data;
+                    renderPrediction();
+                });
+            }
+            predictionInterval = setInterval(renderPrediction, 500); // Refresh the hold countdown every 500ms
+            console.log("Prediction stream started.");
         } else {
-            console.error("predictionUrl is not defined. Cannot start polling.");
+            console.error("predictionEventsUrl is not defined. Cannot start prediction updates.");
         }
     }
 
@@ -170,29 +246,22 @@ document.addEventListener('DOMContentLoaded', function() {
          if (predictionInterval) {
             clearInterval(predictionInterval);
             predictionInterval = null;
-            console.log("Prediction polling stopped.");
+        }
+         if (predictionStream) {
+            predictionStream.close();
+            predictionStream = null;
+            latestPrediction = null;
+            console.log("Prediction stream stopped.");
         }
     }
 
-    async function fetchPrediction() {
-    if (!currentPracticeSign || !videoFeedElement || videoFeedElement.style.display !== 'block') {
+    function renderPrediction() {
+    if (!currentPracticeSign || !videoFeedElement || videoFeedElement.style.display !== 'block' || !latestPrediction) {
         return;
     }
 
     try {
-        if (typeof predictionUrl === 'undefined') {
-            console.error("predictionUrl is not defined in fetchPrediction.");
-            return;
-        }
-        const response = await fetch(predictionUrl + "?t=" + new Date().getTime());
-        if (!response.ok) {
-            throw new Error(`HTTP error! Status: ${response.status}`);
-        }
-        // const predictionText = await response.text(); // OLD WAY
-
-        const predictionData = await response.json(); // NEW: Parse as JSON
-        const predictedSign = predictionData.sign;    // NEW: Extract the sign
-       
+        const predictedSign = latestPrediction.sign;
 
         if (detectedSignDisplay) {
             // detectedSignDisplay.textContent = predictionText || "..."; // OLD WAY
@@ -200,8 +269,9 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         // updateFeedback(predictionText || "..."); // OLD WAY
         updateFeedback(predictedSign || "...");   // NEW: Pass only the sign string to updateFeedback
+        showFingerFeedback(latestPrediction.finger_feedback);
     } catch (error) {
-        console.error("Error fetching prediction:", error);
+        console.error("Error showing prediction:", error);
         if (feedbackElement) {
             feedbackElement.textContent = "Error getting prediction. Check console.";
             feedbackElement.className = 'status-incorrect';
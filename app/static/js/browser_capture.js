@@ -0,0 +1,88 @@
+// Captures the student's camera in the browser and posts its frames to /student/recognize_frame, for servers
+// without a camera of their own (NO_CAMERA) or with BROWSER_CAPTURE=1. The server mirrors each frame like its own
+// camera feed and runs it through the student's recognition session; predictions arrive through the usual
+// prediction stream (see prediction_stream.js). Only one frame is uploaded at a time, so a slow server or
+// connection lowers the frame rate instead of queueing uploads.
+// onStart() runs once the camera shows in videoElement, onError(message) if it cannot be opened. Returns {stop()}.
+const BROWSER_CAPTURE_FPS = 15; // Most frames per second sent
+const BROWSER_CAPTURE_WIDTH = 640; // Frames are scaled down to this width before upload (the server's MAX_FRAME_WIDTH)
+const BROWSER_CAPTURE_QUALITY = 0.7; // JPEG quality of the uploaded frames
+
+function startBrowserCapture(videoElement, frameUrl, onStart, onError) {
+    const canvas = document.createElement('canvas');
+    const context = canvas.getContext('2d');
+    let mediaStream = null;
+    let stopped = false;
+    let timer = null;
+
+    function schedule(delay) {
+        if (!stopped) timer = setTimeout(sendFrame, delay);
+    }
+
+    function sendFrame() {
+        const startedAt = Date.now();
+        if (!videoElement.videoWidth) { // no frame decoded yet
+            schedule(100);
+            return;
+        }
+        const scale = Math.min(1, BROWSER_CAPTURE_WIDTH / videoElement.videoWidth);
+        canvas.width = Math.round(videoElement.videoWidth * scale);
+        canvas.height = Math.round(videoElement.videoHeight * scale);
+        context.drawImage(videoElement, 0, 0, canvas.width, canvas.height);
+        canvas.toBlob(blob => {
+            if (stopped) return;
+            if (!blob) {
+                schedule(100);
+                return;
+            }
+            fetch(frameUrl, { method: 'POST', headers: { 'Content-Type': 'image/jpeg' }, body: blob })
+                .then(response => {
+                    if (response.status === 503) { // still warming up (Retry-After: 1)
+                        schedule(1000);
+                        return;
+                    }
+                    if (!response.ok) console.warn(`Camera frame rejected: HTTP ${response.status}`);
+                    schedule(Math.max(0, 1000 / BROWSER_CAPTURE_FPS - (Date.now() - startedAt)));
+                })
+                .catch(error => {
+                    console.error('Error sending camera frame:', error);
+                    schedule(2000); // back off before retrying
+                });
+        }, 'image/jpeg', BROWSER_CAPTURE_QUALITY);
+    }
+
+    function stop() {
+        stopped = true;
+        clearTimeout(timer);
+        if (mediaStream) {
+            mediaStream.getTracks().forEach(track => track.stop());
+            mediaStream = null;
+        }
+        videoElement.srcObject = null;
+    }
+
+    if (!navigator.mediaDevices || !navigator.mediaDevices.getUserMedia) {
+        setTimeout(() => onError("This browser cannot share its camera here (it needs an https:// page)."), 0); // after the caller has set up its page
+        return { stop };
+    }
+    navigator.mediaDevices.getUserMedia({ video: { width: { ideal: 640 }, height: { ideal: 480 } }, audio: false })
+        .then(stream => {
+            if (stopped) {
+                stream.getTracks().forEach(track => track.stop());
+                return;
+            }
+            mediaStream = stream;
+            videoElement.srcObject = stream;
+            return videoElement.play().then(() => {
+                onStart();
+                sendFrame();
+            });
+        })
+        .catch(error => {
+            console.error('Could not open the camera:', error);
+            stop();
+            onError(`Could not open your camera: ${error.message || error.name}`);
+        });
+
+    return { stop };
+}
@@ -0,0 +1,60 @@
+// Receives stable-prediction changes pushed by the server instead of polling /student/get_prediction.
+// Uses Server-Sent Events (/student/prediction_events) and falls back to long-polling
+// (/student/wait_prediction) when EventSource is unavailable or the stream cannot be opened.
+// onPrediction receives {sign, confidence, seq, timestamp} for every change.
+function openPredictionStream(eventsUrl, waitUrl, onPrediction) {
+    let eventSource = null;
+    let closed = false;
+    let lastSeq = -1;
+    let streamOpened = false;
+
+    function deliver(data) {
+        lastSeq = data.seq;
+        onPrediction(data);
+    }
+
+    function longPoll() {
+        if (closed) return;
+        fetch(`${waitUrl}?after=${lastSeq}&t=${new Date().getTime()}`)
+            .then(response => {
+                if (response.status === 204) return null; // nothing changed before the timeout
+                if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                if (data) deliver(data);
+                longPoll();
+            })
+            .catch(error => {
+                console.error('Error waiting for prediction:', error);
+                setTimeout(longPoll, 2000); // back off before retrying
+            });
+    }
+
+    if (window.EventSource && eventsUrl) {
+        eventSource = new EventSource(eventsUrl);
+        eventSource.addEventListener('open', () => { streamOpened = true; });
+        eventSource.addEventListener('prediction', event => deliver(JSON.parse(event.data)));
+        eventSource.addEventListener('error', () => {
+            // EventSource reconnects by itself once a stream has worked; fall back if it never opened
+            if (!streamOpened && !closed) {
+                console.warn('Prediction event stream unavailable, falling back to long-polling.');
+                eventSource.close();
+                eventSource = null;
+                longPoll();
+            }
+        });
+    } else if (waitUrl) {
+        longPoll();
+    }
+
+    return {
+        close() {
+            closed = true;
+            if (eventSource) {
+                eventSource.close();
+                eventSource = null;
+            }
+        }
+    };
+}
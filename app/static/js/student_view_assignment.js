@@ -6,130 +6,225 @@ document.addEventListener('DOMContentLoaded', function () {
     const cameraPlaceholderDiv = document.getElementById('video_feed_placeholder_text'); // This is the <p> tag
     const videoFeedImg = document.getElementById('video_feed_assignment_img'); // Updated ID
     const videoFeedContainer = document.querySelector('.video-feed-container'); // Parent of img and placeholder text
+    const wordModeCheckbox = document.getElementById('word_mode_checkbox');
+    const wordHypothesesTextElement = document.getElementById('word_hypotheses_text');
 
-    let recordedSignAttempts = []; // Array to store {sign, confidence}
-    let lastPrediction = "";
-    let stableCounter = 0;
-    const STABILITY_THRESHOLD = 25; 
     let predictionIntervalId = null;
+    let predictionStream = null; // pushed prediction changes (see prediction_stream.js)
+    let browserCaptureHandle = null; // camera captured in the browser (see browser_capture.js), when the server has none
+    let latestPrediction = null;
+    let latestPredictionReceivedAt = 0;
+    // Attempts are detected and logged on the server; the page only shows the ones of this practice run
+    let practiceAssignmentId = null;
+    let practiceFirstAttemptSeq = null;
+    let lastShownAttemptSeq = -1;
+    let attemptNoticeUntil = 0;
 
-    const getPredictionUrl = predictionTextElement ? predictionTextElement.dataset.getPredictionUrl : null;
+    const predictionEventsUrl = predictionTextElement ? predictionTextElement.dataset.predictionEventsUrl : null;
+    const waitPredictionUrl = predictionTextElement ? predictionTextElement.dataset.waitPredictionUrl : null;
     const videoFeedUrl = videoFeedImg ? videoFeedImg.dataset.videoFeedUrl : null;
+    const recognizeFrameUrl = videoFeedImg ? videoFeedImg.dataset.recognizeFrameUrl : null; // set instead of videoFeedUrl with browser capture
+    const startPracticeUrl = startCameraButton ? startCameraButton.dataset.startPracticeUrl : null;
+    const practiceAttemptsUrl = startCameraButton ? startCameraButton.dataset.practiceAttemptsUrl : null;
 
-    function fetchPrediction() {
-        if (!getPredictionUrl) {
-            // console.error("Get prediction URL is not set.");
+    // Word mode: the server decodes fingerspelled words; show the letters so far and the likeliest words
+    function showWords(words) {
+        if (!wordHypothesesTextElement || !words) return;
+        const ranked = words.hypotheses.map(h => `${h.word} (${Math.round(h.score * 100)}%)`).join(", ");
+        wordHypothesesTextElement.textContent = `Spelling: ${words.prefix || "..."}` + (ranked ? ` | ${ranked}` : "");
+    }
+
+    // Every push carries the newest attempts (recent_attempts); all of this run's unseen ones are added, in order.
+    // If some already fell out of that list (e.g. after a reconnect), the whole run is fetched instead.
+    function showNewAttempts(attempts, complete) {
+        if (!attempts || practiceFirstAttemptSeq === null) return;
+        const unseen = attempts.filter(attempt => attempt.assignment_id === practiceAssignmentId &&
+            attempt.seq >= practiceFirstAttemptSeq && attempt.seq > lastShownAttemptSeq);
+        if (!unseen.length) return;
+        const expectedSeq = Math.max(lastShownAttemptSeq + 1, practiceFirstAttemptSeq);
+        if (!complete && unseen[0].seq > expectedSeq && practiceAttemptsUrl) {
+            fetch(practiceAttemptsUrl)
+                .then(response => response.json())
+                .then(data => showNewAttempts(data.attempts, true))
+                .catch(error => console.error("Could not load the practice run's attempts:", error));
+            return;
+        }
+        unseen.forEach(showNewAttempt);
+    }
+
+    function showNewAttempt(attempt) {
+        if (attempt.seq <= lastShownAttemptSeq) return;
+        lastShownAttemptSeq = attempt.seq;
+        const currentNotes = submissionNotesTextarea.value;
+        const separator = currentNotes.length > 0 ? " " : "";
+        submissionNotesTextarea.value += separator + attempt.sign;
+        console.log("Recorded attempt:", attempt);
+
+        predictionTextElement.style.color = '#28a745';
+        setTimeout(() => {
+            predictionTextElement.style.color = '#007bff';
+        }, 500);
+        stabilityTimerTextElement.textContent = "Added to notes!";
+        attemptNoticeUntil = Date.now() + 1000;
+    }
+
+    // Runs every 100 ms on the latest pushed prediction (no request per tick) to animate the hold progress
+    function applyLatestPrediction() {
+        if (!predictionEventsUrl && !waitPredictionUrl) {
             if(predictionTextElement) predictionTextElement.textContent = "Error: Config issue.";
             return;
         }
+        if (!latestPrediction) {
+            return;
+        }
+
+        // data is an object like {"sign": "A", "confidence": 0.95, "seq": 12, "held_for": 1.2, "hold_seconds": 2.5, "recent_attempts": [...]}
+        const data = latestPrediction;
+        const sign = data.sign;
+        showWords(data.words);
+        const showingNotice = Date.now() < attemptNoticeUntil;
 
-        fetch(getPredictionUrl)
-            .then(response => response.json()) // Expect JSON now
+        if (sign && sign !== "No prediction" && sign.trim() !== "") {
+            predictionTextElement.textContent = sign; // The detailed "Detect: X (Y%)" is on the video feed itself.
+            if (showingNotice) {
+                return;
+            }
+            if (data.held_for !== null && data.held_for !== undefined && data.hold_seconds) {
+                // held_for was measured when the server pushed; add the time since
+                const heldFor = Math.min(data.held_for + (Date.now() - latestPredictionReceivedAt) / 1000, data.hold_seconds);
+                stabilityTimerTextElement.textContent = `Holding: ${heldFor.toFixed(1)}/${data.hold_seconds}s`;
+            } else {
+                stabilityTimerTextElement.textContent = "";
+            }
+        } else {
+            predictionTextElement.textContent = "Waiting for prediction...";
+            if (!showingNotice) stabilityTimerTextElement.textContent = "";
+        }
+    }
+
+    function startAttemptLog() {
+        if (!startPracticeUrl) {
+            console.error("Start practice URL is not set; signs will not be recorded.");
+            return;
+        }
+        const formData = new FormData();
+        if (wordModeCheckbox && wordModeCheckbox.checked) formData.append('word_mode', '1');
+        fetch(startPracticeUrl, { method: 'POST', body: formData })
+            .then(response => response.json())
             .then(data => {
-                // data should be an object like {"sign": "A", "confidence": 0.95}
-                const sign = data.sign;
-                const confidence = data.confidence; // This is the confidence of the last processed frame
-
-                if (sign && sign !== "No prediction" && sign.trim() !== "") {
-                    // Display the sign from the server (which might include "Detect: ...")
-          
-                    
-                    predictionTextElement.textContent = sign; // This will now be just the sign letter or "Ready..." etc.
-                                                        // The detailed "Detect: X (Y%)" is on the video feed itself.
-
-                    if (sign === lastPrediction) {
-                        stableCounter++;
-                        const lowerSignCompare = sign.toLowerCase().trim();
-                        
-                        if (lowerSignCompare !== 'ready' && lowerSignCompare !== 'ready...' && lowerSignCompare !== 'no prediction' && lowerSignCompare !== 'low confidence' && stableCounter > 0 && stableCounter < STABILITY_THRESHOLD) {
-                            stabilityTimerTextElement.textContent = `Holding: ${stableCounter}/${STABILITY_THRESHOLD}`;
-                        } else {
-                            stabilityTimerTextElement.textContent = ""; 
-                        }
-
-                        if (stableCounter === STABILITY_THRESHOLD) {
-                            const lowerSign = sign.toLowerCase().trim();
-                            if (lowerSign !== 'ready' && lowerSign !== 'ready...' && lowerSign !== 'no prediction' && lowerSign !== 'low confidence') {
-                                const currentNotes = submissionNotesTextarea.value;
-                                const separator = currentNotes.length > 0 ? " " : "";
-                                
-                                // Use the sign and confidence directly from the JSON response
-                                submissionNotesTextarea.value += separator + sign; 
-                                recordedSignAttempts.push({ sign: sign, confidence: confidence });
-                                console.log("Recorded attempt:", { sign: sign, confidence: confidence });
-                                
-                                predictionTextElement.style.color = '#28a745';
-                                setTimeout(() => {
-                                    predictionTextElement.style.color = '#007bff';
-                                }, 500);
-                                stabilityTimerTextElement.textContent = "Added to notes!";
-                                setTimeout(() => { stabilityTimerTextElement.textContent = ""; }, 3000);
-                            } else {
-                                stabilityTimerTextElement.textContent = ""; 
-                            }
-                            stableCounter = 0; 
-                        }
-                    } else {
-                        lastPrediction = sign; 
-                        stableCounter = 0;
-                        stabilityTimerTextElement.textContent = ""; 
-                    }
-                } else if (sign === "No prediction" || (sign && sign.trim() === "") || !sign) {
-                    predictionTextElement.textContent = "Waiting for prediction...";
-                    lastPrediction = ""; 
-                    stableCounter = 0;
-                    stabilityTimerTextElement.textContent = ""; 
+                practiceAssignmentId = data.assignment_id;
+                practiceFirstAttemptSeq = data.first_attempt_seq;
+                if (wordModeCheckbox && wordModeCheckbox.checked && !data.word_mode && wordHypothesesTextElement) {
+                    wordHypothesesTextElement.textContent = "This assignment has no words to spell; practicing single signs.";
                 }
             })
-            .catch(error => {
-                console.error('Error fetching prediction:', error);
-                if(predictionTextElement) predictionTextElement.textContent = "Error fetching prediction.";
-                lastPrediction = "";
-                stableCounter = 0;
-                if(stabilityTimerTextElement) stabilityTimerTextElement.textContent = ""; // Clear timer text
-            });
+            .catch(error => console.error("Could not start the practice run:", error));
     }
 
     function startSignPractice() {
-        if (!videoFeedUrl) {
+        if (!videoFeedUrl && !recognizeFrameUrl) {
             console.error("Video feed URL is not set.");
             if(cameraPlaceholderDiv) cameraPlaceholderDiv.textContent = "Error: Camera feed URL not configured.";
             return;
         }
 
         if (videoFeedImg && cameraPlaceholderDiv && videoFeedContainer) {
-            videoFeedImg.src = videoFeedUrl;
+            if (recognizeFrameUrl) {
+                // The server has no camera: this browser's camera is shown here and its frames are sent for recognition
+                browserCaptureHandle = startBrowserCapture(videoFeedImg, recognizeFrameUrl, () => {}, showCameraError);
+            } else {
+                videoFeedImg.src = videoFeedUrl;
+            }
             videoFeedImg.style.display = 'block'; 
             cameraPlaceholderDiv.style.display = 'none'; // Hide the placeholder text
             // The button is outside cameraPlaceholderDiv now, so no need to hide cameraPlaceholderDiv itself
         }
 
         if (predictionTextElement && submissionNotesTextarea && stabilityTimerTextElement && !predictionIntervalId) {
-            predictionIntervalId = setInterval(fetchPrediction, 100); 
+            startAttemptLog();
+            predictionStream = openPredictionStream(predictionEventsUrl, waitPredictionUrl, data => {
+                latestPrediction = data;
+                latestPredictionReceivedAt = Date.now();
+                showNewAttempts(data.recent_attempts, false); // on every push, not only the latest per tick
+            });
+            predictionIntervalId = setInterval(applyLatestPrediction, 100); 
         }
         if (startCameraButton) {
             startCameraButton.disabled = true; // Disable button after starting
             startCameraButton.textContent = "Camera Active";
         }
+        if (wordModeCheckbox) wordModeCheckbox.disabled = true;
+    }
+
+    function showCameraError(message) {
+        browserCaptureHandle = null;
+        videoFeedImg.style.display = 'none';
+        cameraPlaceholderDiv.textContent = message;
+        cameraPlaceholderDiv.style.display = 'block';
+        if (startCameraButton) { // let the student retry (e.g. after allowing camera access)
+            startCameraButton.disabled = false;
+            startCameraButton.textContent = "Start Camera & Practice";
+        }
     }
 
     if (startCameraButton) {
         startCameraButton.addEventListener('click', startSignPractice);
     }
     
-    // Add hidden input to form for submitting recordedSignAttempts
-    const form = document.querySelector('form[action*="/submit"]'); // Find the submission form
-    if (form) {
-        const hiddenInput = document.createElement('input');
-        hiddenInput.type = 'hidden';
-        hiddenInput.name = 'sign_attempts_json';
-        form.appendChild(hiddenInput);
-
-        form.addEventListener('submit', function() {
-            hiddenInput.value = JSON.stringify(recordedSignAttempts);
-        });
+    // Recorded video upload: the server recognizes it in the background and grades it like a live session
+    const videoInput = document.getElementById('practice-video');
+    const submitVideoButton = document.getElementById('submit_video_btn');
+    const videoJobStatusText = document.getElementById('video_job_status_text');
+    const VIDEO_JOB_POLL_MS = 1000;
+
+    function pollVideoJob(statusUrl) {
+        fetch(statusUrl)
+            .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+            .then(({ ok, data }) => {
+                if (!ok || data.state === 'failed') {
+                    videoJobStatusText.textContent = `Video could not be processed: ${data.error || 'unknown error'}`;
+                    submitVideoButton.disabled = false;
+                    return;
+                }
+                if (data.state === 'done') {
+                    videoJobStatusText.textContent = `Done: ${data.attempts} sign(s) recognized. Opening your submission...`;
+                    window.location.href = data.submission_url;
+                    return;
+                }
+                const percent = Math.round((data.progress || 0) * 100);
+                videoJobStatusText.textContent = data.state === 'saving' ? 'Saving your submission...' : `Processing video... ${percent}%`;
+                setTimeout(() => pollVideoJob(statusUrl), VIDEO_JOB_POLL_MS);
+            })
+            .catch(() => setTimeout(() => pollVideoJob(statusUrl), VIDEO_JOB_POLL_MS * 3));
     }
 
+    if (videoInput && submitVideoButton && videoJobStatusText) {
+        submitVideoButton.addEventListener('click', function () {
+            if (!videoInput.files.length) {
+                videoJobStatusText.textContent = 'Choose a video file first.';
+                return;
+            }
+            const formData = new FormData();
+            formData.append('video', videoInput.files[0]);
+            if (submissionNotesTextarea) formData.append('submission_notes', submissionNotesTextarea.value);
+            submitVideoButton.disabled = true;
+            videoJobStatusText.textContent = 'Uploading video...';
+            fetch(submitVideoButton.dataset.submitVideoUrl, { method: 'POST', body: formData })
+                .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+                .then(({ ok, data }) => {
+                    if (!ok) {
+                        videoJobStatusText.textContent = data.error || 'Upload failed.';
+                        submitVideoButton.disabled = false;
+                        return;
+                    }
+                    pollVideoJob(data.status_url);
+                })
+                .catch(() => {
+                    videoJobStatusText.textContent = 'Upload failed. Check your connection and try again.';
+                    submitVideoButton.disabled = false;
+                });
+        });
+    }
 
     // Ensure all elements are present before adding event listener or starting interval
     if (startCameraButton && videoFeedImg && predictionTextElement && submissionNotesTextarea && stabilityTimerTextElement) {
@@ -144,7 +239,15 @@ document.addEventListener('DOMContentLoaded', function () {
             predictionIntervalId = null;
             console.log("Cleared prediction interval on page hide (StudentViewAssignment).");
         }
-        if (videoFeedImg && videoFeedImg.src !== "") {
+        if (predictionStream) {
+            predictionStream.close();
+            predictionStream = null;
+        }
+        if (browserCaptureHandle) {
+            browserCaptureHandle.stop();
+            browserCaptureHandle = null;
+        }
+        if (videoFeedImg && !recognizeFrameUrl && videoFeedImg.src !== "") {
             videoFeedImg.src = ""; // Attempt to stop the stream
             console.log("Cleared video feed source on page hide (StudentViewAssignment).");
         }
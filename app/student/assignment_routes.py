@@ -1,8 +1,11 @@
-from flask import render_template, session, url_for, request, flash, redirect, current_app
+from flask import render_template, session, url_for, request, flash, redirect, current_app, jsonify
 from . import bp  # Use . to import bp from the current package (student)
 from app.utils import login_required, role_required
+from app import sign_logic, video_recognition
+from app.fingerspelling import vocabulary_words
 from supabase import Client, PostgrestAPIError
-import json
+import os
+import tempfile
 from datetime import datetime, timezone, timedelta
 
 @bp.route('/assignment')
@@ -103,6 +106,144 @@ def view_assignment_student(assignment_id):
     now_utc = datetime.now(timezone.utc)
     return render_template('StudentViewAssignment.html', assignment=assignment_data, user_name=session.get('user_name'), now_utc=now_utc)
 
+def _load_open_assignment(supabase, assignment_id):
+    """Returns (assignment row, None) if it accepts submissions, (row, reason) if it is past due, or (None, reason) if missing."""
+    assignment_res = supabase.table('assignments').select('due_date, lesson_id').eq('id', assignment_id).single().execute()
+    if not (assignment_res and assignment_res.data):
+        return None, 'Assignment not found.'
+    due_date_str = assignment_res.data.get('due_date')
+    if due_date_str:
+        due_date = datetime.fromisoformat(due_date_str)
+        if datetime.now(timezone.utc) > due_date:
+            return assignment_res.data, 'This assignment is past the due date and can no longer be submitted.'
+    return assignment_res.data, None
+
+def _grade_sign_attempts(recorded_sign_attempts):
+    """Returns (average confidence, grade) of the attempts that carry a confidence."""
+    valid_attempts = [attempt for attempt in recorded_sign_attempts if isinstance(attempt, dict) and attempt.get('confidence') is not None]
+    if not valid_attempts:
+        return 0.0, 0.0
+    total_confidence = sum(attempt.get('confidence', 0.0) for attempt in valid_attempts)
+    average_confidence = total_confidence / len(valid_attempts)
+    return average_confidence, round(average_confidence * 100, 2)
+
+def save_auto_graded_submission(supabase, student_id, assignment_id, form_notes, recorded_sign_attempts, lesson_id=None):
+    """Grades the attempts, creates or updates the student's submission and bulk-inserts its sign_attempts.
+
+    Also records lesson progress and the "Perfect Score" badge. Used by the live submission form and by
+    uploaded-video jobs (which run outside a request, so nothing is flashed here).
+    Returns (submission_id or None, grade, [(message, category), ...] for the student). Raises PostgrestAPIError.
+    """
+    messages = []
+    average_confidence, calculated_grade = _grade_sign_attempts(recorded_sign_attempts)
+    print(f"Attempts: {recorded_sign_attempts}, Avg Conf: {average_confidence}, Grade: {calculated_grade}")
+
+    submission_id = None
+    existing_submission_res = supabase.table('submissions') \
+        .select('id') \
+        .eq('student_id', student_id) \
+        .eq('assignment_id', assignment_id) \
+        .maybe_single().execute()
+
+    if existing_submission_res and hasattr(existing_submission_res, 'error') and existing_submission_res.error:
+        raise PostgrestAPIError(existing_submission_res.error)
+
+    is_update = False
+    if existing_submission_res and existing_submission_res.data:
+        submission_id = existing_submission_res.data['id']
+        is_update = True
+        print(f"Found existing submission ID: {submission_id}. Preparing for update.")
+
+    data_for_db = {
+        'student_id': student_id,
+        'assignment_id': assignment_id,
+        'submission_content': form_notes,
+        'submitted_at': datetime.utcnow().isoformat(),
+        'grade': calculated_grade,
+        'average_confidence': average_confidence,
+        'status': 'Auto-Graded'
+    }
+
+    if is_update:
+        print(f"Updating submission ID {submission_id} with: {data_for_db}")
+        db_response = supabase.table('submissions').update(data_for_db).eq('id', submission_id).execute()
+    else:
+        print(f"Inserting new submission with: {data_for_db}")
+        db_response = supabase.table('submissions').insert(data_for_db, returning="representation").execute()
+
+    if db_response and hasattr(db_response, 'error') and db_response.error:
+        raise PostgrestAPIError(db_response.error)
+
+    if not is_update:
+        if db_response and db_response.data and len(db_response.data) > 0:
+            submission_id = db_response.data[0]['id']
+            print(f"New submission created with ID: {submission_id}")
+        else:
+            print("Insert operation did not return data. Attempting manual fetch of submission ID...")
+            fetch_res = supabase.table('submissions').select('id') \
+                .eq('student_id', student_id) \
+                .eq('assignment_id', assignment_id) \
+                .order('submitted_at', desc=True).limit(1).maybe_single().execute()
+            if fetch_res and hasattr(fetch_res, 'error') and fetch_res.error:
+                raise PostgrestAPIError(fetch_res.error)
+            if fetch_res and fetch_res.data:
+                submission_id = fetch_res.data['id']
+                print(f"Manually fetched submission ID: {submission_id}")
+            else:
+                messages.append(('Submission created, but failed to confirm submission ID. Please check assignments.', 'danger'))
+                return None, calculated_grade, messages
+
+    if recorded_sign_attempts:
+        attempts_to_insert = [{
+            'submission_id': submission_id,
+            'student_id': student_id,
+            'related_assignment_id': assignment_id,
+            'sign_recognized': att.get('sign'),
+            'confidence_score': att.get('confidence'),
+            'timestamp': datetime.utcnow().isoformat()
+        } for att in recorded_sign_attempts if isinstance(att, dict) and att.get('sign') is not None]
+
+        if attempts_to_insert:
+            # One insert for all attempts
+            sign_attempts_res = supabase.table('sign_attempts').insert(attempts_to_insert, returning="minimal").execute()
+            if sign_attempts_res and hasattr(sign_attempts_res, 'error') and sign_attempts_res.error:
+                messages.append((f"Submission saved, but error saving sign attempts: {sign_attempts_res.error.message}", 'warning'))
+            else:
+                print(f"Saved {len(attempts_to_insert)} sign attempts for submission {submission_id}")
+
+    # Record assignment completion in lesson progress
+    try:
+        if lesson_id is None:
+            assignment_lesson_res = supabase.table('assignments').select('lesson_id').eq('id', assignment_id).maybe_single().execute()
+            if assignment_lesson_res and assignment_lesson_res.data:
+                lesson_id = assignment_lesson_res.data.get('lesson_id')
+        if lesson_id:
+            # Record progress for assignment completion
+            supabase.table('lesson_progress').insert({
+                'student_id': student_id,
+                'lesson_id': lesson_id,
+                'content_item_index': None,  # Assignments don't have a specific content index
+                'progress_type': 'assignment_complete'
+            }).execute()
+            print(f"Recorded assignment completion progress for lesson {lesson_id}")
+    except Exception as prog_err:
+        print(f"Error recording assignment progress: {prog_err}")
+        # Don't fail the submission if progress recording fails
+
+    if calculated_grade >= 100.0:
+        badge_res = supabase.table('badges').select('id').eq('name', 'Perfect Score').maybe_single().execute()
+        if badge_res and badge_res.data and not (hasattr(badge_res, 'error') and badge_res.error):
+            badge_id = badge_res.data['id']
+            user_badge_res = supabase.table('user_badges').select('id').eq('user_id', student_id).eq('badge_id', badge_id).eq('submission_id', submission_id).maybe_single().execute()
+            if not (user_badge_res and user_badge_res.data) and not (hasattr(user_badge_res, 'error') and user_badge_res.error) :
+                badge_insert_res = supabase.table('user_badges').insert({'user_id': student_id, 'badge_id': badge_id, 'submission_id': submission_id, 'earned_at': datetime.utcnow().isoformat()}).execute()
+                if badge_insert_res and hasattr(badge_insert_res, 'error') and badge_insert_res.error:
+                     messages.append((f"Error awarding badge: {badge_insert_res.error.message}", 'warning'))
+                else:
+                     messages.append(('Congratulations! You earned the "Perfect Score" badge!', 'success'))
+
+    return submission_id, calculated_grade, messages
+
 @bp.route('/assignment/<int:assignment_id>/submit', methods=['POST'])
 @login_required
 @role_required('Student')
@@ -110,11 +251,6 @@ def submit_assignment_work(assignment_id):
     supabase: Client = current_app.supabase
     student_id = session.get('user_id')
     form_notes = request.form.get('submission_notes')
-    sign_attempts_json = request.form.get('sign_attempts_json')
-    
-    recorded_sign_attempts = []
-    average_confidence = 0.0
-    calculated_grade = 0.0
     current_assignment_id = int(assignment_id)
 
     if not student_id:
@@ -123,137 +259,37 @@ def submit_assignment_work(assignment_id):
         flash('Database connection error.', 'danger'); return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
 
     try:
-        assignment_res = supabase.table('assignments').select('due_date').eq('id', current_assignment_id).single().execute()
-        if not (assignment_res and assignment_res.data):
-            flash('Assignment not found.', 'danger')
-            return redirect(url_for('student.student_assignment'))
-        
-        due_date_str = assignment_res.data.get('due_date')
-        if due_date_str:
-            due_date = datetime.fromisoformat(due_date_str)
-            if datetime.now(timezone.utc) > due_date:
-                flash('This assignment is past the due date and can no longer be submitted.', 'danger')
-                return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
+        assignment, closed_reason = _load_open_assignment(supabase, current_assignment_id)
     except Exception as e:
         flash(f"Could not verify assignment due date: {e}", 'danger')
         return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
+    if assignment is None:
+        flash(closed_reason, 'danger')
+        return redirect(url_for('student.student_assignment'))
+    if closed_reason:
+        flash(closed_reason, 'danger')
+        return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
 
-    if sign_attempts_json:
-        try:
-            recorded_sign_attempts = json.loads(sign_attempts_json)
-            if recorded_sign_attempts:
-                valid_attempts = [attempt for attempt in recorded_sign_attempts if isinstance(attempt, dict) and attempt.get('confidence') is not None]
-                if valid_attempts:
-                    total_confidence = sum(attempt.get('confidence', 0.0) for attempt in valid_attempts)
-                    average_confidence = total_confidence / len(valid_attempts)
-                    calculated_grade = round(average_confidence * 100, 2)
-            print(f"Attempts: {recorded_sign_attempts}, Avg Conf: {average_confidence}, Grade: {calculated_grade}")
-        except Exception as e:
-            flash('Error processing sign attempts data.', 'warning'); print(f"Error parsing sign_attempts_json: {e}")
+    # Attempts come from the server-side log of the student's recognition session, not from the browser
+    recognition_session = sign_logic.get_session(student_id)
+    recorded_sign_attempts = recognition_session.attempts_for(current_assignment_id)
+    if not recorded_sign_attempts:
+        # Nothing to grade: refuse instead of saving a 0 (the run ends on logout, a server restart or after inactivity)
+        if not recognition_session.has_practice_run(current_assignment_id):
+            flash('No practice run was found for this assignment. It ends when you log out, after a while without '
+                  'activity or when the server restarts. Click "Start Camera & Practice" and sign again before submitting.', 'warning')
+        else:
+            flash('No signs have been recorded in this practice run yet. Hold each sign until it is added to your notes, '
+                  'then submit.', 'warning')
+        return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
 
-    submission_id = None
     try:
-        existing_submission_res = supabase.table('submissions') \
-            .select('id') \
-            .eq('student_id', student_id) \
-            .eq('assignment_id', current_assignment_id) \
-            .maybe_single().execute()
-
-        if existing_submission_res and hasattr(existing_submission_res, 'error') and existing_submission_res.error:
-            raise PostgrestAPIError(existing_submission_res.error)
-        
-        is_update = False
-        if existing_submission_res and existing_submission_res.data:
-            submission_id = existing_submission_res.data['id']
-            is_update = True
-            print(f"Found existing submission ID: {submission_id}. Preparing for update.")
-
-        data_for_db = {
-            'student_id': student_id,
-            'assignment_id': current_assignment_id,
-            'submission_content': form_notes,
-            'submitted_at': datetime.utcnow().isoformat(),
-            'grade': calculated_grade,
-            'average_confidence': average_confidence,
-            'status': 'Auto-Graded'
-        }
-
-        if is_update:
-            print(f"Updating submission ID {submission_id} with: {data_for_db}")
-            db_response = supabase.table('submissions').update(data_for_db).eq('id', submission_id).execute()
-        else: 
-            print(f"Inserting new submission with: {data_for_db}")
-            db_response = supabase.table('submissions').insert(data_for_db, returning="representation").execute()
-
-        if db_response and hasattr(db_response, 'error') and db_response.error: 
-            raise PostgrestAPIError(db_response.error)
-
-        if not is_update: 
-            if db_response and db_response.data and len(db_response.data) > 0: 
-                submission_id = db_response.data[0]['id']
-                print(f"New submission created with ID: {submission_id}")
-            else: 
-                print("Insert operation did not return data. Attempting manual fetch of submission ID...")
-                fetch_res = supabase.table('submissions').select('id') \
-                    .eq('student_id', student_id) \
-                    .eq('assignment_id', current_assignment_id) \
-                    .order('submitted_at', desc=True).limit(1).maybe_single().execute()
-                if fetch_res and hasattr(fetch_res, 'error') and fetch_res.error:
-                    raise PostgrestAPIError(fetch_res.error)
-                if fetch_res and fetch_res.data:
-                    submission_id = fetch_res.data['id']
-                    print(f"Manually fetched submission ID: {submission_id}")
-                else:
-                    flash('Submission created, but failed to confirm submission ID. Please check assignments.', 'danger')
-                    return redirect(url_for('student.student_assignment'))
-        
+        submission_id, _, messages = save_auto_graded_submission(supabase, student_id, current_assignment_id, form_notes,
+                                                                 recorded_sign_attempts, assignment.get('lesson_id'))
+        for message, category in messages:
+            flash(message, category)
         if submission_id:
-            if recorded_sign_attempts:
-                attempts_to_insert = [{
-                    'submission_id': submission_id, 
-                    'student_id': student_id,
-                    'related_assignment_id': current_assignment_id, 
-                    'sign_recognized': att.get('sign'),
-                    'confidence_score': att.get('confidence'), 
-                    'timestamp': datetime.utcnow().isoformat() 
-                } for att in recorded_sign_attempts if isinstance(att, dict) and att.get('sign') is not None]
-                
-                if attempts_to_insert:
-                    sign_attempts_res = supabase.table('sign_attempts').insert(attempts_to_insert, returning="minimal").execute()
-                    if sign_attempts_res and hasattr(sign_attempts_res, 'error') and sign_attempts_res.error: 
-                        flash(f"Submission saved, but error saving sign attempts: {sign_attempts_res.error.message}", 'warning')
-                    else:
-                        print(f"Saved {len(attempts_to_insert)} sign attempts for submission {submission_id}")
-            
-            # Record assignment completion in lesson progress
-            try:
-                assignment_lesson_res = supabase.table('assignments').select('lesson_id').eq('id', current_assignment_id).maybe_single().execute()
-                if assignment_lesson_res and assignment_lesson_res.data and assignment_lesson_res.data.get('lesson_id'):
-                    lesson_id = assignment_lesson_res.data['lesson_id']
-                    # Record progress for assignment completion
-                    supabase.table('lesson_progress').insert({
-                        'student_id': student_id,
-                        'lesson_id': lesson_id,
-                        'content_item_index': None,  # Assignments don't have a specific content index
-                        'progress_type': 'assignment_complete'
-                    }).execute()
-                    print(f"Recorded assignment completion progress for lesson {lesson_id}")
-            except Exception as prog_err:
-                print(f"Error recording assignment progress: {prog_err}")
-                # Don't fail the submission if progress recording fails
-            
-            if calculated_grade >= 100.0: 
-                badge_res = supabase.table('badges').select('id').eq('name', 'Perfect Score').maybe_single().execute()
-                if badge_res and badge_res.data and not (hasattr(badge_res, 'error') and badge_res.error):
-                    badge_id = badge_res.data['id']
-                    user_badge_res = supabase.table('user_badges').select('id').eq('user_id', student_id).eq('badge_id', badge_id).eq('submission_id', submission_id).maybe_single().execute()
-                    if not (user_badge_res and user_badge_res.data) and not (hasattr(user_badge_res, 'error') and user_badge_res.error) :
-                        badge_insert_res = supabase.table('user_badges').insert({'user_id': student_id, 'badge_id': badge_id, 'submission_id': submission_id, 'earned_at': datetime.utcnow().isoformat()}).execute()
-                        if badge_insert_res and hasattr(badge_insert_res, 'error') and badge_insert_res.error: 
-                             flash(f"Error awarding badge: {badge_insert_res.error.message}", 'warning')
-                        else:
-                             flash('Congratulations! You earned the "Perfect Score" badge!', 'success')
-            
+            recognition_session.mark_attempts_submitted(current_assignment_id, recorded_sign_attempts)
             flash('Assignment submitted and auto-graded successfully!', 'success')
             return redirect(url_for('student.view_submission_details', submission_id=submission_id))
         else: 
@@ -269,6 +305,117 @@ def submit_assignment_work(assignment_id):
     
     return redirect(url_for('student.view_assignment_student', assignment_id=current_assignment_id))
 
+@bp.route('/assignment/<int:assignment_id>/practice', methods=['POST'])
+@login_required
+@role_required('Student')
+def start_assignment_practice(assignment_id):
+    """Starts a practice run: signs the student holds from now on are logged as attempts for this assignment.
+
+    With word_mode=1 the student fingerspells whole words instead: the vocabulary is the assignment's
+    target_words if it has them, else the words of its lesson's items, and each decoded word is an attempt.
+    """
+    recognition_session = sign_logic.get_session(session.get('user_id'))
+    words = []
+    if request.form.get('word_mode') == '1':
+        try:
+            words = _assignment_vocabulary(current_app.supabase, int(assignment_id))
+        except Exception as e:
+            print(f"Could not load the vocabulary of assignment {assignment_id}: {e}")
+    first_seq = recognition_session.start_attempts(int(assignment_id), words, sign_logic.get_available_signs() if words else None)
+    return jsonify({'assignment_id': int(assignment_id), 'first_attempt_seq': first_seq,
+                    'hold_seconds': recognition_session.attempt_detector.hold_seconds,
+                    'word_mode': recognition_session.word_decoder is not None,
+                    'vocabulary': recognition_session.word_decoder.trie.words if recognition_session.word_decoder else []})
+
+@bp.route('/assignment/<int:assignment_id>/attempts')
+@login_required
+@role_required('Student')
+def assignment_practice_attempts(assignment_id):
+    """The attempts of the current practice run (what a submission is graded from), oldest first."""
+    recognition_session = sign_logic.get_session(session.get('user_id'))
+    return jsonify({'assignment_id': int(assignment_id), 'attempts': recognition_session.attempts_for(int(assignment_id))})
+
+def _assignment_vocabulary(supabase, assignment_id):
+    """Words a student may spell in an assignment: its target_words, or the names of its lesson's content items."""
+    assignment_res = supabase.table('assignments').select('*, lessons(content)').eq('id', assignment_id).maybe_single().execute()
+    if not (assignment_res and assignment_res.data):
+        return []
+    assignment = assignment_res.data
+    if assignment.get('target_words'):
+        return vocabulary_words([assignment['target_words']])
+    lesson = assignment.get('lessons') or {}
+    return vocabulary_words([item.get('name') for item in lesson.get('content') or [] if isinstance(item, dict)])
+
+@bp.route('/assignment/<int:assignment_id>/submit_video', methods=['POST'])
+@login_required
+@role_required('Student')
+def submit_assignment_video(assignment_id):
+    """Accepts a recorded practice video and answers at once with a job id; the video is recognized in the background.
+
+    The job decodes the video in the recognition process pool (see app/video_recognition.py), derives
+    sign attempts with the live feed's stabilizer and saves them as the student's submission.
+    Poll the returned status_url for progress and, once done, the submission.
+    """
+    supabase: Client = current_app.supabase
+    student_id = session.get('user_id')
+    current_assignment_id = int(assignment_id)
+    if not supabase:
+        return jsonify({'error': 'Database connection error.'}), 503
+    if request.content_length and request.content_length > video_recognition.VIDEO_MAX_BYTES:
+        return jsonify({'error': f'The video is larger than {video_recognition.VIDEO_MAX_BYTES // (1024 * 1024)} MB.'}), 413
+    video = request.files.get('video')
+    if video is None or not video.filename:
+        return jsonify({'error': 'No video file uploaded.'}), 400
+
+    try:
+        assignment, closed_reason = _load_open_assignment(supabase, current_assignment_id)
+    except Exception as e:
+        print(f"Error verifying assignment {current_assignment_id} for video upload: {e}")
+        return jsonify({'error': f'Could not verify assignment due date: {e}'}), 500
+    if assignment is None:
+        return jsonify({'error': closed_reason}), 404
+    if closed_reason:
+        return jsonify({'error': closed_reason}), 403
+
+    extension = os.path.splitext(video.filename)[1].lower()[:8] or '.video'
+    fd, video_path = tempfile.mkstemp(prefix='handspoken-upload-', suffix=extension, dir=video_recognition.VIDEO_UPLOAD_DIR)
+    os.close(fd)
+    video.save(video_path)
+    form_notes = request.form.get('submission_notes')
+    lesson_id = assignment.get('lesson_id')
+
+    def save_submission(job, attempts):
+        signs = " ".join(attempt['sign'] for attempt in attempts)
+        notes = "\n".join(part for part in (form_notes, f"Recognized from uploaded video: {signs}" if signs else None) if part)
+        submission_id, grade, messages = save_auto_graded_submission(supabase, student_id, current_assignment_id, notes, attempts, lesson_id)
+        if submission_id is None:
+            raise RuntimeError(messages[0][0] if messages else 'Failed to obtain submission ID after operation.')
+        return {'submission_id': submission_id, 'grade': grade, 'messages': [message for message, _ in messages]}
+
+    job = video_recognition.VideoRecognitionJob(student_id, video_path, save_submission,
+                                                mirror=request.form.get('mirror', '1') != '0',
+                                                context={'assignment_id': current_assignment_id})
+    try:
+        video_recognition.submit_video_job(job, sign_logic.MODEL_REGISTRY_DIR, sign_logic.MODEL_VARIANT)
+    except video_recognition.VideoRejectedError as e:
+        os.remove(video_path)
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '30'}
+    status_url = url_for('student.video_job_status', job_id=job.id)
+    return jsonify(dict(job.snapshot(), status_url=status_url)), 202, {'Location': status_url}
+
+@bp.route('/video_jobs/<job_id>')
+@login_required
+@role_required('Student')
+def video_job_status(job_id):
+    """Progress of one of the student's uploaded-video jobs; includes submission_url once the submission is saved."""
+    job = video_recognition.get_job(job_id)
+    if job is None or job.user_id != session.get('user_id'):
+        return jsonify({'error': 'Unknown video job.'}), 404
+    status = job.snapshot()
+    if status.get('submission_id'):
+        status['submission_url'] = url_for('student.view_submission_details', submission_id=status['submission_id'])
+    return jsonify(status)
+
 @bp.route('/submission/<int:submission_id>')
 @login_required
 @role_required('Student')
@@ -1,17 +1,199 @@
-from flask import Response
+from flask import Response, session, request, jsonify
+import json
+import threading
 from . import bp  # Use . to import bp from the current package (student)
+from app import sock
 from app.utils import login_required, role_required
-from app.sign_logic import generate_frames, get_stable_prediction
+from app import sign_logic
+from app.sign_logic import generate_frames, get_stable_prediction, get_session, submit_browser_frame, process_pending_frames, recognize_landmarks, get_available_signs, is_ready, wait_for_prediction, generate_prediction_events
+from app.frame_ingest import make_pending_frame, FrameDecodeError
+from app.mjpeg_encoding import StreamProfile
+from app.landmark_wire import decode_landmark_payload, encode_prediction_records, LandmarkPayloadError, PREDICTION_RECORD_FORMAT
+
+def _warming_up_response():
+    """Answers immediately while the background warm-up is still loading the model, instead of blocking."""
+    return jsonify({'status': sign_logic.warm_up_state, 'error': 'Recognition is warming up, retry shortly.'}), 503, {'Retry-After': '1'}
+
+@bp.context_processor
+def inject_capture_mode():
+    """browser_capture for the student templates: capture in the browser and post frames to recognize_frame instead of showing video_feed."""
+    return {'browser_capture': sign_logic.uses_browser_capture()}
 
 @bp.route('/video_feed')
 @login_required
 @role_required('Student')
 def video_feed():
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    """MJPEG feed; ?quality=, ?scale= and ?fps= override the stream defaults (see mjpeg_encoding.py)."""
+    recognition_session = get_session(session.get('user_id'))
+    stream_profile = StreamProfile.from_args(request.args)
+    return Response(generate_frames(recognition_session, stream_profile), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @bp.route('/get_prediction')
 @login_required
 @role_required('Student')
 def get_prediction():
-    prediction_data = get_stable_prediction() 
+    recognition_session = get_session(session.get('user_id'))
+    prediction_data = get_stable_prediction(recognition_session)
     return Response(prediction_data, mimetype='application/json')
+
+@bp.route('/prediction_events')
+@login_required
+@role_required('Student')
+def prediction_events():
+    """Server-Sent Events: one 'prediction' event per stable-prediction change, replacing /get_prediction polling."""
+    last_seq = request.headers.get('Last-Event-ID', -1, type=int) # sent by EventSource when it reconnects
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'} # keep proxies from buffering the stream
+    return Response(generate_prediction_events(session.get('user_id'), last_seq), mimetype='text/event-stream', headers=headers)
+
+@bp.route('/wait_prediction')
+@login_required
+@role_required('Student')
+def wait_prediction():
+    """Long-poll fallback: ?after=<seq> blocks until the prediction changes (200) or ?timeout= seconds pass (204)."""
+    recognition_session = get_session(session.get('user_id'))
+    after_seq = request.args.get('after', -1, type=int)
+    timeout = min(max(request.args.get('timeout', sign_logic.PREDICTION_WAIT_TIMEOUT, type=float), 0.0), sign_logic.PREDICTION_WAIT_TIMEOUT)
+    prediction = wait_for_prediction(recognition_session, after_seq, timeout)
+    if prediction is None:
+        return '', 204
+    return jsonify(prediction)
+
+@bp.route('/practice_target', methods=['POST'])
+@login_required
+@role_required('Student')
+def set_practice_target():
+    """Sets the sign practiced on the dashboard (form field 'sign'; empty stops). Later predictions carry finger_feedback.
+
+    Answers with the target and finger_feedback_enabled (whether feedback is computed for it: the serving model
+    version has statistics for the sign and FINGER_FEEDBACK is on); finger_feedback itself is only ever the result
+    dict or None, as in the predictions.
+    """
+    sign = request.form.get('sign', '').strip()
+    if sign and sign not in get_available_signs():
+        return jsonify({'error': f"Unknown sign '{sign}'."}), 400
+    recognition_session = get_session(session.get('user_id'))
+    finger_feedback_enabled = recognition_session.set_practice_target(sign, sign_logic.finger_stats_for)
+    return jsonify({'target': recognition_session.practice_target, 'finger_feedback_enabled': finger_feedback_enabled})
+
+@bp.route('/recognize_frame', methods=['POST'])
+@login_required
+@role_required('Student')
+def recognize_frame():
+    """Accepts one browser-captured frame (JPEG/PNG/WebP body, a multipart 'frame' file, or raw RGBA/BGR bytes)."""
+    if not is_ready():
+        return _warming_up_response()
+    recognition_session = get_session(session.get('user_id'))
+
+    uploaded = request.files.get('frame')
+    if uploaded is not None:
+        payload, content_type = uploaded.read(), uploaded.mimetype
+    else:
+        payload, content_type = request.get_data(cache=False), request.mimetype
+
+    try:
+        pending_frame = make_pending_frame(
+            payload, content_type,
+            width=request.args.get('width', type=int),
+            height=request.args.get('height', type=int),
+            channels=request.args.get('channels', type=int),
+            mirror=request.args.get('mirror', '1') != '0')
+    except FrameDecodeError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(submit_browser_frame(recognition_session, pending_frame))
+
+@bp.route('/recognize_landmarks', methods=['POST'])
+@login_required
+@role_required('Student')
+def recognize_landmarks_route():
+    """Classifies pre-extracted 21-point hand landmarks sent as packed float32 (see app.landmark_wire).
+
+    One hand updates the student's stable prediction; N hands are scored as a batch.
+    Batch results are JSON by default, or packed records with Accept: application/octet-stream.
+    """
+    try:
+        points = decode_landmark_payload(request.get_data(cache=False), dims=request.args.get('dims', 2, type=int))
+    except LandmarkPayloadError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not is_ready():
+        return _warming_up_response()
+
+    recognition_session = get_session(session.get('user_id'))
+    result = recognize_landmarks(recognition_session, points)
+    if len(points) == 1:
+        return jsonify(result)
+
+    class_indices, confidences = result['class_indices'], result['confidences']
+    if request.accept_mimetypes.best_match(['application/json', 'application/octet-stream']) == 'application/octet-stream':
+        return Response(encode_prediction_records(class_indices, confidences),
+                        mimetype='application/octet-stream',
+                        headers={'X-Prediction-Format': PREDICTION_RECORD_FORMAT, 'X-Model-Version': str(result['model_version'])})
+
+    class_names = result['class_names'] # of the model that scored the batch, even if another was swapped in since
+    return jsonify({'model_version': result['model_version'], 'predictions': [
+        {'sign': class_names[class_index], 'class_index': int(class_index), 'confidence': float(confidence)}
+        for class_index, confidence in zip(class_indices, confidences)
+    ]})
+
+if sock is not None:
+    from simple_websocket import ConnectionClosed
+
+    @sock.route('/recognize_ws', bp=bp)
+    def recognize_ws(ws):
+        """Streaming variant of recognize_frame.
+
+        Binary messages are frames; a text message is a JSON object that sets the format of
+        the frames that follow ({"content_type", "width", "height", "channels", "mirror"}).
+        A reader thread queues frames while this thread processes the newest one, so frames
+        sent faster than we can process are dropped instead of buffered.
+        """
+        if session.get('user_role') != 'Student':
+            ws.close(reason=1008, message='Student login required.')
+            return
+        recognition_session = get_session(session.get('user_id'))
+        frame_format = {'content_type': 'image/jpeg'}
+        frame_ready = threading.Event()
+        closed = threading.Event()
+
+        def read_frames():
+            while not closed.is_set():
+                try:
+                    message = ws.receive()
+                except ConnectionClosed:
+                    break
+                if message is None:
+                    continue
+                if isinstance(message, str):
+                    try:
+                        frame_format.update(json.loads(message))
+                    except (ValueError, TypeError) as e:
+                        print(f"Ignoring malformed frame format message: {e}")
+                    continue
+                try:
+                    recognition_session.frame_queue.put(make_pending_frame(
+                        message, frame_format.get('content_type'),
+                        width=frame_format.get('width'), height=frame_format.get('height'),
+                        channels=frame_format.get('channels'), mirror=frame_format.get('mirror', True)))
+                    frame_ready.set()
+                except FrameDecodeError as e:
+                    print(f"Rejected WebSocket frame (user {recognition_session.user_id}): {e}")
+            closed.set()
+            frame_ready.set()
+
+        reader = threading.Thread(target=read_frames, daemon=True)
+        reader.start()
+        try:
+            while not closed.is_set():
+                if not frame_ready.wait(timeout=30):
+                    continue
+                frame_ready.clear()
+                if closed.is_set():
+                    break
+                result = process_pending_frames(recognition_session)
+                if result.get('processed') or 'error' in result:
+                    ws.send(json.dumps(result))
+        except ConnectionClosed:
+            pass
+        finally:
+            closed.set()
@@ -0,0 +1,211 @@
+import struct
+
+import numpy as np
+
+# Minimal read-only view of a .tflite flatbuffer (schema: tensorflow/lite/schema/schema.fbs).
+# Only the tables needed to pull tensors and operators out of a model are decoded.
+
+FILE_IDENTIFIER = b'TFL3'
+
+# Builtin operator codes
+FULLY_CONNECTED = 9
+DEQUANTIZE = 6
+RELU = 19
+RESHAPE = 22
+SOFTMAX = 25
+RELU6 = 21
+QUANTIZE = 114
+
+# ActivationFunctionType
+ACTIVATION_NONE = 0
+ACTIVATION_RELU = 1
+ACTIVATION_RELU6 = 3
+
+# TensorType -> NumPy dtype (little-endian, as stored in the buffer)
+TENSOR_DTYPES = {
+    0: np.dtype('<f4'), # FLOAT32
+    1: np.dtype('<f2'), # FLOAT16
+    2: np.dtype('<i4'), # INT32
+    3: np.dtype('u1'),  # UINT8
+    4: np.dtype('<i8'), # INT64
+    7: np.dtype('<i2'), # INT16
+    9: np.dtype('i1'),  # INT8
+}
+
+# Field slots (declaration order in schema.fbs)
+_MODEL_OPERATOR_CODES, _MODEL_SUBGRAPHS, _MODEL_BUFFERS = 1, 2, 4
+_SUBGRAPH_TENSORS, _SUBGRAPH_INPUTS, _SUBGRAPH_OUTPUTS, _SUBGRAPH_OPERATORS = 0, 1, 2, 3
+_TENSOR_SHAPE, _TENSOR_TYPE, _TENSOR_BUFFER, _TENSOR_NAME, _TENSOR_QUANTIZATION = 0, 1, 2, 3, 4
+_QUANT_SCALE, _QUANT_ZERO_POINT, _QUANT_DIMENSION = 2, 3, 6
+_OPERATOR_OPCODE_INDEX, _OPERATOR_INPUTS, _OPERATOR_OUTPUTS, _OPERATOR_OPTIONS = 0, 1, 2, 4
+_OPCODE_DEPRECATED_BUILTIN, _OPCODE_BUILTIN = 0, 3
+_BUFFER_DATA, _BUFFER_OFFSET, _BUFFER_SIZE = 0, 1, 2
+
+
+class TFLiteFormatError(ValueError):
+    """Raised when a file is not a flatbuffer model this reader understands."""
+
+
+class _Table:
+    """A flatbuffer table: position of its data plus its vtable, read lazily from the shared buffer."""
+
+    __slots__ = ('buf', 'pos', 'vtable', 'vtable_size')
+
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+        self.vtable = pos - struct.unpack_from('<i', buf, pos)[0]
+        self.vtable_size = struct.unpack_from('<H', buf, self.vtable)[0]
+
+    def _field_pos(self, slot):
+        entry = 4 + 2 * slot
+        if entry >= self.vtable_size:
+            return 0
+        offset = struct.unpack_from('<H', self.buf, self.vtable + entry)[0]
+        return self.pos + offset if offset else 0
+
+    def scalar(self, slot, fmt, default=0):
+        pos = self._field_pos(slot)
+        return struct.unpack_from(fmt, self.buf, pos)[0] if pos else default
+
+    def _indirect(self, slot):
+        pos = self._field_pos(slot)
+        return pos + struct.unpack_from('<I', self.buf, pos)[0] if pos else 0
+
+    def table(self, slot):
+        pos = self._indirect(slot)
+        return _Table(self.buf, pos) if pos else None
+
+    def string(self, slot):
+        pos = self._indirect(slot)
+        if not pos:
+            return ''
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return bytes(self.buf[pos + 4:pos + 4 + length]).decode('utf-8', 'replace')
+
+    def vector(self, slot, dtype):
+        """Returns a scalar vector as a NumPy view (no copy), empty if the field is absent."""
+        pos = self._indirect(slot)
+        if not pos:
+            return np.empty(0, dtype=dtype)
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return np.frombuffer(self.buf, dtype=dtype, count=length, offset=pos + 4)
+
+    def tables(self, slot):
+        pos = self._indirect(slot)
+        if not pos:
+            return []
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        elements = []
+        for i in range(length):
+            element = pos + 4 + 4 * i
+            elements.append(_Table(self.buf, element + struct.unpack_from('<I', self.buf, element)[0]))
+        return elements
+
+
+class Tensor:
+    """One subgraph tensor. data holds the constant values (or None for activations)."""
+
+    __slots__ = ('index', 'name', 'shape', 'dtype', 'data', 'scale', 'zero_point', 'quantized_dimension')
+
+    def __init__(self, index, name, shape, dtype, data, scale, zero_point, quantized_dimension):
+        self.index = index
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.data = data
+        self.scale = scale
+        self.zero_point = zero_point
+        self.quantized_dimension = quantized_dimension
+
+    def dequantized(self):
+        """Constant values as float32, applying per-tensor or per-channel (scale, zero_point) if present."""
+        if self.data is None:
+            raise TFLiteFormatError(f"Tensor '{self.name}' has no constant data.")
+        values = self.data.astype(np.float32)
+        if self.scale is None or self.dtype.kind == 'f':
+            return values
+        broadcast_shape = [1] * values.ndim
+        if len(self.scale) > 1:
+            broadcast_shape[self.quantized_dimension] = -1
+        scale = self.scale.astype(np.float32).reshape(broadcast_shape)
+        zero_point = self.zero_point.astype(np.float32).reshape(broadcast_shape) if len(self.zero_point) else np.float32(0)
+        return (values - zero_point) * scale
+
+
+class Operator:
+    __slots__ = ('opcode', 'inputs', 'outputs', 'options')
+
+    def __init__(self, opcode, inputs, outputs, options):
+        self.opcode = opcode
+        self.inputs = inputs
+        self.outputs = outputs
+        self.options = options # builtin options table (or None); read with scalar()
+
+
+class TFLiteModel:
+    """Tensors and operators of the first subgraph of a .tflite file."""
+
+    def __init__(self, tensors, operators, inputs, outputs):
+        self.tensors = tensors
+        self.operators = operators
+        self.inputs = inputs
+        self.outputs = outputs
+
+
+def read_model(model_path):
+    """Parses a .tflite file into a TFLiteModel. Constant tensor data are views into the file bytes."""
+    with open(model_path, 'rb') as f:
+        buf = f.read()
+    if len(buf) < 8 or buf[4:8] != FILE_IDENTIFIER:
+        raise TFLiteFormatError(f"{model_path} is not a TFLite flatbuffer model.")
+
+    model = _Table(buf, struct.unpack_from('<I', buf, 0)[0])
+    subgraphs = model.tables(_MODEL_SUBGRAPHS)
+    if len(subgraphs) != 1:
+        raise TFLiteFormatError(f"Expected one subgraph, found {len(subgraphs)}.")
+    subgraph = subgraphs[0]
+
+    opcodes = [max(code.scalar(_OPCODE_DEPRECATED_BUILTIN, '<b'), code.scalar(_OPCODE_BUILTIN, '<i'))
+               for code in model.tables(_MODEL_OPERATOR_CODES)]
+
+    buffers = []
+    for buffer in model.tables(_MODEL_BUFFERS):
+        offset = buffer.scalar(_BUFFER_OFFSET, '<Q')
+        if offset > 1: # Large models keep buffer data after the flatbuffer itself
+            buffers.append(np.frombuffer(buf, dtype=np.uint8, count=buffer.scalar(_BUFFER_SIZE, '<Q'), offset=offset))
+        else:
+            buffers.append(buffer.vector(_BUFFER_DATA, np.uint8))
+
+    tensors = []
+    for index, tensor in enumerate(subgraph.tables(_SUBGRAPH_TENSORS)):
+        type_code = tensor.scalar(_TENSOR_TYPE, '<b')
+        if type_code not in TENSOR_DTYPES:
+            raise TFLiteFormatError(f"Unsupported tensor type {type_code}.")
+        dtype = TENSOR_DTYPES[type_code]
+        shape = tuple(int(d) for d in tensor.vector(_TENSOR_SHAPE, '<i4'))
+        raw = buffers[tensor.scalar(_TENSOR_BUFFER, '<I')]
+        data = raw.view(dtype).reshape(shape) if len(raw) else None
+
+        scale = zero_point = None
+        quantized_dimension = 0
+        quantization = tensor.table(_TENSOR_QUANTIZATION)
+        if quantization is not None:
+            scale = quantization.vector(_QUANT_SCALE, '<f4')
+            zero_point = quantization.vector(_QUANT_ZERO_POINT, '<i8')
+            quantized_dimension = quantization.scalar(_QUANT_DIMENSION, '<i')
+            if not len(scale):
+                scale = zero_point = None
+        tensors.append(Tensor(index, tensor.string(_TENSOR_NAME), shape, dtype, data, scale, zero_point, quantized_dimension))
+
+    operators = []
+    for operator in subgraph.tables(_SUBGRAPH_OPERATORS):
+        operators.append(Operator(
+            opcodes[operator.scalar(_OPERATOR_OPCODE_INDEX, '<I')],
+            [int(i) for i in operator.vector(_OPERATOR_INPUTS, '<i4')],
+            [int(i) for i in operator.vector(_OPERATOR_OUTPUTS, '<i4')],
+            operator.table(_OPERATOR_OPTIONS)))
+
+    return TFLiteModel(tensors, operators,
+                       [int(i) for i in subgraph.vector(_SUBGRAPH_INPUTS, '<i4')],
+                       [int(i) for i in subgraph.vector(_SUBGRAPH_OUTPUTS, '<i4')])
@@ -0,0 +1,271 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import tempfile
+import threading
+import time
+import uuid
+import os
+
+import cv2
+import numpy as np
+
+from .landmark_normalization import landmarks_to_array, normalize_landmarks, NUM_LANDMARKS
+from .model_metadata import load_model_metadata
+from .model_registry import resolve_model
+from .recognition_session import RecognitionSession
+from .prediction_stabilizer import MIN_PREDICTION_CONFIDENCE
+
+# --- Video Recognition Config ---
+VIDEO_FRAME_STRIDE = int(os.getenv('VIDEO_FRAME_STRIDE', 2)) # Run recognition on every Nth decoded frame (2 turns a 30 fps recording into 15 fps, as the live feed)
+VIDEO_WORKERS = int(os.getenv('VIDEO_WORKERS', 0)) or os.cpu_count() or 1 # Processes decoding and recognizing uploaded videos, shared by all jobs
+VIDEO_CHUNK_SECONDS = 4 # Length of the video slice one pool task decodes; slices of one video run in parallel
+VIDEO_MAX_BYTES = 50 * 1024 * 1024 # Largest accepted upload
+VIDEO_MAX_SECONDS = 180 # Longest accepted recording
+VIDEO_MAX_ACTIVE_JOBS = int(os.getenv('VIDEO_MAX_ACTIVE_JOBS', 8)) # Uploads queued or processing at once; more are rejected until one finishes
+VIDEO_JOB_TTL = 3600 # Seconds a finished job's status stays available
+VIDEO_UPLOAD_DIR = os.getenv('VIDEO_UPLOAD_DIR') or tempfile.gettempdir() # Uploads are deleted once their job finishes
+# --------------------------------
+
+
+class VideoRejectedError(ValueError):
+    """Raised when an upload cannot be processed (unreadable, too long, or too many jobs running)."""
+
+
+def probe_video(path):
+    """Returns (frame_count, fps) of a video file, or raises VideoRejectedError."""
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            raise VideoRejectedError("The file could not be read as a video.")
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = capture.get(cv2.CAP_PROP_FPS)
+    finally:
+        capture.release()
+    if frame_count <= 0 or not fps or fps <= 0 or fps > 240:
+        raise VideoRejectedError("The video has no readable frames or frame rate.")
+    if frame_count / fps > VIDEO_MAX_SECONDS:
+        raise VideoRejectedError(f"The video is {frame_count / fps:.0f}s long; the limit is {VIDEO_MAX_SECONDS}s.")
+    return frame_count, fps
+
+
+# --- Pool Worker Side ---
+# Each worker process keeps its model backends; MediaPipe is created per slice so tracking never spans two slices.
+
+_worker_backends = {}
+
+
+def _worker_backend(model_path):
+    from .inference_backend import create_backend
+    backend = _worker_backends.get(model_path)
+    if backend is None:
+        backend = _worker_backends[model_path] = create_backend(model_path)
+    return backend
+
+
+def recognize_video_slice(video_path, start_frame, stop_frame, stride, model_path, mirror=True):
+    """Pool task: decodes frames [start_frame, stop_frame) and runs MediaPipe on every stride-th one.
+
+    Returns (sampled frame indices, (N, num_classes) float32 probabilities with NaN rows for frames
+    without a hand). All hands of the slice go through the model as one batch.
+    """
+    import mediapipe
+    capture = cv2.VideoCapture(video_path)
+    hands = mediapipe.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                            min_detection_confidence=0.6, min_tracking_confidence=0.6)
+    indices, hand_rows = [], []
+    points = np.empty((stop_frame - start_frame, NUM_LANDMARKS, 2), dtype=np.float32)
+    try:
+        if start_frame:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        for frame_index in range(start_frame, stop_frame):
+            if (frame_index - start_frame) % stride:
+                if not capture.grab(): # skipped frames are demuxed but never converted
+                    break
+                continue
+            success, image = capture.read()
+            if not success:
+                break
+            image_rgb = cv2.cvtColor(cv2.flip(image, 1) if mirror else image, cv2.COLOR_BGR2RGB)
+            results = hands.process(image_rgb)
+            if results.multi_hand_landmarks and len(results.multi_hand_landmarks[0].landmark) == NUM_LANDMARKS:
+                landmarks_to_array(results.multi_hand_landmarks[0], out=points[len(hand_rows)])
+                hand_rows.append(len(indices))
+            indices.append(frame_index)
+    finally:
+        hands.close()
+        capture.release()
+
+    backend = _worker_backend(model_path)
+    probabilities = np.full((len(indices), backend.num_classes), np.nan, dtype=np.float32)
+    if hand_rows:
+        probabilities[hand_rows] = backend.predict(normalize_landmarks(points[:len(hand_rows)]))
+    return np.asarray(indices, dtype=np.int64), probabilities
+
+
+# --- Jobs ---
+
+class VideoRecognitionJob:
+    """One uploaded video: decoded and recognized in the pool, then turned into sign attempts and saved.
+
+    on_complete(job, attempts) runs on the job's thread once the attempts are known (it writes the
+    submission) and returns a dict merged into the job's result.
+    """
+
+    def __init__(self, user_id, video_path, on_complete, stride=VIDEO_FRAME_STRIDE, mirror=True, context=None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.video_path = video_path
+        self.on_complete = on_complete
+        self.stride = max(1, int(stride))
+        self.mirror = mirror
+        self.context = context or {} # e.g. the assignment id, for the status endpoint
+        self.state = "queued" # queued -> processing -> saving -> done, or failed
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.slices_total = 0
+        self.slices_done = 0
+        self.frames_sampled = 0
+        self.frames_with_hand = 0
+        self.video_seconds = None
+        self.model_version = None
+        self.attempts = []
+        self.result = {}
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed")
+
+    def snapshot(self):
+        return {
+            'job_id': self.id,
+            'state': self.state,
+            'error': self.error,
+            'progress': round(self.slices_done / self.slices_total, 3) if self.slices_total else 0.0,
+            'frames_sampled': self.frames_sampled,
+            'frames_with_hand': self.frames_with_hand,
+            'video_seconds': self.video_seconds,
+            'model_version': self.model_version,
+            'attempts': len(self.attempts),
+            'processing_seconds': round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            **self.context,
+            **self.result,
+        }
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    with _jobs_lock:
+        if _pool is None:
+            # spawn: a forked copy of a threaded web worker (MediaPipe, TFLite, open sockets) is not safe
+            _pool = ProcessPoolExecutor(max_workers=VIDEO_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+            print(f"Video recognition pool started with {VIDEO_WORKERS} process(es).")
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _jobs_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _evict_finished_jobs_locked(now):
+    for job_id in [job_id for job_id, job in _jobs.items() if job.finished and now - job.finished_at > VIDEO_JOB_TTL]:
+        del _jobs[job_id]
+
+
+def submit_video_job(job, model_registry_dir, model_variant):
+    """Queues a job and returns it at once; raises VideoRejectedError if VIDEO_MAX_ACTIVE_JOBS are running."""
+    with _jobs_lock:
+        _evict_finished_jobs_locked(time.time())
+        if sum(1 for other in _jobs.values() if not other.finished) >= VIDEO_MAX_ACTIVE_JOBS:
+            raise VideoRejectedError("Too many videos are being processed; try again in a minute.")
+        _jobs[job.id] = job
+    threading.Thread(target=_run_job, args=(job, model_registry_dir, model_variant), name=f'video-job-{job.id[:8]}', daemon=True).start()
+    return job
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def derive_sign_attempts(frame_times, probabilities, class_names, session_name='video'):
+    """Feeds per-frame model outputs (NaN rows: no hand) through a fresh RecognitionSession, as the live feed does.
+
+    Returns the sign attempts the session logged, as {'sign', 'confidence', 'timestamp'} (seconds into the video).
+    """
+    recognition_session = RecognitionSession(session_name)
+    for frame_time, row in zip(frame_times, probabilities):
+        if np.isnan(row[0]):
+            recognition_session.record_prediction("No hand detected", 0.0, frame_time)
+        else:
+            index = int(np.argmax(row))
+            confidence = float(row[index])
+            prediction = class_names[index] if confidence >= MIN_PREDICTION_CONFIDENCE else "Low Confidence"
+            recognition_session.record_prediction(prediction, confidence, frame_time, row)
+    return [{key: entry[key] for key in ('sign', 'confidence', 'timestamp')} for entry in recognition_session.attempt_log.since(0)]
+
+
+def _run_job(job, model_registry_dir, model_variant):
+    job.started_at = time.time()
+    job.state = "processing"
+    pool = None
+    try:
+        frame_count, fps = probe_video(job.video_path)
+        job.video_seconds = round(frame_count / fps, 2)
+        # The job keeps the version that was active when it started, even if the model is swapped meanwhile
+        job.model_version, model_path = resolve_model(None, model_variant, model_registry_dir)
+        class_names = load_model_metadata(model_path)['class_names']
+
+        # Slice boundaries are multiples of the stride, so sampling matches one pass over the whole file
+        slice_frames = max(job.stride, int(VIDEO_CHUNK_SECONDS * fps) // job.stride * job.stride)
+        bounds = [(start, min(start + slice_frames, frame_count)) for start in range(0, frame_count, slice_frames)]
+        job.slices_total = len(bounds)
+        pool = _get_pool()
+        futures = {pool.submit(recognize_video_slice, job.video_path, start, stop, job.stride, model_path, job.mirror): start
+                   for start, stop in bounds}
+        slices = {}
+        for future in as_completed(futures):
+            slices[futures[future]] = future.result()
+            job.slices_done += 1
+
+        indices = np.concatenate([slices[start][0] for start, _ in bounds])
+        probabilities = np.concatenate([slices[start][1] for start, _ in bounds])
+        job.frames_sampled = len(indices)
+        job.frames_with_hand = int((~np.isnan(probabilities[:, 0])).sum()) if len(indices) else 0
+        job.attempts = derive_sign_attempts(indices / fps, probabilities, class_names, f'video-{job.id[:8]}')
+        if not job.attempts:
+            # Nothing to grade: saving would store a 0 over any earlier submission, so that one is left alone
+            reason = "no hand was found" if not job.frames_with_hand else "no sign was held long enough"
+            job.error, job.state = f"No signs were recognized in the video ({reason}). Your earlier submission, if any, was kept.", "failed"
+            print(f"Video job {job.id}: {job.frames_sampled} frames ({job.frames_with_hand} with a hand), no attempts; nothing saved.")
+            return
+
+        job.state = "saving"
+        job.result = job.on_complete(job, job.attempts) or {}
+        job.state = "done"
+        print(f"Video job {job.id}: {job.frames_sampled} frames ({job.frames_with_hand} with a hand) in "
+              f"{time.time() - job.started_at:.1f}s, {len(job.attempts)} attempt(s).")
+    except BrokenProcessPool as e:
+        print(f"Video job {job.id} failed: the recognition pool broke ({e}); it will be restarted.")
+        _reset_pool(pool)
+        job.error, job.state = "Video processing was interrupted; please upload again.", "failed"
+    except Exception as e:
+        print(f"Video job {job.id} failed: {e}")
+        job.error, job.state = str(e), "failed"
+    finally:
+        job.finished_at = time.time()
+        try:
+            os.remove(job.video_path)
+        except OSError:
+            pass
@@ -0,0 +1,129 @@
+"""Frame rate of the pipelined, broadcast camera feed versus the old serial loop, with per-stage timings.
+
+A simulated camera returns the static sign images (app/static/Images) at --camera-fps, blocking in read()
+like a real device does: until the next frame is due, then for --read-ms of transfer/decode time.
+Both variants run the real MediaPipe + model + overlay + JPEG encode work: the serial loop does capture,
+inference and encode one after another on one thread, while generate_frames() runs them as a CameraPipeline.
+With --subscribers N, N feeds are open at once: the old code ran one loop per feed on the same camera, the
+broadcaster runs one for all of them, so CPU per second should stay flat as N grows.
+
+    python -m benchmarks.bench_camera_pipeline [--camera-fps 30] [--read-ms 8] [--frames 150] [--subscribers 1 3]
+"""
+import argparse
+import os
+import threading
+import time
+
+import cv2
+
+from app import sign_logic
+from app.recognition_session import RecognitionSession
+from app.mjpeg_encoding import StreamProfile
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'static', 'Images')
+
+
+class SimulatedCamera:
+    """Stands in for cv2.VideoCapture: read() blocks until the next frame is due, then for read_seconds."""
+
+    def __init__(self, frames, fps, read_seconds):
+        self.frames = frames
+        self.interval = 1.0 / fps
+        self.read_seconds = read_seconds
+        self.next_frame_at = time.perf_counter()
+        self.index = 0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        delay = self.next_frame_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_frame_at = max(self.next_frame_at + self.interval, time.perf_counter())
+        time.sleep(self.read_seconds)
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame.copy()
+
+    def release(self):
+        pass
+
+
+def load_frames():
+    frames = []
+    for letter in 'ABCDEFGHI':
+        image = cv2.imread(os.path.join(IMAGES_DIR, f'{letter}.png'))
+        if image is not None:
+            frames.append(cv2.flip(cv2.resize(image, (640, 480)), 1)) # the feed mirrors frames again
+    return frames
+
+
+def run_serial(session, num_frames):
+    """The previous generate_frames loop body: read, process and encode back to back."""
+    start = time.perf_counter()
+    for _ in range(num_frames):
+        success, image = sign_logic.cap.read()
+        image_bgr = sign_logic._annotate_camera_frame(session, image, time.time())[0]
+        cv2.imencode('.jpg', image_bgr)
+    return num_frames / (time.perf_counter() - start)
+
+
+def run_pipelined(num_subscribers, num_frames):
+    """Opens num_subscribers feeds and pulls num_frames from each; returns (mean fps per feed, CPU s per s, stats)."""
+    # The viewer frame-rate cap is lifted so the feeds measure the pipeline rather than STREAM_MAX_FPS
+    feeds = [sign_logic.generate_frames(RecognitionSession(f'bench-{i}'), StreamProfile(max_fps=60)) for i in range(num_subscribers)]
+    for feed in feeds:
+        next(feed) # start-up is not part of the steady-state rate
+    rates = []
+
+    def pull(feed):
+        start = time.perf_counter()
+        for _ in range(num_frames):
+            next(feed)
+        rates.append(num_frames / (time.perf_counter() - start))
+
+    threads = [threading.Thread(target=pull, args=(feed,)) for feed in feeds]
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu_per_second = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+    stats = sign_logic.get_camera_pipeline_stats()
+    for feed in feeds:
+        feed.close()
+    return sum(rates) / len(rates), cpu_per_second, stats[0] if stats else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--camera-fps', type=float, default=30)
+    parser.add_argument('--read-ms', type=float, default=8, help="Blocking time of every read (USB transfer, driver decode)")
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[1, 3])
+    args = parser.parse_args()
+
+    os.environ.pop('NO_CAMERA', None)
+    with sign_logic.initialization_lock:
+        sign_logic.load_model_resources()
+    sign_logic.hands = sign_logic._create_hands()
+    sign_logic.cap = SimulatedCamera(load_frames(), args.camera_fps, args.read_ms / 1000)
+    sign_logic.is_initialized = True
+    session = RecognitionSession('bench')
+
+    print(f"Simulated camera at {args.camera_fps:g} fps ({args.read_ms:g} ms per read), {args.frames} frames, {os.cpu_count()} CPU(s):")
+    serial_fps = run_serial(session, args.frames)
+    print(f"  serial loop, 1 feed   {serial_fps:6.1f} fps")
+    for num_subscribers in args.subscribers:
+        fps, cpu_per_second, stats = run_pipelined(num_subscribers, args.frames)
+        skipped = sum(s['skipped'] for s in stats.get('subscribers', []))
+        print(f"  pipelined, {num_subscribers} feed(s) {fps:6.1f} fps per feed   CPU {cpu_per_second:4.2f} s/s   "
+              f"frames skipped by slow feeds {skipped}")
+        for stage, stage_stats in stats.get('stages', {}).items():
+            print(f"    {stage:<10} mean {stage_stats['mean_ms']:7.2f} ms  max {stage_stats['max_ms']:7.2f} ms  dropped {stage_stats['dropped']}")
+    sign_logic.hands.close()
+
+
+if __name__ == '__main__':
+    main()
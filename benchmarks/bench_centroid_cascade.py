@@ -0,0 +1,155 @@
+"""Early-exit share, accuracy and speed of the centroid cascade (app/centroid_cascade.py) in front of the model.
+
+For each --prototypes count a cascade is built from the training split of hand_landmarks.pkl exactly as
+tools/build_centroids.py does, then scored on the held-out split (never seen by the prototypes, the answers
+or the calibration):
+
+  exit          share of held-out hands answered from the prototypes
+  agree         early exits whose class matches the model's
+  accuracy      model alone vs cascade + model, against the held-out labels (and the difference)
+
+Speed, per --backends entry, over the held-out hands one at a time as live frames arrive (mean us/hand; a median
+would only show whichever path most hands take):
+
+  backend       backend.predict() on one row
+  cascade       exit_class() on the row, backend.predict() only when it cannot answer
+  scheduled     LoadedModel.predict(), the live path through the InferenceScheduler, without and with the cascade
+  bulk          the whole held-out split as one batch: backend.predict() alone, and early_exit() with the backend
+                on the remaining rows (why LoadedModel.predict_batch() leaves the cascade out)
+
+    python -m benchmarks.bench_centroid_cascade [--prototypes 1 2 4 8] [--backends numpy tflite] [--hands 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.inference_backend import NumpyBackend, create_backend
+from app.model_registry import LoadedModel, active_model_path
+from tools.build_centroids import build_cascade
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def per_hand_us(predict, vectors, repeats=3):
+    """Mean microseconds of predict(row) over the rows of vectors (best of repeats passes)."""
+    best = None
+    for _ in range(repeats):
+        samples = np.empty(len(vectors))
+        for i in range(len(vectors)):
+            row = vectors[i]
+            start = time.perf_counter()
+            predict(row)
+            samples[i] = time.perf_counter() - start
+        mean = float(samples.mean())
+        best = mean if best is None else min(best, mean)
+    return best * 1e6
+
+
+def cascade_predict(cascade, backend):
+    def predict(row):
+        index = cascade.exit_class(row)
+        if index is not None:
+            return cascade.class_probabilities[index]
+        return backend.predict(row.reshape(1, -1))[0]
+    return predict
+
+
+def bulk_us(predict, vectors, repeats=5):
+    predict(vectors)
+    best = min(_timed(predict, vectors) for _ in range(repeats))
+    return best / len(vectors) * 1e6
+
+
+def cascade_predict_batch(cascade, backend):
+    def predict(vectors):
+        mask, classes = cascade.early_exit(vectors)
+        probabilities = cascade.class_probabilities[classes]
+        if not mask.all():
+            probabilities[~mask] = backend.predict(np.ascontiguousarray(vectors[~mask]))
+        return probabilities
+    return predict
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--prototypes', type=int, nargs='+', default=[1, 2, 4, 8], help="Prototype counts per class to compare")
+    parser.add_argument('--radius-quantile', type=float, default=0.99)
+    parser.add_argument('--target-agreement', type=float, default=0.999)
+    parser.add_argument('--calibration-fraction', type=float, default=0.25)
+    parser.add_argument('--backends', nargs='+', default=['numpy', 'tflite'], choices=['numpy', 'tflite'])
+    parser.add_argument('--hands', type=int, default=2000, help="Held-out hands timed one at a time")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    (train_features, train_labels), (holdout, holdout_labels) = split_dataset(features, labels)
+    reference = NumpyBackend(args.model)
+    (fit, _), (calibration, _) = split_dataset(train_features, train_labels, args.calibration_fraction, seed=args.seed)
+    model_probabilities = (reference.predict(fit), reference.predict(calibration))
+    model_classes = reference.predict(holdout).argmax(axis=1)
+    model_accuracy = float((model_classes == holdout_labels).mean())
+    print(f"{len(holdout)} held-out hands, {len(class_names)} classes, {os.cpu_count()} CPU(s); "
+          f"model alone {model_accuracy:.2%} accurate")
+
+    cascades = {}
+    print(f"  {'prototypes':>10} {'ratio':>6} {'exit':>6} {'agree':>8} {'accuracy':>9} {'delta':>8}")
+    for count in args.prototypes:
+        options = SimpleNamespace(**dict(vars(args), prototypes=count))
+        cascade, _, _ = build_cascade(train_features, train_labels, model_probabilities, len(class_names),
+                                      options, np.random.default_rng(args.seed))
+        cascades[count] = cascade
+        mask, classes = cascade.early_exit(holdout)
+        predicted = np.where(mask, classes, model_classes)
+        accuracy = float((predicted == holdout_labels).mean())
+        agree = float((classes[mask] == model_classes[mask]).mean()) if mask.any() else 1.0
+        print(f"  {count * len(class_names):>10} {cascade.ratio_threshold:6.2f} {mask.mean():6.1%} {agree:8.2%} "
+              f"{accuracy:9.2%} {(accuracy - model_accuracy) * 100:+7.2f}pt")
+
+    hands = np.ascontiguousarray(holdout[:args.hands])
+    print(f"Mean us per hand over {len(hands)} held-out hands ('numpy' falls back to TFLite for models it cannot run):")
+    for backend_name in args.backends:
+        backend = create_backend(args.model, backend_name)
+        backend.warm_up()
+        baseline = per_hand_us(lambda row: backend.predict(row.reshape(1, -1)), hands)
+        row = [f"backend {baseline:6.1f}"]
+        for count, cascade in cascades.items():
+            cost = per_hand_us(cascade_predict(cascade, backend), hands)
+            row.append(f"k={count} {cost:6.1f} ({baseline / cost:.2f}x)")
+        print(f"  {backend.name:<7} " + "  ".join(row))
+        bulk = bulk_us(backend.predict, holdout)
+        row = [f"backend {bulk:6.2f}"]
+        for count, cascade in cascades.items():
+            cost = bulk_us(cascade_predict_batch(cascade, backend), holdout)
+            row.append(f"k={count} {cost:6.2f} ({bulk / cost:.2f}x)")
+        print(f"  {'  bulk':<7} " + "  ".join(row))
+
+    # The live path: a LoadedModel with and without the cascade, scheduler included
+    best = max(cascades, key=lambda count: cascades[count].early_exit(holdout)[0].mean())
+    with tempfile.TemporaryDirectory() as directory:
+        path = cascades[best].save(os.path.join(directory, 'bench.centroids.npz'))
+        plain, cascaded = LoadedModel('bench', args.model), LoadedModel('bench', args.model, path)
+    try:
+        scheduled = per_hand_us(plain.predict, hands, repeats=1)
+        scheduled_cascade = per_hand_us(cascaded.predict, hands, repeats=1)
+    finally:
+        plain.close()
+        cascaded.close()
+    print(f"LoadedModel.predict ({plain.backend.name} backend, through the scheduler, k={best}): "
+          f"{scheduled:.1f} us/hand without the cascade, {scheduled_cascade:.1f} with it ({scheduled / scheduled_cascade:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
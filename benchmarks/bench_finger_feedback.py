@@ -0,0 +1,112 @@
+"""Whether finger feedback (app/finger_feedback.py) names the right finger, and what it costs per frame.
+
+Statistics are built from the training split of hand_landmarks.pkl exactly as tools/build_finger_stats.py does,
+once per --variants count, and tested on the held-out split:
+
+  localized     a held-out hand of the target sign with one finger's four landmarks taken from a hand of another
+                sign; among the ones the model no longer reads as the target (the frames feedback is shown for),
+                how often the named finger is the replaced one (and how often no finger is named)
+  confusions    held-out hands of one sign practiced as another (--pairs, e.g. A:S = target A, made S): the finger
+                named most often, and how often
+  cost          us per FingerStats.deviation() call, and per RecognitionSession.record_prediction() with a practice
+                target whose every frame is wrong, against no target (FINGER_FEEDBACK_INTERVAL rate-limits the
+                computation; frames are timestamped at --fps)
+
+    python -m benchmarks.bench_finger_feedback [--variants 1 2 4] [--trials 2000] [--pairs A:S K:V M:N U:V]
+"""
+import argparse
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from app.finger_feedback import FINGERS, FINGER_NAMES
+from app.inference_backend import NumpyBackend
+from app.model_registry import active_model_path
+from app.prediction_stabilizer import MIN_PREDICTION_CONFIDENCE
+from app.recognition_session import RecognitionSession
+from tools.build_finger_stats import build_finger_stats
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def swapped_finger_trials(rng, backend, holdout, holdout_labels, trials):
+    """[(hand, target class, replaced finger index)] the model does not read as the target."""
+    hands, targets, fingers = [], [], []
+    for _ in range(trials):
+        row = int(rng.integers(len(holdout)))
+        target = int(holdout_labels[row])
+        donor = holdout[rng.choice(np.flatnonzero(holdout_labels != target))]
+        finger = int(rng.integers(len(FINGERS)))
+        hand = holdout[row].copy()
+        for landmark in FINGERS[finger][1]:
+            hand[2 * landmark:2 * landmark + 2] = donor[2 * landmark:2 * landmark + 2]
+        hands.append(hand)
+        targets.append(target)
+        fingers.append(finger)
+    probabilities = backend.predict(np.stack(hands))
+    shown = (probabilities.argmax(axis=1) != np.array(targets)) | (probabilities.max(axis=1) < MIN_PREDICTION_CONFIDENCE)
+    return [(hands[i], targets[i], fingers[i]) for i in np.flatnonzero(shown)]
+
+
+def record_us(frames, fps, stats=None, target=None):
+    """Mean us per record_prediction() over frames, all predicted as 'Low Confidence'."""
+    recognition_session = RecognitionSession('bench')
+    if stats is not None:
+        recognition_session.set_practice_target(target, lambda version: stats)
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        recognition_session.record_prediction("Low Confidence", 0.5, i / fps, None, 'bench', frame)
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--variants', type=int, nargs='+', default=[1, 2, 4], help="k-means variants per class to compare")
+    parser.add_argument('--min-std', type=float, default=0.02)
+    parser.add_argument('--trials', type=int, default=2000, help="Hands with one finger replaced")
+    parser.add_argument('--pairs', nargs='+', default=['A:S', 'K:V', 'M:N', 'U:V', 'R:U', 'E:S'], help="target:made sign pairs")
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    class_names = list(class_names)
+    (train_features, train_labels), (holdout, holdout_labels) = split_dataset(features, labels)
+    rng = np.random.default_rng(args.seed)
+    trials = swapped_finger_trials(rng, NumpyBackend(args.model), holdout, holdout_labels, args.trials)
+    pairs = [pair.split(':') for pair in args.pairs if all(name in class_names for name in pair.split(':'))]
+    print(f"{len(holdout)} held-out hands, {len(class_names)} signs; {len(trials)} of {args.trials} hands with a replaced "
+          f"finger are no longer read as their sign; {os.cpu_count()} CPU(s)")
+
+    for variants in args.variants:
+        stats = build_finger_stats(train_features, train_labels, class_names, variants, args.min_std, np.random.default_rng(args.seed))
+        named = Counter()
+        start = time.perf_counter()
+        for hand, target, finger in trials:
+            result = stats.deviation(hand, class_names[target])
+            named['right' if result['finger'] == FINGER_NAMES[finger] else 'none' if result['finger'] is None else 'wrong'] += 1
+        deviation_us = (time.perf_counter() - start) / len(trials) * 1e6
+        print(f"  {variants} variant(s) per sign: right finger named {named['right'] / len(trials):.0%}, another finger "
+              f"{named['wrong'] / len(trials):.0%}, none {named['none'] / len(trials):.0%}; {deviation_us:.1f} us per deviation()")
+        confusions = []
+        for target, made in pairs:
+            hands = holdout[holdout_labels == class_names.index(made)]
+            fingers = Counter(stats.deviation(hand, target)['finger'] for hand in hands)
+            finger, count = fingers.most_common(1)[0]
+            confusions.append(f"{target}:{made} {finger or 'none'} {count / len(hands):.0%}")
+        print(f"    confusions (target:made, finger named most often): {', '.join(confusions)}")
+
+    frames = [hand for hand, _, _ in trials][:600]
+    baseline = record_us(frames, args.fps)
+    with_feedback = record_us(frames, args.fps, stats, class_names[trials[0][1]])
+    print(f"record_prediction at {args.fps:g} fps ({variants} variants): {baseline:.1f} us without a practice target, "
+          f"{with_feedback:.1f} us with one (+{with_feedback - baseline:.1f} us per frame)")
+
+
+if __name__ == '__main__':
+    main()
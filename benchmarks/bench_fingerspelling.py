@@ -0,0 +1,183 @@
+"""Word accuracy and per-frame cost of fingerspelling word mode (app/fingerspelling.py).
+
+Spelled words are synthesized from hand_landmarks.pkl: each letter is one recording of that class held
+for --hold-min..--hold-max frames with per-frame jitter, the hand moves into it over 1-3 interpolated
+frames (which the model often misreads), a doubled letter gets a short bounce between two recordings
+of the letter, and words are separated by --gap frames without a hand. The model runs on every frame;
+the same frames are then decoded three ways:
+
+  beam search   FingerspellingDecoder over the per-frame probabilities, constrained to the vocabulary
+  greedy        per-frame argmax (confident frames only), repeats collapsed, no vocabulary
+  stabilized    the letters the default stabilizer shows, one per change (what the notes field received)
+
+Cost: us per update() for a few vocabulary sizes (the vocabulary padded with random letter strings)
+and beam widths, and what that is at --fps for a classroom of --sessions students.
+
+    python -m benchmarks.bench_fingerspelling [--words 200] [--beam-widths 4 8 16] [--vocabulary-sizes 30 1000 10000]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.fingerspelling import FingerspellingDecoder, LexiconTrie, FINGERSPELL_BEAM_WIDTH
+from app.inference_backend import NumpyBackend
+from app.model_registry import active_model_path
+from app.prediction_stabilizer import create_stabilizer, MIN_PREDICTION_CONFIDENCE, NON_VALID_SIGN_STATES
+from tools.landmark_dataset import load_landmark_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+LESSON_WORDS = ['HELLO', 'THANKS', 'PLEASE', 'SORRY', 'FRIEND', 'FAMILY', 'MOTHER', 'FATHER', 'SISTER', 'BROTHER',
+                'SCHOOL', 'TEACHER', 'STUDENT', 'BOOK', 'WATER', 'FOOD', 'APPLE', 'HAPPY', 'GOOD', 'MORNING',
+                'NIGHT', 'NAME', 'YES', 'NO', 'HELP', 'LOVE', 'CAT', 'DOG', 'BALL', 'COOL', 'JAZZ', 'QUIZ']
+
+
+def synthesize_words(rng, features, by_class, words, args):
+    """Returns (frames (T, 42) with NaN rows for no hand, [(start, end, word)])."""
+    rows, spans = [], []
+    no_hand = np.full(features.shape[1], np.nan, dtype=np.float32)
+    for word in words:
+        rows += [no_hand] * args.gap
+        start = len(rows)
+        previous = None
+        for char in word:
+            target = features[rng.choice(by_class[char])]
+            if previous is not None:
+                for step in range(1, int(rng.integers(1, 4)) + 1): # the hand moving into the letter
+                    rows.append(previous + (target - previous) * step / 4)
+            for _ in range(int(rng.integers(args.hold_min, args.hold_max + 1))):
+                rows.append(target + rng.normal(0, args.jitter, target.shape).astype(np.float32))
+            previous = target
+        spans.append((start, len(rows), word))
+    rows += [no_hand] * args.gap
+    return np.asarray(rows, dtype=np.float32), spans
+
+
+def frame_probabilities(backend, frames):
+    hand = ~np.isnan(frames[:, 0])
+    probabilities = [None] * len(frames)
+    predicted = backend.predict(np.ascontiguousarray(frames[hand]))
+    for row, index in enumerate(np.flatnonzero(hand)):
+        probabilities[index] = predicted[row]
+    return probabilities
+
+
+def decode_beam(probabilities, trie, beam_width):
+    decoder = FingerspellingDecoder(trie, beam_width=beam_width)
+    words, seconds = [], 0.0
+    for frame_probabilities_ in probabilities:
+        start = time.perf_counter()
+        word = decoder.update(frame_probabilities_, 0.0)
+        seconds += time.perf_counter() - start
+        if word is not None:
+            words.append(word['sign'])
+    return words, seconds / len(probabilities) * 1e6
+
+
+def split_words(labels, probabilities):
+    """Groups per-frame letters (None between words) into words, one letter per run of the same label."""
+    words, letters, previous, gap = [], [], None, 0
+    for label, frame in zip(labels, probabilities):
+        if frame is None:
+            gap += 1
+            if gap == 8 and letters:
+                words.append(''.join(letters))
+                letters = []
+            previous = None
+            continue
+        gap = 0
+        if label is not None and label != previous:
+            letters.append(label)
+        previous = label if label is not None else previous
+    if letters:
+        words.append(''.join(letters))
+    return words
+
+
+def decode_greedy(probabilities, class_names):
+    labels = []
+    for frame in probabilities:
+        if frame is None or float(np.max(frame)) < MIN_PREDICTION_CONFIDENCE:
+            labels.append(None)
+        else:
+            labels.append(class_names[int(np.argmax(frame))])
+    return split_words(labels, probabilities)
+
+
+def decode_stabilized(probabilities, class_names, fps):
+    stabilizer = create_stabilizer()
+    labels = []
+    for i, frame in enumerate(probabilities):
+        if frame is None:
+            stabilizer.update("No hand detected", 0.0, i / fps)
+            labels.append(None)
+            continue
+        index = int(np.argmax(frame))
+        confidence = float(frame[index])
+        prediction = class_names[index] if confidence >= MIN_PREDICTION_CONFIDENCE else "Low Confidence"
+        display = stabilizer.update(prediction, confidence, i / fps, frame)
+        labels.append(display if display not in NON_VALID_SIGN_STATES and display != "Ready..." else None)
+    return split_words(labels, probabilities)
+
+
+def accuracy(decoded, spans):
+    truth = [word for _, _, word in spans]
+    correct = sum(1 for got, want in zip(decoded, truth) if got == want)
+    return correct, len(truth), len(decoded)
+
+
+def padded_vocabulary(rng, words, size, letters):
+    vocabulary = list(words)
+    while len(vocabulary) < size:
+        vocabulary.append(''.join(rng.choice(letters, int(rng.integers(3, 9)))))
+    return vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--words', type=int, default=200, help="Words spelled")
+    parser.add_argument('--hold-min', type=int, default=4, help="Fewest frames a letter is held")
+    parser.add_argument('--hold-max', type=int, default=9)
+    parser.add_argument('--gap', type=int, default=10, help="Frames without a hand between words")
+    parser.add_argument('--jitter', type=float, default=0.03, help="Per-coordinate landmark noise (normalized units)")
+    parser.add_argument('--beam-widths', type=int, nargs='+', default=[4, FINGERSPELL_BEAM_WIDTH, 16])
+    parser.add_argument('--vocabulary-sizes', type=int, nargs='+', default=[len(LESSON_WORDS), 1000, 10000])
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--sessions', type=int, default=32, help="Students decoding at once, for the CPU share")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    by_class = {name: np.flatnonzero(labels == index) for index, name in enumerate(class_names)}
+    backend = NumpyBackend(args.model)
+    rng = np.random.default_rng(args.seed)
+    words = [str(word) for word in rng.choice(LESSON_WORDS, args.words)]
+    frames, spans = synthesize_words(rng, features, by_class, words, args)
+    probabilities = frame_probabilities(backend, frames)
+    print(f"{args.words} words, {len(frames)} frames, vocabulary of {len(LESSON_WORDS)} lesson words, {os.cpu_count()} CPU(s)")
+
+    trie = LexiconTrie(LESSON_WORDS, class_names)
+    beam_words, _ = decode_beam(probabilities, trie, FINGERSPELL_BEAM_WIDTH)
+    for name, decoded in (('beam search', beam_words), ('greedy', decode_greedy(probabilities, class_names)),
+                          ('stabilized', decode_stabilized(probabilities, class_names, args.fps))):
+        correct, total, emitted = accuracy(decoded, spans)
+        print(f"  {name:<12} {correct}/{total} words right ({correct / total:.0%}), {emitted} words emitted")
+
+    print(f"Cost per frame (us/update) and CPU share of {args.sessions} sessions at {args.fps:g} fps:")
+    letters = [name for name in class_names if len(name) == 1]
+    for size in args.vocabulary_sizes:
+        sized_trie = LexiconTrie(padded_vocabulary(rng, LESSON_WORDS, size, letters), class_names)
+        costs = []
+        for beam_width in args.beam_widths:
+            decoded, update_us = decode_beam(probabilities, sized_trie, beam_width)
+            correct, total, _ = accuracy(decoded, spans)
+            costs.append(f"beam {beam_width:2d}: {update_us:6.1f} us, {update_us * args.fps * args.sessions / 1e4:5.2f}% CPU, "
+                         f"{correct / total:4.0%} right")
+        print(f"  {len(sized_trie):6d} words ({len(sized_trie.children):6d} trie nodes)  " + "  |  ".join(costs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Cold start, resident memory, per-batch latency and output parity of each inference backend.
+
+Every backend is measured in a fresh child process that imports only the backend modules (not the Flask
+app, whose MediaPipe import pulls in TensorFlow on its own when it is installed), so cold start and RSS
+are what a dedicated inference worker would pay. Parity is checked in this process on hand_landmarks.pkl.
+
+    python -m benchmarks.bench_inference_backends [--backends numpy tflite] [--repeat 300] [--model path.tflite]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+
+import numpy as np
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+BATCH_SIZES = (1, 8, 32, 256)
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc; falls back to peak RSS elsewhere)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_backend(backend_name, repeat, model_path):
+    """Child-process side: builds one backend from scratch and returns its measurements as a dict."""
+    # Register `app` as a bare package so importing app.inference_backend skips app/__init__ (Flask, MediaPipe)
+    package = types.ModuleType('app')
+    package.__path__ = [os.path.join(REPO_ROOT, 'app')]
+    sys.modules['app'] = package
+
+    baseline_rss = rss_mb()
+    start = time.perf_counter()
+    from app.inference_backend import NumpyBackend, TFLiteBackend
+    backend = (NumpyBackend if backend_name == 'numpy' else TFLiteBackend)(model_path)
+    backend.predict(np.zeros((1, backend.num_features), dtype=np.float32))
+    cold_start = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    latencies = {}
+    for batch_size in BATCH_SIZES:
+        batch = rng.standard_normal((batch_size, backend.num_features)).astype(np.float32)
+        backend.predict(batch) # allocate this bucket before timing
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            backend.predict(batch)
+            timings.append(time.perf_counter() - t0)
+        latencies[batch_size] = float(np.median(timings))
+
+    return {
+        'backend': backend.name,
+        'cold_start_s': cold_start,
+        'rss_delta_mb': rss_mb() - baseline_rss,
+        'rss_mb': rss_mb(),
+        'imports_tensorflow': 'tensorflow' in sys.modules,
+        'latency_s': latencies,
+    }
+
+
+def check_parity(backend_names, model_path):
+    """Max abs probability difference and argmax agreement of each backend against TFLite."""
+    from app.inference_backend import NumpyBackend, TFLiteBackend
+    from tools.landmark_dataset import load_landmark_dataset
+
+    features, labels, _ = load_landmark_dataset()
+    reference = TFLiteBackend(model_path).predict(features)
+    print(f"\nParity against TFLite over {len(features)} dataset vectors (TFLite accuracy {(reference.argmax(1) == labels).mean():.4f}):")
+    for name in backend_names:
+        if name == 'tflite':
+            continue
+        probabilities = NumpyBackend(model_path).predict(features)
+        max_error = np.abs(probabilities - reference).max()
+        agreement = (probabilities.argmax(1) == reference.argmax(1)).mean()
+        print(f"  {name:<7} max abs error {max_error:.3g}   argmax agreement {agreement:.4f}")
+        assert max_error < 1e-3 and agreement == 1.0, f"{name} backend diverges from TFLite"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=['numpy', 'tflite'], choices=['numpy', 'tflite'])
+    parser.add_argument('--repeat', type=int, default=300)
+    parser.add_argument('--model', help="Model to load (default: the active version in the model registry)")
+    parser.add_argument('--child', choices=['numpy', 'tflite'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_backend(args.child, args.repeat, args.model)))
+        return
+    if args.model is None:
+        from app.model_registry import active_model_path
+        args.model = active_model_path()
+
+    print(f"{'backend':<8} {'cold start':>11} {'RSS +':>9} {'RSS':>9} {'imports TF':>11}  " +
+          "  ".join(f"{f'N={n}':>10}" for n in BATCH_SIZES))
+    for name in args.backends:
+        child = subprocess.run([sys.executable, '-m', 'benchmarks.bench_inference_backends', '--child', name, '--repeat', str(args.repeat), '--model', args.model],
+                               cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        print(f"{result['backend']:<8} {result['cold_start_s'] * 1000:9.0f} ms {result['rss_delta_mb']:6.0f} MB {result['rss_mb']:6.0f} MB "
+              f"{'yes' if result['imports_tensorflow'] else 'no':>11}  " +
+              "  ".join(f"{result['latency_s'][str(n)] * 1e6:7.1f} us" for n in BATCH_SIZES))
+
+    check_parity(args.backends, args.model)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Throughput and latency of the micro-batching InferenceScheduler versus one invoke per frame.
+
+Each simulated session is a thread submitting normalized landmark vectors from hand_landmarks.pkl
+at --fps (0 = as fast as possible). For each batch window the benchmark reports predictions/s,
+mean batch size and p50/p99 latency per prediction.
+
+    python -m benchmarks.bench_inference_scheduler [--sessions 1 10 30] [--windows 0 1 2 5] [--fps 30] [--seconds 3]
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from app import sign_logic
+from app.inference_scheduler import InferenceScheduler
+from tools.landmark_dataset import load_landmark_dataset
+
+
+def run_sessions(predict, vectors, num_sessions, fps, seconds):
+    """Runs num_sessions client threads against predict(vector); returns (latencies in s, elapsed s)."""
+    latencies = [[] for _ in range(num_sessions)]
+    start_barrier = threading.Barrier(num_sessions + 1)
+    stop_at = [0.0]
+
+    def client(session_index):
+        rng = np.random.default_rng(session_index)
+        interval = 1.0 / fps if fps else 0.0
+        start_barrier.wait()
+        next_frame = time.perf_counter()
+        while time.perf_counter() < stop_at[0]:
+            vector = vectors[rng.integers(len(vectors))]
+            t0 = time.perf_counter()
+            predict(vector)
+            latencies[session_index].append(time.perf_counter() - t0)
+            if interval:
+                next_frame += interval
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(num_sessions)]
+    for t in threads:
+        t.start()
+    stop_at[0] = time.perf_counter() + seconds
+    begin = time.perf_counter()
+    start_barrier.wait()
+    for t in threads:
+        t.join()
+    return np.concatenate([np.asarray(l) for l in latencies]), time.perf_counter() - begin
+
+
+def report(label, latencies, elapsed, batch_info=""):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"  {label:<22} {len(latencies) / elapsed:10,.0f} pred/s   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms  {batch_info}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 30])
+    parser.add_argument('--windows', type=float, nargs='+', default=[0, 1, 2, 5], help="Batch windows in ms")
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--fps', type=float, default=30, help="Frames per second per session (0 = unthrottled)")
+    parser.add_argument('--seconds', type=float, default=3)
+    args = parser.parse_args()
+
+    if not sign_logic.ensure_model_loaded():
+        raise SystemExit("Model could not be loaded.")
+    vectors, _, _ = load_landmark_dataset()
+
+    # Baseline: one invoke per frame on a shared batch-1 interpreter, serialized by a lock
+    baseline_lock = threading.Lock()
+    def predict_unbatched(vector):
+        with baseline_lock:
+            return sign_logic.predict_landmark_batch(vector[None])[0]
+    predict_unbatched(vectors[0]) # allocate before timing
+
+    for num_sessions in args.sessions:
+        print(f"\n{num_sessions} session(s) @ {'max' if not args.fps else f'{args.fps:g}'} fps, {args.seconds:g}s each:")
+        latencies, elapsed = run_sessions(predict_unbatched, vectors, num_sessions, args.fps, args.seconds)
+        report("batch=1 (no scheduler)", latencies, elapsed)
+        for window_ms in args.windows:
+            scheduler = InferenceScheduler(sign_logic.predict_landmark_batch, batch_window_ms=window_ms, max_batch_size=args.max_batch)
+            latencies, elapsed = run_sessions(scheduler.predict, vectors, num_sessions, args.fps, args.seconds)
+            scheduler.stop()
+            stats = scheduler.stats
+            mean_batch = stats['requests'] / max(1, stats['batches'])
+            report(f"window {window_ms:g} ms", latencies, elapsed, f"mean batch {mean_batch:5.2f} (max {stats['max_batch_seen']})")
+
+
+if __name__ == '__main__':
+    main()
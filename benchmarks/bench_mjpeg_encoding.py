@@ -0,0 +1,123 @@
+"""Bytes per second sent to one /video_feed viewer: the old encode-every-frame loop versus AdaptiveMjpegStream.
+
+Two scenes at --camera-fps: 'still' is a hand holding each sign image (app/static/Images) for --hold seconds
+with a little sensor noise on every frame, 'moving' is the same with the hand swaying --sway pixels, so every
+frame differs. The old loop sent every frame at full resolution with cv2.imencode defaults (quality 95); the
+adaptive stream uses the configured quality, scale and frame-rate cap and skips unchanged frames. Sends are
+simulated on a link of --link-mbps (0 = not limited), so a slow link backs up and the stream adapts. The
+clock is simulated; encoding is real.
+
+    python -m benchmarks.bench_mjpeg_encoding [--camera-fps 30] [--hold 2] [--sway 12] [--link-mbps 0 4 1]
+"""
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+from app.mjpeg_encoding import AdaptiveMjpegStream, EncodedFrame, StreamProfile, multipart_chunk, placeholder_chunk
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'static', 'Images')
+
+
+def make_scene(camera_fps, hold_seconds, sway_pixels=0, seed=0):
+    """Frames of the simulated camera: each sign image, swaying sway_pixels sideways, plus per-frame sensor noise."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for letter in 'ABCDEFGHI':
+        image = cv2.imread(os.path.join(IMAGES_DIR, f'{letter}.png'))
+        if image is None:
+            continue
+        image = cv2.resize(image, (640, 480))
+        cv2.putText(image, f"Stable: {letter}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2, cv2.LINE_AA)
+        for index in range(int(camera_fps * hold_seconds)):
+            shift = sway_pixels * np.sin(2 * np.pi * index / camera_fps)
+            shifted = cv2.warpAffine(image, np.float32([[1, 0, shift], [0, 1, 0]]), (640, 480), borderMode=cv2.BORDER_REPLICATE)
+            noise = rng.normal(0, 2.0, image.shape)
+            frames.append(np.clip(shifted + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def link_seconds(num_bytes, link_bytes_per_second):
+    return num_bytes / link_bytes_per_second if link_bytes_per_second else 0.0
+
+
+def run_legacy(frames, camera_fps, link_bytes_per_second):
+    """Every frame, full resolution, default quality; a slow link just delays every following frame."""
+    clock, sent, total_bytes = 0.0, 0, 0
+    for index, image in enumerate(frames):
+        captured_at = index / camera_fps
+        if clock > captured_at:
+            continue # still writing the previous frame; the old loop read on after the write returned
+        chunk = multipart_chunk(cv2.imencode('.jpg', image)[1].tobytes())
+        clock = captured_at + link_seconds(len(chunk), link_bytes_per_second)
+        sent += 1
+        total_bytes += len(chunk)
+    return sent, total_bytes, None
+
+
+def run_adaptive(frames, camera_fps, link_bytes_per_second, profile):
+    """The new generate_frames send loop, driven by the simulated clock instead of real sleeps."""
+    clock = 0.0
+    stream = AdaptiveMjpegStream(profile)
+    stream._last_adapted_at = 0.0
+    for index, image in enumerate(frames):
+        captured_at = index / camera_fps
+        if clock > captured_at or stream.time_until_next_send(captured_at) > 1e-9:
+            continue
+        frame = EncodedFrame(image)
+        if not stream.should_send(frame, captured_at):
+            continue
+        chunk = stream.encode(frame, captured_at)
+        send_seconds = link_seconds(len(chunk), link_bytes_per_second)
+        clock = captured_at + send_seconds
+        stream.record_send(len(chunk), send_seconds, clock)
+    return stream.frames_sent, stream.bytes_sent, stream
+
+
+def run_scene(frames, duration, args, profile):
+    """Prints legacy vs adaptive throughput and bandwidth of one scene on every --link-mbps link."""
+    for link_mbps in args.link_mbps:
+        link_bytes_per_second = link_mbps * 1e6 / 8
+        label = f"{link_mbps:g} Mbit/s link" if link_mbps else "unlimited link"
+        print(f"  {label}:")
+        results = {}
+        for name, run in (('legacy', lambda: run_legacy(frames, args.camera_fps, link_bytes_per_second)),
+                          ('adaptive', lambda: run_adaptive(frames, args.camera_fps, link_bytes_per_second, profile))):
+            sent, total_bytes, stream = run()
+            results[name] = total_bytes
+            detail = ''
+            if stream is not None:
+                snapshot = stream.snapshot()
+                detail = (f"   unchanged skipped {snapshot['frames_unchanged']:4d}   final quality {snapshot['quality']}"
+                          f"   fps cap {snapshot['fps_cap']:g}   downgrades {snapshot['downgrades']}")
+            print(f"    {name:<9} {sent / duration:5.1f} fps   {total_bytes / duration / 1000:8.1f} kB/s   "
+                  f"{total_bytes / max(sent, 1) / 1000:6.1f} kB/frame{detail}")
+        print(f"    bandwidth reduction {results['legacy'] / max(results['adaptive'], 1):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--camera-fps', type=float, default=30)
+    parser.add_argument('--hold', type=float, default=2.0, help="Seconds each sign is held still")
+    parser.add_argument('--sway', type=float, default=12, help="Sideways sway of the 'moving' scene, in pixels")
+    parser.add_argument('--link-mbps', type=float, nargs='+', default=[0, 4, 1])
+    args = parser.parse_args()
+
+    profile = StreamProfile()
+    print(f"Adaptive defaults: quality {profile.quality}, scale {profile.scale:g}, max {profile.max_fps:g} fps")
+    for scene, sway_pixels in (('still', 0), ('moving', args.sway)):
+        frames = make_scene(args.camera_fps, args.hold, sway_pixels)
+        duration = len(frames) / args.camera_fps
+        print(f"Scene '{scene}': {len(frames)} frames ({duration:.0f} s at {args.camera_fps:g} fps)")
+        run_scene(frames, duration, args, profile)
+
+    placeholder_chunk.cache_clear()
+    placeholder_chunk("Camera Disabled by Server Config", font_scale=0.7)
+    placeholder_chunk("Camera Disabled by Server Config", font_scale=0.7)
+    info = placeholder_chunk.cache_info()
+    print(f"Placeholder frames: {info.misses} encode, {info.hits} cache hit(s) for 2 sends")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Accuracy, size, load time and invoke latency of each model variant (see tools/quantize_model.py).
+
+Every variant found next to --model is scored on the held-out split of hand_landmarks.pkl (the same
+stratified 80/20 split used in training) and timed with each --backends entry. 'numpy' falls back to
+TFLite for models it cannot execute (full-int8), as the app does; the backend actually used is shown.
+Load time covers reading the model and the backend's warm_up(), with the TFLite runtime already imported.
+Latency is the median of --repeats predict() calls at batch 1 (one live frame) and batch 32 (bulk scoring).
+
+Finally the cheapest variant (lowest batch-1 latency, then smallest file) whose accuracy is within
+--tolerance points of the float32 variant (or the default model, if float32 was not generated) is named.
+
+    python -m benchmarks.bench_model_variants [--backends numpy tflite] [--repeats 300] [--tolerance 1.0]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.inference_backend import create_backend
+from app.interpreter_pool import _load_interpreter_class
+from app.model_metadata import DEFAULT_VARIANT, MODEL_VARIANTS, model_variant_path, load_model_metadata
+from app.model_registry import active_model_path
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def median_seconds(fn, repeats):
+    fn() # first call outside the timing
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--backends', nargs='+', default=['numpy', 'tflite'], choices=['numpy', 'tflite'])
+    parser.add_argument('--repeats', type=int, default=300)
+    parser.add_argument('--tolerance', type=float, default=1.0, help="Accuracy points a variant may lose")
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    _, (holdout_features, holdout_labels) = split_dataset(features, labels)
+    batch_1 = np.ascontiguousarray(holdout_features[:1])
+    batch_32 = np.ascontiguousarray(holdout_features[:32])
+    _load_interpreter_class() # keep the TensorFlow import out of the load times
+
+    variants = [DEFAULT_VARIANT] + [v for v in MODEL_VARIANTS if os.path.exists(model_variant_path(args.model, v))]
+    print(f"{len(holdout_labels)} held-out vectors, {len(class_names)} classes; variants: {', '.join(variants)}")
+    print(f"  {'variant':<9} {'backend':<8} {'size':>8} {'accuracy':>9} {'agree':>7} {'load':>9} {'batch 1':>10} {'batch 32':>10}")
+
+    reference_predictions = None
+    results = []
+    for variant in variants:
+        path = model_variant_path(args.model, variant)
+        load_model_metadata(path) # the app refuses variants whose metadata does not match
+        size = os.path.getsize(path)
+        measured = set()
+        for backend_name in args.backends:
+            start = time.perf_counter()
+            backend = create_backend(path, backend_name)
+            backend.warm_up()
+            load_seconds = time.perf_counter() - start
+            if backend.name in measured: # 'numpy' fell back to TFLite, which was (or will be) measured anyway
+                continue
+            measured.add(backend.name)
+
+            predictions = np.argmax(backend.predict(holdout_features), axis=1)
+            if reference_predictions is None:
+                reference_predictions = predictions
+            accuracy = float(np.mean(predictions == holdout_labels)) * 100
+            agreement = float(np.mean(predictions == reference_predictions)) * 100
+            latency_1 = median_seconds(lambda: backend.predict(batch_1), args.repeats)
+            latency_32 = median_seconds(lambda: backend.predict(batch_32), args.repeats)
+            results.append((variant, backend.name, size, accuracy, latency_1))
+            print(f"  {variant:<9} {backend.name:<8} {size / 1024:6.1f} kB {accuracy:8.2f}% {agreement:6.2f}% "
+                  f"{load_seconds * 1000:6.1f} ms {latency_1 * 1e6:7.1f} us {latency_32 * 1e6:7.1f} us")
+
+    reference_variant = 'float32' if 'float32' in variants else DEFAULT_VARIANT
+    reference_accuracy = max(r[3] for r in results if r[0] == reference_variant)
+    eligible = [r for r in results if r[3] >= reference_accuracy - args.tolerance]
+    variant, backend_name, size, accuracy, latency_1 = min(eligible, key=lambda r: (r[4], r[2]))
+    print(f"Cheapest within {args.tolerance:g} point(s) of {reference_variant} ({reference_accuracy:.2f}%): "
+          f"MODEL_VARIANT={variant} INFERENCE_BACKEND={backend_name} ({accuracy:.2f}%, {latency_1 * 1e6:.1f} us at batch 1, {size / 1024:.1f} kB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Micro-benchmark for app.landmark_normalization.
+
+Times normalize_landmarks against the per-landmark Python loop that generate_frames used before, on hands
+reconstructed from hand_landmarks.pkl, and reports the largest difference between them (the parity itself is
+tested in tests/test_landmark_normalization.py). A single live frame is no faster (0.8-1.0x here: reading the
+MediaPipe landmarks dominates and NumPy's per-call overhead outweighs the loop); the gain is only in batches
+(the landmark API and the dataset tools).
+
+    python -m benchmarks.bench_normalization [--repeat 2000]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.landmark_normalization import normalize_landmarks, landmarks_to_array, MIDDLE_FINGER_MCP
+from tools.landmark_dataset import load_landmark_dataset
+
+
+def legacy_normalize(hand_landmarks):
+    """The original generate_frames loop, kept verbatim as the parity reference."""
+    landmarks_normalized = []
+    wrist = hand_landmarks.landmark[0]
+    origin_x, origin_y = wrist.x, wrist.y
+    mcp_middle = hand_landmarks.landmark[MIDDLE_FINGER_MCP]
+    scale = np.sqrt((mcp_middle.x - origin_x)**2 + (mcp_middle.y - origin_y)**2)
+    scale = max(scale, 1e-6)
+    for landmark in hand_landmarks.landmark:
+        norm_x = (landmark.x - origin_x) / scale
+        norm_y = (landmark.y - origin_y) / scale
+        landmarks_normalized.extend([norm_x, norm_y])
+    return np.array([landmarks_normalized], dtype=np.float32)
+
+
+def as_mediapipe_hand(points):
+    """Wraps a (21, 2) array in an object shaped like a MediaPipe NormalizedLandmarkList."""
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in points])
+
+
+def image_space_hands(features, rng):
+    """Maps normalized training vectors back to plausible image coordinates (random scale and offset)."""
+    points = features.reshape(-1, 21, 2)
+    scale = rng.uniform(0.05, 0.2, size=(len(points), 1, 1))
+    offset = rng.uniform(0.2, 0.8, size=(len(points), 1, 2))
+    return (points * scale + offset).astype(np.float32)
+
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    features, _, _ = load_landmark_dataset()
+    raw_points = image_space_hands(features, rng)
+    hands = [as_mediapipe_hand(p) for p in raw_points[:1000]]
+
+    # Parity: legacy loop vs vectorized path, hand by hand
+    legacy = np.concatenate([legacy_normalize(h) for h in hands])
+    points_buffer = np.empty((1, 21, 2), dtype=np.float32)
+    out_buffer = np.empty((1, 42), dtype=np.float32)
+    vectorized = np.concatenate([
+        normalize_landmarks(landmarks_to_array(h, out=points_buffer[0])[None], out=out_buffer).copy() for h in hands
+    ])
+    max_error = np.abs(legacy - vectorized).max()
+    print(f"Parity over {len(hands)} hands: max abs error {max_error:.3g}")
+
+    # Batch parity against the stored (already normalized) training vectors
+    batch_error = np.abs(normalize_landmarks(raw_points) - features).max()
+    print(f"Batch parity over {len(raw_points)} dataset hands: max abs error {batch_error:.3g}")
+
+    # Single frame, including the MediaPipe -> array copy the live loop does (no faster than the loop)
+    hand = hands[0]
+    legacy_t = time_per_call(lambda: legacy_normalize(hand), args.repeat)
+    new_t = time_per_call(lambda: normalize_landmarks(landmarks_to_array(hand, out=points_buffer[0])[None], out=out_buffer), args.repeat)
+    print(f"\nSingle frame: legacy loop {legacy_t * 1e6:8.2f} us | vectorized {new_t * 1e6:8.2f} us | {legacy_t / new_t:5.2f}x")
+
+    print("\nBatch throughput (normalize_landmarks on (N, 21, 2) with a preallocated output):")
+    for batch_size in (1, 8, 32, 256, 4096):
+        batch = raw_points[:batch_size]
+        out = np.empty((batch_size, 42), dtype=np.float32)
+        repeat = max(10, args.repeat // max(1, batch_size // 8))
+        t = time_per_call(lambda: normalize_landmarks(batch, out=out), repeat)
+        print(f"  N={batch_size:5d}: {t * 1e6:9.2f} us/batch  {batch_size / t:14,.0f} hands/s")
+
+
+if __name__ == '__main__':
+    main()
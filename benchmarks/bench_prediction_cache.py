@@ -0,0 +1,129 @@
+"""Hit rate and accuracy of the quantized-landmark PredictionCache, replayed against the uncached model.
+
+Sequences are either recorded (--recorded file.npz, same format as bench_stabilizers) or synthesized
+from hand_landmarks.pkl: each sign is one recording held still for --hold-min..--hold-max seconds, with
+per-frame tracker jitter (--jitter, gaussian, in units of the wrist-to-middle-MCP distance; 0.02 is about
+1.5 px on a hand 75 px across) and a slow drift of the whole hand. Every frame is classified twice: by
+the model directly and through a PredictionCache of each --grid size; the labels (after
+MIN_PREDICTION_CONFIDENCE) and the stable predictions of the default stabilizer are compared.
+
+  hit rate       share of frames answered from the cache (model not invoked)
+  label agree    frames whose instantaneous label matches the uncached path
+  stable agree   frames whose stable prediction matches the uncached path
+  max |dp|       largest probability difference from the uncached output
+  us/frame       model (or cache) time per frame, single-vector calls as in the live path
+
+    python -m benchmarks.bench_prediction_cache [--grid 0.05 0.1 0.15 0.2] [--jitter 0.02] [--cache-size 32]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.inference_backend import NumpyBackend
+from app.model_registry import active_model_path
+from app.prediction_cache import PredictionCache, PREDICTION_CACHE_MIN_CONFIDENCE
+from app.prediction_stabilizer import create_stabilizer, MIN_PREDICTION_CONFIDENCE
+from benchmarks.bench_stabilizers import load_recorded, NO_HAND
+from tools.landmark_dataset import load_landmark_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def synthesize_episode(rng, features, labels, num_classes, args):
+    """Returns (features (T, 42) with NaN rows for no hand, true labels (T,)) of held, jittering signs."""
+    by_class = [np.flatnonzero(labels == c) for c in range(num_classes)]
+    rows, truth = [], []
+    for _ in range(args.signs):
+        gap = int(rng.uniform(0.3, 0.8) * args.fps)
+        rows += [np.full(features.shape[1], np.nan, dtype=np.float32)] * gap
+        truth += [NO_HAND] * gap
+        sign = int(rng.integers(num_classes))
+        base = features[rng.choice(by_class[sign])]
+        drift = np.zeros(features.shape[1], dtype=np.float32)
+        for _ in range(int(rng.uniform(args.hold_min, args.hold_max) * args.fps)):
+            drift = 0.95 * drift + rng.normal(0, args.jitter / 4, features.shape[1]).astype(np.float32)
+            rows.append(base + drift + rng.normal(0, args.jitter, features.shape[1]).astype(np.float32))
+            truth.append(sign)
+    return np.asarray(rows, dtype=np.float32), np.asarray(truth)
+
+
+def label(probabilities, class_names):
+    index = int(np.argmax(probabilities))
+    confidence = float(probabilities[index])
+    return (class_names[index] if confidence >= MIN_PREDICTION_CONFIDENCE else "Low Confidence"), confidence
+
+
+def replay(backend, episodes, class_names, fps, cache_factory=None):
+    """Returns (per-frame labels, stable displays, probabilities, seconds in model/cache, hit rate)."""
+    labels, displays, outputs, seconds, hits, lookups = [], [], [], 0.0, 0, 0
+    for features in episodes:
+        cache = cache_factory() if cache_factory else None
+        stabilizer = create_stabilizer()
+        for i, vector in enumerate(features):
+            if np.isnan(vector[0]):
+                prediction, confidence, probabilities = "No hand detected", 0.0, None
+            else:
+                start = time.perf_counter()
+                if cache is not None:
+                    key, probabilities = cache.lookup(vector)
+                    if probabilities is None:
+                        probabilities = backend.predict(vector[None])[0]
+                        cache.put(key, vector, probabilities)
+                else:
+                    probabilities = backend.predict(vector[None])[0]
+                seconds += time.perf_counter() - start
+                prediction, confidence = label(probabilities, class_names)
+            labels.append(prediction)
+            outputs.append(probabilities)
+            displays.append(stabilizer.update(prediction, confidence, i / fps, probabilities))
+        if cache is not None:
+            hits, lookups = hits + cache.hits, lookups + cache.hits + cache.misses
+    return labels, displays, outputs, seconds, hits / lookups if lookups else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recorded', help="Replay a recorded .npz sequence instead of synthesized ones")
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--grid', type=float, nargs='+', default=[0.05, 0.1, 0.15, 0.2])
+    parser.add_argument('--cache-size', type=int, default=32)
+    parser.add_argument('--min-confidence', type=float, default=PREDICTION_CACHE_MIN_CONFIDENCE)
+    parser.add_argument('--episodes', type=int, default=10)
+    parser.add_argument('--signs', type=int, default=8, help="Signs per synthesized episode")
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--hold-min', type=float, default=1.5)
+    parser.add_argument('--hold-max', type=float, default=3.0)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    backend = NumpyBackend(args.model)
+    fps = args.fps
+    if args.recorded:
+        raw_episodes, fps = load_recorded(args.recorded, args.fps)
+        episodes = [episode_features for episode_features, _, _ in raw_episodes]
+    else:
+        rng = np.random.default_rng(args.seed)
+        episodes = [synthesize_episode(rng, features, labels, len(class_names), args)[0] for _ in range(args.episodes)]
+    hand_frames = sum(int((~np.isnan(e[:, 0])).sum()) for e in episodes)
+    print(f"{len(episodes)} episode(s), {sum(len(e) for e in episodes)} frames ({hand_frames} with a hand), "
+          f"jitter {args.jitter:g}, cache size {args.cache_size}, min confidence {args.min_confidence:g}")
+
+    base_labels, base_displays, base_outputs, base_seconds, _ = replay(backend, episodes, class_names, fps)
+    print(f"  uncached       {base_seconds / hand_frames * 1e6:6.1f} us/frame")
+    for grid in args.grid:
+        cached_labels, displays, outputs, seconds, hit_rate = replay(
+            backend, episodes, class_names, fps, lambda grid=grid: PredictionCache(grid, args.cache_size, args.min_confidence))
+        label_agree = np.mean([a == b for a, b in zip(base_labels, cached_labels)])
+        stable_agree = np.mean([a == b for a, b in zip(base_displays, displays)])
+        max_diff = max((float(np.abs(a - b).max()) for a, b in zip(base_outputs, outputs) if a is not None), default=0.0)
+        print(f"  grid {grid:<7g}   hit rate {hit_rate:6.1%}   label agree {label_agree:7.2%}   stable agree {stable_agree:7.2%}   "
+              f"max |dp| {max_diff:.3f}   {seconds / hand_frames * 1e6:6.1f} us/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Requests per second per student: polling /get_prediction versus the SSE / long-poll push channel.
+
+A simulated student signs for --seconds at --camera-fps: each sign is held for --hold seconds with a few
+misdetected frames, then the hand drops out briefly. Predictions are recorded into a real RecognitionSession
+on a background thread while one client thread either polls /student/get_prediction every --poll-ms (the old
+pages used 100 ms and 500 ms) or long-polls /student/wait_prediction. The SSE stream sends the same events
+as the long-poll over a single request. Also reports server time per request.
+
+    python -m benchmarks.bench_prediction_push [--seconds 10] [--hold 2] [--poll-ms 100 500]
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from app import create_app, sign_logic
+
+
+def simulate_student(recognition_session, seconds, camera_fps, hold_seconds, stop, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = 'ABCDEFGHI'
+    start = time.monotonic()
+    frame = 0
+    while not stop.is_set() and time.monotonic() - start < seconds:
+        t = frame / camera_fps
+        cycle = int(t // (hold_seconds + 0.5))
+        if t % (hold_seconds + 0.5) >= hold_seconds:
+            prediction, confidence = "No hand detected", 0.0
+        elif rng.random() < 0.05:
+            prediction, confidence = "Low Confidence", 0.0
+        else:
+            prediction, confidence = letters[cycle % len(letters)], float(rng.uniform(0.96, 0.999))
+        recognition_session.record_prediction(prediction, confidence, time.time())
+        frame += 1
+        time.sleep(max(0.0, start + frame / camera_fps - time.monotonic()))
+
+
+def run(client, mode, args, poll_seconds=None):
+    """Returns (requests, sign changes seen, server seconds per request) for one simulated student."""
+    recognition_session = sign_logic.get_session('bench-student')
+    stop = threading.Event()
+    student = threading.Thread(target=simulate_student, args=(recognition_session, args.seconds, args.camera_fps, args.hold, stop))
+    student.start()
+    requests, updates, busy_seconds, last = 0, 0, 0.0, None
+    after_seq = -1
+    while student.is_alive():
+        start = time.perf_counter()
+        if mode == 'poll':
+            data = client.get('/student/get_prediction').json
+        else:
+            response = client.get(f'/student/wait_prediction?after={after_seq}&timeout=1')
+            data = response.json if response.status_code == 200 else None
+        elapsed = time.perf_counter() - start
+        requests += 1
+        if data is not None:
+            if mode != 'poll':
+                after_seq = data['seq']
+            if data['sign'] != last:
+                updates += 1
+                last = data['sign']
+        if mode == 'poll':
+            busy_seconds += elapsed
+            time.sleep(max(0.0, poll_seconds - elapsed))
+    stop.set()
+    student.join()
+    sign_logic.release_session('bench-student')
+    return requests, updates, (busy_seconds / requests if mode == 'poll' else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--hold', type=float, default=2.0)
+    parser.add_argument('--camera-fps', type=float, default=30)
+    parser.add_argument('--poll-ms', type=float, nargs='+', default=[100, 500])
+    args = parser.parse_args()
+
+    sign_logic.warm_up_state = "ready" # the model is not needed: predictions are injected directly
+    app = create_app({'SECRET_KEY': 'bench'})
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['user_role'], flask_session['user_id'] = 'Student', 'bench-student'
+
+    print(f"{args.seconds:g} s of signing at {args.camera_fps:g} fps, each sign held {args.hold:g} s:")
+    for poll_ms in args.poll_ms:
+        requests, updates, per_request = run(client, 'poll', args, poll_ms / 1000)
+        print(f"  poll every {poll_ms:4g} ms   {requests / args.seconds:5.1f} req/s   {updates:3d} sign changes seen   "
+              f"{per_request * 1000:.2f} ms server time per request")
+    requests, updates, _ = run(client, 'long-poll', args)
+    print(f"  long-poll            {requests / args.seconds:5.1f} req/s   {updates:3d} sign changes seen   "
+          f"(SSE: 1 request for the whole session, same events)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Accuracy and cost of dynamic sign recognition (SEQUENCE_MODE, app/sequence_recognition.py).
+
+There are no recorded dynamic signs in the repository, so both the templates and the test streams are
+synthesized from hand_landmarks.pkl poses in normalized space, where a turning hand changes the vector
+(the normalization removes position and size, not rotation):
+
+  Hello       an open hand ('B') waving: two +-30 degree swings about the wrist
+  Thank You   a flat hand ('B') tipping forward from -10 to +60 degrees
+
+Templates come from --templates-per-sign clean performances. Test streams mix fingerspelled letters
+(held --hold seconds each, short transitions between them) with dynamic signs performed with another
+sample of the pose, a random duration (time warp), swing amplitude and per-frame jitter, separated by
+no-hand gaps. Every frame runs the model, the SequenceRecognizer and the default stabilizer, as a
+session does:
+
+  dynamic recognized   dynamic signs the stabilizer showed during the movement or within a second after it
+  letters recognized   letters shown, with and without the sequence recognizer (what it costs static signs)
+  false dynamic        letter holds during which a dynamic sign was newly shown
+
+Throughput: --sessions concurrent sessions (threads) each record a frame every 1/--fps seconds through
+RecognitionSession.record_prediction() with landmarks; reported is the frame rate each session reached
+and the cost of a record_prediction() call, with and without the sequence recognizer.
+
+    python -m benchmarks.bench_sequence_recognition [--streams 20] [--fps 15] [--sessions 1 8 32]
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.inference_backend import NumpyBackend
+from app.model_registry import active_model_path
+from app.prediction_stabilizer import create_stabilizer, MIN_PREDICTION_CONFIDENCE
+from app.recognition_session import RecognitionSession
+from app.sequence_recognition import SEQUENCE_WINDOW_FRAMES, SequenceRecognizer, SequenceTemplates, window_features
+from tools.landmark_dataset import load_landmark_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+NO_HAND = None
+
+
+def rotate(vector, degrees):
+    """A normalized (42,) hand turned about the wrist (the origin of the normalized coordinates)."""
+    radians = np.deg2rad(degrees)
+    rotation = np.array([[np.cos(radians), -np.sin(radians)], [np.sin(radians), np.cos(radians)]], dtype=np.float32)
+    return (vector.reshape(-1, 2) @ rotation.T).reshape(-1)
+
+
+def hello(pose, phase, amplitude=1.0):
+    return rotate(pose, 30 * amplitude * np.sin(2 * np.pi * 2 * phase))
+
+
+def thank_you(pose, phase, amplitude=1.0):
+    return rotate(pose, -10 + 70 * amplitude * phase)
+
+
+DYNAMIC_SIGNS = {'Hello': ('B', hello), 'Thank You': ('B', thank_you)}
+
+
+def perform(motion, pose, frames, amplitude=1.0):
+    return np.stack([motion(pose, phase, amplitude) for phase in np.linspace(0, 1, frames)])
+
+
+def build_templates(rng, features, by_class, per_sign):
+    names, rows = [], []
+    for name, (letter, motion) in DYNAMIC_SIGNS.items():
+        for _ in range(per_sign):
+            pose = features[rng.choice(by_class[letter])]
+            rows.append(window_features(perform(motion, pose, SEQUENCE_WINDOW_FRAMES)))
+            names.append(name)
+    return SequenceTemplates(names, np.stack(rows))
+
+
+def synthesize_stream(rng, features, by_class, class_names, args):
+    """Returns (frames: list of (42,) vectors or NO_HAND, segments [(start, end, sign name, dynamic)])."""
+    frames, segments = [], []
+    previous = None
+    for _ in range(args.items):
+        gap = int(rng.uniform(0.3, 0.8) * args.fps)
+        frames += [NO_HAND] * gap
+        start = len(frames)
+        if rng.random() < args.dynamic_share:
+            name = str(rng.choice(list(DYNAMIC_SIGNS)))
+            letter, motion = DYNAMIC_SIGNS[name]
+            pose = features[rng.choice(by_class[letter])]
+            length = int(rng.uniform(0.8, 1.25) * SEQUENCE_WINDOW_FRAMES)
+            performed = perform(motion, pose, length, rng.uniform(0.8, 1.2))
+            frames += list(performed + rng.normal(0, args.jitter, performed.shape).astype(np.float32))
+            segments.append((start, len(frames), name, True))
+            previous = performed[-1]
+        else:
+            name = class_names[int(rng.integers(len(class_names)))]
+            target = features[rng.choice(by_class[name])]
+            for _ in range(int(args.hold * args.fps)):
+                frames.append(target + rng.normal(0, args.jitter, target.shape).astype(np.float32))
+            if previous is not None: # the hand moving from the last sign into this one
+                frames[start:start + 3] = [previous + (frames[start + 3] - previous) * step / 4 for step in range(1, 4)]
+            segments.append((start, len(frames), name, False))
+            previous = frames[-1]
+    frames += [NO_HAND] * int(args.fps)
+    return frames, segments
+
+
+def frame_predictions(backend, frames, class_names):
+    hand = [i for i, frame in enumerate(frames) if frame is not NO_HAND]
+    probabilities = np.zeros((len(frames), backend.num_classes), dtype=np.float32)
+    probabilities[hand] = backend.predict(np.ascontiguousarray(np.stack([frames[i] for i in hand])))
+    predictions = []
+    for i, frame in enumerate(frames):
+        if frame is NO_HAND:
+            predictions.append(("No hand detected", 0.0, None))
+            continue
+        index = int(np.argmax(probabilities[i]))
+        confidence = float(probabilities[i, index])
+        label = class_names[index] if confidence >= MIN_PREDICTION_CONFIDENCE else "Low Confidence"
+        predictions.append((label, confidence, probabilities[i]))
+    return predictions
+
+
+def replay(streams, fps, templates):
+    """Returns (hits by kind {True: [n, total], False: [n, total]}, false dynamic, us per recognizer update)."""
+    hits = {True: [0, 0], False: [0, 0]}
+    false_dynamic, update_seconds, updates = 0, 0.0, 0
+    for frames, predictions, segments in streams:
+        recognizer = SequenceRecognizer(templates) if templates is not None else None
+        stabilizer = create_stabilizer()
+        displays = []
+        for i, (frame, (prediction, confidence, probabilities)) in enumerate(zip(frames, predictions)):
+            if recognizer is not None:
+                start = time.perf_counter()
+                prediction, confidence, probabilities = recognizer.update(frame, prediction, confidence, probabilities)
+                update_seconds += time.perf_counter() - start
+                updates += 1
+            displays.append(stabilizer.update(prediction, confidence, i / fps, probabilities))
+        for start, end, name, dynamic in segments:
+            shown = displays[start:end + (int(fps) if dynamic else 0)]
+            hits[dynamic][0] += name in shown
+            hits[dynamic][1] += 1
+            if not dynamic: # a dynamic sign appearing during the hold (one still shown from before does not count)
+                false_dynamic += any(displays[i] in DYNAMIC_SIGNS and displays[i] != displays[i - 1] for i in range(start, end))
+    return hits, false_dynamic, update_seconds / max(updates, 1) * 1e6
+
+
+def run_sessions(num_sessions, fps, seconds, templates, stream, predictions):
+    """Runs num_sessions paced sessions for seconds; returns (mean frames/s per session, mean us per record)."""
+    rates, record_seconds = [0.0] * num_sessions, [0.0] * num_sessions
+
+    def session_loop(index):
+        session = RecognitionSession(f'bench-{index}')
+        session.sequence_recognizer = SequenceRecognizer(templates) if templates is not None else None
+        frames, started, busy = 0, time.perf_counter(), 0.0
+        while time.perf_counter() - started < seconds:
+            i = (frames + index * 7) % len(stream)
+            prediction, confidence, probabilities = predictions[i]
+            start = time.perf_counter()
+            session.record_prediction(prediction, confidence, time.time(), probabilities, 'bench', stream[i])
+            busy += time.perf_counter() - start
+            frames += 1
+            delay = started + frames / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        rates[index] = frames / (time.perf_counter() - started)
+        record_seconds[index] = busy / frames * 1e6
+
+    threads = [threading.Thread(target=session_loop, args=(index,)) for index in range(num_sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return float(np.mean(rates)), float(np.mean(record_seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--streams', type=int, default=20)
+    parser.add_argument('--items', type=int, default=10, help="Signs per stream")
+    parser.add_argument('--dynamic-share', type=float, default=0.4, help="Share of signs that are dynamic")
+    parser.add_argument('--hold', type=float, default=2.0, help="Seconds each letter is held")
+    parser.add_argument('--jitter', type=float, default=0.03, help="Per-coordinate landmark noise (normalized units)")
+    parser.add_argument('--templates-per-sign', type=int, default=3)
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each throughput run")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    by_class = {name: np.flatnonzero(labels == index) for index, name in enumerate(class_names)}
+    backend = NumpyBackend(args.model)
+    rng = np.random.default_rng(args.seed)
+    templates = build_templates(rng, features, by_class, args.templates_per_sign)
+    streams = []
+    for _ in range(args.streams):
+        frames, segments = synthesize_stream(rng, features, by_class, class_names, args)
+        streams.append((frames, frame_predictions(backend, frames, class_names), segments))
+    num_frames = sum(len(frames) for frames, _, _ in streams)
+    print(f"{args.streams} streams, {num_frames} frames at {args.fps:g} fps, {len(templates.names)} templates "
+          f"for {', '.join(templates.signs)}, {os.cpu_count()} CPU(s)")
+
+    hits, false_dynamic, update_us = replay(streams, args.fps, templates)
+    static_hits, _, _ = replay(streams, args.fps, None)
+    print(f"  dynamic recognized   {hits[True][0]}/{hits[True][1]} ({hits[True][0] / max(hits[True][1], 1):.0%})")
+    print(f"  letters recognized   {hits[False][0]}/{hits[False][1]} ({hits[False][0] / max(hits[False][1], 1):.0%}), "
+          f"without the sequence recognizer {static_hits[False][0]}/{static_hits[False][1]}")
+    print(f"  false dynamic        {false_dynamic}/{hits[False][1]} letter holds")
+    print(f"  recognizer update    {update_us:.1f} us/frame")
+
+    frames, predictions, _ = streams[0]
+    print(f"Throughput at {args.fps:g} fps per session (record_prediction with landmarks, model outputs precomputed):")
+    for num_sessions in args.sessions:
+        rate, record_us = run_sessions(num_sessions, args.fps, args.seconds, templates, frames, predictions)
+        _, static_us = run_sessions(num_sessions, args.fps, args.seconds, None, frames, predictions)
+        print(f"  {num_sessions:3d} sessions  {rate:5.1f} frames/s per session ({rate / args.fps:.0%} of target), "
+              f"{record_us:6.1f} us per record_prediction ({static_us:6.1f} us without the sequence recognizer)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""Time-to-stable and flip rate of each prediction stabilizer, replayed over landmark sequences.
+
+Sequences are either recorded (--recorded file.npz with 'landmarks' (T, 21, 2) raw MediaPipe coordinates or
+(T, 42) normalized vectors, 'labels' (T,) class indices with -1 where no hand was seen, and optionally 'fps')
+or synthesized from hand_landmarks.pkl: each sign is held for --hold-min..--hold-max seconds using random
+recordings of that class, with --noise of the frames replaced by another class, a few interpolated frames
+while the hand moves to the next sign, and a short no-hand gap in between. The model runs once on every frame;
+each stabilizer then replays the same per-frame predictions.
+
+  time-to-stable  seconds from the start of a sign until the stabilizer shows it (missed: never shown)
+  flips/min       wrong signs shown, plus the right sign lost and shown again within the same hold
+  us/update       cost of one update() call
+
+The previous buffer-recounting majority vote is replayed too, as a reference for the incremental one.
+
+    python -m benchmarks.bench_stabilizers [--episodes 20] [--fps 15] [--set ema.alpha=0.4 hysteresis.enter_frames=4]
+"""
+import argparse
+from collections import deque
+import os
+import time
+
+import numpy as np
+
+from app.inference_backend import NumpyBackend
+from app.model_registry import active_model_path
+from app.landmark_normalization import normalize_landmarks
+from app.prediction_stabilizer import (STABILIZERS, create_stabilizer, MIN_PREDICTION_CONFIDENCE, NON_VALID_SIGN_STATES,
+                                       PREDICTION_BUFFER_SIZE, SMOOTHING_THRESHOLD, STABLE_STATE_HOLD_DURATION)
+from tools.landmark_dataset import load_landmark_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+NO_HAND = -1
+
+
+class PreviousMajorityVote:
+    """The smoothing RecognitionSession used before the Stabilizer interface: recounts the buffer every frame."""
+
+    name = 'previous'
+
+    def __init__(self):
+        self.prediction_buffer = deque(maxlen=PREDICTION_BUFFER_SIZE)
+        self.display = "Ready..."
+        self.last_valid_timestamp = None
+
+    def update(self, prediction, confidence, current_time, probabilities=None):
+        self.prediction_buffer.append(prediction)
+        if len(self.prediction_buffer) == PREDICTION_BUFFER_SIZE:
+            counts = {pred: self.prediction_buffer.count(pred) for pred in set(self.prediction_buffer)}
+            most_common_pred = max(counts, key=counts.get)
+            if counts[most_common_pred] >= int(PREDICTION_BUFFER_SIZE * SMOOTHING_THRESHOLD):
+                if most_common_pred not in NON_VALID_SIGN_STATES:
+                    self.display = most_common_pred
+                    self.last_valid_timestamp = current_time
+                else:
+                    if self.display not in NON_VALID_SIGN_STATES and self.display != "Ready...":
+                        self.display = "Ready..."
+                    self.last_valid_timestamp = None
+            elif self.last_valid_timestamp is not None and current_time - self.last_valid_timestamp >= STABLE_STATE_HOLD_DURATION:
+                self.display = "Ready..."
+                self.last_valid_timestamp = None
+            elif self.last_valid_timestamp is None and self.display != "Ready..." and self.display not in NON_VALID_SIGN_STATES:
+                self.display = "Ready..."
+        elif self.last_valid_timestamp is not None and current_time - self.last_valid_timestamp >= STABLE_STATE_HOLD_DURATION:
+            self.display = "Ready..."
+            self.last_valid_timestamp = None
+        return self.display
+
+
+def synthesize_episode(rng, features, labels, num_classes, args):
+    """Returns (features (T, 42) with NaN rows for no hand, true labels (T,), segment list [(start, end, label)])."""
+    by_class = [np.flatnonzero(labels == c) for c in range(num_classes)]
+    rows, truth, segments = [], [], []
+    for _ in range(args.signs):
+        sign = int(rng.integers(num_classes))
+        gap = int(rng.uniform(0.3, 0.8) * args.fps)
+        rows += [np.full(features.shape[1], np.nan, dtype=np.float32)] * gap
+        truth += [NO_HAND] * gap
+        hold = int(rng.uniform(args.hold_min, args.hold_max) * args.fps)
+        start = len(rows)
+        previous = features[rng.choice(by_class[int(rng.integers(num_classes))])]
+        target = features[rng.choice(by_class[sign])]
+        for step in range(1, 4): # the hand moving into the sign
+            rows.append(previous + (target - previous) * step / 4)
+            truth.append(sign)
+        for _ in range(hold):
+            source = sign if rng.random() >= args.noise else int(rng.integers(num_classes))
+            rows.append(features[rng.choice(by_class[source])])
+            truth.append(sign)
+        segments.append((start, len(rows), sign))
+    return np.asarray(rows, dtype=np.float32), np.asarray(truth), segments
+
+
+def load_recorded(path, default_fps):
+    """Returns ([(features, truth, segments)], fps) from a recorded .npz file."""
+    data = np.load(path)
+    landmarks = np.asarray(data['landmarks'], dtype=np.float32)
+    truth = np.asarray(data['labels'])
+    fps = float(data['fps']) if 'fps' in data else default_fps
+    features = np.full((len(landmarks), 42), np.nan, dtype=np.float32)
+    hand = truth != NO_HAND
+    features[hand] = normalize_landmarks(landmarks[hand].reshape(int(hand.sum()), -1))
+    segments, start = [], None
+    for i in range(len(truth) + 1):
+        label = truth[i] if i < len(truth) else NO_HAND
+        if start is not None and label != truth[start]:
+            segments.append((start, i, int(truth[start])))
+            start = None
+        if start is None and label != NO_HAND:
+            start = i
+    return [(features, truth, segments)], fps
+
+
+def frame_predictions(backend, features, class_names):
+    """Per-frame (prediction, confidence, probabilities) as the live path produces them."""
+    hand = ~np.isnan(features[:, 0])
+    probabilities = np.zeros((len(features), backend.num_classes), dtype=np.float32)
+    if hand.any():
+        probabilities[hand] = backend.predict(np.ascontiguousarray(features[hand]))
+    frames = []
+    for i in range(len(features)):
+        if not hand[i]:
+            frames.append(("No hand detected", 0.0, None))
+            continue
+        index = int(np.argmax(probabilities[i]))
+        confidence = float(probabilities[i, index])
+        label = class_names[index] if confidence >= MIN_PREDICTION_CONFIDENCE else "Low Confidence"
+        frames.append((label, confidence, probabilities[i]))
+    return frames
+
+
+def replay(make_stabilizer, episodes, fps, class_names):
+    """Returns (time-to-stable list, misses, flips, seconds, us per update, displays)."""
+    times, misses, flips, total_seconds, update_seconds, updates = [], 0, 0, 0.0, 0.0, 0
+    all_displays = []
+    for frames, segments in episodes:
+        stabilizer = make_stabilizer()
+        displays = []
+        for i, (prediction, confidence, probabilities) in enumerate(frames):
+            start = time.perf_counter()
+            displays.append(stabilizer.update(prediction, confidence, i / fps, probabilities))
+            update_seconds += time.perf_counter() - start
+        updates += len(frames)
+        total_seconds += len(frames) / fps
+        all_displays.append(displays)
+        for start, end, label in segments:
+            sign = class_names[label]
+            shown = [i for i in range(start, end) if displays[i] == sign]
+            if not shown:
+                misses += 1
+            else:
+                times.append((shown[0] - start) / fps)
+            previous = displays[start - 1] if start else "Ready..."
+            seen_sign = False
+            for i in range(start, end):
+                if displays[i] != previous:
+                    if displays[i] == sign:
+                        flips += seen_sign # shown again after losing it
+                        seen_sign = True
+                    elif displays[i] not in NON_VALID_SIGN_STATES and displays[i] != "Ready...":
+                        flips += 1 # a wrong sign
+                previous = displays[i]
+    return times, misses, flips, total_seconds, update_seconds / max(updates, 1) * 1e6, all_displays
+
+
+def parse_overrides(items):
+    overrides = {kind: {} for kind in STABILIZERS}
+    for item in items:
+        key, value = item.split('=', 1)
+        kind, param = key.split('.', 1)
+        overrides[kind][param] = float(value) if '.' in value else int(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recorded', help="Replay a recorded .npz sequence instead of synthesized ones")
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--episodes', type=int, default=20)
+    parser.add_argument('--signs', type=int, default=8, help="Signs per synthesized episode")
+    parser.add_argument('--fps', type=float, default=15, help="Frame rate of synthesized episodes")
+    parser.add_argument('--hold-min', type=float, default=1.5)
+    parser.add_argument('--hold-max', type=float, default=3.0)
+    parser.add_argument('--noise', type=float, default=0.2, help="Share of held frames taken from another class")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--set', nargs='*', default=[], metavar='KIND.PARAM=VALUE', help="Override stabilizer parameters")
+    args = parser.parse_args()
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    backend = NumpyBackend(args.model)
+    fps = args.fps
+    if args.recorded:
+        raw_episodes, fps = load_recorded(args.recorded, args.fps)
+    else:
+        rng = np.random.default_rng(args.seed)
+        raw_episodes = [synthesize_episode(rng, features, labels, len(class_names), args) for _ in range(args.episodes)]
+    episodes = [(frame_predictions(backend, episode_features, class_names), segments)
+                for episode_features, _, segments in raw_episodes]
+    num_frames = sum(len(frames) for frames, _ in episodes)
+    num_signs = sum(len(segments) for _, segments in episodes)
+    print(f"{len(episodes)} episode(s), {num_signs} signs, {num_frames} frames at {fps:g} fps")
+
+    overrides = parse_overrides(args.set)
+    strategies = [('previous', PreviousMajorityVote)]
+    strategies += [(kind, lambda kind=kind: create_stabilizer(kind, **overrides[kind])) for kind in STABILIZERS]
+    results = {}
+    for name, make_stabilizer in strategies:
+        times, misses, flips, seconds, us_per_update, displays = replay(make_stabilizer, episodes, fps, class_names)
+        results[name] = displays
+        params = getattr(make_stabilizer(), 'params', dict)()
+        median = np.median(times) if times else float('nan')
+        p90 = np.percentile(times, 90) if times else float('nan')
+        print(f"  {name:<11} time-to-stable median {median:5.2f} s  p90 {p90:5.2f} s   missed {misses:3d}/{num_signs}   "
+              f"flips/min {flips / seconds * 60:5.2f}   {us_per_update:5.1f} us/update   {params}")
+    same = results['previous'] == results['majority']
+    print(f"Incremental majority matches the previous smoothing on every frame: {same}")
+
+
+if __name__ == '__main__':
+    main()
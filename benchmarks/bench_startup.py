@@ -0,0 +1,78 @@
+"""Time from process start to the first served response, and to recognition readiness.
+
+Each run is a fresh interpreter that imports the app, calls create_app() and requests --path through the
+test client (no network). It then polls /readyz until recognition resources report ready.
+
+    python -m benchmarks.bench_startup [--runs 3] [--path /auth/login]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def measure(path, ready_timeout):
+    """Child-process side: returns the timings of one cold start as a dict."""
+    process_start = time.perf_counter()
+    from app import create_app
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    client = app.test_client()
+    response = client.get(path)
+    first_response = time.perf_counter()
+
+    ready = None
+    deadline = time.perf_counter() + ready_timeout
+    while time.perf_counter() < deadline:
+        readyz = client.get('/readyz')
+        if readyz.status_code == 200:
+            ready = time.perf_counter()
+            break
+        if readyz.status_code == 404: # no readiness endpoint: resources were loaded inside create_app
+            ready = created
+            break
+        time.sleep(0.01)
+
+    from app import sign_logic
+    if getattr(sign_logic, '_warm_up_thread', None) is not None:
+        sign_logic._warm_up_thread.join() # let it finish printing before the result line
+    return {
+        'status': response.status_code,
+        'import_s': imported - process_start,
+        'create_app_s': created - imported,
+        'first_response_s': first_response - process_start,
+        'ready_s': ready - process_start if ready else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--path', default='/auth/login', help="Route requested right after create_app()")
+    parser.add_argument('--ready-timeout', type=float, default=60)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.path, args.ready_timeout)))
+        return
+
+    print(f"GET {args.path} after a cold start ({args.runs} runs):")
+    print(f"  {'imports':>9} {'create_app':>11} {'first response':>15} {'recognition ready':>18}")
+    for _ in range(args.runs):
+        child = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--child', '--path', args.path,
+                                '--ready-timeout', str(args.ready_timeout)],
+                               cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        ready = f"{result['ready_s'] * 1000:13.0f} ms" if result['ready_s'] is not None else f"{'timeout':>16}"
+        print(f"  {result['import_s'] * 1000:6.0f} ms {result['create_app_s'] * 1000:8.0f} ms "
+              f"{result['first_response_s'] * 1000:12.0f} ms {ready}   (HTTP {result['status']})")
+
+
+if __name__ == '__main__':
+    main()
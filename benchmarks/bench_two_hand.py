@@ -0,0 +1,110 @@
+"""Frame rate of one-hand versus two-hand recognition (HAND_MODE, see sign_logic._classify_hands).
+
+Frames are built from the sign images in app/static/Images: a one-hand frame is a sign image padded to
+640x480, a two-hand frame puts the image next to its mirror image (the same sign made with the other
+hand). Each case runs MediaPipe Hands (created as the app does for that mode) and the classification
+on --frames frames, with the prediction cache off so every frame invokes the model:
+
+  one-hand mode, one hand      today's live path
+  two-hand mode, one hand      TwoHandTracker (app/hand_tracking.py) with only one hand in view
+  max_num_hands=2, one hand    a plain two-hand MediaPipe tracker instead, which detects on every frame
+  two-hand mode, two hands     both hands in one batched invoke
+  two hands, two invokes       the same hands classified one invoke after another, for comparison
+
+    python -m benchmarks.bench_two_hand [--signs B L V Y] [--frames 150] [--search-interval 5]
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from app import sign_logic
+from app.hand_tracking import HAND_SEARCH_INTERVAL, TwoHandTracker
+from app.landmark_normalization import normalize_landmarks, landmarks_to_array, mirror_normalized_landmarks
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'static', 'Images')
+
+
+def load_frames(signs):
+    one_hand, two_hands = [], []
+    for sign in signs:
+        image = cv2.imread(os.path.join(IMAGES_DIR, f'{sign}.png'))
+        if image is None:
+            continue
+        half = cv2.resize(image, (320, 480))
+        blank = np.full_like(half, 235)
+        one_hand.append(cv2.cvtColor(np.hstack([half, blank]), cv2.COLOR_BGR2RGB))
+        two_hands.append(cv2.cvtColor(np.hstack([half, cv2.flip(half, 1)]), cv2.COLOR_BGR2RGB))
+    return one_hand, two_hands
+
+
+def classify_sequentially(results, prediction_cache=None):
+    """_classify_hands() with one model invoke per hand instead of one batch; returns (label, confidence)."""
+    model = sign_logic.active_model
+    best = None
+    for hand_landmarks, handedness in sign_logic._detected_hands(results):
+        normalized = normalize_landmarks(landmarks_to_array(hand_landmarks))
+        if handedness != sign_logic.TRAINED_HANDEDNESS:
+            mirror_normalized_landmarks(normalized)
+        prediction = sign_logic._label_prediction(model.predict(normalized[0]), model.class_names)
+        if best is None or prediction[1] > best[1]:
+            best = prediction
+    return best
+
+
+def run_case(hands, frames, num_frames, classify):
+    """Returns (frames/s, classification us/frame, mean hands tracked, predictions seen)."""
+    for image in frames[:2]:
+        hands.process(image) # first frames include graph start-up
+    tracked, classify_seconds, predictions = 0, 0.0, set()
+    start = time.perf_counter()
+    for i in range(num_frames):
+        results = hands.process(frames[(i // 15) % len(frames)]) # each sign held for 15 frames, as in a 1 s hold at 15 fps
+        if results.multi_hand_landmarks:
+            tracked += len(results.multi_hand_landmarks)
+            classify_start = time.perf_counter()
+            predictions.add(classify(results, None)[0])
+            classify_seconds += time.perf_counter() - classify_start
+    seconds = time.perf_counter() - start
+    return num_frames / seconds, classify_seconds / num_frames * 1e6, tracked / num_frames, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signs', nargs='+', default=['B', 'L', 'V', 'Y'])
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--search-interval', type=int, default=HAND_SEARCH_INTERVAL)
+    args = parser.parse_args()
+
+    if not sign_logic.ensure_model_loaded():
+        raise SystemExit("Model could not be loaded.")
+    one_hand, two_hands = load_frames(args.signs)
+    print(f"Model '{sign_logic.active_model.version}' ({sign_logic.active_model.num_features} features), "
+          f"{len(one_hand)} sign(s), {args.frames} frames per case, {os.cpu_count()} CPU(s)")
+
+    two_hand_tracker = lambda: TwoHandTracker(sign_logic._create_hands, args.search_interval)
+    cases = [
+        ('one-hand mode, one hand', 'one', one_hand, sign_logic._classify_results, lambda: sign_logic._create_hands(1)),
+        ('two-hand mode, one hand', 'two', one_hand, sign_logic._classify_results, two_hand_tracker),
+        ('max_num_hands=2, one hand', 'two', one_hand, sign_logic._classify_results, lambda: sign_logic._create_hands(2)),
+        ('two-hand mode, two hands', 'two', two_hands, sign_logic._classify_results, two_hand_tracker),
+        ('two hands, two invokes', 'two', two_hands, classify_sequentially, two_hand_tracker),
+    ]
+    baseline = None
+    for name, mode, frames, classify, create_hands in cases:
+        sign_logic.HAND_MODE = mode
+        hands = create_hands()
+        try:
+            fps, classify_us, tracked, predictions = run_case(hands, frames, args.frames, classify)
+        finally:
+            hands.close()
+        baseline = baseline or fps
+        print(f"  {name:<26} {fps:6.1f} frames/s ({fps / baseline:4.2f}x)  classify {classify_us:7.1f} us/frame  "
+              f"{tracked:4.2f} hands/frame  predictions: {', '.join(sorted(predictions))}")
+    sign_logic.HAND_MODE = 'one'
+
+
+if __name__ == '__main__':
+    main()
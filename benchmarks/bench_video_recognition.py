@@ -0,0 +1,103 @@
+"""Throughput of uploaded-video recognition (app/video_recognition.py) by pool size, against one serial pass.
+
+Without --video, a practice recording is synthesized from the sign images in app/static/Images: each sign of
+--signs is held for --hold seconds (with a little hand jitter) between short empty gaps, written at --fps as
+MJPG, mirrored like a webcam recording. The serial baseline runs the same slice task over the whole file in
+this process; each --workers entry then runs a full job (slices in the process pool, stabilizer, attempts;
+nothing is saved). Pool start-up is excluded: one warm-up job runs first. Throughput only scales up to the
+number of cores (the pool is capped by VIDEO_WORKERS, default os.cpu_count()).
+
+    python -m benchmarks.bench_video_recognition [--signs B H L L O] [--hold 4] [--fps 30] [--stride 2] [--workers 1 2 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from app import sign_logic, video_recognition
+from app.model_metadata import load_model_metadata
+from app.model_registry import resolve_model
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'static', 'Images')
+
+
+def synthesize_video(path, signs, hold_seconds, gap_seconds, fps, seed=0):
+    rng = np.random.default_rng(seed)
+    images = {sign: cv2.imread(os.path.join(IMAGES_DIR, f'{sign}.png')) for sign in set(signs)}
+    height, width = next(iter(images.values())).shape[:2]
+    blank = np.full((height, width, 3), 235, dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    frames = 0
+    for sign in signs:
+        for _ in range(int(gap_seconds * fps)):
+            writer.write(blank)
+            frames += 1
+        for _ in range(int(hold_seconds * fps)):
+            dx, dy = rng.normal(0, 1.5, 2)
+            shifted = cv2.warpAffine(images[sign], np.float32([[1, 0, dx], [0, 1, dy]]), (width, height), borderMode=cv2.BORDER_REPLICATE)
+            writer.write(cv2.flip(shifted, 1)) # a webcam recording is mirrored; the job flips it back
+            frames += 1
+    writer.release()
+    return frames
+
+
+def run_job(video_path, stride):
+    """Runs one job to completion on a copy of the video (jobs delete their upload); returns (seconds, job)."""
+    fd, copy_path = tempfile.mkstemp(suffix='.avi')
+    os.close(fd)
+    with open(video_path, 'rb') as source, open(copy_path, 'wb') as target:
+        target.write(source.read())
+    job = video_recognition.VideoRecognitionJob('bench', copy_path, lambda job, attempts: {}, stride=stride)
+    start = time.perf_counter()
+    video_recognition.submit_video_job(job, sign_logic.MODEL_REGISTRY_DIR, sign_logic.MODEL_VARIANT)
+    while not job.finished:
+        time.sleep(0.01)
+    if job.state == 'failed':
+        raise SystemExit(f"Job failed: {job.error}")
+    return time.perf_counter() - start, job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help="Process this file instead of a synthesized one")
+    parser.add_argument('--signs', nargs='+', default=['B', 'H', 'L', 'L', 'O'])
+    parser.add_argument('--hold', type=float, default=4.0)
+    parser.add_argument('--gap', type=float, default=0.5)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--stride', type=int, default=video_recognition.VIDEO_FRAME_STRIDE)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    video_path = args.video
+    if video_path is None:
+        video_path = os.path.join(tempfile.mkdtemp(), 'practice.avi')
+        frames = synthesize_video(video_path, args.signs, args.hold, args.gap, args.fps)
+        print(f"Synthesized {frames} frames ({frames / args.fps:.1f}s) signing {' '.join(args.signs)}")
+    frame_count, fps = video_recognition.probe_video(video_path)
+    _, model_path = resolve_model(None, sign_logic.MODEL_VARIANT, sign_logic.MODEL_REGISTRY_DIR)
+    class_names = load_model_metadata(model_path)['class_names']
+    print(f"{frame_count} frames at {fps:g} fps, stride {args.stride}, {os.cpu_count()} CPU(s)")
+
+    video_recognition.recognize_video_slice(video_path, 0, args.stride, args.stride, model_path) # imports MediaPipe, loads the model
+    start = time.perf_counter()
+    indices, probabilities = video_recognition.recognize_video_slice(video_path, 0, frame_count, args.stride, model_path)
+    serial_seconds = time.perf_counter() - start
+    attempts = video_recognition.derive_sign_attempts(indices / fps, probabilities, class_names)
+    print(f"  serial, in process    {serial_seconds:6.2f}s  {len(indices) / serial_seconds:6.1f} frames/s  "
+          f"attempts: {' '.join(a['sign'] for a in attempts) or '-'}")
+
+    for workers in args.workers:
+        video_recognition._pool = None
+        video_recognition.VIDEO_WORKERS = workers
+        run_job(video_path, args.stride) # starts the pool processes and loads their models
+        seconds, job = run_job(video_path, args.stride)
+        print(f"  pool, {workers} worker(s)    {seconds:6.2f}s  {job.frames_sampled / seconds:6.1f} frames/s  "
+              f"{serial_seconds / seconds:4.2f}x  attempts: {' '.join(a['sign'] for a in job.attempts) or '-'}")
+        video_recognition._get_pool().shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,8 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 class Config:
     SECRET_KEY = os.environ.get('FLASK_SECRET_KEY')
    
-    MODEL_PATH = os.path.join(basedir, 'svm_sign_model_normalized.pkl')
+    MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR') or os.path.join(basedir, 'models') # Versioned models and manifest.json (see app/model_registry.py)
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
     SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY')
     SUPABASE_SERVICE_KEY = os.environ.get('SUPABASE_SERVICE_KEY')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') # /metrics requires 'Authorization: Bearer <token>'; unset, it is only served in debug mode
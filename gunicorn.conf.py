@@ -0,0 +1,21 @@
+import os
+
+# --- Gunicorn Config ---
+# The gthread worker spends one thread per open connection, and the student pages keep connections open:
+# the MJPEG /student/video_feed, the SSE /student/prediction_events and, only while the stream cannot be
+# opened, a /student/wait_prediction long-poll (up to 25 s). The pool is sized so that EXPECTED_VIEWERS open
+# practice pages still leave REQUEST_THREADS free for login, submissions and the admin pages.
+EXPECTED_VIEWERS = int(os.getenv('EXPECTED_VIEWERS', 30)) # Practice pages open at once (one class)
+THREADS_PER_VIEWER = 3 # video_feed + prediction_events + a wait_prediction during fallback (2 once SSE is open)
+REQUEST_THREADS = int(os.getenv('REQUEST_THREADS', 16)) # Left for ordinary requests when every viewer is connected
+# --------------------------------
+
+workers = 1 # Recognition sessions, the camera broadcaster and the model registry live in one process
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 0)) or EXPECTED_VIEWERS * THREADS_PER_VIEWER + REQUEST_THREADS
+timeout = 120
+
+
+def when_ready(server):
+    server.log.info(f"{threads} threads: {EXPECTED_VIEWERS} practice pages x {THREADS_PER_VIEWER} streaming "
+                    f"connections + {REQUEST_THREADS} for other requests")
@@ -0,0 +1,18 @@
+import shutil
+
+import pytest
+
+from app.model_registry import load_manifest, registered_file_path, MODEL_REGISTRY_DIR
+
+
+@pytest.fixture
+def work_model(tmp_path):
+    """Path of a working copy of the active model version (model, metadata, variants and extra files) in tmp_path/work."""
+    work_dir = tmp_path / 'work'
+    work_dir.mkdir()
+    manifest = load_manifest(MODEL_REGISTRY_DIR)
+    version = manifest['active']
+    entry = manifest['versions'][version]
+    for file_name in entry['files']:
+        shutil.copyfile(registered_file_path(MODEL_REGISTRY_DIR, version, entry, file_name), work_dir / file_name)
+    return work_dir / entry['model_file']
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import create_app, sign_logic
+from app.student import assignment_routes
+
+ASSIGNMENT_ID = 7
+STUDENT_ID = 'student-1'
+
+
+class FakeQuery:
+    """Answers the assignment lookup of _load_open_assignment: an open assignment without a due date."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return SimpleNamespace(data={'due_date': None, 'lesson_id': None})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = create_app({'TESTING': True, 'SECRET_KEY': 'test'})
+    app.supabase = SimpleNamespace(table=lambda name: FakeQuery())
+    saved = []
+    monkeypatch.setattr(assignment_routes, 'save_auto_graded_submission',
+                        lambda supabase, student_id, assignment_id, notes, attempts, lesson_id=None: saved.append(attempts) or (1, 90.0, []))
+    sign_logic.release_session(STUDENT_ID)
+    with app.test_client() as client:
+        with client.session_transaction() as flask_session:
+            flask_session.update(user_id=STUDENT_ID, user_role='Student')
+        client.saved = saved
+        yield client
+    sign_logic.release_session(STUDENT_ID)
+
+
+def submit(client):
+    return client.post(f'/student/assignment/{ASSIGNMENT_ID}/submit', data={'submission_notes': 'A B'})
+
+
+def flashed(client):
+    with client.session_transaction() as flask_session:
+        return flask_session.get('_flashes', [])
+
+
+def test_submit_without_practice_run_is_refused(client):
+    response = submit(client)
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/student/assignment/{ASSIGNMENT_ID}/view')
+    assert client.saved == []
+    assert [(category, 'No practice run' in message) for category, message in flashed(client)] == [('warning', True)]
+
+
+def test_submit_after_session_release_is_refused(client):
+    sign_logic.get_session(STUDENT_ID).start_attempts(ASSIGNMENT_ID)
+    sign_logic.release_session(STUDENT_ID) # logout, eviction after inactivity or a restart
+    submit(client)
+    assert client.saved == []
+    assert 'No practice run' in flashed(client)[0][1]
+
+
+def test_submit_with_empty_practice_run_is_refused(client):
+    sign_logic.get_session(STUDENT_ID).start_attempts(ASSIGNMENT_ID)
+    submit(client)
+    assert client.saved == []
+    assert 'No signs have been recorded' in flashed(client)[0][1]
+
+
+def test_submit_with_attempts_is_graded(client):
+    recognition_session = sign_logic.get_session(STUDENT_ID)
+    recognition_session.start_attempts(ASSIGNMENT_ID)
+    with recognition_session.lock:
+        recognition_session.attempt_log.append({'sign': 'A', 'confidence': 0.9}, ASSIGNMENT_ID)
+    response = submit(client)
+    assert [[attempt['sign'] for attempt in attempts] for attempts in client.saved] == [['A']]
+    assert '/student/submission/' in response.headers['Location']
+
+
+def test_every_new_attempt_is_pushed_and_listed(client):
+    recognition_session = sign_logic.get_session(STUDENT_ID)
+    recognition_session.start_attempts(ASSIGNMENT_ID)
+    with recognition_session.lock:
+        for sign in 'ABC': # three attempts between two pushes
+            recognition_session.attempt_log.append({'sign': sign, 'confidence': 0.9}, ASSIGNMENT_ID)
+    assert [attempt['sign'] for attempt in recognition_session.snapshot()['recent_attempts']] == ['A', 'B', 'C']
+    attempts = client.get(f'/student/assignment/{ASSIGNMENT_ID}/attempts').get_json()['attempts']
+    assert [attempt['sign'] for attempt in attempts] == ['A', 'B', 'C']
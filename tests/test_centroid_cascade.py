@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from app.centroid_cascade import CentroidCascade, load_centroid_cascade
+from app.model_metadata import ModelMetadataError
+from app.model_registry import LoadedModel, resolve_centroids, resolve_model
+
+PROBABILITIES = np.array([[0.9, 0.05, 0.05], [0.05, 0.9, 0.05], [0.05, 0.05, 0.9]], dtype=np.float32)
+
+
+@pytest.fixture
+def cascade():
+    # Class 0 at the origin, class 1 with two prototypes along x, class 2 far up y; radius 1, other class 2x farther
+    prototypes = [[0.0, 0.0], [10.0, 0.0], [12.0, 0.0], [0.0, 20.0]]
+    return CentroidCascade(prototypes, [0, 1, 1, 2], PROBABILITIES, radii=[1.0, 1.0, 1.0], ratio_threshold=2.0)
+
+
+@pytest.mark.parametrize('vector, expected', [
+    ([0.5, 0.0], 0), # inside class 0's radius, far from the rest
+    ([11.6, 0.5], 1), # near class 1's second prototype
+    ([0.0, 1.5], None), # outside every radius
+    ([5.0, 0.0], None), # between classes 0 and 1
+])
+def test_exit_class_answers_only_clear_hands(cascade, vector, expected):
+    assert cascade.exit_class(np.array(vector, dtype=np.float32)) == expected
+
+
+def brute_force_exit(cascade, vector):
+    distances = np.sqrt(((cascade.prototypes - vector) ** 2).sum(axis=1))
+    per_class = [distances[cascade.prototype_classes == index].min() for index in range(cascade.num_classes)]
+    nearest = int(np.argmin(per_class))
+    other = min(distance for index, distance in enumerate(per_class) if index != nearest)
+    return nearest if per_class[nearest] <= cascade.radii[nearest] and other >= cascade.ratio_threshold * per_class[nearest] else None
+
+
+def test_batch_and_single_exits_match_a_brute_force_search(cascade):
+    vectors = np.random.default_rng(0).uniform(-2, 14, size=(500, 2)).astype(np.float32)
+    mask, classes = cascade.early_exit(vectors)
+    expected = [brute_force_exit(cascade, vector) for vector in vectors]
+    assert [int(c) if answered else None for answered, c in zip(mask, classes)] == expected
+    assert [cascade.exit_class(vector) for vector in vectors] == expected
+    assert 0 < mask.sum() < len(vectors)
+
+
+def test_save_and_load_round_trip(cascade, tmp_path):
+    loaded = load_centroid_cascade(cascade.save(str(tmp_path / 'model.centroids.npz')))
+    assert np.array_equal(loaded.prototypes, cascade.prototypes) and loaded.ratio_threshold == cascade.ratio_threshold
+    assert loaded.exit_class(np.array([0.5, 0.0], dtype=np.float32)) == 0
+
+
+def test_load_rejects_unreadable_and_newer_files(cascade, tmp_path):
+    broken = tmp_path / 'broken.npz'
+    broken.write_bytes(b'not an npz file')
+    with pytest.raises(ValueError):
+        load_centroid_cascade(str(broken))
+    newer = str(tmp_path / 'newer.npz')
+    np.savez(newer, format_version=99)
+    with pytest.raises(ValueError, match='format_version'):
+        load_centroid_cascade(newer)
+
+
+@pytest.fixture(scope='module')
+def model():
+    version, path = resolve_model()
+    model = LoadedModel(version, path, resolve_centroids(version))
+    yield model
+    model.close()
+
+
+def test_loaded_model_answers_prototypes_without_the_model(model):
+    index = 0
+    prototype = model.cascade.prototypes[np.flatnonzero(model.cascade.prototype_classes == index)[0]]
+    answered = model.predict(prototype)
+    assert np.shares_memory(answered, model.cascade.class_probabilities) and int(np.argmax(answered)) == index
+    far = np.full(model.num_features, 50.0, dtype=np.float32) # outside every radius
+    rows = model.predict_many([prototype, far])
+    assert np.shares_memory(rows[0], model.cascade.class_probabilities)
+    assert not np.shares_memory(rows[1], model.cascade.class_probabilities) and len(rows[1]) == len(model.class_names) # from the scheduler
+
+
+def test_loaded_model_rejects_prototypes_of_another_shape(model, cascade, tmp_path):
+    path = cascade.save(str(tmp_path / 'other.centroids.npz')) # 2 features, 3 classes
+    with pytest.raises(ModelMetadataError):
+        LoadedModel(model.version, model.path, path)
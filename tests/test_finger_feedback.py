@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.finger_feedback import FingerFeedback, FingerStats, finger_stats_path_for
+from app.model_registry import (LoadedModel, ModelRegistryError, register_model, resolve_finger_stats, resolve_model,
+                                load_manifest, MODEL_REGISTRY_DIR)
+from tools.landmark_dataset import load_landmark_dataset
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return load_landmark_dataset(renormalize=False)
+
+
+def active_stats_path():
+    return resolve_finger_stats(None, MODEL_REGISTRY_DIR)
+
+
+def test_active_version_registers_its_finger_stats():
+    path = active_stats_path()
+    assert path is not None and os.path.basename(path) == os.path.basename(finger_stats_path_for(resolve_model()[1]))
+    assert resolve_finger_stats('v1', MODEL_REGISTRY_DIR) is None
+
+
+def test_loaded_model_carries_the_finger_stats():
+    version, path = resolve_model()
+    model = LoadedModel(version, path, finger_stats_path=active_stats_path())
+    try:
+        assert sorted(model.finger_stats.class_names) == sorted(model.class_names)
+    finally:
+        model.close()
+
+
+def test_register_model_shares_identical_stats_and_checks_their_hash(tmp_path, work_model):
+    registry_dir, model_path = tmp_path / 'registry', work_model
+    assert register_model(str(model_path), registry_dir=str(registry_dir)) == 'v1'
+    assert register_model(str(model_path), registry_dir=str(registry_dir)) == 'v2'
+    stats_file = os.path.basename(finger_stats_path_for(str(model_path)))
+    assert load_manifest(str(registry_dir))['versions']['v2']['shared_files'][stats_file] == 'v1'
+
+    with open(registry_dir / 'v1' / stats_file, 'ab') as f:
+        f.write(b'\0')
+    with pytest.raises(ModelRegistryError):
+        resolve_finger_stats('v2', str(registry_dir))
+
+
+def test_register_model_rejects_unreadable_stats(tmp_path, work_model):
+    with open(finger_stats_path_for(str(work_model)), 'wb') as f:
+        f.write(b'not an npz file')
+    with pytest.raises(ValueError):
+        register_model(str(work_model), registry_dir=str(tmp_path / 'registry'))
+
+
+def test_feedback_follows_the_frames_model_version(dataset):
+    features, labels, class_names = dataset
+    stats = FingerStats.load(active_stats_path())
+    stats_by_version = {None: stats, 'v-old': stats, 'v-new': None}
+    feedback = FingerFeedback('A', stats_by_version.get, interval=0.0)
+    hand = features[labels == class_names.index('S')][0]
+
+    assert feedback.update('S', hand, 0.0, 'v-old') is not None
+    assert feedback.update('S', hand, 1.0, 'v-new') is None # the new version has no statistics: no stale result
+    assert feedback.update('S', hand, 2.0, 'v-old') is not None
+    assert feedback.update('A', hand, 3.0, 'v-old') is None # a frame of the target clears it
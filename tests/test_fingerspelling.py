@@ -0,0 +1,76 @@
+import string
+
+import numpy as np
+import pytest
+
+from app.fingerspelling import FingerspellingDecoder, LexiconTrie, vocabulary_words
+
+CLASS_NAMES = list(string.ascii_uppercase) + ['Hello']
+GAP = 4 # handless frames that end a word
+
+
+def letter(char, probability=0.97):
+    row = np.full(len(CLASS_NAMES), (1.0 - probability) / (len(CLASS_NAMES) - 1), dtype=np.float32)
+    row[CLASS_NAMES.index(char)] = probability
+    return row
+
+
+def spell(decoder, frames):
+    """Feeds frames (a letter, '-' for a low-confidence frame, None for no hand); returns the words it ended."""
+    words = []
+    for frame in frames:
+        probabilities = None if frame is None else letter('A', 0.3) if frame == '-' else letter(frame)
+        word = decoder.update(probabilities, 0.0)
+        if word is not None:
+            words.append(word['sign'])
+    return words
+
+
+def held(text, frames=5):
+    return [char for char in text for _ in range(frames)]
+
+
+@pytest.fixture
+def decoder():
+    trie = LexiconTrie(['CAT', 'CAR', 'BAL', 'BALL', 'COW'], CLASS_NAMES)
+    return FingerspellingDecoder(trie, word_gap_frames=GAP)
+
+
+def test_vocabulary_words_are_upper_case_unique_and_at_least_two_letters():
+    assert vocabulary_words(['Cat, dog!', ['cat', 'a I'], None, 'x-ray']) == ['CAT', 'DOG', 'RAY']
+
+
+def test_trie_leaves_out_words_with_unknown_letters():
+    trie = LexiconTrie(['cat', 'café', 'CAT', 'C4T'], CLASS_NAMES)
+    assert trie.words == ['CAT'] and len(trie) == 1
+    node = trie.children[trie.children[0][CLASS_NAMES.index('C')]][CLASS_NAMES.index('A')]
+    assert trie.prefix(node) == 'CA' and trie.word[node] is None
+
+
+def test_held_letters_collapse_into_the_word(decoder):
+    assert spell(decoder, held('CAT') + [None] * GAP) == ['CAT']
+
+
+def test_a_doubled_letter_needs_a_blank_between_its_holds(decoder):
+    assert spell(decoder, held('BAL', 8) + [None] * GAP) == ['BAL']
+    assert spell(decoder, held('BAL') + ['-', '-'] + held('L') + [None] * GAP) == ['BALL']
+
+
+def test_a_word_missing_from_the_trie_is_never_produced(decoder):
+    words = spell(decoder, held('DOG') + [None] * GAP) + spell(decoder, held('CATS') + [None] * GAP)
+    assert set(words) <= set(decoder.trie.words) # at most the nearest vocabulary word, never DOG or CATS
+    assert 'CAT' in words # the letter after a complete word has no branch to follow
+    assert spell(decoder, held('CAR') + [None] * GAP) == ['CAR'] # the search started over
+
+
+def test_hypotheses_rank_the_words_of_the_current_prefix(decoder):
+    spell(decoder, held('CA'))
+    assert decoder.prefix() == 'CA' and all(hypothesis['score'] < 0.01 for hypothesis in decoder.hypotheses())
+    spell(decoder, held('T'))
+    best = decoder.hypotheses()[0]
+    assert best['word'] == 'CAT' and best['score'] > 0.9
+
+
+def test_no_word_without_a_hand_or_with_another_models_output(decoder):
+    assert spell(decoder, [None] * (3 * GAP)) == []
+    assert decoder.update(np.ones(5, dtype=np.float32) / 5) is None # a different class count counts as a gap
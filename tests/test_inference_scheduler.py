@@ -0,0 +1,117 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.inference_scheduler import InferenceScheduler
+
+NUM_FEATURES = 4
+
+
+class GatedModel:
+    """Doubles its input; the first batch blocks until release(), so requests pile up behind it."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        self.started.set()
+        self.gate.wait(5)
+        return batch * 2.0
+
+
+def vector(value):
+    return np.full(NUM_FEATURES, value, dtype=np.float32)
+
+
+@pytest.fixture
+def model():
+    return GatedModel()
+
+
+@pytest.fixture
+def scheduler(model):
+    scheduler = InferenceScheduler(model, num_features=NUM_FEATURES, max_batch_size=4)
+    yield scheduler
+    model.gate.set()
+    scheduler.stop()
+
+
+def block(scheduler, model):
+    """Occupies the scheduler thread with a one-request batch; returns that request's Future."""
+    first = scheduler.submit(vector(-1))
+    assert model.started.wait(5)
+    return first
+
+
+def test_requests_queued_behind_a_batch_share_the_next_one(scheduler, model):
+    first = block(scheduler, model)
+    futures = [scheduler.submit(vector(i)) for i in range(3)]
+    model.gate.set()
+    assert first.result(5)[0] == -2
+    assert [future.result(5)[0] for future in futures] == [0, 2, 4] # each caller gets its own row
+    assert model.batch_sizes == [1, 3]
+
+
+def test_batches_never_exceed_max_batch_size(scheduler, model):
+    block(scheduler, model)
+    futures = [scheduler.submit(vector(i)) for i in range(10)]
+    model.gate.set()
+    assert [future.result(5)[0] for future in futures] == [2 * i for i in range(10)]
+    assert model.batch_sizes == [1, 4, 4, 2]
+    assert scheduler.stats['max_batch_seen'] == 4 and scheduler.stats['requests'] == 11
+
+
+def test_submit_many_lands_in_one_batch(scheduler, model):
+    block(scheduler, model)
+    scheduler.submit(vector(0))
+    hands = scheduler.submit_many([vector(1), vector(2)])
+    model.gate.set()
+    assert [future.result(5)[0] for future in hands] == [2, 4]
+    assert model.batch_sizes == [1, 3]
+
+
+def test_a_failed_batch_fails_its_requests_only():
+    calls = []
+
+    def run_batch(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise ValueError("model error")
+        return batch.copy()
+
+    scheduler = InferenceScheduler(run_batch, num_features=NUM_FEATURES)
+    try:
+        with pytest.raises(ValueError):
+            scheduler.predict(vector(1))
+        assert scheduler.predict(vector(3))[0] == 3 # the thread keeps serving
+        assert scheduler.stats['errors'] == 1
+    finally:
+        scheduler.stop()
+
+
+def test_stop_fails_pending_requests_and_refuses_new_ones(scheduler, model):
+    block(scheduler, model)
+    pending = scheduler.submit(vector(1))
+    stopper = threading.Thread(target=scheduler.stop)
+    stopper.start()
+    model.gate.set()
+    stopper.join(5)
+    with pytest.raises(RuntimeError):
+        pending.result(5)
+    with pytest.raises(RuntimeError):
+        scheduler.submit(vector(2))
+
+
+def test_thread_initializer_runs_on_the_scheduler_thread():
+    threads = []
+    scheduler = InferenceScheduler(lambda batch: batch.copy(), num_features=NUM_FEATURES,
+                                   thread_initializer=lambda: threads.append(threading.current_thread().name))
+    try:
+        scheduler.predict(vector(0))
+        assert threads == ['inference-scheduler']
+    finally:
+        scheduler.stop()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from app.landmark_normalization import (normalize_landmarks, landmarks_to_array, mirror_normalized_landmarks,
+                                        MIDDLE_FINGER_MCP, NUM_FEATURES)
+from benchmarks.bench_normalization import legacy_normalize, as_mediapipe_hand, image_space_hands
+from tools.landmark_dataset import load_landmark_dataset
+
+
+@pytest.fixture(scope='module')
+def dataset_hands():
+    features, _, _ = load_landmark_dataset()
+    return features, image_space_hands(features, np.random.default_rng(0))
+
+
+def test_matches_the_legacy_loop_hand_by_hand(dataset_hands):
+    _, raw_points = dataset_hands
+    hands = [as_mediapipe_hand(points) for points in raw_points[:500]]
+    points_buffer, out_buffer = np.empty((1, 21, 2), dtype=np.float32), np.empty((1, NUM_FEATURES), dtype=np.float32)
+    for hand in hands:
+        vectorized = normalize_landmarks(landmarks_to_array(hand, out=points_buffer[0])[None], out=out_buffer)
+        np.testing.assert_allclose(vectorized, legacy_normalize(hand), atol=1e-4)
+
+
+def test_batch_matches_the_training_normalization(dataset_hands):
+    features, raw_points = dataset_hands
+    np.testing.assert_allclose(normalize_landmarks(raw_points), features, atol=1e-4)
+
+
+def test_accepts_single_hands_and_flat_rows(dataset_hands):
+    _, raw_points = dataset_hands
+    expected = normalize_landmarks(raw_points[:3])
+    np.testing.assert_allclose(normalize_landmarks(raw_points[0]), expected[:1])
+    np.testing.assert_allclose(normalize_landmarks(raw_points[:3].reshape(3, NUM_FEATURES)), expected)
+
+
+def test_writes_into_the_given_buffer(dataset_hands):
+    _, raw_points = dataset_hands
+    out = np.empty((4, NUM_FEATURES), dtype=np.float32)
+    assert normalize_landmarks(raw_points[:4], out=out) is out
+
+
+def test_degenerate_hand_stays_finite():
+    points = np.full((1, 21, 2), 0.5, dtype=np.float32) # wrist and middle finger MCP coincide
+    normalized = normalize_landmarks(points)
+    assert np.isfinite(normalized).all() and not normalized.any()
+
+
+def test_wrist_is_origin_and_scale_is_one(dataset_hands):
+    _, raw_points = dataset_hands
+    normalized = normalize_landmarks(raw_points[:10]).reshape(-1, 21, 2)
+    np.testing.assert_allclose(normalized[:, 0], 0, atol=1e-6)
+    np.testing.assert_allclose(np.hypot(*normalized[:, MIDDLE_FINGER_MCP].T), 1, atol=1e-5)
+
+
+def test_mirroring_negates_x_only(dataset_hands):
+    features, _ = dataset_hands
+    mirrored = mirror_normalized_landmarks(features[:5].copy())
+    np.testing.assert_array_equal(mirrored[:, 0::2], -features[:5, 0::2])
+    np.testing.assert_array_equal(mirrored[:, 1::2], features[:5, 1::2])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app import create_app
+from app.landmark_wire import (decode_landmark_payload, encode_prediction_records, LandmarkPayloadError, LANDMARK_DTYPE,
+                               MAX_LANDMARK_BATCH, NUM_LANDMARKS, PREDICTION_RECORD_DTYPE)
+
+
+def packed(hands, dims=2):
+    return np.arange(hands * NUM_LANDMARKS * dims, dtype=LANDMARK_DTYPE).tobytes()
+
+
+@pytest.mark.parametrize('dims', [2, 3])
+def test_decode_keeps_x_and_y_of_every_hand(dims):
+    points = decode_landmark_payload(packed(3, dims), dims=dims)
+    assert points.shape == (3, NUM_LANDMARKS, 2) and points.dtype == np.float32
+    assert points[1, 0].tolist() == [NUM_LANDMARKS * dims, NUM_LANDMARKS * dims + 1] # the second hand's wrist, z dropped
+
+
+@pytest.mark.parametrize('payload, dims', [
+    (b'', 2), # empty
+    (packed(1)[:-1], 2), # not whole float32 values
+    (packed(1)[:-4], 2), # one float short of a hand
+    (packed(1, 3), 2), # 3-D hand sent as 2-D: 63 floats
+    (packed(1), 4), # unsupported dims
+    (packed(MAX_LANDMARK_BATCH + 1), 2), # too many hands
+])
+def test_decode_rejects_malformed_payloads(payload, dims):
+    with pytest.raises(LandmarkPayloadError):
+        decode_landmark_payload(payload, dims=dims)
+
+
+@pytest.mark.parametrize('bad_value', [np.nan, np.inf])
+def test_decode_rejects_non_finite_coordinates(bad_value):
+    values = np.frombuffer(packed(2), dtype=LANDMARK_DTYPE).copy()
+    values[50] = bad_value
+    with pytest.raises(LandmarkPayloadError):
+        decode_landmark_payload(values.tobytes())
+
+
+def test_decode_ignores_non_finite_z():
+    values = np.frombuffer(packed(1, 3), dtype=LANDMARK_DTYPE).copy()
+    values[2] = np.nan # the wrist's z, which is never used
+    assert decode_landmark_payload(values.tobytes(), dims=3).shape == (1, NUM_LANDMARKS, 2)
+
+
+def test_prediction_records_round_trip():
+    records = np.frombuffer(encode_prediction_records([3, 25], [0.5, 0.99]), dtype=PREDICTION_RECORD_DTYPE)
+    assert records['class_index'].tolist() == [3, 25]
+    assert np.allclose(records['confidence'], [0.5, 0.99])
+
+
+def test_route_answers_malformed_payloads_with_400():
+    app = create_app({'TESTING': True, 'SECRET_KEY': 'test'})
+    with app.test_client() as client:
+        with client.session_transaction() as flask_session:
+            flask_session.update(user_id='student-wire', user_role='Student')
+        response = client.post('/student/recognize_landmarks', data=packed(1)[:-4])
+        assert response.status_code == 400 and 'multiple of 42' in response.get_json()['error']
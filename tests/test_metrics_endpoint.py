@@ -0,0 +1,26 @@
+import pytest
+
+from app import create_app
+
+
+def metrics_client(**config):
+    app = create_app(dict({'TESTING': True, 'SECRET_KEY': 'test', 'METRICS_TOKEN': None}, **config))
+    return app, app.test_client()
+
+
+def test_metrics_without_a_token_are_not_served():
+    _, client = metrics_client()
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_without_a_token_are_served_in_debug_mode():
+    app, client = metrics_client()
+    app.debug = True
+    assert client.get('/metrics').status_code == 200
+
+
+@pytest.mark.parametrize('authorization, status', [(None, 403), ('Bearer wrong', 403), ('Bearer secret', 200)])
+def test_metrics_require_the_configured_token(authorization, status):
+    _, client = metrics_client(METRICS_TOKEN='secret')
+    headers = {'Authorization': authorization} if authorization else {}
+    assert client.get('/metrics', headers=headers).status_code == status
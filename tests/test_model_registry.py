@@ -0,0 +1,111 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from app import sign_logic
+from app.model_registry import (load_manifest, register_model, resolve_model, write_manifest,
+                                ModelRegistryError, MANIFEST_FORMAT_VERSION)
+
+
+@pytest.fixture
+def registry(tmp_path, work_model):
+    """A registry in tmp_path/registry holding the working model as v1."""
+    registry_dir = str(tmp_path / 'registry')
+    register_model(str(work_model), registry_dir=registry_dir)
+    return registry_dir
+
+
+def tamper(path):
+    with open(path, 'ab') as f:
+        f.write(b'\0')
+
+
+def test_resolve_checks_the_model_against_its_hash(registry):
+    version, path = resolve_model(registry_dir=registry)
+    assert version == 'v1'
+    tamper(path)
+    with pytest.raises(ModelRegistryError, match='sha256'):
+        resolve_model(registry_dir=registry)
+
+
+def test_unknown_versions_and_names_are_rejected(registry, work_model):
+    with pytest.raises(ModelRegistryError, match='Unknown model version'):
+        resolve_model('v9', registry_dir=registry)
+    with pytest.raises(ModelRegistryError, match='already registered'):
+        register_model(str(work_model), version='v1', registry_dir=registry)
+    with pytest.raises(ModelRegistryError, match='Invalid version name'):
+        register_model(str(work_model), version='../v2', registry_dir=registry)
+
+
+def test_a_new_version_shares_unchanged_files(registry, work_model):
+    assert register_model(str(work_model), registry_dir=registry) == 'v2'
+    manifest = load_manifest(registry)
+    entry = manifest['versions']['v2']
+    assert set(entry['shared_files']) == set(entry['files']) and set(entry['shared_files'].values()) == {'v1'}
+    assert manifest['active'] == 'v1' # registered without activate
+    assert resolve_model('v2', registry_dir=registry)[1] == resolve_model('v1', registry_dir=registry)[1]
+
+
+@pytest.mark.parametrize('owner', ['v9', 'v2'])
+def test_shared_files_must_point_at_a_version_storing_them(registry, work_model, owner):
+    register_model(str(work_model), registry_dir=registry)
+    manifest = load_manifest(registry)
+    entry = manifest['versions']['v2']
+    file_name = entry['model_file']
+    entry['shared_files'][file_name] = owner # v9 does not exist, v2 would share with itself
+    write_manifest(manifest, registry)
+    with pytest.raises(ModelRegistryError, match='does not store the same file'):
+        load_manifest(registry)
+
+
+def test_newer_manifest_formats_are_rejected(registry):
+    manifest = load_manifest(registry)
+    manifest['format_version'] = MANIFEST_FORMAT_VERSION + 1
+    write_manifest(manifest, registry)
+    with pytest.raises(ModelRegistryError, match='format_version'):
+        load_manifest(registry)
+
+
+def test_invalid_json_is_reported(registry):
+    with open(f'{registry}/manifest.json', 'w') as f:
+        f.write('{"active": ')
+    with pytest.raises(ModelRegistryError, match='not valid JSON'):
+        load_manifest(registry)
+
+
+@pytest.fixture
+def serving(monkeypatch, registry):
+    """sign_logic serving from the temporary registry, restored afterwards."""
+    for name in ('active_model', 'MODEL_PATH', 'inference_backend', 'CLASS_NAMES', 'model_metadata',
+                 'model_reload_error', '_loaded_manifest_mtime'):
+        monkeypatch.setattr(sign_logic, name, getattr(sign_logic, name))
+    monkeypatch.setattr(sign_logic, 'active_model', None)
+    monkeypatch.setattr(sign_logic, 'MODEL_REGISTRY_DIR', registry)
+    monkeypatch.setattr(sign_logic, 'MODEL_RETIRE_DELAY', 0)
+    sign_logic.load_model_resources()
+    yield registry
+    sign_logic.active_model.close()
+
+
+def test_hot_swap_serves_the_new_version(serving, work_model):
+    old_model = sign_logic.active_model
+    assert old_model.version == 'v1'
+    register_model(str(work_model), registry_dir=serving, activate=True)
+    result = sign_logic.reload_model()
+    assert result == {'status': 'reloaded', 'version': 'v2', 'previous_version': 'v1'}
+    assert sign_logic.active_model.version == 'v2' and sign_logic.active_model is not old_model
+    probabilities = sign_logic.predict_scheduled(np.zeros(sign_logic.active_model.num_features, dtype=np.float32))
+    assert len(probabilities) == len(sign_logic.active_model.class_names)
+    assert sign_logic.reload_model()['status'] == 'unchanged'
+
+
+def test_a_version_that_fails_to_verify_keeps_the_old_one_serving(serving, work_model):
+    other_model = work_model.with_name('other_model.tflite') # a model v1 does not store, so v2 keeps its own copy
+    shutil.copyfile(work_model, other_model)
+    shutil.copyfile(work_model.with_suffix('.json'), other_model.with_suffix('.json'))
+    register_model(str(other_model), registry_dir=serving)
+    tamper(f'{serving}/v2/other_model.tflite')
+    result = sign_logic.reload_model('v2')
+    assert result['status'] == 'failed' and result['version'] == 'v1' and 'sha256' in result['error']
+    assert sign_logic.active_model.version == 'v1' and sign_logic.model_reload_error
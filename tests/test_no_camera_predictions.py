@@ -0,0 +1,75 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from app import create_app, sign_logic
+from tools.landmark_dataset import load_landmark_dataset
+
+STUDENT_ID = 'student-no-camera'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('NO_CAMERA', '1')
+    app = create_app({'TESTING': True, 'SECRET_KEY': 'test'})
+    sign_logic.start_warm_up()
+    deadline = time.monotonic() + 60
+    while not sign_logic.is_ready():
+        assert sign_logic.warm_up_state != 'failed' and time.monotonic() < deadline
+        time.sleep(0.05)
+    sign_logic.release_session(STUDENT_ID)
+    with app.test_client() as client:
+        with client.session_transaction() as flask_session:
+            flask_session.update(user_id=STUDENT_ID, user_role='Student')
+        yield client
+    sign_logic.release_session(STUDENT_ID)
+
+
+def hand_of(sign):
+    """Packed landmark payload of one training hand of sign (already normalized, which normalization keeps)."""
+    features, labels, class_names = load_landmark_dataset(renormalize=False)
+    return np.ascontiguousarray(features[labels == class_names.index(sign)][0], dtype='<f4').tobytes()
+
+
+def test_status_shown_until_the_browser_sends_hands(client):
+    assert client.get('/student/get_prediction').get_json()['sign'] == str(sign_logic.resource_status_message)
+
+
+def test_landmark_predictions_are_not_overridden(client):
+    payload = hand_of('A')
+    for _ in range(15):
+        assert client.post('/student/recognize_landmarks', data=payload).status_code == 200
+    prediction = client.get('/student/get_prediction').get_json()
+    assert prediction['sign'] == 'A'
+    assert client.get(f"/student/wait_prediction?after={prediction['seq'] - 1}&timeout=1").get_json()['sign'] == 'A'
+
+
+def test_waiters_wake_on_session_changes_while_a_status_is_shown(monkeypatch):
+    monkeypatch.setattr(sign_logic, '_status_override', lambda recognition_session: "Warming up...")
+    recognition_session = sign_logic.RecognitionSession(STUDENT_ID)
+    after_seq = recognition_session.prediction_seq
+    feeder = threading.Timer(0.1, lambda: [recognition_session.record_prediction('A', 0.99, time.time()) for _ in range(15)])
+    feeder.start()
+    start = time.monotonic()
+    prediction = sign_logic.wait_for_prediction(recognition_session, after_seq, timeout=5)
+    feeder.join()
+    assert prediction is not None and prediction['seq'] > after_seq
+    assert time.monotonic() - start < 1
+
+
+def test_dashboard_captures_in_the_browser(client):
+    page = client.get('/student/dashboard').get_data(as_text=True)
+    assert '<video id="video-feed" class="browser-capture"' in page and '<img id="video-feed">' not in page
+    assert 'const browserCapture = true;' in page and 'js/browser_capture.js' in page
+
+
+def test_browser_frames_are_recognized(client):
+    frame = cv2.imencode('.jpg', np.full((240, 320, 3), 128, dtype=np.uint8))[1].tobytes()
+    response = client.post('/student/recognize_frame', data=frame, content_type='image/jpeg')
+    assert response.status_code == 200, response.get_json()
+    recognition_session = sign_logic.get_session(STUDENT_ID)
+    assert recognition_session.last_frame_at is not None and recognition_session.stats['frames_without_hand'] == 1
+    assert sign_logic._status_override(recognition_session) is None
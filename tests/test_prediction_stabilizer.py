@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from app.prediction_stabilizer import create_stabilizer, EmaStabilizer, HysteresisStabilizer, MajorityVoteStabilizer, READY
+
+
+def feed(stabilizer, predictions, start=0.0, step=0.1):
+    display = None
+    for i, prediction in enumerate(predictions):
+        display = stabilizer.update(prediction, 0.99, start + i * step)
+    return display
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.55])
+def test_majority_without_strict_majority_shows_the_most_frequent_sign(threshold):
+    # 0.55 of 10 frames requires 5, as does 0.5: two signs can both reach it
+    stabilizer = MajorityVoteStabilizer(buffer_size=10, threshold=threshold)
+    assert feed(stabilizer, ['A'] * 6 + ['B'] * 4) == 'A'
+    assert stabilizer.update('B', 0.99, 1.0) == 'A' # 5 A, 5 B: the shown sign stays
+    assert stabilizer.update('C', 0.99, 1.1) == 'B' # 4 A, 5 B, 1 C
+
+
+def test_majority_never_shows_the_latest_label_over_a_more_frequent_one():
+    stabilizer = MajorityVoteStabilizer(buffer_size=10, threshold=0.3)
+    assert feed(stabilizer, ['A'] * 7 + ['B'] * 3) == 'A'
+
+
+@pytest.mark.parametrize('buffer_size, threshold', [(10, 0.0), (10, -0.5), (10, 1.5), (0, 0.9)])
+def test_majority_rejects_invalid_parameters(buffer_size, threshold):
+    with pytest.raises(ValueError):
+        MajorityVoteStabilizer(buffer_size=buffer_size, threshold=threshold)
+
+
+def test_majority_default_needs_nine_of_ten():
+    stabilizer = MajorityVoteStabilizer(buffer_size=10, threshold=0.9)
+    assert feed(stabilizer, ['A'] * 8 + ['B'] * 2) == READY
+    assert feed(stabilizer, ['A'] * 9, start=1.0) == 'A'
+
+
+def probabilities(index, value, num_classes=3):
+    row = np.full(num_classes, (1.0 - value) / (num_classes - 1), dtype=np.float32)
+    row[index] = value
+    return row
+
+
+def test_ema_shows_a_sign_once_its_average_reaches_the_threshold():
+    stabilizer = EmaStabilizer(alpha=0.3, enter_threshold=0.7)
+    for i in range(3): # average 1 - 0.7^3 = 0.66
+        assert stabilizer.update('A', 1.0, i * 0.1, probabilities(0, 1.0)) == READY
+    assert stabilizer.update('A', 1.0, 0.3, probabilities(0, 1.0)) == 'A'
+
+
+def test_ema_counts_low_confidence_frames():
+    stabilizer = EmaStabilizer(alpha=0.5, enter_threshold=0.7)
+    stabilizer.update('A', 0.95, 0.0, probabilities(0, 0.95)) # teaches the name of class 0
+    for i in range(1, 4):
+        display = stabilizer.update('Low Confidence', 0.8, i * 0.1, probabilities(0, 0.8))
+    assert display == 'A'
+
+
+def test_ema_holds_the_sign_after_the_hand_leaves_then_releases_it():
+    stabilizer = EmaStabilizer(alpha=0.5, enter_threshold=0.7, hold_duration=1.0)
+    for i in range(4):
+        stabilizer.update('A', 1.0, i * 0.1, probabilities(0, 1.0))
+    assert stabilizer.update('No hand detected', 0.0, 0.5) == 'A' # decays below the threshold, still held
+    assert stabilizer.update('No hand detected', 0.0, 1.4) == READY
+
+
+def test_hysteresis_enters_after_consecutive_frames_only():
+    stabilizer = HysteresisStabilizer(enter_frames=3, exit_frames=2)
+    assert feed(stabilizer, ['A', 'A', 'B', 'A', 'A']) == READY # the run of A was broken
+    assert stabilizer.update('A', 0.99, 0.5) == 'A'
+
+
+def test_hysteresis_keeps_the_sign_through_borderline_frames():
+    stabilizer = HysteresisStabilizer(enter_frames=2, exit_frames=2, exit_confidence=0.6)
+    stabilizer.update('A', 0.99, 0.0, probabilities(0, 0.99))
+    assert stabilizer.update('A', 0.99, 0.1, probabilities(0, 0.99)) == 'A'
+    for i in range(2, 6): # below MIN_PREDICTION_CONFIDENCE but still supporting A
+        assert stabilizer.update('Low Confidence', 0.7, i * 0.1, probabilities(0, 0.7)) == 'A'
+    assert stabilizer.update('Low Confidence', 0.5, 0.6, probabilities(0, 0.5)) == 'A'
+    assert stabilizer.update('Low Confidence', 0.5, 0.7, probabilities(0, 0.5)) == READY # exit_frames without support
+
+
+def test_hysteresis_switches_to_a_new_sign_held_long_enough():
+    stabilizer = HysteresisStabilizer(enter_frames=2, exit_frames=10)
+    assert feed(stabilizer, ['A', 'A', 'B']) == 'A'
+    assert stabilizer.update('B', 0.99, 0.3) == 'B'
+
+
+def test_status_is_shown_until_the_next_sign():
+    stabilizer = MajorityVoteStabilizer(buffer_size=3, threshold=0.9)
+    stabilizer.set_status("Camera error")
+    assert stabilizer.update('No hand detected', 0.0, 0.0) == "Camera error"
+    assert feed(stabilizer, ['A'] * 3, start=0.1) == 'A'
+
+
+def test_create_stabilizer_applies_params_and_rejects_unknown_kinds():
+    stabilizer = create_stabilizer('hysteresis', enter_frames=7)
+    assert isinstance(stabilizer, HysteresisStabilizer) and stabilizer.params()['enter_frames'] == 7
+    with pytest.raises(ValueError):
+        create_stabilizer('median')
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from app.landmark_normalization import NUM_FEATURES
+from app.sequence_recognition import LandmarkWindow, SequenceRecognizer, SequenceTemplates, window_features
+
+WINDOW, SEGMENTS, LAG, FEATURES = 12, 3, 2, 4
+
+
+def brute_force_features(history, min_hand_fraction=0.5):
+    """What LandmarkWindow.features() should return for frames pushed in history (None = no hand), recomputed from scratch."""
+    rows = []
+    for i, frame in enumerate(history):
+        if frame is None:
+            rows.append(None)
+            continue
+        earlier = history[i - LAG] if i >= LAG else None
+        change = np.abs(frame - earlier) if earlier is not None else np.zeros(FEATURES)
+        rows.append(np.concatenate([frame, change]))
+    window = rows[-WINDOW:]
+    segment_frames = WINDOW // SEGMENTS
+    features = []
+    for segment in range(SEGMENTS):
+        present = [row for row in window[segment * segment_frames:(segment + 1) * segment_frames] if row is not None]
+        if len(history) < WINDOW or len(present) < min_hand_fraction * segment_frames:
+            return None
+        features.append(np.mean(present, axis=0))
+    return np.concatenate(features)
+
+
+def test_window_features_match_a_full_recomputation():
+    rng = np.random.default_rng(0)
+    window = LandmarkWindow(WINDOW, SEGMENTS, FEATURES, motion_lag=LAG)
+    history = []
+    for step in range(80):
+        frame = None if rng.random() < 0.2 else rng.normal(size=FEATURES).astype(np.float32)
+        window.push(frame)
+        history.append(frame)
+        expected = brute_force_features(history)
+        features = window.features()
+        if expected is None:
+            assert features is None, step
+        else:
+            assert features is not None and np.allclose(features, expected, atol=1e-5), step
+
+
+def test_window_needs_enough_hands_in_every_segment():
+    window = LandmarkWindow(WINDOW, SEGMENTS, FEATURES, motion_lag=LAG)
+    for i in range(WINDOW):
+        window.push(None if i < WINDOW // SEGMENTS else np.ones(FEATURES, dtype=np.float32)) # first segment empty
+    assert window.full and window.features() is None
+    window.clear()
+    assert window.count == 0 and window.features() is None
+
+
+@pytest.mark.parametrize('window_frames, segments, motion_lag', [(10, 3, 2), (12, 3, 0), (12, 3, 12)])
+def test_window_rejects_invalid_shapes(window_frames, segments, motion_lag):
+    with pytest.raises(ValueError):
+        LandmarkWindow(window_frames, segments, FEATURES, motion_lag=motion_lag)
+
+
+def test_template_features_equal_the_live_window_on_the_same_movement():
+    recording = np.linspace(0, 1, WINDOW)[:, None] * np.arange(1, FEATURES + 1)[None, :] # WINDOW frames, no resampling
+    window = LandmarkWindow(WINDOW, SEGMENTS, FEATURES, motion_lag=LAG)
+    for frame in [recording[0]] * LAG + list(recording): # still before the recording starts
+        window.push(frame.astype(np.float32))
+    assert np.allclose(window.features(), window_features(recording, WINDOW, SEGMENTS, LAG), atol=1e-5)
+
+
+def test_match_takes_the_nearest_template_of_each_sign():
+    templates = SequenceTemplates(['Hello', 'Hello', 'Thank You'], [[0.0, 0.0], [1.0, 1.0], [0.4, 0.4]])
+    sign, distance, confidences = templates.match(np.array([0.9, 0.9], dtype=np.float32))
+    assert sign == 'Hello' and distance == pytest.approx(0.1)
+    assert templates.signs == ['Hello', 'Thank You'] and confidences.argmax() == 0 and confidences.sum() == pytest.approx(1.0)
+
+
+def wave(frames):
+    """A whole hand moving back and forth: enough motion for a dynamic sign."""
+    return [np.full(NUM_FEATURES, np.sin(i), dtype=np.float32) for i in range(frames)]
+
+
+@pytest.fixture
+def recognizer():
+    templates = SequenceTemplates(['Hello'], [window_features(wave(WINDOW), WINDOW, SEGMENTS, LAG)], WINDOW, SEGMENTS, LAG)
+    return SequenceRecognizer(templates, min_motion=0.5, match_distance=0.5, hold_frames=3)
+
+
+def test_a_moving_hand_near_a_template_becomes_the_dynamic_sign(recognizer):
+    static = np.array([0.2, 0.8], dtype=np.float32)
+    outputs = [recognizer.update(frame, 'B', 0.8, static) for frame in wave(WINDOW)]
+    sign, confidence, probabilities = outputs[-1]
+    assert sign == 'Hello' and confidence == pytest.approx(1.0)
+    assert probabilities.tolist() == [0.0, 0.0, 1.0] # static classes, then the dynamic signs
+
+    after = [recognizer.update(None, 'No hand detected', 0.0)[0] for _ in range(8)] # the hand leaves
+    assert after[0] == 'Hello' and after[-1] == 'No hand detected' # held for a few frames, then frames pass through again
+    assert after.count('Hello') <= 2 + recognizer.hold_frames # matches stop once the last segment has too few hands
+
+
+def test_a_still_hand_keeps_the_static_prediction(recognizer):
+    static = np.array([0.1, 0.9], dtype=np.float32)
+    for _ in range(2 * WINDOW):
+        sign, confidence, probabilities = recognizer.update(np.ones(NUM_FEATURES, dtype=np.float32), 'B', 0.9, static)
+    assert (sign, confidence) == ('B', 0.9)
+    assert probabilities.tolist() == pytest.approx([0.1, 0.9, 0.0])
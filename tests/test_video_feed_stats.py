@@ -0,0 +1,25 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    return create_app({'TESTING': True, 'SECRET_KEY': 'test'})
+
+
+def client_as(app, role):
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session.update(user_id=f'{role.lower()}-1', user_role=role)
+    return client
+
+
+def test_students_cannot_list_streaming_students(app):
+    assert client_as(app, 'Student').get('/student/video_feed/stats').status_code == 404
+    assert client_as(app, 'Student').get('/admin/video_feed/stats').status_code == 403
+
+
+def test_admins_get_feed_stats(app):
+    response = client_as(app, 'Admin').get('/admin/video_feed/stats')
+    assert response.status_code == 200 and 'pipelines' in response.get_json()
@@ -0,0 +1,62 @@
+from concurrent.futures import Future
+import os
+
+import numpy as np
+import pytest
+
+from app import video_recognition
+from app.model_metadata import load_model_metadata
+from app.model_registry import active_model_path, MODEL_REGISTRY_DIR
+
+FPS = 30.0
+NUM_FRAMES = 300 # 10 s, several attempt holds
+
+
+class InlinePool:
+    """Runs recognize_video_slice's stand-in at submit time, like a pool that has already finished."""
+
+    def __init__(self, slice_result):
+        self.slice_result = slice_result
+
+    def submit(self, fn, video_path, start, stop, stride, *args):
+        future = Future()
+        future.set_result(self.slice_result(start, stop, stride))
+        return future
+
+
+@pytest.fixture
+def run_job(monkeypatch, tmp_path):
+    def run(probability_rows):
+        video_path = tmp_path / 'upload.mp4'
+        video_path.write_bytes(b'')
+        monkeypatch.setattr(video_recognition, 'probe_video', lambda path: (NUM_FRAMES, FPS))
+
+        def slice_result(start, stop, stride):
+            indices = np.arange(start, stop, stride)
+            return indices, np.repeat(probability_rows, len(indices), axis=0)
+
+        monkeypatch.setattr(video_recognition, '_get_pool', lambda: InlinePool(slice_result))
+        saved = []
+        job = video_recognition.VideoRecognitionJob('student-1', str(video_path), lambda job, attempts: saved.append(attempts) or {'grade': 90.0}, stride=3)
+        video_recognition._run_job(job, MODEL_REGISTRY_DIR, 'default')
+        return job, saved
+    return run
+
+
+def num_classes():
+    return len(load_model_metadata(active_model_path())['class_names'])
+
+
+def test_video_without_hands_fails_without_saving(run_job):
+    job, saved = run_job(np.full((1, num_classes()), np.nan, dtype=np.float32))
+    assert job.state == 'failed' and 'No signs were recognized' in job.error and 'no hand' in job.error
+    assert saved == []
+    assert not os.path.exists(job.video_path)
+
+
+def test_video_with_a_held_sign_is_saved(run_job):
+    rows = np.zeros((1, num_classes()), dtype=np.float32)
+    rows[0, 0] = 1.0
+    job, saved = run_job(rows)
+    assert job.state == 'done', job.error
+    assert len(saved) == 1 and saved[0] and all(attempt['sign'] == job.attempts[0]['sign'] for attempt in saved[0])
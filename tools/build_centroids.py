@@ -0,0 +1,144 @@
+"""Builds the class prototypes of the centroid cascade (app/centroid_cascade.py) for a model.
+
+Only the training split of hand_landmarks.pkl is used (the held-out split of benchmarks/bench_centroid_cascade.py
+is never seen), itself divided into a fit part and a calibration part:
+
+  prototypes     --prototypes k-means centers per class of the fit vectors (1: the class centroid), float32
+  answers        per class, the model's mean output on the fit vectors it classifies as that class
+  radii          per class, the --radius-quantile of its fit vectors' distance to their nearest own prototype;
+                 hands farther than that from every prototype always go to the model
+  ratio          the smallest distance ratio (nearest other class / nearest class) at which the early exits on the
+                 calibration vectors agree with the model's class at least --target-agreement of the time
+
+Writes <model>.centroids.npz next to the model (about 40 KB at 8 prototypes per class), then register the model
+(tools/register_model.py) to publish it with a new version. Registered versions are never modified, so a model
+inside the registry is scored where it is but the file goes elsewhere: copy the version's files to a working
+directory first, or pass --output to inspect the result. Rebuild after retraining: the answers and the
+calibration belong to one model.
+
+    python -m tools.build_centroids --model work/landmark_model.tflite [--prototypes 8] [--target-agreement 0.999]
+    python -m tools.register_model work/landmark_model.tflite --activate
+"""
+import argparse
+import os
+
+import numpy as np
+
+from app.centroid_cascade import CentroidCascade, centroids_path_for
+from app.inference_backend import NumpyBackend
+from app.model_metadata import load_model_metadata
+from app.model_registry import active_model_path, MODEL_REGISTRY_DIR
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def kmeans(vectors, k, rng, iterations=25):
+    """k centers of vectors (Lloyd's algorithm from k distinct samples); the mean for k=1."""
+    if k <= 1 or len(vectors) <= k:
+        return vectors.mean(axis=0, keepdims=True)
+    centers = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmin(((vectors[:, None, :] - centers[None]) ** 2).sum(axis=2), axis=1)
+        for j in range(k):
+            members = vectors[assignment == j]
+            if len(members):
+                centers[j] = members.mean(axis=0)
+    return centers
+
+
+def margins(prototypes, prototype_classes, vectors):
+    """(nearest class, distance to it, distance to the nearest prototype of another class) of every vector."""
+    distances = np.sqrt(((vectors[:, None, :] - prototypes[None]) ** 2).sum(axis=2))
+    nearest = np.argmin(distances, axis=1)
+    classes = prototype_classes[nearest]
+    nearest_distance = distances[np.arange(len(vectors)), nearest]
+    other_distance = np.where(prototype_classes[None, :] != classes[:, None], distances, np.inf).min(axis=1)
+    return classes, nearest_distance, other_distance
+
+
+def calibrate_ratio(ratios, agrees, target_agreement):
+    """Smallest ratio threshold whose early exits (ratio >= threshold) agree with the model at least target_agreement of the time."""
+    order = np.argsort(-ratios)
+    disagreements = np.cumsum(~agrees[order])
+    allowed = (1.0 - target_agreement) * np.arange(1, len(order) + 1)
+    valid = np.flatnonzero(disagreements <= allowed)
+    if not len(valid):
+        return float('inf')
+    return float(ratios[order[valid[-1]]])
+
+
+def build_cascade(features, labels, model_probabilities, num_classes, args, rng):
+    """Returns (CentroidCascade, calibration exit share, calibration agreement)."""
+    (fit, fit_labels), (calibration, _) = split_dataset(features, labels, args.calibration_fraction, seed=args.seed)
+    fit_model, calibration_model = model_probabilities
+    fit_predicted = fit_model.argmax(axis=1)
+
+    prototypes, prototype_classes = [], []
+    for index in range(num_classes):
+        centers = kmeans(fit[fit_labels == index], args.prototypes, rng)
+        prototypes.append(centers)
+        prototype_classes += [index] * len(centers)
+    prototypes, prototype_classes = np.concatenate(prototypes).astype(np.float32), np.asarray(prototype_classes)
+
+    class_probabilities = np.zeros((num_classes, num_classes), dtype=np.float32)
+    for index in range(num_classes):
+        rows = fit_model[fit_predicted == index]
+        class_probabilities[index] = rows.mean(axis=0) if len(rows) else np.eye(num_classes, dtype=np.float32)[index]
+    class_probabilities /= class_probabilities.sum(axis=1, keepdims=True)
+
+    classes, nearest_distance, _ = margins(prototypes, prototype_classes, fit)
+    radii = np.zeros(num_classes, dtype=np.float32)
+    for index in range(num_classes):
+        own = nearest_distance[(classes == index) & (fit_labels == index)]
+        radii[index] = np.quantile(own, args.radius_quantile) if len(own) else 0.0
+
+    classes, nearest_distance, other_distance = margins(prototypes, prototype_classes, calibration)
+    inside = nearest_distance <= radii[classes]
+    ratios = np.where(inside, other_distance / np.maximum(nearest_distance, 1e-9), 0.0)
+    agrees = classes == calibration_model.argmax(axis=1)
+    ratio_threshold = calibrate_ratio(ratios[inside], agrees[inside], args.target_agreement)
+    exits = inside & (ratios >= ratio_threshold)
+    agreement = float(agrees[exits].mean()) if exits.any() else 1.0
+    return CentroidCascade(prototypes, prototype_classes, class_probabilities, radii, ratio_threshold), float(exits.mean()), agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--output', help="Default: <model>.centroids.npz next to the model")
+    parser.add_argument('--prototypes', type=int, default=8, help="Prototypes per class (1: the class centroid)")
+    parser.add_argument('--radius-quantile', type=float, default=0.99)
+    parser.add_argument('--target-agreement', type=float, default=0.999, help="Share of early exits that must match the model")
+    parser.add_argument('--calibration-fraction', type=float, default=0.25, help="Share of the training split held back to calibrate the ratio")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = args.output or centroids_path_for(args.model)
+    if os.path.commonpath([os.path.abspath(output), MODEL_REGISTRY_DIR]) == MODEL_REGISTRY_DIR:
+        raise SystemExit(f"{output} is inside the model registry, whose versions are never modified; "
+                         f"copy the model and its .json to a working directory, or pass --output.")
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    if list(class_names) != list(load_model_metadata(args.model)['class_names']):
+        raise SystemExit(f"{args.landmark_file} and {args.model} list different classes.")
+    (train_features, train_labels), _ = split_dataset(features, labels)
+    backend = NumpyBackend(args.model)
+    if backend.num_features != train_features.shape[1]:
+        raise SystemExit(f"{args.model} takes {backend.num_features} features; the landmark file has {train_features.shape[1]}.")
+
+    (fit, _), (calibration, _) = split_dataset(train_features, train_labels, args.calibration_fraction, seed=args.seed)
+    model_probabilities = (backend.predict(fit), backend.predict(calibration))
+    cascade, exit_share, agreement = build_cascade(train_features, train_labels, model_probabilities, len(class_names),
+                                                   args, np.random.default_rng(args.seed))
+
+    path = cascade.save(output, os.path.basename(args.model))
+    print(f"{len(cascade)} prototypes ({args.prototypes} per class) from {len(fit)} training vectors; "
+          f"distance ratio {cascade.ratio_threshold:.2f} calibrated on {len(calibration)} more: "
+          f"{exit_share:.0%} exit early, {agreement:.2%} of them agree with the model.")
+    print(f"Wrote {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Builds the per-class landmark statistics behind finger feedback (app/finger_feedback.py) for a model.
+
+From the training split of hand_landmarks.pkl (the held-out split of benchmarks/bench_finger_feedback.py is
+never seen), each class is cut into --variants k-means clusters (a sign made with the hand turned a little
+differently stays its own variant) and each cluster's mean and standard deviation per normalized coordinate are
+stored. Deviations are never divided by less than --min-std, so the wrist (always the origin) and the scale
+landmark do not blow up. The file is matched to the model by class name and is about 35 KB.
+
+Writes <model>.finger_stats.npz next to the model, then register the model (tools/register_model.py) to publish
+it with a new version, as with tools/build_centroids.py: registered versions are never modified, so copy the
+version's files to a working directory first.
+
+    python -m tools.build_finger_stats --model work/landmark_model.tflite [--variants 4]
+    python -m tools.register_model work/landmark_model.tflite --activate
+"""
+import argparse
+import os
+
+import numpy as np
+
+from app.finger_feedback import FingerStats, finger_stats_path_for
+from app.model_metadata import load_model_metadata
+from app.model_registry import MODEL_REGISTRY_DIR
+from tools.build_centroids import kmeans, DEFAULT_MODEL_PATH
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+
+def class_statistics(vectors, variants, min_std, rng):
+    """(variants, F) means and stds of one class's vectors, one row per k-means cluster (fewer rows repeat the first)."""
+    centers = kmeans(vectors, variants, rng)
+    assignment = np.argmin(((vectors[:, None, :] - centers[None]) ** 2).sum(axis=2), axis=1)
+    means, stds = [], []
+    for j in range(len(centers)):
+        members = vectors[assignment == j]
+        if len(members) < 2: # too few to estimate a spread; use the whole class's
+            members = vectors
+        means.append(members.mean(axis=0))
+        stds.append(np.maximum(members.std(axis=0), min_std))
+    while len(means) < variants:
+        means.append(means[0])
+        stds.append(stds[0])
+    return np.stack(means), np.stack(stds)
+
+
+def build_finger_stats(features, labels, class_names, variants, min_std, rng):
+    means, stds = zip(*(class_statistics(features[labels == index], variants, min_std, rng) for index in range(len(class_names))))
+    return FingerStats(class_names, np.stack(means), np.stack(stds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--output', help="Default: <model>.finger_stats.npz next to the model")
+    parser.add_argument('--variants', type=int, default=4, help="k-means clusters per class (1: one mean per class)")
+    parser.add_argument('--min-std', type=float, default=0.02, help="Smallest standard deviation (normalized units)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = args.output or finger_stats_path_for(args.model)
+    if os.path.commonpath([os.path.abspath(output), MODEL_REGISTRY_DIR]) == MODEL_REGISTRY_DIR:
+        raise SystemExit(f"{output} is inside the model registry, whose versions are never modified; "
+                         f"copy the model and its .json to a working directory, or pass --output.")
+
+    features, labels, class_names = load_landmark_dataset(args.landmark_file)
+    if list(class_names) != list(load_model_metadata(args.model)['class_names']):
+        raise SystemExit(f"{args.landmark_file} and {args.model} list different classes.")
+    (train_features, train_labels), _ = split_dataset(features, labels)
+    stats = build_finger_stats(train_features, train_labels, class_names, args.variants, args.min_std, np.random.default_rng(args.seed))
+    path = stats.save(output)
+    print(f"Wrote statistics of {len(class_names)} signs ({args.variants} variants each, from {len(train_features)} "
+          f"training vectors) to {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Builds the dynamic sign templates (models/sequence_templates.npz) that SEQUENCE_MODE matches against.
+
+Each recording is an .npz file holding one performance of a sign as 'landmarks': per-frame MediaPipe
+coordinates, (T, 21, 2) or flat (T, 42) (already normalized rows are fine, normalization is idempotent).
+Frames without a hand are left out of a recording. Several recordings per sign make it more robust:
+
+    python -m tools.build_sequence_templates --sign Hello hello_1.npz hello_2.npz --sign "Thank You" thanks_1.npz [--output models/sequence_templates.npz]
+
+The window length, segment count and motion lag come from app.sequence_recognition and are stored
+with the templates; rebuild after changing them.
+"""
+import argparse
+
+import numpy as np
+
+from app.landmark_normalization import normalize_landmarks
+from app.sequence_recognition import SEQUENCE_TEMPLATES_FILE, SequenceTemplates, window_features
+
+
+def load_recording(path):
+    """Normalized (T, 42) frames of one recording."""
+    with np.load(path) as data:
+        landmarks = data['landmarks']
+    if len(landmarks) < 2:
+        raise ValueError(f"{path} has {len(landmarks)} frame(s); a dynamic sign needs a recorded movement.")
+    return normalize_landmarks(landmarks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sign', nargs='+', action='append', required=True, metavar=('NAME', 'RECORDING'),
+                        help="A sign name followed by its recordings; repeat for each sign")
+    parser.add_argument('--output', default=SEQUENCE_TEMPLATES_FILE)
+    args = parser.parse_args()
+
+    names, features = [], []
+    for name, *recordings in args.sign:
+        if not recordings:
+            raise SystemExit(f"--sign {name} has no recordings.")
+        for path in recordings:
+            features.append(window_features(load_recording(path)))
+            names.append(name)
+        print(f"  {name}: {len(recordings)} recording(s)")
+
+    templates = SequenceTemplates(names, np.stack(features))
+    path = templates.save(args.output)
+    print(f"Wrote {len(names)} templates for {len(templates.signs)} signs to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""One-time converter: writes <model>.json (class names, input shape, normalization, model hash) next to the model.
+
+Reads class names from the training pickle so the app never has to unpickle it at startup, and the input
+shape from the .tflite itself. Run it on a newly trained model before adding it to the model registry
+(tools/register_model.py), or again whenever the model or its classes change:
+
+    python -m tools.convert_landmark_metadata [--model path/to/landmark_model.tflite] [--landmark-file hand_landmarks.pkl]
+"""
+import argparse
+import os
+import pickle
+
+from app.inference_backend import NumpyBackend, TFLiteBackend, UnsupportedModelError
+from app.model_metadata import build_model_metadata, write_model_metadata, load_model_metadata
+from app.model_registry import active_model_path
+from app.tflite_model import TFLiteFormatError
+from tools.landmark_dataset import DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    args = parser.parse_args()
+
+    with open(args.landmark_file, 'rb') as f:
+        class_names = list(pickle.load(f)['class_names'])
+
+    try:
+        backend = NumpyBackend(args.model)
+    except (UnsupportedModelError, TFLiteFormatError):
+        backend = TFLiteBackend(args.model)
+    if backend.num_classes != len(class_names):
+        raise SystemExit(f"Model has {backend.num_classes} outputs but {args.landmark_file} lists {len(class_names)} classes.")
+
+    metadata = build_model_metadata(args.model, class_names, backend.num_features, source=os.path.basename(args.landmark_file))
+    path = write_model_metadata(args.model, metadata)
+    load_model_metadata(args.model) # round-trip validation
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes): {len(class_names)} classes, input {metadata['input_shape']}, sha256 {metadata['model_sha256'][:12]}...")
+
+
+if __name__ == '__main__':
+    main()
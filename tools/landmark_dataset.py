@@ -0,0 +1,61 @@
+"""Loads hand_landmarks.pkl through the runtime normalization so offline tools see exactly what the live path sees.
+
+Run as a script to check that the stored training vectors match app.landmark_normalization:
+
+    python -m tools.landmark_dataset [--landmark-file hand_landmarks.pkl]
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+from app.landmark_normalization import normalize_landmarks, NUM_FEATURES
+
+DEFAULT_LANDMARK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'hand_landmarks.pkl')
+
+
+def load_landmark_dataset(landmark_file=DEFAULT_LANDMARK_FILE, renormalize=True):
+    """Returns (features (N, 42) float32, labels (N,) int32, class_names list) from the training pickle."""
+    with open(landmark_file, 'rb') as f:
+        data = pickle.load(f)
+    landmarks = np.asarray(data['landmarks'])
+    if landmarks.ndim != 2 or landmarks.shape[1] != NUM_FEATURES:
+        raise ValueError(f"Expected (N, {NUM_FEATURES}) landmarks, got {landmarks.shape}")
+    if renormalize:
+        features = normalize_landmarks(landmarks)
+    else:
+        features = landmarks.astype(np.float32)
+    return features, np.asarray(data['labels'], dtype=np.int32), list(data['class_names'])
+
+
+def split_dataset(features, labels, holdout_fraction=0.2, seed=42):
+    """Stratified train/held-out split (same 80/20 proportions used in training)."""
+    rng = np.random.default_rng(seed)
+    train_idx, holdout_idx = [], []
+    for class_index in np.unique(labels):
+        idx = np.flatnonzero(labels == class_index)
+        rng.shuffle(idx)
+        cut = int(round(len(idx) * holdout_fraction))
+        holdout_idx.append(idx[:cut])
+        train_idx.append(idx[cut:])
+    train_idx = np.concatenate(train_idx)
+    holdout_idx = np.concatenate(holdout_idx)
+    return (features[train_idx], labels[train_idx]), (features[holdout_idx], labels[holdout_idx])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    args = parser.parse_args()
+
+    stored, labels, class_names = load_landmark_dataset(args.landmark_file, renormalize=False)
+    renormalized = normalize_landmarks(stored)
+    deviation = np.abs(renormalized - stored).max(axis=1)
+    print(f"{len(stored)} vectors, {len(class_names)} classes")
+    print(f"Max deviation from runtime normalization: {deviation.max():.3g}")
+    print(f"Vectors deviating by more than 1e-4: {int((deviation > 1e-4).sum())}")
+
+
+if __name__ == '__main__':
+    main()
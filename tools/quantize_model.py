@@ -0,0 +1,118 @@
+"""Writes float32, dynamic-range, float16 and full-int8 variants of the landmark model next to it.
+
+No float source model is kept in the repo (landmark_model.tflite itself already has int8 weights), so the
+network is rebuilt in Keras from the model's FULLY_CONNECTED layers with their weights dequantized, then
+converted once per variant:
+
+  float32   no quantization (the dequantized weights as float32)
+  dynamic   int8 weights, float activations quantized per row at run time (what the shipped model is)
+  float16   float16 weights, dequantized to float32 when the model loads
+  int8      int8 weights and activations, calibrated on --calibration-samples vectors from the training
+            split of hand_landmarks.pkl (the held-out split used by benchmarks/bench_model_variants.py is
+            never seen); the input and output stay float32 so every variant is a drop-in replacement
+
+Each variant is written as <model>.<variant>.tflite with its own .json metadata (class names copied from the
+source model's). Register the model again (tools/register_model.py) to publish the variants as a new version;
+files added to a registered version's directory are not in its manifest and are never loaded. Select a variant
+at run time with MODEL_VARIANT (see app/sign_logic.py). Needs TensorFlow.
+
+    python -m tools.quantize_model [--model models/v1/landmark_model.tflite] [--variants float32 dynamic float16 int8]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from app import tflite_model as tfl
+from app.model_metadata import (MODEL_VARIANTS, model_variant_path, build_model_metadata, write_model_metadata,
+                                load_model_metadata)
+from app.model_registry import active_model_path
+from tools.landmark_dataset import load_landmark_dataset, split_dataset, DEFAULT_LANDMARK_FILE
+
+DEFAULT_MODEL_PATH = active_model_path() # the active version in the model registry
+KERAS_ACTIVATIONS = {tfl.ACTIVATION_NONE: None, tfl.ACTIVATION_RELU: 'relu', tfl.ACTIVATION_RELU6: 'relu6'}
+
+
+def rebuild_keras_model(model_path):
+    """Returns a Keras Sequential equivalent to a dense (FULLY_CONNECTED / activation / SOFTMAX) .tflite model."""
+    import tensorflow as tf
+
+    model = tfl.read_model(model_path)
+    num_features = model.tensors[model.inputs[0]].shape[-1]
+    constants = {}
+    layers, weights = [tf.keras.Input(shape=(num_features,))], []
+    for op in model.operators:
+        if op.opcode == tfl.DEQUANTIZE and model.tensors[op.inputs[0]].data is not None:
+            constants[op.outputs[0]] = model.tensors[op.inputs[0]].dequantized()
+        elif op.opcode == tfl.FULLY_CONNECTED:
+            kernel = constants.get(op.inputs[1])
+            kernel = kernel if kernel is not None else model.tensors[op.inputs[1]].dequantized() # (units, inputs)
+            has_bias = len(op.inputs) > 2 and op.inputs[2] >= 0
+            bias = (constants.get(op.inputs[2]) if op.inputs[2] in constants else model.tensors[op.inputs[2]].dequantized()) \
+                if has_bias else np.zeros(kernel.shape[0], dtype=np.float32)
+            activation = op.options.scalar(0, '<b') if op.options is not None else tfl.ACTIVATION_NONE
+            if activation not in KERAS_ACTIVATIONS:
+                raise SystemExit(f"Unsupported fused activation {activation} in {model_path}.")
+            layers.append(tf.keras.layers.Dense(kernel.shape[0], activation=KERAS_ACTIVATIONS[activation]))
+            weights.append((kernel.T, bias))
+        elif op.opcode in (tfl.RELU, tfl.RELU6, tfl.SOFTMAX):
+            name = {tfl.RELU: 'relu', tfl.RELU6: 'relu6', tfl.SOFTMAX: 'softmax'}[op.opcode]
+            layers.append(tf.keras.layers.Activation(name))
+        elif op.opcode != tfl.RESHAPE:
+            raise SystemExit(f"Unsupported operator {op.opcode} in {model_path}; only dense models can be rebuilt.")
+
+    keras_model = tf.keras.Sequential(layers)
+    dense_layers = [layer for layer in keras_model.layers if isinstance(layer, tf.keras.layers.Dense)]
+    for layer, (kernel, bias) in zip(dense_layers, weights):
+        layer.set_weights([kernel, bias])
+    return keras_model
+
+
+def convert(keras_model, variant, calibration):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if variant == 'dynamic':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == 'int8':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([row[None]] for row in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--landmark-file', default=DEFAULT_LANDMARK_FILE)
+    parser.add_argument('--variants', nargs='+', default=list(MODEL_VARIANTS), choices=MODEL_VARIANTS)
+    parser.add_argument('--calibration-samples', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    source_metadata = load_model_metadata(args.model)
+    features, labels, _ = load_landmark_dataset(args.landmark_file)
+    (train_features, _), _ = split_dataset(features, labels)
+    rng = np.random.default_rng(args.seed)
+    calibration = train_features[rng.choice(len(train_features), min(args.calibration_samples, len(train_features)), replace=False)]
+
+    keras_model = rebuild_keras_model(args.model)
+    for variant in args.variants:
+        path = model_variant_path(args.model, variant)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(convert(keras_model, variant, calibration))
+        os.replace(path + '.tmp', path)
+        metadata = build_model_metadata(path, source_metadata['class_names'], source_metadata['input_shape'][-1],
+                                        source=source_metadata.get('source'))
+        metadata['variant'] = variant
+        metadata['source_model'] = os.path.basename(args.model)
+        write_model_metadata(path, metadata)
+        load_model_metadata(path) # round-trip validation
+        print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Adds a model to the versioned model registry (models/ by default, see app/model_registry.py).
+
+Copies the .tflite, its .json metadata and any quantized variants next to it (tools/quantize_model.py) into
+<registry>/<version>/ and records the sha256 of each file in manifest.json. Files an earlier version already stores
+unchanged (a model and its metadata, or the class prototypes) are shared with it rather than copied. With
+--activate (or for the first version) the new version becomes the active one; running apps swap it in within
+MODEL_WATCH_INTERVAL seconds, or at once from the admin Models page.
+
+    python -m tools.register_model path/to/landmark_model.tflite [--version v2] [--source "retrained on ..."] [--activate]
+    python -m tools.register_model --activate-version v1
+    python -m tools.register_model --list
+"""
+import argparse
+
+from app.model_registry import MODEL_REGISTRY_DIR, register_model, set_active_version, list_versions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model', nargs='?', help="Model to register; its <model>.json metadata must exist")
+    parser.add_argument('--registry', default=MODEL_REGISTRY_DIR)
+    parser.add_argument('--version', help="Version name (default: the next vN)")
+    parser.add_argument('--source', help="Free-form note on where the model came from")
+    parser.add_argument('--activate', action='store_true', help="Make the new version active")
+    parser.add_argument('--activate-version', help="Make an already registered version active")
+    parser.add_argument('--list', action='store_true', help="List registered versions")
+    args = parser.parse_args()
+
+    if args.model:
+        version = register_model(args.model, args.version, args.source, args.activate, args.registry)
+        print(f"Registered {args.model} as version '{version}' in {args.registry}.")
+    if args.activate_version:
+        print(f"Active version is now '{set_active_version(args.activate_version, args.registry)}'.")
+    if args.list or not (args.model or args.activate_version):
+        for entry in list_versions(args.registry):
+            print(f"{'*' if entry['active'] else ' '} {entry['version']:<10} {entry['created_at'] or '-':<21} "
+                  f"{entry['model_file']} (+{len(entry['files']) - 1} files, {len(entry['shared_files'])} shared)  {entry.get('source') or ''}")
+
+
+if __name__ == '__main__':
+    main()